@@ -1,33 +1,58 @@
 import asyncio
+import json
 import uuid
-from typing import Optional
+from typing import Awaitable, Callable, Optional
 
 import httpx
 from langchain_core.messages import BaseMessage
 
-from .models import DataPart, Message, Task, TaskSendRequest
+from .models import (
+    FINAL_TASK_STATUSES, DataPart, Message, Task, TaskIdRequest, TaskQueryRequest, TaskSendRequest, TaskStreamEvent,
+)
+from .history import SentHistory, SentHistoryTracker, create_sent_history_tracker, is_resync_required
 from .serialization import serialize_messages
 from app.config.settings import settings
 from app.core.context import get_request_id
 from app.core.logging import get_logger
-from app.core.http_client_registry import register
+from app.core.http_client_registry import create_http_client, register
+from app.core.metrics import counter
 
 _logger = get_logger("a2a_client")
 
 _RETRYABLE_STATUS_CODES: frozenset[int] = frozenset({502, 503, 504})
 
+_CANCEL_REQUESTS = counter(
+    "a2a_client_cancel_requests_total",
+    "결과 대기를 포기하며 서브에이전트에 보낸 tasks/cancel 수 (reason: abandoned | timeout)",
+    ("reason",),
+)
+
+def _is_history_resync(resp: httpx.Response) -> bool:
+    try:
+        body = resp.json()
+    except Exception:
+        return False
+    return is_resync_required(resp.status_code, body)
+
+
+# 취소된 호출자 대신 tasks/cancel을 마저 보내는 task — 참조를 들고 있어야 GC되지 않는다
+_pending_cancels: set[asyncio.Task] = set()
+
 
 class A2AClient:
     def __init__(self, base_url: str):
         # base_url: 에이전트 prefix까지 포함 (e.g. "http://localhost:8005/a2a/recommend-product")
         self.base_url = base_url.rstrip("/")
         self._http_client: Optional[httpx.AsyncClient] = None
+        self._history: Optional[SentHistoryTracker] = (
+            create_sent_history_tracker() if settings.a2a_delta_history_enabled else None
+        )
         register(self)
 
     @property
     def http_client(self) -> httpx.AsyncClient:
         if self._http_client is None or self._http_client.is_closed:
-            self._http_client = httpx.AsyncClient(
+            self._http_client = create_http_client(
                 timeout=settings.a2a_timeout,
                 headers={"X-Internal-Token": settings.internal_token or ""},
             )
@@ -37,46 +62,88 @@ class A2AClient:
         if self._http_client is not None and not self._http_client.is_closed:
             await self._http_client.aclose()
 
-    async def send_task(
-        self,
-        session_id: str,
-        data: dict,
-        timeout: httpx.Timeout | None = None,
-    ) -> Task:
-        serialized = {
-            k: serialize_messages(v)
-               if isinstance(v, list) and v and isinstance(v[0], BaseMessage)
-               else v
-            for k, v in data.items()
-            if v is not None
-        }
+    def _build_request(
+        self, session_id: str, data: dict, *, full_history: bool = False
+    ) -> tuple[TaskSendRequest, Optional[SentHistory]]:
+        """(요청, 전송 성공 시 commit할 이력 상태). delta 이력 모드면 messages는 새 메시지만 담는다."""
+        sent: Optional[SentHistory] = None
+        serialized: dict = {}
+        for k, v in data.items():
+            if v is None:
+                continue
+            if isinstance(v, list) and v and isinstance(v[0], BaseMessage):
+                if k == "messages" and self._history is not None:
+                    serialized[k], serialized["history"], sent = self._history.encode(
+                        session_id, v, full=full_history
+                    )
+                else:
+                    serialized[k] = serialize_messages(v)
+            else:
+                serialized[k] = v
         req = TaskSendRequest(
             id=str(uuid.uuid4()),
             sessionId=session_id,
             message=Message(role="user", parts=[DataPart(data=serialized)]),
         )
+        return req, sent
 
-        last_exc: Exception | None = None
-        attempt_errors: list[str] = []
+    async def _send_with_history(
+        self,
+        session_id: str,
+        data: dict,
+        send: Callable[[TaskSendRequest], Awaitable[Task]],
+    ) -> Task:
+        """서브에이전트가 이력 캐시를 잃어 409(history_resync)로 답하면 전체 이력으로 한 번 다시 보낸다."""
+        req, sent = self._build_request(session_id, data)
+        try:
+            task = await send(req)
+        except httpx.HTTPStatusError as e:
+            if sent is None or not _is_history_resync(e.response):
+                raise
+            _logger.info("a2a_history_resync", url=self.base_url, session_id=session_id)
+            self._history.forget(session_id)
+            req, sent = self._build_request(session_id, data, full_history=True)
+            task = await send(req)
+        if sent is not None:
+            self._history.commit(session_id, sent)
+        return task
 
+    @staticmethod
+    def _extra_headers() -> dict[str, str]:
         extra_headers: dict[str, str] = {}
         if rid := get_request_id():
             extra_headers["X-Request-ID"] = rid
+        return extra_headers
+
+    @staticmethod
+    def _parse_task(resp: httpx.Response) -> Task:
+        try:
+            return Task(**resp.json())
+        except Exception as e:
+            _logger.error("a2a_response_parse_failed", error_type=type(e).__name__, exc_info=True)
+            raise ValueError("A2A 응답 파싱 실패") from None
+
+    async def _post_with_retry(
+        self,
+        method: str,
+        payload: dict,
+        timeout: httpx.Timeout | None,
+        extra_headers: dict[str, str],
+    ) -> Task:
+        """tasks/* POST 1건 — 502/503/504와 연결 오류는 backoff 후 재시도."""
+        last_exc: Exception | None = None
+        attempt_errors: list[str] = []
 
         for attempt in range(settings.a2a_max_retries):
             try:
                 resp = await self.http_client.post(
-                    f"{self.base_url}/tasks/send",
-                    json=req.model_dump(),
+                    f"{self.base_url}/{method}",
+                    json=payload,
                     timeout=timeout,
                     headers=extra_headers,
                 )
                 resp.raise_for_status()
-                try:
-                    return Task(**resp.json())
-                except Exception as e:
-                    _logger.error("a2a_response_parse_failed", error_type=type(e).__name__, exc_info=True)
-                    raise ValueError("A2A 응답 파싱 실패") from None
+                return self._parse_task(resp)
             except httpx.HTTPStatusError as e:
                 if e.response.status_code not in _RETRYABLE_STATUS_CODES:
                     raise
@@ -86,6 +153,7 @@ class A2AClient:
                 _logger.warning(
                     "a2a_send_task_retry",
                     url=self.base_url,
+                    method=method,
                     attempt=attempt + 1,
                     max_retries=settings.a2a_max_retries,
                     error_type=error_type,
@@ -102,6 +170,7 @@ class A2AClient:
                 _logger.warning(
                     "a2a_send_task_retry",
                     url=self.base_url,
+                    method=method,
                     attempt=attempt + 1,
                     max_retries=settings.a2a_max_retries,
                     error_type=error_type,
@@ -111,9 +180,223 @@ class A2AClient:
                         min(settings.a2a_retry_backoff_base ** attempt, settings.a2a_retry_backoff_max)
                     )
 
+        _logger.error(
+            "a2a_send_task_all_retries_exhausted",
+            url=self.base_url,
+            method=method,
+            attempts=attempt_errors,
+        )
+        raise last_exc
+
+    async def send_task(
+        self,
+        session_id: str,
+        data: dict,
+        timeout: httpx.Timeout | None = None,
+    ) -> Task:
+        """서브에이전트 작업을 실행하고 최종 Task를 반환.
+
+        a2a_async_tasks_enabled면 tasks/send로 등록만 하고 tasks/get long poll로 결과를 기다린다.
+        전체 대기 한도는 a2a_timeout이며, timeout.read가 None이면(파일 일괄 등록) 한도 없이 기다린다.
+        """
+        extra_headers = self._extra_headers()
+
+        async def send(req: TaskSendRequest) -> Task:
+            if not settings.a2a_async_tasks_enabled:
+                return await self._post_with_retry("tasks/send", req.model_dump(), timeout, extra_headers)
+            req.blocking = False
+            unbounded = timeout is not None and timeout.read is None
+            return await self._run_async_task(req, None if unbounded else settings.a2a_timeout, extra_headers)
+
+        return await self._send_with_history(session_id, data, send)
+
+    async def _run_async_task(
+        self,
+        req: TaskSendRequest,
+        max_wait: Optional[float],
+        extra_headers: dict[str, str],
+    ) -> Task:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + max_wait if max_wait is not None else None
+        control_timeout = httpx.Timeout(settings.a2a_control_timeout)
+
+        # 같은 task id로 재전송하면 서버가 기존 작업에 붙이므로 재시도해도 LLM 작업이 중복되지 않는다
+        try:
+            task = await self._post_with_retry("tasks/send", req.model_dump(), control_timeout, extra_headers)
+            return await self._wait_for_task(req, task, deadline, max_wait, extra_headers)
+        except asyncio.CancelledError:
+            # 상위 실행(chat_stream producer 등)이 취소됨 — 서브에이전트 작업도 멈추게 한다.
+            # 취소된 task 안에서는 더 기다릴 수 없으므로 별도 task로 보낸다.
+            _CANCEL_REQUESTS.inc(reason="abandoned")
+            cancel = asyncio.create_task(self.cancel_task(req.id))
+            _pending_cancels.add(cancel)
+            cancel.add_done_callback(_pending_cancels.discard)
+            raise
+
+    async def _wait_for_task(
+        self,
+        req: TaskSendRequest,
+        task: Task,
+        deadline: Optional[float],
+        max_wait: Optional[float],
+        extra_headers: dict[str, str],
+    ) -> Task:
+        loop = asyncio.get_running_loop()
+        not_found = 0
+        while task.status not in FINAL_TASK_STATUSES:
+            wait = settings.a2a_poll_wait_seconds
+            if deadline is not None:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    _logger.error("a2a_task_wait_timeout", url=self.base_url, task_id=req.id, max_wait=max_wait)
+                    _CANCEL_REQUESTS.inc(reason="timeout")
+                    await self.cancel_task(req.id)
+                    raise TimeoutError("A2A 작업 대기 시간 초과")
+                wait = min(wait, remaining)
+            try:
+                task = await self._post_with_retry(
+                    "tasks/get",
+                    TaskQueryRequest(id=req.id, waitSeconds=wait).model_dump(),
+                    httpx.Timeout(settings.a2a_control_timeout, read=wait + settings.a2a_control_timeout),
+                    extra_headers,
+                )
+            except httpx.HTTPStatusError as e:
+                # 작업은 등록받은 replica 메모리에만 있다. 404는 조회가 다른 replica로 갔거나 서버가
+                # 재시작된 경우 — 여기서 다시 등록하면 LLM 작업이 처음부터 중복 실행되므로 조회만 재시도한다
+                if e.response.status_code != 404 or not_found >= settings.a2a_task_not_found_retries:
+                    raise
+                not_found += 1
+                _logger.warning("a2a_task_not_found_retry", url=self.base_url, task_id=req.id, attempt=not_found)
+                await asyncio.sleep(
+                    min(settings.a2a_retry_backoff_base ** not_found, settings.a2a_retry_backoff_max)
+                )
+                continue
+            not_found = 0
+        return task
+
+    async def get_task(self, task_id: str, wait: Optional[float] = None) -> Task:
+        read_timeout = (wait or 0) + settings.a2a_control_timeout
+        return await self._post_with_retry(
+            "tasks/get",
+            TaskQueryRequest(id=task_id, waitSeconds=wait).model_dump(),
+            httpx.Timeout(settings.a2a_control_timeout, read=read_timeout),
+            self._extra_headers(),
+        )
+
+    async def cancel_task(self, task_id: str) -> Optional[Task]:
+        """tasks/cancel — best-effort. 실패하면 None (서버 쪽 작업은 보관 시간 후 정리된다).
+
+        404는 요청이 작업을 갖지 않은 replica로 간 것일 수 있으므로 a2a_task_not_found_retries번 다시 보낸다.
+        """
+        for attempt in range(settings.a2a_task_not_found_retries + 1):
+            try:
+                resp = await self.http_client.post(
+                    f"{self.base_url}/tasks/cancel",
+                    json=TaskIdRequest(id=task_id).model_dump(),
+                    timeout=settings.a2a_control_timeout,
+                    headers=self._extra_headers(),
+                )
+                if resp.status_code == 404 and attempt < settings.a2a_task_not_found_retries:
+                    continue
+                resp.raise_for_status()
+                return self._parse_task(resp)
+            except Exception as e:
+                _logger.warning("a2a_cancel_task_failed", url=self.base_url, task_id=task_id, error_type=type(e).__name__)
+                return None
+
+    async def send_task_subscribe(
+        self,
+        session_id: str,
+        data: dict,
+        on_event: Callable[[TaskStreamEvent], Awaitable[None]],
+        timeout: httpx.Timeout | None = None,
+    ) -> Task:
+        """tasks/sendSubscribe — 진행 이벤트를 on_event로 넘기고 최종 Task를 반환.
+
+        재시도는 send_task와 같은 조건(502/503/504, 연결 오류)이지만 이벤트를 하나라도
+        받은 뒤에는 재시도하지 않는다(서브에이전트 작업이 이미 진행 중이므로 중복 실행 방지).
+        스트림이 Task 없이 끝나면 ValueError.
+        """
+        extra_headers = self._extra_headers()
+        return await self._send_with_history(
+            session_id, data, lambda req: self._subscribe(req, on_event, timeout, extra_headers)
+        )
+
+    async def _subscribe(
+        self,
+        req: TaskSendRequest,
+        on_event: Callable[[TaskStreamEvent], Awaitable[None]],
+        timeout: httpx.Timeout | None,
+        extra_headers: dict[str, str],
+    ) -> Task:
+        last_exc: Exception | None = None
+        attempt_errors: list[str] = []
+
+        for attempt in range(settings.a2a_max_retries):
+            received = False
+            try:
+                async with self.http_client.stream(
+                    "POST",
+                    f"{self.base_url}/tasks/sendSubscribe",
+                    json=req.model_dump(),
+                    timeout=timeout,
+                    headers=extra_headers,
+                ) as resp:
+                    if resp.is_error:
+                        await resp.aread()  # 409(history_resync) 판별용 본문
+                    resp.raise_for_status()
+                    async for line in resp.aiter_lines():
+                        if not line.startswith("data:"):
+                            continue
+                        try:
+                            event = TaskStreamEvent(**json.loads(line[5:].strip()))
+                        except Exception as e:
+                            _logger.error("a2a_stream_event_parse_failed", error_type=type(e).__name__)
+                            raise ValueError("A2A 스트림 이벤트 파싱 실패") from None
+                        received = True
+                        if event.kind == "task" and event.task is not None:
+                            return event.task
+                        await on_event(event)
+                raise ValueError("A2A 스트림이 Task 없이 종료되었습니다")
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code not in _RETRYABLE_STATUS_CODES:
+                    raise
+                last_exc = e
+                error_type = f"HTTP{e.response.status_code}"
+            except (httpx.RequestError, httpx.TimeoutException) as e:
+                if received:
+                    raise
+                last_exc = e
+                error_type = type(e).__name__
+
+            attempt_errors.append(f"attempt {attempt + 1}: {error_type}")
+            _logger.warning(
+                "a2a_send_task_retry",
+                url=self.base_url,
+                attempt=attempt + 1,
+                max_retries=settings.a2a_max_retries,
+                error_type=error_type,
+                streaming=True,
+            )
+            if attempt < settings.a2a_max_retries - 1:
+                await asyncio.sleep(
+                    min(settings.a2a_retry_backoff_base ** attempt, settings.a2a_retry_backoff_max)
+                )
+
         _logger.error(
             "a2a_send_task_all_retries_exhausted",
             url=self.base_url,
             attempts=attempt_errors,
+            streaming=True,
         )
         raise last_exc
+
+
+def create_a2a_client(agent: str, base_url: str):
+    """a2a_local_agents에 있는 에이전트면 in-process 클라이언트, 아니면 HTTP A2AClient."""
+    if agent in settings.a2a_local_agents:
+        from .local import LocalA2AClient
+
+        _logger.info("a2a_local_transport_enabled", agent=agent)
+        return LocalA2AClient(agent)
+    return A2AClient(base_url)
@@ -0,0 +1,191 @@
+"""
+A2A 대화 이력 delta 전송.
+
+A2AClient는 hop마다 대화 전체(messages)를 serialize_messages로 직렬화해 보냈다 — 요청 크기와
+직렬화 CPU가 대화 길이에 비례해 커진다. a2a_delta_history_enabled면
+
+- 클라이언트(SentHistoryTracker)는 sessionId별로 서브에이전트에 이미 보낸 메시지 id 목록과
+  이력 digest를 기억하고, 앞부분이 그대로면 새 메시지만 보낸다
+  (data["messages"] = delta, data["history"] = {"base_count", "base_digest"}).
+- 서브에이전트(HistoryCache)는 sessionId별 직렬화 이력을 잠시 보관해 delta를 이어 붙인다.
+  캐시가 없거나(만료·재시작·다른 인스턴스) 개수·digest가 다르면 409(history_resync)로
+  응답하고, 클라이언트는 전체 이력으로 한 번 다시 보낸다.
+
+digest는 메시지별 직렬화 JSON을 이어 해시한 rolling digest라 양쪽 모두 새 메시지만 해시하면 된다.
+요약(summary)으로 앞부분 메시지가 바뀌면 id 목록이 달라지므로 전체를 다시 보낸다.
+"""
+
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+from langchain_core.messages import BaseMessage
+
+from .models import DataPart, TaskSendRequest
+from .serialization import serialize_messages
+from app.config.settings import settings
+from app.core.logging import get_logger
+from app.core.metrics import counter
+
+_logger = get_logger("a2a_history")
+
+HISTORY_RESYNC_CODE = "history_resync"
+
+_DELTA_REQUESTS = counter(
+    "a2a_history_requests_total",
+    "A2A 이력 전송 방식별 요청 수 (mode: delta | full | resync)",
+    ("mode",),
+)
+
+
+def extend_digest(digest: str, raw_messages: List[dict]) -> str:
+    """직렬화된 메시지를 digest 뒤에 이어 해시한다 (빈 digest = 빈 이력)."""
+    for raw in raw_messages:
+        h = hashlib.sha256(digest.encode())
+        h.update(json.dumps(raw, sort_keys=True, ensure_ascii=False, separators=(",", ":")).encode())
+        digest = h.hexdigest()
+    return digest
+
+
+# ── 클라이언트 ───────────────────────────────────────────────────────────
+
+@dataclass
+class SentHistory:
+    ids: List[str]
+    digest: str
+    expires_at: float = 0.0
+
+
+class SentHistoryTracker:
+    """A2AClient 1개(서브에이전트 1종)가 sessionId별로 보낸 이력."""
+
+    def __init__(self, max_sessions: int, ttl_seconds: float):
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self._sessions: "OrderedDict[str, SentHistory]" = OrderedDict()
+
+    def encode(
+        self, session_id: str, messages: List[BaseMessage], *, full: bool = False
+    ) -> Tuple[List[dict], Dict[str, Any], SentHistory]:
+        """(보낼 직렬화 메시지, history 필드, 전송 성공 시 commit할 상태). 전체 전송은 base_count 0."""
+        ids = [m.id for m in messages]
+        sent = None if full else self._get(session_id)
+        if sent is not None and ids[:len(sent.ids)] == sent.ids:
+            delta = serialize_messages(messages[len(sent.ids):])
+            _DELTA_REQUESTS.inc(mode="delta")
+            return (
+                delta,
+                {"base_count": len(sent.ids), "base_digest": sent.digest},
+                SentHistory(ids, extend_digest(sent.digest, delta)),
+            )
+        raw = serialize_messages(messages)
+        _DELTA_REQUESTS.inc(mode="full")
+        return raw, {"base_count": 0, "base_digest": ""}, SentHistory(ids, extend_digest("", raw))
+
+    def commit(self, session_id: str, sent: SentHistory) -> None:
+        # id 없는 메시지가 있으면 앞부분 동일성을 확인할 수 없으므로 기억하지 않는다
+        if any(i is None for i in sent.ids):
+            self._sessions.pop(session_id, None)
+            return
+        sent.expires_at = time.monotonic() + self.ttl_seconds
+        self._sessions[session_id] = sent
+        self._sessions.move_to_end(session_id)
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+
+    def forget(self, session_id: str) -> None:
+        self._sessions.pop(session_id, None)
+
+    def _get(self, session_id: str) -> Optional[SentHistory]:
+        sent = self._sessions.get(session_id)
+        if sent is None:
+            return None
+        if sent.expires_at <= time.monotonic():
+            del self._sessions[session_id]
+            return None
+        return sent
+
+
+def is_resync_required(status_code: int, body: Any) -> bool:
+    detail = body.get("detail") if isinstance(body, dict) else None
+    return status_code == 409 and isinstance(detail, dict) and detail.get("code") == HISTORY_RESYNC_CODE
+
+
+# ── 서버 ─────────────────────────────────────────────────────────────────
+
+@dataclass
+class _CachedHistory:
+    messages: List[dict]
+    digest: str
+    expires_at: float
+
+
+class HistoryCache:
+    """서브에이전트 서버의 sessionId별 직렬화 이력 (TTL + LRU)."""
+
+    def __init__(self, max_sessions: int, ttl_seconds: float):
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self._sessions: "OrderedDict[str, _CachedHistory]" = OrderedDict()
+
+    def resolve(self, session_id: Optional[str], messages: List[dict], history: Optional[dict]) -> List[dict]:
+        """history의 base 뒤에 messages를 이어 붙인 전체 이력을 반환하고 캐시를 갱신.
+
+        history가 없으면(delta 미사용 클라이언트) messages를 그대로 반환하고 캐시하지 않는다.
+        base_count가 0이면 전체 전송이다. 캐시와 맞지 않으면 409(history_resync).
+        """
+        if history is None:
+            return messages
+        if not history.get("base_count"):
+            full, digest = messages, extend_digest("", messages)
+        else:
+            cached = self._get(session_id) if session_id else None
+            if (
+                cached is None
+                or len(cached.messages) != history.get("base_count")
+                or cached.digest != history.get("base_digest")
+            ):
+                _DELTA_REQUESTS.inc(mode="resync")
+                _logger.info("a2a_history_resync_required", session_id=session_id, cached=cached is not None)
+                raise HTTPException(
+                    status_code=409,
+                    detail={"code": HISTORY_RESYNC_CODE, "message": "전체 이력을 다시 보내야 합니다."},
+                )
+            full, digest = cached.messages + messages, extend_digest(cached.digest, messages)
+
+        if session_id:
+            self._sessions[session_id] = _CachedHistory(full, digest, time.monotonic() + self.ttl_seconds)
+            self._sessions.move_to_end(session_id)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        return full
+
+    def _get(self, session_id: str) -> Optional[_CachedHistory]:
+        cached = self._sessions.get(session_id)
+        if cached is None:
+            return None
+        if cached.expires_at <= time.monotonic():
+            del self._sessions[session_id]
+            return None
+        return cached
+
+
+def create_history_cache() -> HistoryCache:
+    return HistoryCache(settings.a2a_history_cache_max_sessions, settings.a2a_history_cache_ttl_seconds)
+
+
+def create_sent_history_tracker() -> SentHistoryTracker:
+    return SentHistoryTracker(settings.a2a_history_cache_max_sessions, settings.a2a_history_cache_ttl_seconds)
+
+
+def apply_history(cache: HistoryCache, request: TaskSendRequest) -> None:
+    """요청 DataPart의 delta messages를 전체 이력으로 바꾼다 (history 필드 제거). 맞지 않으면 409."""
+    for part in request.message.parts:
+        if isinstance(part, DataPart):
+            history = part.data.pop("history", None)
+            part.data["messages"] = cache.resolve(request.sessionId, part.data.get("messages", []), history)
+            return
@@ -0,0 +1,163 @@
+"""
+In-process A2A transport — 단일 호스트 배포에서 서브에이전트를 HTTP 없이 같은 프로세스에서 실행.
+
+a2a_local_agents에 적은 에이전트는 create_a2a_client가 LocalA2AClient를 돌려준다.
+A2AClient와 같은 메서드(send_task · send_task_subscribe · get_task · cancel_task)와 같은 Task
+계약을 유지하면서
+
+- HTTP 연결·X-Internal-Token/body-limit 미들웨어·JSON 인코딩을 거치지 않고
+- 메시지를 serialize_messages로 dict로 바꾸지 않고 객체 그대로 넘기며 (serialization.in_process)
+- 에이전트의 TaskManager에 직접 등록해 취소·대기 동작은 HTTP 경로와 같다.
+
+서브에이전트 실행은 새 contextvars 컨텍스트에서 시작한다 — 호출한 CRM 노드의 LangChain
+실행 컨텍스트(callbacks)가 이어지면 서브에이전트의 LLM 토큰이 CRM astream_events에 섞이기 때문.
+메시지·dict 객체를 공유하므로 서브에이전트는 입력을 변경하지 않는다고 가정한다(현재 노드들은 새 state만 반환).
+"""
+
+import asyncio
+import contextvars
+import importlib
+import uuid
+from types import SimpleNamespace
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import httpx
+
+from .models import FINAL_TASK_STATUSES, DataPart, Message, Task, TaskSendRequest, TaskStreamEvent
+from .serialization import in_process
+from app.config.settings import settings
+from app.core.context import get_request_id, set_request_id
+from app.core.logging import get_logger
+
+_logger = get_logger("a2a_local")
+
+# 에이전트 이름 → A2A 진입 모듈 (init_agent_state · task_events 제공)
+LOCAL_AGENT_MODULES: Dict[str, str] = {
+    "recommend_product_agent": "app.agents.recommend_product_agent.a2a_agent",
+    "generate_message_agent": "app.agents.generate_message_agent.a2a_agent",
+    "data_registration_agent": "app.agents.data_registration_agent.a2a_agent",
+}
+
+_hosts: Dict[str, "LocalAgentHost"] = {}
+
+
+class LocalAgentHost:
+    """에이전트 1종의 in-process 인스턴스 — 서버 lifespan과 같은 init_agent_state로 처음 호출 시 초기화."""
+
+    def __init__(self, agent: str, state: Any = None):
+        self.agent = agent
+        self.module = importlib.import_module(LOCAL_AGENT_MODULES[agent])
+        self._state = state
+
+    @property
+    def state(self) -> Any:
+        if self._state is None:
+            state = SimpleNamespace()
+            self.module.init_agent_state(state)
+            self._state = state
+            _logger.info("a2a_local_agent_initialized", agent=self.agent)
+        return self._state
+
+    def submit(self, request: TaskSendRequest, *, stream: bool = True) -> None:
+        """stream=False(send_task)면 진행 이벤트 없이 실행한다 (에이전트 task_events 참고)."""
+        state = self.state
+        context = contextvars.Context()
+        context.run(in_process.set, True)
+        if rid := get_request_id():
+            context.run(set_request_id, rid)
+        state.a2a_tasks.submit(request, lambda: self.module.task_events(request, state, stream=stream), context=context)
+
+    async def close(self) -> None:
+        if self._state is not None:
+            await self._state.a2a_tasks.close()
+
+
+def get_local_host(agent: str) -> LocalAgentHost:
+    host = _hosts.get(agent)
+    if host is None:
+        host = _hosts[agent] = LocalAgentHost(agent)
+    return host
+
+
+async def close_local_agents() -> None:
+    """실행 중인 in-process 작업 취소 (CRM 서버 종료 시). 에이전트 서비스의 HTTP 클라이언트는 close_all이 닫는다."""
+    for host in list(_hosts.values()):
+        await host.close()
+    _hosts.clear()
+
+
+class LocalA2AClient:
+    """A2AClient와 같은 인터페이스의 in-process 클라이언트."""
+
+    def __init__(self, agent: str, host: Optional[LocalAgentHost] = None):
+        self.agent = agent
+        self._host = host
+
+    @property
+    def host(self) -> LocalAgentHost:
+        if self._host is None:
+            self._host = get_local_host(self.agent)
+        return self._host
+
+    async def aclose(self) -> None:
+        return None
+
+    def _build_request(self, session_id: str, data: dict) -> TaskSendRequest:
+        return TaskSendRequest(
+            id=str(uuid.uuid4()),
+            sessionId=session_id,
+            message=Message(role="user", parts=[DataPart(data={k: v for k, v in data.items() if v is not None})]),
+        )
+
+    async def send_task(
+        self,
+        session_id: str,
+        data: dict,
+        timeout: httpx.Timeout | None = None,
+    ) -> Task:
+        """A2AClient.send_task와 같다 — 대기 한도는 a2a_timeout, timeout.read가 None이면 한도 없음."""
+        req = self._build_request(session_id, data)
+        self.host.submit(req, stream=False)
+        unbounded = timeout is not None and timeout.read is None
+        try:
+            task = await self.host.state.a2a_tasks.wait(req.id, None if unbounded else settings.a2a_timeout)
+        except asyncio.CancelledError:
+            self.host.state.a2a_tasks.cancel(req.id)
+            raise
+        if task.status not in FINAL_TASK_STATUSES:
+            _logger.error("a2a_task_wait_timeout", agent=self.agent, task_id=req.id, local=True)
+            self.host.state.a2a_tasks.cancel(req.id, reason="timeout")
+            raise TimeoutError("A2A 작업 대기 시간 초과")
+        return task
+
+    async def send_task_subscribe(
+        self,
+        session_id: str,
+        data: dict,
+        on_event: Callable[[TaskStreamEvent], Awaitable[None]],
+        timeout: httpx.Timeout | None = None,
+    ) -> Task:
+        req = self._build_request(session_id, data)
+        self.host.submit(req)
+        tasks = self.host.state.a2a_tasks
+        finished = False
+        try:
+            async for event in tasks.subscribe(req.id):
+                if event.kind == "task" and event.task is not None:
+                    finished = True
+                    return event.task
+                await on_event(event)
+        finally:
+            if not finished:
+                tasks.cancel(req.id)
+        raise ValueError("A2A 스트림이 Task 없이 종료되었습니다")
+
+    async def get_task(self, task_id: str, wait: Optional[float] = None) -> Task:
+        tasks = self.host.state.a2a_tasks
+        task = await tasks.wait(task_id, wait) if wait else tasks.get(task_id)
+        if task is None:
+            raise ValueError(f"A2A 작업을 찾을 수 없습니다: {task_id}")
+        return task
+
+    async def cancel_task(self, task_id: str) -> Optional[Task]:
+        return self.host.state.a2a_tasks.cancel(task_id)
@@ -9,6 +9,13 @@ class TaskStatus(str, Enum):
     WORKING = "working"
     COMPLETED = "completed"
     FAILED = "failed"
+    CANCELED = "canceled"
+
+
+# 더 이상 바뀌지 않는 상태 — tasks/get 대기·재시도 판단 기준
+FINAL_TASK_STATUSES: frozenset[TaskStatus] = frozenset({
+    TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELED,
+})
 
 
 class TextPart(BaseModel):
@@ -48,6 +55,19 @@ class TaskSendRequest(BaseModel):
     id: str
     sessionId: Optional[str] = None
     message: Message
+    # False면 tasks/send가 작업을 등록만 하고 SUBMITTED/WORKING Task를 즉시 반환한다.
+    # 같은 id로 다시 보내면 새로 실행하지 않고 기존 작업에 붙는다 (재시도 멱등).
+    blocking: bool = True
+
+
+class TaskIdRequest(BaseModel):
+    """tasks/cancel · tasks/resubscribe 요청"""
+    id: str
+
+
+class TaskQueryRequest(TaskIdRequest):
+    """tasks/get 요청 — waitSeconds를 주면 작업이 끝나거나 그 시간이 지날 때까지 기다렸다가 응답 (long poll)"""
+    waitSeconds: Optional[float] = Field(default=None, ge=0)
 
 
 class Task(BaseModel):
@@ -56,3 +76,20 @@ class Task(BaseModel):
     status: TaskStatus
     artifacts: List[Dict[str, Any]] = []
     history: List[Message] = []
+
+
+class TaskStreamEvent(BaseModel):
+    """tasks/sendSubscribe SSE 이벤트 1건.
+
+    kind:
+      status — 서브에이전트 그래프 노드 진입/완료 (node, phase)
+      token  — 노드 내부 LLM 토큰 (node, run_id로 동시 생성 스트림 구분)
+      task   — 최종 Task (스트림의 마지막 이벤트, tasks/send 응답과 동일)
+    """
+    id: str
+    kind: Literal["status", "token", "task"]
+    node: Optional[str] = None
+    phase: Optional[Literal["start", "end"]] = None
+    run_id: Optional[str] = None
+    content: Optional[str] = None
+    task: Optional[Task] = None
@@ -1,14 +1,23 @@
+from contextvars import ContextVar
+
 from langchain_core.messages import BaseMessage, messages_from_dict
 from app.core.logging import get_logger
 
 _logger = get_logger("a2a.serialization")
 
+# in-process transport(a2a/local.py)로 실행 중인 작업 — 메시지를 dict로 바꾸지 않고 객체 그대로 넘긴다
+in_process: ContextVar[bool] = ContextVar("a2a_in_process", default=False)
+
 
 def serialize_messages(messages: list[BaseMessage]) -> list[dict]:
+    if in_process.get():
+        return list(messages)
     return [{"type": m.type, "data": m.model_dump()} for m in messages]
 
 
 def deserialize_messages(raw: list[dict]) -> list[BaseMessage]:
+    if raw and all(isinstance(m, BaseMessage) for m in raw):
+        return list(raw)
     try:
         return messages_from_dict(raw)
     except Exception as e:
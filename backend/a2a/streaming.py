@@ -0,0 +1,83 @@
+import json
+from typing import Any, AsyncIterator, Callable, Optional
+
+from .models import Task, TaskStreamEvent
+
+
+def _sse(event: TaskStreamEvent) -> str:
+    return f"data: {json.dumps(event.model_dump(mode='json', exclude_none=True), ensure_ascii=False)}\n\n"
+
+
+async def graph_task_events(
+    graph: Any,
+    graph_input: dict,
+    config: dict,
+    *,
+    task_id: str,
+    tracked_nodes: frozenset[str],
+    token_nodes: frozenset[str],
+    build_task: Callable[[dict], Task],
+    build_failed_task: Callable[[], Task],
+    logger,
+    stream: bool = True,
+) -> AsyncIterator[TaskStreamEvent]:
+    """서브에이전트 그래프를 astream_events(v2)로 실행하며 TaskStreamEvent를 생성.
+
+    노드 진입/완료(tracked_nodes)와 token_nodes 안의 LLM 토큰을 그대로 흘려보내고,
+    마지막에 tasks/send와 같은 Task를 kind="task"로 보낸다. 실행 task가 취소되면
+    (a2a/tasks.py의 tasks/cancel·연결 종료) 그래프 실행도 함께 중단된다.
+
+    stream=False(tasks/send)면 중계할 구독자가 없으므로 graph.ainvoke로 실행해 최종 Task만 보낸다 —
+    이벤트 콜백과 작업별 진행 이벤트 버퍼 비용을 치르지 않는다.
+    """
+    result: Optional[dict] = None
+    try:
+        if not stream:
+            output = await graph.ainvoke(graph_input, config)
+            result = output if isinstance(output, dict) else {}
+        else:
+            async for event in graph.astream_events(graph_input, config, version="v2"):
+                event_type = event.get("event", "")
+                node = event.get("metadata", {}).get("langgraph_node") or ""
+
+                if event_type == "on_chain_end" and not event.get("parent_ids"):
+                    # 루트 그래프 실행 종료 — ainvoke 반환값과 같은 최종 state
+                    output = event.get("data", {}).get("output")
+                    result = output if isinstance(output, dict) else {}
+                elif (event_type in ("on_chain_start", "on_chain_end") and node in tracked_nodes
+                      and event.get("name") == node):
+                    yield TaskStreamEvent(
+                        id=task_id, kind="status", node=node,
+                        phase="start" if event_type == "on_chain_start" else "end",
+                    )
+                elif event_type == "on_chat_model_stream" and node in token_nodes:
+                    chunk = event.get("data", {}).get("chunk")
+                    content = getattr(chunk, "content", "") if chunk is not None else ""
+                    if isinstance(content, str) and content:
+                        yield TaskStreamEvent(
+                            id=task_id, kind="token", node=node, run_id=event.get("run_id"), content=content,
+                        )
+    except Exception as e:
+        logger.error("a2a_stream_task_failed", task_id=task_id, error_type=type(e).__name__, exc_info=True)
+        yield TaskStreamEvent(id=task_id, kind="task", task=build_failed_task())
+        return
+
+    if result is None:
+        logger.error("a2a_stream_task_no_result", task_id=task_id)
+        yield TaskStreamEvent(id=task_id, kind="task", task=build_failed_task())
+        return
+
+    try:
+        task = build_task(result)
+    except Exception as e:
+        logger.error("a2a_stream_task_failed", task_id=task_id, error_type=type(e).__name__, exc_info=True)
+        task = build_failed_task()
+    logger.info("a2a_task_completed", task_id=task_id, status=task.status, streaming=stream)
+    yield TaskStreamEvent(id=task_id, kind="task", task=task)
+
+
+async def sse_events(events: AsyncIterator[TaskStreamEvent]) -> AsyncIterator[str]:
+    """TaskStreamEvent 스트림을 tasks/sendSubscribe SSE 문자열로."""
+    async for event in events:
+        yield _sse(event)
+
@@ -0,0 +1,321 @@
+"""
+A2A 작업(task) 수명주기 — tasks/send(비동기 등록) · tasks/get · tasks/resubscribe · tasks/cancel.
+
+tasks/send가 서브에이전트 그래프가 끝날 때까지(최대 a2a_timeout) HTTP 요청 하나를 붙잡고,
+502/503/504 재시도가 같은 LLM 작업을 처음부터 다시 돌리던 구조를 대체한다.
+
+- TaskManager가 task id별로 실행을 한 번만 띄운다. 같은 id의 tasks/send 재전송은 기존 실행에 붙는다.
+- 실행은 요청과 분리된 asyncio task로 진행되고, 상태는 tasks/get(long poll) 또는
+  tasks/resubscribe(SSE)로 조회한다. tasks/cancel은 실행 중인 그래프를 취소한다.
+- 끝난 작업은 a2a_task_retention_seconds 동안 보관해 늦게 도착한 조회·재전송에 응답한다.
+- 요청자가 사라지면 작업도 멈춘다: blocking tasks/send와 tasks/sendSubscribe는 연결이 끊기면
+  작업을 취소하고(reason=disconnect), 비동기 클라이언트는 대기를 포기할 때 tasks/cancel을 보낸다.
+  취소는 그래프 실행 task에 전달돼 진행 중인 LLM 호출(ainvoke_with_retry)·검색까지 중단된다.
+
+단일 이벤트 루프(서버 프로세스)에서만 사용한다. 작업 상태는 이 프로세스 메모리에만 있으므로
+서브에이전트가 여러 대면 tasks/get·tasks/cancel이 다른 replica로 가 404가 된다
+(그래서 클라이언트 비동기 모드 a2a_async_tasks_enabled는 기본 off).
+"""
+
+import asyncio
+import contextvars
+import time
+from collections import deque
+from typing import AsyncIterator, Callable, Deque, Dict, Optional
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+
+from .models import (
+    FINAL_TASK_STATUSES, Task, TaskIdRequest, TaskQueryRequest, TaskSendRequest, TaskStatus, TaskStreamEvent,
+)
+from .history import apply_history
+from .streaming import sse_events
+from app.config.settings import settings
+from app.core.logging import get_logger
+from app.core.metrics import counter, histogram
+
+_logger = get_logger("a2a_tasks")
+
+_CANCELLED_TASKS = counter(
+    "a2a_cancelled_tasks_total",
+    "실행 중에 취소된 A2A 작업 수 (reason: cancel | disconnect | timeout | shutdown)",
+    ("agent", "reason"),
+)
+_CANCELLED_WORK_SECONDS = histogram(
+    "a2a_cancelled_work_seconds",
+    "취소된 A2A 작업이 취소 시점까지 실행된 시간(초)",
+    ("agent",),
+    buckets=(0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0),
+)
+
+# blocking tasks/send가 클라이언트 연결 종료를 확인하는 간격(초)
+_DISCONNECT_POLL_INTERVAL = 1.0
+
+# 재구독 replay용으로 보관하는 진행 이벤트 수 (토큰 이벤트 포함)
+_EVENT_BUFFER_SIZE = 2048
+
+TaskEventSource = Callable[[], AsyncIterator[TaskStreamEvent]]
+
+
+class _TaskRun:
+    def __init__(self, task: Task):
+        self.task = task
+        self.events: Deque[TaskStreamEvent] = deque(maxlen=_EVENT_BUFFER_SIZE)
+        self.dropped = 0
+        self.runner: Optional[asyncio.Task] = None
+        self.started_at = time.monotonic()
+        self.finished_at: Optional[float] = None
+        self.cancel_reason: Optional[str] = None
+        self.done = asyncio.Event()
+        self._changed = asyncio.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self.done.is_set()
+
+    def set_status(self, status: TaskStatus) -> None:
+        self.task = self.task.model_copy(update={"status": status})
+        self.notify()
+
+    def notify(self) -> None:
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+
+class TaskManager:
+    """에이전트 서버 1개의 A2A 작업 테이블."""
+
+    def __init__(self, name: str, *, retention_seconds: float, max_tasks: int):
+        self.name = name
+        self.retention_seconds = retention_seconds
+        self.max_tasks = max_tasks
+        self._runs: Dict[str, _TaskRun] = {}
+
+    def submit(
+        self,
+        request: TaskSendRequest,
+        source: TaskEventSource,
+        context: Optional[contextvars.Context] = None,
+    ) -> Task:
+        """작업을 등록하고 현재 Task를 반환. 이미 있는 id면 새로 실행하지 않는다.
+
+        context를 주면 실행 task를 그 contextvars 컨텍스트에서 시작한다 (in-process transport).
+        """
+        run = self._runs.get(request.id)
+        if run is not None:
+            _logger.info("a2a_task_duplicate_submit", agent=self.name, task_id=request.id, status=run.task.status)
+            return run.task
+
+        self._prune()
+        if len(self._runs) >= self.max_tasks:
+            _logger.warning("a2a_task_capacity_exceeded", agent=self.name, tasks=len(self._runs))
+            raise HTTPException(status_code=503, detail="A2A 작업 한도를 초과했습니다.")
+
+        run = _TaskRun(Task(id=request.id, sessionId=request.sessionId, status=TaskStatus.SUBMITTED))
+        self._runs[request.id] = run
+        run.runner = asyncio.create_task(self._drive(run, source), context=context)
+        # 시작 전에 취소된 task는 코루틴 본문이 실행되지 않으므로 마무리는 done 콜백에서 한다
+        run.runner.add_done_callback(lambda _: self._finalize(run))
+        return run.task
+
+    async def _drive(self, run: _TaskRun, source: TaskEventSource) -> None:
+        try:
+            run.set_status(TaskStatus.WORKING)
+            async for event in source():
+                if event.kind == "task" and event.task is not None:
+                    run.task = event.task
+                    break
+                if len(run.events) == run.events.maxlen:
+                    run.dropped += 1
+                run.events.append(event)
+                run.notify()
+        except asyncio.CancelledError:
+            _logger.info("a2a_task_canceled", agent=self.name, task_id=run.task.id, reason=run.cancel_reason)
+            run.task = Task(id=run.task.id, sessionId=run.task.sessionId, status=TaskStatus.CANCELED)
+        except Exception as e:
+            _logger.error("a2a_task_failed", agent=self.name, task_id=run.task.id,
+                          error_type=type(e).__name__, exc_info=True)
+            run.task = Task(id=run.task.id, sessionId=run.task.sessionId, status=TaskStatus.FAILED)
+
+    def _finalize(self, run: _TaskRun) -> None:
+        if run.task.status not in FINAL_TASK_STATUSES:
+            _logger.error("a2a_task_no_result", agent=self.name, task_id=run.task.id)
+            run.task = Task(id=run.task.id, sessionId=run.task.sessionId, status=TaskStatus.FAILED)
+        run.finished_at = time.monotonic()
+        run.done.set()
+        run.notify()
+
+    def get(self, task_id: str) -> Optional[Task]:
+        run = self._runs.get(task_id)
+        return run.task if run is not None else None
+
+    async def wait(self, task_id: str, timeout: Optional[float]) -> Optional[Task]:
+        """작업이 끝나거나 timeout초가 지날 때까지 기다린 뒤 현재 Task. 없는 id면 None."""
+        run = self._runs.get(task_id)
+        if run is None:
+            return None
+        if not run.finished:
+            try:
+                await asyncio.wait_for(asyncio.shield(run.done.wait()), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+        return run.task
+
+    def cancel(self, task_id: str, reason: str = "cancel") -> Optional[Task]:
+        """실행 중이면 취소하고 CANCELED Task를 반환. 이미 끝난 작업은 그대로 반환."""
+        run = self._runs.get(task_id)
+        if run is None:
+            return None
+        if not run.finished and run.runner is not None and run.cancel_reason is None:
+            self._cancel_run(run, reason)
+        return run.task
+
+    def _cancel_run(self, run: _TaskRun, reason: str) -> None:
+        run.cancel_reason = reason
+        run.runner.cancel()
+        run.set_status(TaskStatus.CANCELED)
+        _CANCELLED_TASKS.inc(agent=self.name, reason=reason)
+        _CANCELLED_WORK_SECONDS.observe(time.monotonic() - run.started_at, agent=self.name)
+        _logger.info("a2a_task_cancel_requested", agent=self.name, task_id=run.task.id, reason=reason)
+
+    def subscribe(self, task_id: str) -> Optional[AsyncIterator[TaskStreamEvent]]:
+        run = self._runs.get(task_id)
+        if run is None:
+            return None
+        return self._follow(run)
+
+    async def _follow(self, run: _TaskRun) -> AsyncIterator[TaskStreamEvent]:
+        """보관 중인 진행 이벤트를 replay하고, 작업이 끝나면 최종 Task로 끝낸다."""
+        sent = 0  # 지금까지 발생한 이벤트 기준 순번 (버퍼에서 밀려난 것 포함)
+        while True:
+            changed = run._changed
+            start = max(sent, run.dropped)
+            pending = list(run.events)[start - run.dropped:]
+            sent = run.dropped + len(run.events)
+            for event in pending:
+                yield event
+            if run.finished:
+                yield TaskStreamEvent(id=run.task.id, kind="task", task=run.task)
+                return
+            await changed.wait()
+
+    def _prune(self) -> None:
+        now = time.monotonic()
+        expired = [
+            task_id for task_id, run in self._runs.items()
+            if run.finished_at is not None and now - run.finished_at >= self.retention_seconds
+        ]
+        for task_id in expired:
+            del self._runs[task_id]
+        # 그래도 가득 차 있으면 끝난 작업부터 오래된 순으로 정리
+        if len(self._runs) >= self.max_tasks:
+            for task_id in [t for t, r in self._runs.items() if r.finished]:
+                if len(self._runs) < self.max_tasks:
+                    break
+                del self._runs[task_id]
+
+    async def close(self, drain_timeout: float = 0.0) -> None:
+        """서버 종료 시 — 실행 중인 작업을 drain_timeout초까지 기다리고, 그래도 남은 작업만 취소.
+
+        비동기 tasks/send는 작업 동안 열린 요청이 없어 uvicorn graceful shutdown이 기다려주지 않으므로
+        여기서 기다려야 배포·scale-in 때 진행 중인 작업이 CANCELED로 끝나지 않는다.
+        """
+        running = [run for run in self._runs.values() if run.runner is not None and not run.finished]
+        if running and drain_timeout > 0:
+            _logger.info("a2a_tasks_draining", agent=self.name, count=len(running), timeout=drain_timeout)
+            await asyncio.wait([run.runner for run in running], timeout=drain_timeout)
+            running = [run for run in running if not run.runner.done()]
+        for run in running:
+            if run.cancel_reason is None:
+                self._cancel_run(run, "shutdown")
+        runners = [run.runner for run in running]
+        if runners:
+            await asyncio.gather(*runners, return_exceptions=True)
+            _logger.info("a2a_tasks_canceled_on_shutdown", agent=self.name, count=len(runners))
+
+
+def create_task_manager(name: str) -> TaskManager:
+    return TaskManager(
+        name,
+        retention_seconds=settings.a2a_task_retention_seconds,
+        max_tasks=settings.a2a_max_tasks,
+    )
+
+
+def get_task_manager(req: Request) -> TaskManager:
+    return req.app.state.a2a_tasks
+
+
+def _register(req: Request, request: TaskSendRequest, source: TaskEventSource) -> TaskManager:
+    manager = get_task_manager(req)
+    if manager.get(request.id) is None:
+        # delta 이력을 전체 이력으로 복원 (재전송은 이미 복원된 작업에 붙으므로 건너뜀)
+        apply_history(req.app.state.a2a_history, request)
+    manager.submit(request, source)
+    return manager
+
+
+async def submit_task(req: Request, request: TaskSendRequest, source: TaskEventSource) -> Task:
+    """tasks/send 공통 처리 — blocking이면 작업이 끝날 때까지 기다려 최종 Task를 반환.
+
+    blocking 대기 중 클라이언트 연결이 끊기면 작업을 취소한다.
+    """
+    manager = _register(req, request, source)
+    task = manager.get(request.id)
+    if not request.blocking:
+        return task
+    while task.status not in FINAL_TASK_STATUSES:
+        task = await manager.wait(request.id, _DISCONNECT_POLL_INTERVAL)
+        if task.status not in FINAL_TASK_STATUSES and await req.is_disconnected():
+            return manager.cancel(request.id, reason="disconnect")
+    return task
+
+
+def subscribe_task(req: Request, request: TaskSendRequest, source: TaskEventSource) -> StreamingResponse:
+    """tasks/sendSubscribe 공통 처리 — 작업을 등록하고 진행 이벤트를 SSE로 흘린다.
+
+    StreamingResponse는 연결이 끊기면 제너레이터를 취소하므로, 그 시점에 끝나지 않은 작업은 취소한다.
+    """
+    manager = _register(req, request, source)
+
+    async def events() -> AsyncIterator[TaskStreamEvent]:
+        finished = False
+        try:
+            async for event in manager.subscribe(request.id):
+                finished = event.kind == "task"
+                yield event
+        finally:
+            if not finished:
+                manager.cancel(request.id, reason="disconnect")
+
+    return StreamingResponse(sse_events(events()), media_type="text/event-stream")
+
+
+def add_task_routes(router: APIRouter) -> None:
+    """에이전트 router에 tasks/get · tasks/cancel · tasks/resubscribe를 추가한다."""
+
+    @router.post("/tasks/get", response_model=Task)
+    async def get_task(request: TaskQueryRequest, req: Request):
+        manager = get_task_manager(req)
+        if request.waitSeconds:
+            task = await manager.wait(request.id, min(request.waitSeconds, settings.a2a_get_max_wait))
+        else:
+            task = manager.get(request.id)
+        if task is None:
+            raise HTTPException(status_code=404, detail="Task not found")
+        return task
+
+    @router.post("/tasks/cancel", response_model=Task)
+    async def cancel_task(request: TaskIdRequest, req: Request):
+        task = get_task_manager(req).cancel(request.id)
+        if task is None:
+            raise HTTPException(status_code=404, detail="Task not found")
+        return task
+
+    @router.post("/tasks/resubscribe")
+    async def resubscribe_task(request: TaskIdRequest, req: Request):
+        events = get_task_manager(req).subscribe(request.id)
+        if events is None:
+            raise HTTPException(status_code=404, detail="Task not found")
+        return StreamingResponse(sse_events(events), media_type="text/event-stream")
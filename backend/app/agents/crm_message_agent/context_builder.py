@@ -0,0 +1,100 @@
+"""
+supervisor 라우팅·최종 응답 프롬프트용 토큰 예산 컨텍스트 빌더.
+
+대화 후반에는 이전 턴의 추천 상품 목록·생성 메시지·조회 결과가 그대로 쌓여 프롬프트가
+커진다. 호출 지점별 예산(settings)을 넘으면 마지막 HumanMessage 이전(이전 턴)의
+ToolMessage/AIMessage 출력을 상품·페르소나 ID와 첫 줄만 남긴 참조로 압축하고, 그래도
+넘으면 가장 오래된 메시지부터 뺀다. 현재 턴(마지막 HumanMessage 이후)은 최종 응답이
+원문을 인용해야 하므로 항상 그대로 둔다. state의 메시지는 바꾸지 않고 프롬프트용 사본만 만든다.
+"""
+
+from typing import List
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, ToolMessage
+
+from ...core.logging import get_logger
+from ...core.token_counter import count_message_tokens, count_tokens, message_text
+from .id_patterns import PERSONA_ID_RE, PRODUCT_ID_RE
+
+_logger = get_logger("context_builder")
+
+
+# 이보다 짧은 출력은 압축해도 이득이 없음 (handoff 메시지 등)
+_COMPRESS_MIN_TOKENS = 80
+_MAX_REFERENCE_IDS = 10
+_FIRST_LINE_MAX_CHARS = 80
+
+
+def _compact_reference(message: BaseMessage) -> str:
+    text = message_text(message)
+    source = message.name or ("tool" if isinstance(message, ToolMessage) else "assistant")
+    parts = [f"[이전 턴 {source} 출력 — 원문 생략]"]
+    product_ids = list(dict.fromkeys(PRODUCT_ID_RE.findall(text)))
+    persona_ids = list(dict.fromkeys(PERSONA_ID_RE.findall(text)))
+    if product_ids:
+        parts.append("상품 ID: " + ", ".join(product_ids[:_MAX_REFERENCE_IDS]))
+    if persona_ids:
+        parts.append("페르소나 ID: " + ", ".join(persona_ids[:_MAX_REFERENCE_IDS]))
+    first_line = next((line.strip().lstrip("#").strip() for line in text.splitlines() if line.strip()), "")
+    if first_line:
+        parts.append("첫 줄: " + first_line[:_FIRST_LINE_MAX_CHARS])
+    return " / ".join(parts)
+
+
+def _latest_turn_start(messages: List[BaseMessage]) -> int:
+    for i in range(len(messages) - 1, -1, -1):
+        if isinstance(messages[i], HumanMessage):
+            return i
+    return 0
+
+
+def build_budgeted_context(
+    messages: List[BaseMessage],
+    summary: str,
+    *,
+    budget: int,
+    call_site: str,
+) -> List[BaseMessage]:
+    """예산(토큰) 안으로 줄인 프롬프트용 메시지 목록을 반환한다. budget <= 0이면 원본 그대로."""
+    summary_tokens = count_tokens(summary)
+    tokens_before = count_message_tokens(messages) + summary_tokens
+    if budget <= 0 or tokens_before <= budget:
+        _logger.info("prompt_context_tokens", call_site=call_site, tokens_before=tokens_before,
+                     tokens_after=tokens_before, budget=budget, compressed=0, dropped=0)
+        return messages
+
+    split = _latest_turn_start(messages)
+    older, latest = list(messages[:split]), list(messages[split:])
+    latest_tokens = count_message_tokens(latest) + summary_tokens
+
+    compressed = 0
+    for i, msg in enumerate(older):
+        if count_message_tokens(older) + latest_tokens <= budget:
+            break
+        if not isinstance(msg, (AIMessage, ToolMessage)):
+            continue
+        if count_tokens(message_text(msg)) < _COMPRESS_MIN_TOKENS:
+            continue
+        older[i] = msg.model_copy(update={"content": _compact_reference(msg)})
+        compressed += 1
+
+    dropped = 0
+    while older and count_message_tokens(older) + latest_tokens > budget:
+        older.pop(0)
+        dropped += 1
+        # 짝 잃은 ToolMessage가 맨 앞에 남지 않게 함께 제거
+        while older and isinstance(older[0], ToolMessage):
+            older.pop(0)
+            dropped += 1
+
+    result = older + latest
+    _logger.info(
+        "prompt_context_tokens",
+        call_site=call_site,
+        tokens_before=tokens_before,
+        tokens_after=count_message_tokens(result) + summary_tokens,
+        budget=budget,
+        compressed=compressed,
+        dropped=dropped,
+    )
+    return result
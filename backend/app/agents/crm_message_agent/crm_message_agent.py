@@ -1,10 +1,15 @@
 import json
+import time
 import asyncio
 from typing import Optional, Dict, Any, List, AsyncGenerator, Awaitable, Callable
 
 from .workflow import build_workflow
 from .state import CRMMessageAgentState
+from .nodes import fold_history_into_summary
+from ..shared.product.product_client import ProductClient
+from ..shared.product.product_refs import resolve_product_refs
 from ...core.logging import get_logger
+from ...core.sse_coalescer import SSECoalescer
 from ...config.settings import settings
 from langchain_core.messages import HumanMessage, AIMessage
 
@@ -72,13 +77,112 @@ _TRACKED_NODES: frozenset[str] = frozenset({
 })
 
 
+# 턴별 노드 소요 시간 집계 대상 (chat_turn_node_timing 로그)
+_TIMED_NODES: frozenset[str] = _TRACKED_NODES | {"maybe_summarize"}
+
+
+def _record_node_timing(event: Dict[str, Any], started: Dict[str, float], timing: Dict[str, float]) -> None:
+    """노드 자체의 on_chain_start/end 쌍(run_id 기준)으로 노드별 누적 소요 시간(ms)을 기록."""
+    node_name = event.get("metadata", {}).get("langgraph_node")
+    if node_name not in _TIMED_NODES or event.get("name") != node_name:
+        return
+    event_type = event.get("event")
+    if event_type == "on_chain_start":
+        started[event.get("run_id")] = time.perf_counter()
+    elif event_type == "on_chain_end" and (t0 := started.pop(event.get("run_id"), None)) is not None:
+        timing[node_name] = round(timing.get(node_name, 0.0) + (time.perf_counter() - t0) * 1000, 1)
+
+
 class CRMMessageAgent:
     def __init__(self, checkpointer=None):
         self.workflow = build_workflow(checkpointer=checkpointer)
+        self._has_checkpointer = checkpointer is not None
         # SSE 데드라인 초과 후에도 백그라운드에서 계속 도는 워크플로우 완료 태스크 보관
         # (참조를 안 들고 있으면 asyncio가 아직 안 끝난 task를 GC해버릴 수 있음).
         # crm_server.py의 lifespan 종료 절차가 배포 시 이 task들을 기다려준다.
         self._background_tasks: set[asyncio.Task] = set()
+        # thread_id → 진행 중인 턴 후 백그라운드 요약 task (같은 thread의 새 턴이 시작되면 취소)
+        self._summary_tasks: Dict[str, asyncio.Task] = {}
+        self._product_client: Optional[ProductClient] = None
+
+    async def _resolve_products(self, products: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """state의 추천 상품 참조를 응답용 전체 상품 정보로 재수화. 실패 시 참조 그대로 반환."""
+        if not products:
+            return products
+        if self._product_client is None:
+            self._product_client = ProductClient()
+        try:
+            return await resolve_product_refs(products, self._product_client)
+        except Exception as e:
+            _logger.warning("resolve_product_refs_failed", error_type=type(e).__name__)
+            return products
+
+    def _cancel_pending_summary(self, thread_id: str) -> None:
+        """새 턴 시작 시 같은 thread의 백그라운드 요약을 취소한다.
+
+        턴을 기다리게 하지 않기 위해서이며, 진행 중인 턴과 요약이 같은 체크포인트에서
+        갈라져 한쪽 쓰기가 유실되는 것도 막는다. 이력은 남아 있으므로 이번 턴이 끝난 뒤
+        다시 예약된다.
+        """
+        task = self._summary_tasks.pop(thread_id, None)
+        if task is not None and not task.done():
+            task.cancel()
+            _logger.info("conversation_summary_cancelled", thread_id=thread_id)
+
+    def _schedule_summary(self, config: Dict) -> None:
+        """턴 종료 후 이력이 임계값을 넘었으면 요약을 백그라운드로 예약한다."""
+        if not settings.conversation_summarize_background or not self._has_checkpointer:
+            return
+        thread_id = config["configurable"]["thread_id"]
+        model = config["configurable"].get("model", settings.chatgpt_model_name)
+        task = asyncio.create_task(self._summarize_after_turn(thread_id, model))
+        self._summary_tasks[thread_id] = task
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        task.add_done_callback(
+            lambda t: self._summary_tasks.pop(thread_id, None) if self._summary_tasks.get(thread_id) is t else None
+        )
+
+    async def _summarize_after_turn(self, thread_id: str, model: str) -> None:
+        """최신 체크포인트의 오래된 메시지를 요약에 접어 넣고 체크포인트에 반영한다.
+
+        LLM 호출 동안 다른 인스턴스에서 새 턴이 시작됐을 수 있으므로, 쓰기 직전에
+        체크포인트가 그대로인지 확인하고 바뀌었으면 버린다(다음 턴 후 재시도).
+        supervisor 이름으로 쓰므로 다음 노드는 END — 그래프 실행을 재개시키지 않는다.
+        """
+        thread_config = {"configurable": {"thread_id": thread_id}}
+        try:
+            snapshot = await self.workflow.aget_state(thread_config)
+            messages = snapshot.values.get("messages", [])
+            if len(messages) <= settings.conversation_summarize_threshold:
+                return
+            folded = await fold_history_into_summary(
+                messages, snapshot.values.get("summary", ""), model, mode="background",
+            )
+            if folded is None:
+                return
+            summary, delete_ops = folded
+
+            latest = await self.workflow.aget_state(thread_config)
+            if latest.config["configurable"].get("checkpoint_id") != snapshot.config["configurable"].get("checkpoint_id"):
+                _logger.info("conversation_summary_stale", thread_id=thread_id)
+                return
+            await self.workflow.aupdate_state(
+                snapshot.config, {"summary": summary, "messages": delete_ops}, as_node="supervisor",
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            _logger.warning(
+                "conversation_summary_background_failed",
+                thread_id=thread_id,
+                error_type=type(e).__name__,
+            )
+
+    async def _run_turn(self, initial_state: CRMMessageAgentState, config: Dict) -> Dict[str, Any]:
+        result = await self.workflow.ainvoke(initial_state, config)
+        self._schedule_summary(config)
+        return result
 
     def _build_config(
         self,
@@ -204,6 +308,7 @@ class CRMMessageAgent:
                 return
 
             _logger.info("chat_late_completion", thread_id=thread_id)
+            result = {**result, "recommended_products": await self._resolve_products(result.get("recommended_products", []))}
             payload = self._build_chat_result_payload(result, thread_id, session_id)
             try:
                 await on_late_result(payload)
@@ -274,7 +379,8 @@ class CRMMessageAgent:
             **({"file_records": file_records} if file_records else {}),
         }
 
-        task = asyncio.create_task(self.workflow.ainvoke(initial_state, config))
+        self._cancel_pending_summary(thread_id)
+        task = asyncio.create_task(self._run_turn(initial_state, config))
         done, _ = await asyncio.wait({task}, timeout=settings.graph_execution_timeout)
         if task not in done:
             _logger.error("workflow_timeout", thread_id=thread_id)
@@ -312,6 +418,7 @@ class CRMMessageAgent:
                 "logs": ["[ERROR] 대화 처리 실패"],
             }
 
+        result = {**result, "recommended_products": await self._resolve_products(result.get("recommended_products", []))}
         return self._build_chat_result_payload(result, thread_id, session_id)
 
     async def chat_stream(
@@ -335,7 +442,9 @@ class CRMMessageAgent:
 
         SSE event types:
           node_start — 노드 진입 (tracked nodes 기준, supervisor는 최초 1회만)
-          token      — LLM 토큰 (supervisor 직접 호출분만; A2A 너머 토큰은 미전달)
+          token      — LLM 토큰 (supervisor 직접 호출분만; A2A 너머 토큰은 agent_token으로 전달)
+          agent_progress — 서브에이전트 내부 노드 시작/완료 (a2a_streaming_enabled일 때만)
+          agent_token    — 서브에이전트 LLM 토큰 (a2a_streaming_enabled일 때만, run_id로 후보 구분)
           text_chunk — 생성 메시지 콘텐츠 청크 (generate_message_agent 완료 후 점진적 방출)
           text_done  — text_chunk 시퀀스 완료 신호 (커서 제거용)
           log        — state["logs"] 항목
@@ -344,6 +453,9 @@ class CRMMessageAgent:
           error      — 고정 한국어 메시지 (str(e) 절대 포함 금지)
           done       — 스트림 종료 신호
 
+        token / agent_token / text_chunk는 sse_coalesce_window_ms·sse_coalesce_max_bytes 안에서
+        하나의 프레임으로 합쳐 보낸다(content 이어붙임). 다른 이벤트는 버퍼를 비운 뒤 즉시 전송.
+
         on_late_result: SSE 데드라인(graph_execution_timeout) 초과로 클라이언트에는
             이미 error/done을 보낸 뒤에도, 워크플로우가 실제로는 완료될 수 있다(A2A로
             분리된 recommend/generate 서비스는 로컬 task를 취소해도 멈추지 않음).
@@ -381,6 +493,9 @@ class CRMMessageAgent:
         def _sse(data: Dict[str, Any]) -> str:
             return f"data: {json.dumps(data, ensure_ascii=False)}\n\n"
 
+        # 토큰 이벤트 병합 — 노드 경계 이벤트는 버퍼를 비운 뒤 즉시 전송
+        _co = SSECoalescer(settings.sse_coalesce_window_ms / 1000, settings.sse_coalesce_max_bytes)
+
         def _accumulate(node_name: str, output: Any) -> None:
             data = _extract_from_output(output)
             if data.get("logs"):
@@ -464,6 +579,7 @@ class CRMMessageAgent:
 
                 _logger.info("chat_stream_late_completion", thread_id=thread_id)
                 if on_late_result is not None:
+                    _acc["recommended_products"] = await self._resolve_products(_acc["recommended_products"])
                     try:
                         await on_late_result(_build_result_payload())
                     except Exception as e:
@@ -497,11 +613,22 @@ class CRMMessageAgent:
         queue: asyncio.Queue = asyncio.Queue()
 
         async def _produce() -> None:
+            node_started: Dict[str, float] = {}
+            node_timing: Dict[str, float] = {}
+            turn_started = time.perf_counter()
             try:
                 async for event in self.workflow.astream_events(
                     initial_state, config, version="v2"
                 ):
+                    _record_node_timing(event, node_started, node_timing)
                     await queue.put(("event", event))
+                _logger.info(
+                    "chat_turn_node_timing",
+                    thread_id=thread_id,
+                    nodes_ms=node_timing,
+                    total_ms=round((time.perf_counter() - turn_started) * 1000, 1),
+                )
+                self._schedule_summary(config)
                 await queue.put(("done", None))
             except asyncio.CancelledError:
                 await queue.put(("cancelled", None))
@@ -513,6 +640,7 @@ class CRMMessageAgent:
                 )
                 await queue.put(("error", None))  # str(e) 절대 큐에 넣지 않음
 
+        self._cancel_pending_summary(thread_id)
         producer = asyncio.create_task(_produce())
         _loop = asyncio.get_running_loop()
         _deadline = _loop.time() + settings.graph_execution_timeout
@@ -530,15 +658,24 @@ class CRMMessageAgent:
                         _detach_to_background()
                         if not _detached:
                             _release_semaphore_once()
+                        for frame in _co.flush():
+                            yield frame
                         yield _sse({"type": "error", "message": "처리 시간이 초과되었습니다."})
                         yield _sse({"type": "done"})
                         return
                 else:
+                    _wait = min(settings.sse_keepalive_timeout, _remaining)
+                    _flush_in = _co.time_until_flush()
+                    if _flush_in is not None:
+                        _wait = min(_wait, _flush_in)
                     try:
-                        kind, data = await asyncio.wait_for(
-                            queue.get(), timeout=min(settings.sse_keepalive_timeout, _remaining)
-                        )
+                        kind, data = await asyncio.wait_for(queue.get(), timeout=_wait)
                     except asyncio.TimeoutError:
+                        if _co.has_pending:
+                            # 병합 창이 끝났는데 다음 토큰이 없음 — 모아둔 토큰을 내보낸다
+                            for frame in _co.flush():
+                                yield frame
+                            continue
                         if _loop.time() >= _deadline:
                             _detach_to_background()
                             if not _detached:
@@ -554,6 +691,8 @@ class CRMMessageAgent:
                     return  # 클라이언트 disconnect — yield 없이 종료
                 if kind == "error":
                     _release_semaphore_once()
+                    for frame in _co.flush():
+                        yield frame
                     yield _sse({"type": "error", "message": "처리 중 오류가 발생했습니다."})
                     yield _sse({"type": "done"})
                     return
@@ -572,29 +711,55 @@ class CRMMessageAgent:
                     if node_name not in _started_nodes:  # supervisor 중복 방지
                         step += 1
                         _started_nodes.add(node_name)
-                        yield _sse({"type": "node_start", "node": node_name, "step": step})
+                        for frame in _co.add({"type": "node_start", "node": node_name, "step": step}):
+                            yield frame
 
                 elif event_type == "on_chat_model_stream":
                     chunk = event.get("data", {}).get("chunk")
                     if chunk is not None:
                         content = getattr(chunk, "content", "")
                         if content:
-                            yield _sse({"type": "token", "content": content})
+                            for frame in _co.add({"type": "token", "content": content}):
+                                yield frame
+
+                elif event_type == "on_custom_event" and event.get("name") == "a2a_progress":
+                    progress = event.get("data") or {}
+                    if progress.get("kind") == "status":
+                        for frame in _co.add({
+                            "type": "agent_progress",
+                            "agent": progress.get("agent"),
+                            "node": progress.get("node"),
+                            "phase": progress.get("phase"),
+                        }):
+                            yield frame
+                    elif progress.get("kind") == "token" and progress.get("content"):
+                        for frame in _co.add({
+                            "type": "agent_token",
+                            "agent": progress.get("agent"),
+                            "node": progress.get("node"),
+                            "run_id": progress.get("run_id"),
+                            "content": progress.get("content"),
+                        }):
+                            yield frame
 
                 elif event_type == "on_chain_end" and node_name in _TRACKED_NODES:
                     output = event.get("data", {}).get("output")
                     _accumulate(node_name, output)
                     log_data = _extract_from_output(output)
                     for log_line in log_data.get("logs", []):
-                        yield _sse({"type": "log", "message": log_line})
+                        for frame in _co.add({"type": "log", "message": log_line}):
+                            yield frame
                     streaming_text = _get_node_streaming_text(node_name, output, _acc)
                     if streaming_text:
                         chunk_size = 3
                         for i in range(0, len(streaming_text), chunk_size):
-                            yield _sse({"type": "text_chunk", "content": streaming_text[i:i + chunk_size]})
+                            for frame in _co.add({"type": "text_chunk", "content": streaming_text[i:i + chunk_size]}):
+                                yield frame
                             await asyncio.sleep(0.015)
-                        yield _sse({"type": "text_done"})
-                    yield _sse({"type": "node_end", "node": node_name})
+                        for frame in _co.add({"type": "text_done"}):
+                            yield frame
+                    for frame in _co.add({"type": "node_end", "node": node_name}):
+                        yield frame
 
         except asyncio.CancelledError:
             _logger.info("chat_stream_cancelled", thread_id=thread_id)
@@ -607,5 +772,8 @@ class CRMMessageAgent:
 
         # ── Result 이벤트 ────────────────────────────────────────────────
         _release_semaphore_once()
+        for frame in _co.flush():
+            yield frame
+        _acc["recommended_products"] = await self._resolve_products(_acc["recommended_products"])
         yield _sse(_build_result_payload())
         yield _sse({"type": "done"})
@@ -0,0 +1,11 @@
+"""
+대화 텍스트에서 페르소나·상품 ID를 찾는 정규식 (intent_router · context_builder 공용).
+
+ID 뒤에는 조사가 바로 붙는 경우가 많다("PERSONA_00012에", "A20251200017로"). 유니코드 정규식에서는
+한글도 \\w라서 \\b 경계가 성립하지 않으므로, 앞뒤 경계를 ASCII 영숫자 기준 lookaround로 둔다.
+"""
+
+import re
+
+PERSONA_ID_RE = re.compile(r"(?<![A-Za-z0-9_])PERSONA_[A-Za-z0-9]+(?![A-Za-z0-9])")
+PRODUCT_ID_RE = re.compile(r"(?<![A-Za-z0-9])[A-Z]\d{11}(?![A-Za-z0-9])")
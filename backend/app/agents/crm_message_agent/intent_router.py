@@ -0,0 +1,176 @@
+"""
+supervisor 첫 라우팅 fast-path — 임베딩 최근접 예문 + ID 정규식 신호.
+
+"PERSONA_00012에 맞는 상품 추천해줘", "이 상품으로 메시지 만들어줘"처럼 흔하고 모호하지 않은
+요청은 supervisor 라우팅 LLM 호출 없이 task_plan을 바로 정한다. 마지막 HumanMessage를
+opensearch-api의 KURE-v1 인코더(/api/search/encode/batch)로 임베딩해 라벨링된 예문과
+코사인 유사도를 비교하고, 최고 유사도·2위 플랜과의 차이(margin)가 임계값을 넘을 때만 확정한다.
+정규식 신호(페르소나/상품 ID)와 모순되는 플랜, 인코딩 실패·타임아웃은 모두 LLM 라우팅으로 폴백.
+"""
+
+import asyncio
+import math
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from langchain_core.messages import HumanMessage
+
+from ...config.settings import settings
+from ...core.logging import get_logger
+from .id_patterns import PERSONA_ID_RE, PRODUCT_ID_RE
+
+_logger = get_logger("intent_router")
+
+
+# encode/batch 요청당 최대 텍스트 수 (opensearch-api EncodeBatchRequest.max_length)
+_ENCODE_BATCH_SIZE = 10
+_MAX_QUERY_CHARS = 500
+
+_RECOMMEND = ("recommend_product_agent",)
+_RECOMMEND_THEN_GENERATE = ("recommend_product_agent", "generate_message_agent")
+_GENERATE = ("generate_message_agent",)
+_SEARCH = ("search_agent",)
+
+# 플랜별 라벨링 예문 — supervisor_prompt의 판단 기준 표와 같은 분류를 따른다.
+# 여러 작업이 섞였거나 등록·수정 등 애매한 요청은 일부러 넣지 않는다 (LLM이 판단).
+_EXEMPLARS: Dict[Tuple[str, ...], Tuple[str, ...]] = {
+    _RECOMMEND: (
+        "PERSONA_00012에 맞는 상품 추천해줘",
+        "PERSONA_00253 페르소나에게 어울리는 스킨케어 제품 추천해줘",
+        "이 페르소나한테 맞는 상품 몇 개 골라줘",
+        "PERSONA_00104 고객에게 추천할 만한 제품 알려줘",
+        "페르소나 특성에 맞는 화장품 추천 부탁해",
+        "PERSONA_00031에게 건성 피부용 상품 추천해줘",
+        "이 고객 피부 고민에 맞는 제품 추천해줄래",
+        "PERSONA_00077한테 어떤 상품이 좋을지 추천해줘",
+    ),
+    _RECOMMEND_THEN_GENERATE: (
+        "PERSONA_00012에 맞는 상품 추천하고 메시지도 만들어줘",
+        "PERSONA_00253에게 상품 추천해서 그걸로 CRM 메시지 작성해줘",
+        "페르소나에 맞는 제품 추천 후 홍보 메시지 생성해줘",
+        "추천 상품으로 앱 푸시 메시지까지 만들어줘",
+        "PERSONA_00104 맞춤 상품 추천해서 문자 메시지 써줘",
+        "이 고객한테 맞는 상품 골라서 마케팅 메시지 만들어줘",
+    ),
+    _GENERATE: (
+        "PERSONA_00012에게 베스트셀러 상품 소개 메시지 만들어줘",
+        "A20251200017 상품으로 CRM 메시지 작성해줘",
+        "이 상품 신제품 홍보 메시지 만들어줘",
+        "PERSONA_00253에게 특정 브랜드 상품 홍보 메시지 생성해줘",
+        "방금 추천한 상품으로 메시지 만들어줘",
+        "프로모션 이벤트 안내 문자 메시지 작성해줘",
+        "성분 효능을 강조한 앱 푸시 메시지 써줘",
+        "A20251200039 제품 소개 메시지 만들어줘",
+    ),
+    _SEARCH: (
+        "페르소나 목록 보여줘",
+        "30대 지성 피부 페르소나 찾아줘",
+        "PERSONA_00012 상세 정보 알려줘",
+        "어떤 브랜드들이 있어?",
+        "상품 카테고리 목록 알려줘",
+        "사용 가능한 메시지 타입이 뭐가 있어?",
+        "이 브랜드 인기 상품 조회해줘",
+        "민감성 피부 고민이 있는 페르소나 검색해줘",
+    ),
+}
+
+
+@dataclass(frozen=True)
+class IntentRoute:
+    """fast-path 판정 결과. task_plan이 None이면 LLM 라우팅으로 폴백."""
+    task_plan: Optional[List[str]]
+    top_plan: Optional[List[str]]
+    similarity: float
+    margin: float
+    reason: str
+    latency_ms: float
+
+
+def _cosine(a: List[float], b: List[float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+def _latest_human_text(messages: list) -> Optional[str]:
+    """마지막 메시지가 HumanMessage일 때만 본문 반환 (에이전트 작업 도중 재진입이면 None)."""
+    if not messages or not isinstance(messages[-1], HumanMessage):
+        return None
+    content = messages[-1].content
+    if isinstance(content, list):
+        content = " ".join(p.get("text", "") for p in content if isinstance(p, dict))
+    return content.strip() or None
+
+
+class IntentRouter:
+    def __init__(self, encode: Callable[[List[str]], Awaitable[List[List[float]]]]):
+        self._encode = encode
+        self._exemplar_task: Optional[asyncio.Task] = None
+
+    async def _build_exemplar_vectors(self) -> List[Tuple[Tuple[str, ...], List[float]]]:
+        labeled = [(plan, text) for plan, texts in _EXEMPLARS.items() for text in texts]
+        vectors: List[List[float]] = []
+        for i in range(0, len(labeled), _ENCODE_BATCH_SIZE):
+            vectors += await self._encode([text for _, text in labeled[i:i + _ENCODE_BATCH_SIZE]])
+        _logger.info("intent_router_exemplars_ready", exemplar_count=len(labeled))
+        return [(plan, vec) for (plan, _), vec in zip(labeled, vectors)]
+
+    async def _exemplar_vectors(self) -> List[Tuple[Tuple[str, ...], List[float]]]:
+        # 예문 인코딩은 요청 타임아웃과 무관하게 끝까지 진행(shield)하고, 실패하면 다음 요청에서 재시도
+        if self._exemplar_task is None or (
+            self._exemplar_task.done() and self._exemplar_task.exception() is not None
+        ):
+            self._exemplar_task = asyncio.ensure_future(self._build_exemplar_vectors())
+        return await asyncio.shield(self._exemplar_task)
+
+    async def route(self, messages: list, file_records: Optional[list] = None) -> IntentRoute:
+        started = time.perf_counter()
+
+        def _result(task_plan, top_plan=None, similarity=0.0, margin=0.0, reason="") -> IntentRoute:
+            return IntentRoute(
+                task_plan=list(task_plan) if task_plan else None,
+                top_plan=list(top_plan) if top_plan else None,
+                similarity=round(similarity, 4),
+                margin=round(margin, 4),
+                reason=reason,
+                latency_ms=round((time.perf_counter() - started) * 1000, 1),
+            )
+
+        if file_records:
+            return _result(None, reason="file_records")
+        text = _latest_human_text(messages)
+        if text is None:
+            return _result(None, reason="no_human_message")
+
+        try:
+            exemplars, (query_vec,) = await asyncio.wait_for(
+                asyncio.gather(self._exemplar_vectors(), self._encode([text[:_MAX_QUERY_CHARS]])),
+                timeout=settings.supervisor_intent_router_timeout,
+            )
+        except Exception as e:
+            _logger.warning("intent_router_encode_failed", error_type=type(e).__name__)
+            return _result(None, reason="encode_failed")
+
+        best: Dict[Tuple[str, ...], float] = {}
+        for plan, vec in exemplars:
+            best[plan] = max(best.get(plan, -1.0), _cosine(query_vec, vec))
+        ranked = sorted(best.items(), key=lambda kv: kv[1], reverse=True)
+        top_plan, similarity = ranked[0]
+        margin = similarity - ranked[1][1] if len(ranked) > 1 else similarity
+
+        if similarity < settings.supervisor_intent_router_min_similarity:
+            return _result(None, top_plan, similarity, margin, "low_similarity")
+        if margin < settings.supervisor_intent_router_min_margin:
+            return _result(None, top_plan, similarity, margin, "low_margin")
+
+        # 정규식 신호와 모순되는 플랜은 확정하지 않음 (supervisor_prompt 작업 순서 규칙)
+        if "recommend_product_agent" in top_plan:
+            # 페르소나 ID가 대화에 없으면 search_agent 선행이 필요할 수 있음
+            if not any(PERSONA_ID_RE.search(str(m.content)) for m in messages):
+                return _result(None, top_plan, similarity, margin, "persona_id_missing")
+            # 상품 ID를 직접 지정했으면 추천 불필요
+            if PRODUCT_ID_RE.search(text):
+                return _result(None, top_plan, similarity, margin, "product_id_conflict")
+
+        return _result(top_plan, top_plan, similarity, margin, "confident")
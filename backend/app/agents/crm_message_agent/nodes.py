@@ -1,24 +1,29 @@
+import time
 import uuid
 import httpx
 from functools import lru_cache
 
 from langchain.agents import create_agent
+from langchain_core.callbacks.manager import adispatch_custom_event
 from langchain_core.messages import AIMessage, ToolMessage, RemoveMessage
 from langchain_core.runnables import RunnableConfig
 from langgraph.types import Command
 from pydantic import BaseModel, Field
-from typing import List, Literal
+from typing import List, Literal, Optional, Tuple
 from a2a.client import A2AClient
-from a2a.models import TaskStatus
+from a2a.models import Task, TaskStatus, TaskStreamEvent
 from a2a.serialization import deserialize_messages
 from ...core.llm_factory import get_llm
 from ...core.llm_utils import ainvoke_with_retry
 from ...core.logging import get_logger
 from ...config.settings import settings
 from .state import CRMMessageAgentState
+from .intent_router import IntentRouter
+from .context_builder import build_budgeted_context
 from .prompts.supervisor_prompt import build_supervisor_prompt, build_final_answer_prompt
 from .prompts.summary_prompt import build_summary_prompt
 from .prompts.search_agent_prompt import SEARCH_AGENT_SYSTEM_PROMPT
+from ..shared.product.product_client import ProductClient
 from ..tools.handoff_tools import create_handoff_messages
 from ..tools.search_tools import (
     get_all_personas,
@@ -36,7 +41,15 @@ _logger = get_logger("crm_message_agent")
 
 async def _generate_final_answer(llm, messages: list, summary: str):
     return await ainvoke_with_retry(
-        llm, build_final_answer_prompt(messages, summary),
+        llm,
+        build_final_answer_prompt(
+            build_budgeted_context(
+                messages, summary,
+                budget=settings.supervisor_final_answer_context_token_budget,
+                call_site="supervisor_final_answer",
+            ),
+            summary,
+        ),
         semaphore_key="supervisor_final_answer",
         max_concurrency=settings.supervisor_final_answer_max_concurrency,
         max_retries=settings.supervisor_final_answer_max_retries,
@@ -78,18 +91,30 @@ def _safe_trim_index(messages: list, keep: int) -> int:
     return cut
 
 
-async def maybe_summarize(state: CRMMessageAgentState, config: RunnableConfig):
-    messages = state.get("messages", [])
-    if len(messages) <= settings.conversation_summarize_threshold:
-        return {}
+async def fold_history_into_summary(
+    messages: list,
+    existing_summary: str,
+    model: str,
+    mode: str,
+) -> Optional[Tuple[str, list]]:
+    """절단 대상(오래된) 메시지만 기존 요약에 접어 넣는다.
 
-    model = config.get("configurable", {}).get("model", settings.chatgpt_model_name)
+    conversation_keep_messages개를 남기고 그 앞부분만 요약 프롬프트에 넣으므로
+    전체 이력을 매번 다시 요약하지 않는다. 실패하면 None (요약·이력 그대로 유지).
+
+    Returns:
+        (새 요약, 절단 메시지 RemoveMessage 목록)
+    """
+    cut = _safe_trim_index(messages, settings.conversation_keep_messages)
+    if cut <= 0:
+        return None
+    to_fold = messages[:cut]
     llm = get_llm(model, temperature=settings.llm_temperature_classifier)
-    existing_summary = state.get("summary", "")
+    started = time.perf_counter()
 
     try:
         response = await ainvoke_with_retry(
-            llm, build_summary_prompt(messages, existing_summary),
+            llm, build_summary_prompt(to_fold, existing_summary),
             semaphore_key="conversation_summarize",
             max_concurrency=settings.conversation_summarize_max_concurrency,
             max_retries=settings.conversation_summarize_max_retries,
@@ -97,19 +122,35 @@ async def maybe_summarize(state: CRMMessageAgentState, config: RunnableConfig):
             logger=_logger, retry_event="conversation_summarize_retry",
         )
     except Exception as e:
-        _logger.warning("summarize_skipped", error_type=type(e).__name__)
-        return {}
-
-    cut = _safe_trim_index(messages, settings.conversation_keep_messages)
-    messages_to_delete = messages[:cut]
-    delete_ops = [RemoveMessage(id=m.id) for m in messages_to_delete]
+        _logger.warning("summarize_skipped", error_type=type(e).__name__, mode=mode)
+        return None
 
     _logger.info(
         "conversation_summarized",
-        deleted=len(messages_to_delete),
+        deleted=cut,
         kept=len(messages) - cut,
+        mode=mode,
+        duration_ms=round((time.perf_counter() - started) * 1000, 1),
     )
-    return {"summary": response.content, "messages": delete_ops}
+    return response.content, [RemoveMessage(id=m.id) for m in to_fold]
+
+
+async def maybe_summarize(state: CRMMessageAgentState, config: RunnableConfig):
+    messages = state.get("messages", [])
+    threshold = settings.conversation_summarize_threshold
+    if settings.conversation_summarize_background:
+        # 평소엔 턴 종료 후 백그라운드 요약(CRMMessageAgent._summarize_after_turn)이 처리 —
+        # 연속 실패·취소로 이력이 계속 쌓인 경우에만 인라인으로 요약하는 안전망
+        threshold *= 2
+    if len(messages) <= threshold:
+        return {}
+
+    model = config.get("configurable", {}).get("model", settings.chatgpt_model_name)
+    folded = await fold_history_into_summary(messages, state.get("summary", ""), model, mode="inline")
+    if folded is None:
+        return {}
+    summary, delete_ops = folded
+    return {"summary": summary, "messages": delete_ops}
 
 
 _ValidAgent = Literal[
@@ -178,6 +219,11 @@ def _get_search_agent(model_name: str):
     return create_agent(model=llm, tools=_SEARCH_TOOLS, system_prompt=SEARCH_AGENT_SYSTEM_PROMPT)
 
 
+@lru_cache(maxsize=1)
+def _get_intent_router() -> IntentRouter:
+    return IntentRouter(encode=ProductClient().encode_batch)
+
+
 async def supervisor_agent(state: CRMMessageAgentState, config: RunnableConfig):
     _logger.info("supervisor_started", node_name="supervisor_agent")
 
@@ -218,16 +264,36 @@ async def supervisor_agent(state: CRMMessageAgentState, config: RunnableConfig):
         _logger.info("supervisor_deterministic_route", node_name="supervisor_agent", next=next_agent)
         return Command(goto=next_agent)
 
-    # 첫 진입: LLM으로 전체 플랜 결정
+    # 첫 진입: 임베딩 fast-path가 확신하면 LLM 라우팅 생략 (shadow 모드는 비교 로그만)
+    route = None
+    if settings.supervisor_intent_router_mode != "off":
+        route = await _get_intent_router().route(messages, file_records=state.get("file_records"))
+        if settings.supervisor_intent_router_mode == "on" and route.task_plan:
+            _logger.info("supervisor_intent_routed", node_name="supervisor_agent",
+                         task_plan=route.task_plan, similarity=route.similarity,
+                         margin=route.margin, latency_ms=route.latency_ms)
+            return Command(goto=route.task_plan[0], update={"task_plan": route.task_plan})
+
+    # LLM으로 전체 플랜 결정
+    llm_started = time.perf_counter()
     try:
         decision = await ainvoke_with_retry(
             llm.with_structured_output(RouteDecision),
-            build_supervisor_prompt(messages, summary, file_records=state.get("file_records")),
+            build_supervisor_prompt(
+                build_budgeted_context(
+                    messages, summary,
+                    budget=settings.supervisor_routing_context_token_budget,
+                    call_site="supervisor_routing",
+                ),
+                summary,
+                file_records=state.get("file_records"),
+            ),
             semaphore_key="supervisor_routing",
             max_concurrency=settings.supervisor_routing_max_concurrency,
             max_retries=settings.supervisor_routing_max_retries,
             backoff_base=settings.supervisor_routing_backoff_base,
             logger=_logger, retry_event="supervisor_routing_retry",
+            hedge_builder=lambda model: model.with_structured_output(RouteDecision),
         )
     except Exception as e:
         # LLM이 JSON 외 텍스트를 덧붙여 파싱 실패한 경우
@@ -242,8 +308,23 @@ async def supervisor_agent(state: CRMMessageAgentState, config: RunnableConfig):
             _logger.warning("supervisor_final_answer_fallback_used", node_name="supervisor_agent")
         return {"messages": [final_answer]}
 
+    llm_latency_ms = round((time.perf_counter() - llm_started) * 1000, 1)
     _logger.info("supervisor_plan_decided", node_name="supervisor_agent",
-                 task_plan=decision.task_plan, reason=decision.reason)
+                 task_plan=decision.task_plan, reason=decision.reason, llm_latency_ms=llm_latency_ms)
+    if route is not None:
+        _logger.info(
+            "supervisor_intent_router_compare",
+            node_name="supervisor_agent",
+            router_plan=route.task_plan,
+            top_plan=route.top_plan,
+            llm_plan=list(decision.task_plan),
+            agree=route.top_plan == list(decision.task_plan),
+            similarity=route.similarity,
+            margin=route.margin,
+            fallback_reason=None if route.task_plan else route.reason,
+            router_latency_ms=route.latency_ms,
+            llm_latency_ms=llm_latency_ms,
+        )
 
     if not decision.task_plan:
         try:
@@ -279,6 +360,29 @@ async def search_agent(state: CRMMessageAgentState, config: RunnableConfig):
     )
 
 
+async def _send_sub_agent_task(client: A2AClient, agent: str, session_id: str, data: dict, config: RunnableConfig) -> Task:
+    """서브에이전트 A2A 호출. a2a_streaming_enabled면 sendSubscribe로 보내고
+    진행 이벤트를 ``a2a_progress`` 커스텀 이벤트로 재발행해 chat_stream이 중계하게 함."""
+    if not settings.a2a_streaming_enabled:
+        return await client.send_task(session_id, data)
+
+    async def _relay(event: TaskStreamEvent) -> None:
+        await adispatch_custom_event(
+            "a2a_progress",
+            {
+                "agent": agent,
+                "kind": event.kind,
+                "node": event.node,
+                "phase": event.phase,
+                "run_id": event.run_id,
+                "content": event.content,
+            },
+            config=config,
+        )
+
+    return await client.send_task_subscribe(session_id, data, on_event=_relay)
+
+
 def make_recommend_product_node(client: A2AClient):
     async def recommend_product_agent(state: CRMMessageAgentState, config: RunnableConfig):
         _logger.info("recommend_product_agent_started", node_name="recommend_product_agent")
@@ -286,11 +390,11 @@ def make_recommend_product_node(client: A2AClient):
         session_id = f"{thread_id}:recommend" if thread_id else str(uuid.uuid4())
 
         try:
-            task = await client.send_task(session_id, {
+            task = await _send_sub_agent_task(client, "recommend_product_agent", session_id, {
                 "messages": _filter_handoff_messages(state.get("messages", [])),
                 "active_persona_id": state.get("active_persona_id"),
                 "user_id": (config or {}).get("configurable", {}).get("user_id"),
-            })
+            }, config)
         except Exception as e:
             _logger.error("recommend_product_agent_failed", node_name="recommend_product_agent", error_type=type(e).__name__)
             return Command(
@@ -373,11 +477,11 @@ def make_generate_message_node(client: A2AClient):
         session_id = f"{thread_id}:generate_message" if thread_id else str(uuid.uuid4())
 
         try:
-            task = await client.send_task(session_id, {
+            task = await _send_sub_agent_task(client, "generate_message_agent", session_id, {
                 "messages": _filter_handoff_messages(state.get("messages", [])),
                 "active_persona_id": state.get("active_persona_id"),
                 "user_id": (config or {}).get("configurable", {}).get("user_id"),
-            })
+            }, config)
         except Exception as e:
             _logger.error("generate_message_agent_failed", node_name="generate_message_agent", error_type=type(e).__name__)
             return Command(
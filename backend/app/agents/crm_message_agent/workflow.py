@@ -1,13 +1,14 @@
 from langgraph.graph import StateGraph, START, END
-from a2a.client import A2AClient
+from a2a.client import create_a2a_client
 from ...config.settings import settings
 from .nodes import search_agent, supervisor_agent, maybe_summarize, make_recommend_product_node, make_generate_message_node, make_data_registration_node
 from .state import CRMMessageAgentState
 
+
 def build_workflow(checkpointer=None):
-    recommend_client     = A2AClient(f"{settings.recommend_agent_url}/a2a/recommend-product")
-    generate_client      = A2AClient(f"{settings.generate_message_agent_url}/a2a/generate-message")
-    data_reg_client      = A2AClient(f"{settings.data_registration_agent_url}/a2a/data-registration")
+    recommend_client     = create_a2a_client("recommend_product_agent", f"{settings.recommend_agent_url}/a2a/recommend-product")
+    generate_client      = create_a2a_client("generate_message_agent", f"{settings.generate_message_agent_url}/a2a/generate-message")
+    data_reg_client      = create_a2a_client("data_registration_agent", f"{settings.data_registration_agent_url}/a2a/data-registration")
 
     workflow = StateGraph(CRMMessageAgentState)
 
@@ -1,7 +1,12 @@
+from typing import Any, AsyncIterator
+
 from fastapi import APIRouter, Request
 
-from a2a.models import AgentCard, AgentSkill, DataPart, Task, TaskSendRequest, TaskStatus
+from a2a.models import AgentCard, AgentSkill, DataPart, Task, TaskSendRequest, TaskStatus, TaskStreamEvent
 from a2a.serialization import deserialize_messages, serialize_messages
+from a2a.history import create_history_cache
+from a2a.tasks import add_task_routes, create_task_manager, submit_task
+from app.agents.data_registration_agent.workflow import build_workflow
 from app.config.settings import settings
 from app.core.logging import get_logger
 
@@ -26,8 +31,7 @@ async def agent_card():
     )
 
 
-@router.post("/tasks/send", response_model=Task)
-async def send_task(request: TaskSendRequest, req: Request):
+async def _run_task(request: TaskSendRequest, state: Any) -> Task:
     data = next(
         (p.data for p in request.message.parts if isinstance(p, DataPart)),
         {},
@@ -36,7 +40,7 @@ async def send_task(request: TaskSendRequest, req: Request):
     config = {
         "configurable": {
             "thread_id": request.sessionId or request.id,
-            "services": req.app.state.services,
+            "services": state.services,
             "user_id": data.get("user_id"),
         },
         "recursion_limit": settings.langgraph_recursion_limit,
@@ -50,7 +54,7 @@ async def send_task(request: TaskSendRequest, req: Request):
             "messages": messages,
             "file_records": data.get("file_records"),
         }
-        graph = req.app.state.graph
+        graph = state.graph
         result = await graph.ainvoke(subgraph_input, config)
 
         status = TaskStatus.COMPLETED if result.get("status") == "completed" else TaskStatus.FAILED
@@ -80,3 +84,33 @@ async def send_task(request: TaskSendRequest, req: Request):
             status=TaskStatus.FAILED,
             artifacts=[{"type": "data", "data": {"error": "데이터 등록 처리 중 오류가 발생했습니다.", "status": "failed"}}],
         )
+
+
+async def task_events(request: TaskSendRequest, state: Any, stream: bool = True) -> AsyncIterator[TaskStreamEvent]:
+    """작업 1건 실행 — HTTP 라우트와 in-process transport(a2a/local.py) 공통. state는 services·graph를 가진 app.state.
+    진행 이벤트를 내지 않으므로 stream은 다른 에이전트와 시그니처를 맞추기 위한 것이다."""
+    yield TaskStreamEvent(id=request.id, kind="task", task=await _run_task(request, state))
+
+
+@router.post("/tasks/send", response_model=Task)
+async def send_task(request: TaskSendRequest, req: Request):
+    """작업 등록 — blocking=false면 즉시 반환하고 결과는 tasks/get으로 받는다. 같은 id 재전송은 기존 작업에 붙는다."""
+    return await submit_task(req, request, lambda: task_events(request, req.app.state))
+
+
+def init_agent_state(state: Any) -> None:
+    """services·graph·A2A 작업 테이블을 state에 채운다 — 서버 lifespan과 in-process transport 공통."""
+    from app.core.containers import DataRegistrationServices
+    from app.agents.data_registration_agent.services.product_registration import ProductRegistrationService
+    from app.agents.shared.persona.persona_client import PersonaClient
+
+    state.services = DataRegistrationServices(
+        registration=ProductRegistrationService(),
+        persona_client=PersonaClient(),
+    )
+    state.graph = build_workflow()
+    state.a2a_history = create_history_cache()
+    state.a2a_tasks = create_task_manager("data_registration_agent")
+
+
+add_task_routes(router)
@@ -28,7 +28,7 @@ from .category_config import (
 )
 from ....core.auth import UserContext
 from ....core.auth_utils import create_user_assertion
-from ....core.http_client_registry import register
+from ....core.http_client_registry import create_http_client, register
 from ....core.logging import get_logger
 
 logger = get_logger("product_registration")
@@ -246,7 +246,7 @@ class ProductRegistrationService:
     @property
     def http_client(self) -> httpx.AsyncClient:
         if self._http_client is None or self._http_client.is_closed:
-            self._http_client = httpx.AsyncClient(
+            self._http_client = create_http_client(
                 timeout=httpx.Timeout(settings.http_timeout_long),
                 headers={"X-Internal-Token": settings.internal_token},
             )
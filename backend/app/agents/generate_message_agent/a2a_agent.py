@@ -1,7 +1,13 @@
+from typing import Any, AsyncIterator
+
 from fastapi import APIRouter, Request
 
-from a2a.models import AgentCard, AgentSkill, DataPart, Task, TaskSendRequest, TaskStatus
+from a2a.models import AgentCard, AgentSkill, DataPart, Task, TaskSendRequest, TaskStatus, TaskStreamEvent
 from a2a.serialization import deserialize_messages, serialize_messages
+from a2a.streaming import graph_task_events
+from a2a.history import create_history_cache
+from a2a.tasks import add_task_routes, create_task_manager, submit_task, subscribe_task
+from app.agents.generate_message_agent.workflow import build_workflow
 from app.config.settings import settings
 from app.core.logging import get_logger
 
@@ -26,14 +32,20 @@ async def agent_card():
     )
 
 
-@router.post("/tasks/send", response_model=Task)
-async def send_task(request: TaskSendRequest, req: Request):
+# tasks/sendSubscribe로 진행 상황을 중계할 노드 / 토큰을 중계할 노드 (메시지 본문 생성·수정만)
+_STREAM_TRACKED_NODES: frozenset[str] = frozenset({
+    "router_node", "generate_message_node", "quality_check_node", "message_feedback_node", "output_node",
+})
+_STREAM_TOKEN_NODES: frozenset[str] = frozenset({"generate_message_node", "message_feedback_node"})
+
+
+def _prepare(request: TaskSendRequest, state: Any) -> tuple[dict, dict]:
     data = next(
         (p.data for p in request.message.parts if isinstance(p, DataPart)),
         {},
     )
 
-    configurable: dict = {"thread_id": request.sessionId or request.id, "services": req.app.state.services}
+    configurable: dict = {"thread_id": request.sessionId or request.id, "services": state.services}
     if data.get("user_id"):
         configurable["user_id"] = data["user_id"]
     config = {
@@ -44,40 +56,94 @@ async def send_task(request: TaskSendRequest, req: Request):
     _logger.info("a2a_task_received", task_id=request.id, session_id=request.sessionId,
                  active_persona_id=data.get("active_persona_id"))
 
-    try:
-        messages = deserialize_messages(data.get("messages", []))
-        subgraph_input = {
-            "messages": messages,
-            **({"active_persona_id": data["active_persona_id"]} if data.get("active_persona_id") else {}),
-        }
-        graph = req.app.state.graph
-        result = await graph.ainvoke(subgraph_input, config)
-
-        status = TaskStatus.COMPLETED  # 정상 실행은 항상 COMPLETED; FAILED는 except 블록에서만
-
-        _logger.info("a2a_task_completed", task_id=request.id, status=status)
-
-        return Task(
-            id=request.id,
-            sessionId=request.sessionId,
-            status=status,
-            artifacts=[{
-                "type": "data",
-                "data": {
-                    "generated_tasks": result.get("generated_tasks", []),
-                    "messages": serialize_messages(result.get("messages", [])),
-                    "logs": result.get("logs", []),
-                    "status": result.get("status"),
-                    "error": result.get("error"),
-                },
-            }],
-        )
+    messages = deserialize_messages(data.get("messages", []))
+    subgraph_input = {
+        "messages": messages,
+        **({"active_persona_id": data["active_persona_id"]} if data.get("active_persona_id") else {}),
+    }
+    return subgraph_input, config
+
+
+def _build_task(request: TaskSendRequest, result: dict) -> Task:
+    status = TaskStatus.COMPLETED  # 정상 실행은 항상 COMPLETED; FAILED는 except 블록에서만
+    return Task(
+        id=request.id,
+        sessionId=request.sessionId,
+        status=status,
+        artifacts=[{
+            "type": "data",
+            "data": {
+                "generated_tasks": result.get("generated_tasks", []),
+                "messages": serialize_messages(result.get("messages", [])),
+                "logs": result.get("logs", []),
+                "status": result.get("status"),
+                "error": result.get("error"),
+            },
+        }],
+    )
+
+
+def _build_failed_task(request: TaskSendRequest) -> Task:
+    return Task(
+        id=request.id,
+        sessionId=request.sessionId,
+        status=TaskStatus.FAILED,
+        artifacts=[{"type": "data", "data": {"error": "메시지 생성 처리 중 오류가 발생했습니다.", "status": "failed"}}],
+    )
+
 
+async def task_events(request: TaskSendRequest, state: Any, stream: bool = True) -> AsyncIterator[TaskStreamEvent]:
+    """작업 1건 실행 — HTTP 라우트와 in-process transport(a2a/local.py) 공통. state는 services·graph를 가진 app.state.
+    stream=False(tasks/send)면 진행 이벤트 없이 최종 Task만 보낸다."""
+    try:
+        subgraph_input, config = _prepare(request, state)
     except Exception as e:
         _logger.error("a2a_task_failed", task_id=request.id, error_type=type(e).__name__, exc_info=True)
-        return Task(
-            id=request.id,
-            sessionId=request.sessionId,
-            status=TaskStatus.FAILED,
-            artifacts=[{"type": "data", "data": {"error": "메시지 생성 처리 중 오류가 발생했습니다.", "status": "failed"}}],
-        )
+        yield TaskStreamEvent(id=request.id, kind="task", task=_build_failed_task(request))
+        return
+
+    async for event in graph_task_events(
+        state.graph, subgraph_input, config,
+        task_id=request.id,
+        tracked_nodes=_STREAM_TRACKED_NODES,
+        token_nodes=_STREAM_TOKEN_NODES,
+        build_task=lambda result: _build_task(request, result),
+        build_failed_task=lambda: _build_failed_task(request),
+        logger=_logger,
+        stream=stream,
+    ):
+        yield event
+
+
+@router.post("/tasks/send", response_model=Task)
+async def send_task(request: TaskSendRequest, req: Request):
+    """작업 등록 — blocking=false면 즉시 반환하고 결과는 tasks/get · tasks/resubscribe로 받는다.
+    같은 id 재전송은 기존 작업에 붙는다. 진행 이벤트(토큰)는 내지 않고 그래프를 ainvoke로 실행한다."""
+    return await submit_task(req, request, lambda: task_events(request, req.app.state, stream=False))
+
+
+@router.post("/tasks/sendSubscribe")
+async def send_task_subscribe(request: TaskSendRequest, req: Request):
+    """tasks/send의 스트리밍 버전 — 노드 진행·메시지 생성 토큰을 SSE로 흘리고 마지막에 Task를 보낸다.
+    연결이 끊기면 작업도 취소된다."""
+    return subscribe_task(req, request, lambda: task_events(request, req.app.state))
+
+
+def init_agent_state(state: Any) -> None:
+    """services·graph·A2A 작업 테이블을 state에 채운다 — 서버 lifespan과 in-process transport 공통."""
+    from app.core.containers import GenerateMessageServices
+    from app.agents.generate_message_agent.services.generate_crm_message import CrmMessageGenerator
+    from app.agents.generate_message_agent.services.quality_check import QualityChecker
+    from app.agents.generate_message_agent.services.apply_feedback import ApplyFeedback
+
+    state.services = GenerateMessageServices(
+        generator=CrmMessageGenerator(),
+        checker=QualityChecker(),
+        applier=ApplyFeedback(),
+    )
+    state.graph = build_workflow()
+    state.a2a_history = create_history_cache()
+    state.a2a_tasks = create_task_manager("generate_message_agent")
+
+
+add_task_routes(router)
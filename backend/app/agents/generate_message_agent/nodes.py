@@ -1,13 +1,16 @@
+import asyncio
+import time
 from datetime import datetime, timezone
 
 from .state import GenerateMessageState
+from .prompts.candidate_hint_prompt import CANDIDATE_HINTS, apply_candidate_hint
 from ..shared.parser_and_router.parser_and_router_request import generate_message_router
 from ...config.settings import settings
 from ...core.llm_factory import get_llm
 from ...core.logging import AgentLogger, get_logger
 from langchain_core.messages import AIMessage
 from langchain_core.runnables import RunnableConfig
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import json
 
 _MAX_RETRIES = 2
@@ -42,6 +45,108 @@ def _parse_message(raw) -> Dict[str, Any]:
     return {"title": "", "message": content}
 
 
+# 후보 경쟁 모드에서 통과 후보가 없을 때 피드백 루프로 넘길 후보 선택 기준 — 뒤 단계까지 간 후보 우선
+_QC_STAGE_RANK = {"rule_check": 1, "semantic_check": 2, "llm_judge": 3}
+
+
+def _candidate_race_enabled(purpose: str) -> bool:
+    purposes = settings.generate_candidate_race_purposes
+    return settings.generate_candidate_race_k > 1 and ("*" in purposes or purpose in purposes)
+
+
+def _qc_rank(quality_check: Dict[str, Any]) -> tuple:
+    scores = quality_check.get("llm_judge_scores") or {}
+    return (_QC_STAGE_RANK.get(quality_check.get("failed_stage"), 0), scores.get("overall", 0))
+
+
+async def _race_candidates(
+    task: Dict[str, Any],
+    generator,
+    checker,
+    model: str,
+    judge_llm,
+    persona_info: Optional[Dict[str, Any]],
+) -> Optional[Dict[str, Any]]:
+    """
+    후보 K개를 동시에 생성·품질 검사해 3단계를 먼저 통과한 후보를 반환한다 (나머지는 취소).
+
+    통과 후보가 없으면 가장 뒤 단계까지 간 후보를 실패 결과와 함께 반환해 기존 피드백 루프로
+    넘기고, 후보가 전부 예외로 끝나면 None을 반환한다 (generate_crm_message의 생성 실패와 동일 취급).
+
+    Returns:
+        ``{"message": dict, "quality_check": dict}`` 또는 None.
+    """
+    k = settings.generate_candidate_race_k
+    temperatures = settings.generate_candidate_race_temperatures or [settings.llm_temperature_generator]
+
+    async def run_candidate(i: int) -> tuple:
+        llm = get_llm(model, temperature=temperatures[i % len(temperatures)])
+        prompt = apply_candidate_hint(task["prompt"], CANDIDATE_HINTS[i % len(CANDIDATE_HINTS)])
+        message = _parse_message(await generator.generate_crm_message_candidate(prompt, llm))
+        quality_check = await checker.check_quality(
+            message=message,
+            product_id=task["product_id"],
+            purpose=task["purpose"],
+            llm=judge_llm,
+            persona_info=persona_info,
+        )
+        return i, message, quality_check
+
+    started = time.monotonic()
+    pending = [asyncio.create_task(run_candidate(i)) for i in range(k)]
+    winner = None
+    best = None
+    finished = 0
+    try:
+        for fut in asyncio.as_completed(pending):
+            try:
+                i, message, quality_check = await fut
+            except Exception as e:
+                _logger.warning("candidate_race_candidate_failed", product_id=task["product_id"], error_type=type(e).__name__)
+                continue
+            finished += 1
+            if quality_check["passed"]:
+                winner = (i, message, quality_check)
+                break
+            if best is None or _qc_rank(quality_check) > _qc_rank(best[2]):
+                best = (i, message, quality_check)
+    finally:
+        cancelled = sum(1 for p in pending if not p.done())
+        for p in pending:
+            p.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    chosen = winner or best
+    _logger.info(
+        "candidate_race_done",
+        product_id=task["product_id"],
+        purpose=task["purpose"],
+        passed=winner is not None,
+        winner_index=chosen[0] if chosen else None,
+        finished_count=finished,
+        cancelled_count=cancelled,
+        elapsed_ms=round((time.monotonic() - started) * 1000),
+    )
+    if chosen is None:
+        return None
+    return {"message": chosen[1], "quality_check": chosen[2]}
+
+
+def _log_pipeline_latency(state: GenerateMessageState, status: str) -> None:
+    """생성 모드(candidate_race / retry_loop)별 end-to-end 지연 기록 — loadtest/candidate_race_report.py가 집계."""
+    start_time = state.get("start_time")
+    if not start_time:
+        return
+    duration_ms = round((datetime.now(timezone.utc) - datetime.fromisoformat(start_time)).total_seconds() * 1000)
+    _logger.info(
+        "generate_pipeline_latency",
+        generation_mode=(state.get("intermediate") or {}).get("generation_mode", "retry_loop"),
+        duration_ms=duration_ms,
+        feedback_retry_count=state.get("feedback_retry_count", 0),
+        status=status,
+    )
+
+
 async def init_node(state: GenerateMessageState, config: RunnableConfig) -> dict:
     logger = AgentLogger({**state, "logs": []}, node_name="init_node", agent_name="generate_message_agent")
     logger.info("agent_started", user_message="[init] 에이전트 시작")
@@ -107,7 +212,8 @@ async def router_node(state: GenerateMessageState, config: RunnableConfig) -> Di
 
 
 async def generate_message_node(state: GenerateMessageState, config: RunnableConfig) -> Dict[str, Any]:
-    generator = config["configurable"]["services"].generator
+    services = config["configurable"]["services"]
+    generator = services.generator
     agent_logger = AgentLogger(state, node_name="generate_message_node")
     model = config.get("configurable", {}).get("model", settings.chatgpt_model_name)
     message_llm = get_llm(model, temperature=settings.llm_temperature_generator)
@@ -127,7 +233,28 @@ async def generate_message_node(state: GenerateMessageState, config: RunnableCon
         tasks = await generator.get_product_info(tasks)
         tasks = await generator.get_brand_tone(tasks)
         tasks = await generator.get_crm_prompt(tasks, persona_info=persona_info)
-        tasks = await generator.generate_crm_message(tasks, message_llm)
+
+        race_tasks = [t for t in tasks if _candidate_race_enabled(t["purpose"])]
+        loop_tasks = [t for t in tasks if not _candidate_race_enabled(t["purpose"])]
+        judge_llm = None
+        if race_tasks:
+            judge_llm = get_llm(model, temperature=settings.llm_temperature_classifier, reasoning_effort="low")
+            agent_logger.info(
+                "candidate_race_started",
+                user_message=f"후보 경쟁 생성 ({len(race_tasks)}개 태스크 × 후보 {settings.generate_candidate_race_k}개)",
+                task_count=len(race_tasks),
+                k=settings.generate_candidate_race_k,
+            )
+        loop_results, race_results = await asyncio.gather(
+            generator.generate_crm_message(
+                loop_tasks, message_llm,
+                stream_rule_check=services.checker.new_streaming_rule_check if settings.generate_stream_rule_check_enabled else None,
+            ) if loop_tasks else asyncio.sleep(0, result=[]),
+            asyncio.gather(*[
+                _race_candidates(t, generator, services.checker, model, judge_llm, persona_info)
+                for t in race_tasks
+            ]),
+        )
     except Exception as e:
         agent_logger.error("generate_message_error", user_message="[generate] 오류가 발생했습니다.", error_type=type(e).__name__, exc_info=True)
         # Command(goto="output_node") 대신 plain dict 반환:
@@ -140,17 +267,25 @@ async def generate_message_node(state: GenerateMessageState, config: RunnableCon
             "logs": agent_logger.get_user_logs(),
         }
 
-    generated_tasks = [
-        {
+    def _generated_task(t: Dict[str, Any], message: Dict[str, Any]) -> Dict[str, Any]:
+        return {
             "product_id": t["product_id"],
             "product_name": t.get("product_info", {}).get("product_name", ""),
             "brand": t.get("product_info", {}).get("brand", ""),
             "sub_tag": t.get("product_info", {}).get("sub_tag", ""),
             "purpose": t["purpose"],
-            "message": _parse_message(t["message"]),
+            "message": message,
         }
-        for t in tasks
+
+    generated_tasks = [_generated_task(t, _parse_message(t["message"])) for t in loop_results]
+    # 후보 경쟁 태스크는 이미 품질 검사를 마쳤으므로 결과를 함께 넘겨 quality_check_node에서 재검사하지 않음
+    generated_tasks += [
+        {**_generated_task(t, r["message"]), "quality_check": r["quality_check"], "_race_checked": True}
+        for t, r in zip(race_tasks, race_results)
+        if r is not None
     ]
+    order = {(t["product_id"], t["purpose"]): i for i, t in enumerate(tasks)}
+    generated_tasks.sort(key=lambda t: order.get((t["product_id"], t["purpose"]), len(order)))
 
     agent_logger.info(
         "generate_message_done",
@@ -160,6 +295,10 @@ async def generate_message_node(state: GenerateMessageState, config: RunnableCon
 
     return {
         "generated_tasks": generated_tasks,
+        "intermediate": {
+            **(state.get("intermediate") or {}),
+            "generation_mode": "candidate_race" if race_tasks else "retry_loop",
+        },
         "logs": agent_logger.get_user_logs(),
     }
 
@@ -190,23 +329,55 @@ async def quality_check_node(state: GenerateMessageState, config: RunnableConfig
     checked_tasks = []
     failed_task_ids = []
 
-    for task in generated_tasks:
+    error_result = {"passed": False, "failed_stage": "quality_check_error", "failure_reason": "품질 검사 중 오류가 발생했습니다."}
+
+    # 후보 경쟁 모드에서 이미 검사된 태스크는 결과를 그대로 사용 (플래그는 제거 → 피드백 후에는 재검사)
+    unchecked_tasks = [t for t in generated_tasks if not t.get("_race_checked")]
+
+    # 배치 모드: 메시지 여러 개를 Judge 1회 호출로 채점 (호출 수·세마포어 점유 감소)
+    batch_results = None
+    if settings.quality_check_llm_judge_batch_enabled and len(unchecked_tasks) > 1:
         try:
-            quality_check = await checker.check_quality(
-                message=task["message"],
-                product_id=task["product_id"],
-                purpose=task["purpose"],
+            batch_results = await checker.check_quality_batch(
+                [
+                    {"message": t["message"], "product_id": t["product_id"], "purpose": t["purpose"]}
+                    for t in unchecked_tasks
+                ],
                 llm=judge_llm,
                 persona_info=persona_info,
             )
         except Exception as e:
             agent_logger.error(
-                "quality_check_task_error",
-                user_message=f"[quality_check] 태스크 검사 실패 (product_id={task['product_id']})",
-                product_id=task["product_id"],
+                "quality_check_batch_error",
+                user_message="[quality_check] 배치 품질 검사 실패",
                 error_type=type(e).__name__,
             )
-            quality_check = {"passed": False, "failed_stage": "quality_check_error", "failure_reason": "품질 검사 중 오류가 발생했습니다."}
+            batch_results = [dict(error_result) for _ in unchecked_tasks]
+    batch_iter = iter(batch_results or [])
+
+    for task in generated_tasks:
+        if task.get("_race_checked"):
+            task = {k: v for k, v in task.items() if k != "_race_checked"}
+            quality_check = task["quality_check"]
+        elif batch_results is not None:
+            quality_check = next(batch_iter)
+        else:
+            try:
+                quality_check = await checker.check_quality(
+                    message=task["message"],
+                    product_id=task["product_id"],
+                    purpose=task["purpose"],
+                    llm=judge_llm,
+                    persona_info=persona_info,
+                )
+            except Exception as e:
+                agent_logger.error(
+                    "quality_check_task_error",
+                    user_message=f"[quality_check] 태스크 검사 실패 (product_id={task['product_id']})",
+                    product_id=task["product_id"],
+                    error_type=type(e).__name__,
+                )
+                quality_check = dict(error_result)
         checked_tasks.append({**task, "quality_check": quality_check})
         if not quality_check["passed"]:
             failed_task_ids.append(task["product_id"])
@@ -354,6 +525,7 @@ async def output_node(state: GenerateMessageState) -> Dict[str, Any]:
             content = f"CRM 메시지 생성 실패: {reason}\n\n실패 목록:\n" + "\n".join(failed_details)
 
     logger.info("output_done", user_message=f"[output] 완료 (status={status})", status=status)
+    _log_pipeline_latency(state, status)
 
     if failed_task_ids:
         # generated_tasks에서는 실패 태스크를 제거 — CRM 레이어에 passed=False 태스크가
@@ -77,18 +77,20 @@ def build_apply_feedback_prompt(
   CTA를 언급하지 않았다면 그대로 보존하고, 만약 기존 메시지에 CTA가 없다면 마지막
   문장에 구체적인 행동 유도(예: "지금 제품 상세보기")를 반드시 추가하세요"""
 
-    human_prompt = f"""## 기존 메시지
+    # 프롬프트 prefix 캐시 적중을 위해 변동이 적은 섹션부터 배치:
+    # 브랜드 톤 → 상품 정보 → 페르소나 → 기존 메시지·피드백(매 호출)
+    human_prompt = f"""## 브랜드 톤 (준수 필수)
+{brand_tone}
+
+## 상품 정보 (이 정보에 있는 사실만 사용)
+{product_summary}{persona_section}
+
+## 기존 메시지
 제목: {existing_title}
 본문: {existing_message}
 
 ## 피드백 (반드시 반영하세요)
-{feedback}
-
-## 상품 정보 (이 정보에 있는 사실만 사용)
-{product_summary}
-
-## 브랜드 톤 (준수 필수)
-{brand_tone}{persona_section}"""
+{feedback}"""
 
     return [
         SystemMessage(content=system_prompt),
@@ -0,0 +1,32 @@
+"""
+생성 프롬프트 보조 힌트
+
+- 후보 경쟁(candidate race) 모드: 같은 목적 프롬프트로 K개 후보를 동시에 생성할 때 후보마다
+  서로 다른 작성 방향을 덧붙여 결과가 한 방향으로 몰리지 않게 한다. 힌트는 규제·브랜드톤
+  지침을 덮어쓰지 않는 범위의 구성 변주만 담는다.
+- 스트리밍 조기 중단: 생성 도중 규칙 위반으로 중단된 경우 재생성 프롬프트에 중단 사유를 덧붙인다.
+"""
+
+from typing import List
+from langchain_core.messages import BaseMessage, HumanMessage
+
+# 0번은 힌트 없음 — 기존 단일 생성과 동일한 프롬프트
+CANDIDATE_HINTS: tuple[str, ...] = (
+    "",
+    "고객이 겪는 구체적인 상황이나 순간을 묘사하며 시작하고, 제품이 그 상황에 어떻게 도움이 되는지로 이어가세요.",
+    "제품의 가장 차별화된 효능 한 가지에 집중해 근거와 함께 간결하게 작성하세요.",
+    "제목을 고객의 고민을 건드리는 질문형으로 작성하고, 본문에서 그 질문에 답하는 구조로 작성하세요.",
+)
+
+
+def apply_candidate_hint(prompt: List[BaseMessage], hint: str) -> List[BaseMessage]:
+    """마지막 HumanMessage 뒤에 작성 힌트를 덧붙인 새 프롬프트를 반환한다 (빈 힌트면 원본 그대로)."""
+    if not hint:
+        return prompt
+    *head, last = prompt
+    return [*head, HumanMessage(content=f"{last.content}\n\n## 이번 메시지 작성 방향\n{hint}")]
+
+
+def build_stream_abort_hint(abort_reason: str) -> str:
+    """스트리밍 조기 중단 사유 → 재생성 시 덧붙일 힌트."""
+    return f"직전 작성이 규칙 위반({abort_reason})으로 중단되었습니다. 이 규칙을 반드시 지켜 처음부터 다시 작성하세요."
@@ -20,7 +20,7 @@ class PurPosePrompts:
         - 어조(항목 4): 제목과 본문 모두에 일관되게 적용 — 제목도 본문과 같은 어조로 느껴져야 합니다
         - 핵심 키워드(항목 5): 제품과 연관된 키워드 1-2개 반드시 포함
         - 강조 감성(항목 6): 메시지의 감성적 방향 참고
-        - 금지 표현(항목 7): 아래 공통 금지 표현에 더해 반드시 준수
+        - 금지 표현(항목 7): 위 공통 금지 표현에 더해 반드시 준수
         - 문체 예시(항목 8): 문장 구조와 어투 참고"""
 
     def _build_common_regulations(self) -> str:
@@ -103,8 +103,6 @@ class PurPosePrompts:
         - **목적**: 브랜드/제품 첫 소개
         - **목표**: 신규 고객이 "더 알고 싶다"는 감정을 갖도록 유도
 
-        {self._build_brand_tone_section(brand_tone)}
-
         # 메시지 작성 원칙
 
         ## 핵심 강조 포인트
@@ -140,7 +138,9 @@ class PurPosePrompts:
         - 전문 용어 나열
         - 강압적 판매 톤
 
-        {self._build_common_regulations()}"""
+        {self._build_common_regulations()}
+
+        {self._build_brand_tone_section(brand_tone)}"""
 
         human_prompt = self._build_human_prompt(product_data, persona_info)
         return [SystemMessage(content=system_prompt), HumanMessage(content=human_prompt)]
@@ -158,8 +158,6 @@ class PurPosePrompts:
         - **목적**: 신제품 런칭 안내
         - **목표**: "기존 제품과 무엇이 다른가"에 대한 답을 주어 얼리어답터 확보
 
-        {self._build_brand_tone_section(brand_tone)}
-
         # 메시지 작성 원칙
 
         ## 핵심 강조 포인트
@@ -192,7 +190,9 @@ class PurPosePrompts:
         - 근거 없는 "세계 최초", "업계 유일"
         - 출시 전 제품에 대한 효능 확정 표현
 
-        {self._build_common_regulations()}"""
+        {self._build_common_regulations()}
+
+        {self._build_brand_tone_section(brand_tone)}"""
 
         human_prompt = self._build_human_prompt(product_data, persona_info)
         return [SystemMessage(content=system_prompt), HumanMessage(content=human_prompt)]
@@ -210,8 +210,6 @@ class PurPosePrompts:
         - **목적**: 베스트셀러 추천
         - **목표**: "많은 사람이 선택했고, 이유가 있다"는 확신을 주어 구매 결정 촉진
 
-        {self._build_brand_tone_section(brand_tone)}
-
         # 메시지 작성 원칙
 
         ## 핵심 강조 포인트
@@ -254,7 +252,9 @@ class PurPosePrompts:
         - "모든 사람 만족", "부작용 제로" 같은 일반화
         - 근거 없는 "국민 제품", "대한민국 베스트"
 
-        {self._build_common_regulations()}"""
+        {self._build_common_regulations()}
+
+        {self._build_brand_tone_section(brand_tone)}"""
 
         human_prompt = self._build_human_prompt(product_data, persona_info)
         return [SystemMessage(content=system_prompt), HumanMessage(content=human_prompt)]
@@ -272,8 +272,6 @@ class PurPosePrompts:
         - **목적**: 할인/이벤트 안내
         - **목표**: 혜택의 구체성과 기한의 긴급성으로 즉각적 구매 결정 유도
 
-        {self._build_brand_tone_section(brand_tone)}
-
         # 메시지 작성 원칙
 
         ## 핵심 강조 포인트
@@ -318,7 +316,9 @@ class PurPosePrompts:
         - "역대급", "최저가" (객관적 근거 없을 때)
         - 강압적 구매 유도
 
-        {self._build_common_regulations()}"""
+        {self._build_common_regulations()}
+
+        {self._build_brand_tone_section(brand_tone)}"""
 
         human_prompt = self._build_human_prompt(product_data, persona_info)
         return [SystemMessage(content=system_prompt), HumanMessage(content=human_prompt)]
@@ -336,8 +336,6 @@ class PurPosePrompts:
         - **목적**: 성분/효능 강조 소개
         - **목표**: "이 성분이 내 피부에 왜 필요한지" 이해시켜 구매 확신 제공
 
-        {self._build_brand_tone_section(brand_tone)}
-
         # 메시지 작성 원칙
 
         ## 핵심 강조 포인트
@@ -381,7 +379,9 @@ class PurPosePrompts:
         - 의학적 치료 효과 암시 ("피부과 처방", "세포 재생", "DNA 복구")
         - 상품정보에 없는 성분/효능 추가
 
-        {self._build_common_regulations()}"""
+        {self._build_common_regulations()}
+
+        {self._build_brand_tone_section(brand_tone)}"""
 
         human_prompt = self._build_human_prompt(product_data, persona_info)
         return [SystemMessage(content=system_prompt), HumanMessage(content=human_prompt)]
@@ -399,8 +399,6 @@ class PurPosePrompts:
         - **목적**: 피부타입/고민 맞춤 추천
         - **목표**: "이 제품이 바로 내 고민을 위한 것"이라는 확신을 주어 구매 전환 극대화
 
-        {self._build_brand_tone_section(brand_tone)}
-
         # 메시지 작성 원칙
 
         ## 핵심 강조 포인트
@@ -439,7 +437,9 @@ class PurPosePrompts:
         - "당신만을 위한", "100% 맞춤" 같은 과장된 독점성
         - 다른 피부 타입 비하 또는 비교
 
-        {self._build_common_regulations()}"""
+        {self._build_common_regulations()}
+
+        {self._build_brand_tone_section(brand_tone)}"""
 
         human_prompt = self._build_human_prompt(product_data, persona_info)
         return [SystemMessage(content=system_prompt), HumanMessage(content=human_prompt)]
@@ -457,8 +457,6 @@ class PurPosePrompts:
         - **목적**: 라이프스타일/연령대 맞춤 추천
         - **목표**: "이 제품이 내 삶의 루틴에 딱 맞는다"는 확신으로 일상 습관화 유도
 
-        {self._build_brand_tone_section(brand_tone)}
-
         # 메시지 작성 원칙
 
         ## 핵심 강조 포인트
@@ -501,7 +499,9 @@ class PurPosePrompts:
         - 라이프스타일 간 우열 비교
         - "완벽한 피부", "노화 방지" 같은 과장 표현
 
-        {self._build_common_regulations()}"""
+        {self._build_common_regulations()}
+
+        {self._build_brand_tone_section(brand_tone)}"""
 
         human_prompt = self._build_human_prompt(product_data, persona_info)
         return [SystemMessage(content=system_prompt), HumanMessage(content=human_prompt)]
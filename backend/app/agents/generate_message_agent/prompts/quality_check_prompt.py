@@ -5,7 +5,7 @@
 """
 
 import json
-from typing import Tuple, Dict, Any, Optional
+from typing import Tuple, Dict, Any, List, Optional
 
 _JUDGE_PRODUCT_FIELDS = {
     # DB 최상위 필드
@@ -26,38 +26,7 @@ def _filter_product_info(product_info: Dict[str, Any]) -> Dict[str, Any]:
     return {k: v for k, v in product_info.items() if k in _JUDGE_PRODUCT_FIELDS and v}
 
 
-def build_quality_check_prompt(
-    brand_name: str,
-    product_name: str,
-    product_info: Dict[str, Any],
-    purpose: str,
-    brand_tone: str,
-    title: str,
-    message: str,
-    persona_info: Optional[Dict[str, Any]] = None,
-) -> Tuple[str, str]:
-    """
-    LLM Judge 프롬프트 구성
-
-    Returns:
-        (system_prompt, human_prompt) 문자열 튜플
-    """
-    # 타깃 고객 관련 필드 추출
-    concern = product_info.get("concern") or []
-    key_benefits = product_info.get("key_benefits") or []
-    target_user = product_info.get("target_user") or ""
-
-    concern_text = ", ".join(concern) if concern else "정보 없음"
-    key_benefits_text = "\n".join(f"- {b}" for b in key_benefits) if key_benefits else "정보 없음"
-
-    product_summary = json.dumps(_filter_product_info(product_info), ensure_ascii=False, indent=2)
-
-    if persona_info:
-        target_customer_text = json.dumps(persona_info, ensure_ascii=False, indent=2)
-    else:
-        target_customer_text = target_user if target_user else "정보 없음"
-
-    system_prompt = """당신은 뷰티 CRM 마케팅 메시지 품질 평가 전문가입니다.
+_JUDGE_SYSTEM_PROMPT = """당신은 뷰티 CRM 마케팅 메시지 품질 평가 전문가입니다.
 아래 5가지 기준으로 메시지를 평가하세요. 금지 표현·약사법 위반 여부는 이미 사전 검증되었으므로 평가하지 않습니다.
 
 ## 평가 기준 (각 1-5점)
@@ -119,15 +88,49 @@ CRM 메시지로서 읽기 좋고 행동을 유도하는 문장인지 평가합
 - "개선 필요:"와 "잘된 점:"을 혼합하거나 한 문장 안에 섞지 마세요
 - 전체 한글로 작성하세요"""
 
-    human_prompt = f"""## 평가 대상 메시지
+_JUDGE_BATCH_INSTRUCTION = """
 
-### 제목
-{title}
+## 여러 메시지 일괄 평가
+사용자 입력에는 "# 메시지 N" 으로 구분된 평가 대상이 여러 개 들어 있습니다.
+- 각 메시지는 서로 비교하지 말고, 해당 메시지 블록의 참고 정보만으로 독립적으로 평가하세요
+- 메시지마다 결과를 하나씩, 입력 순서 그대로 results에 담으세요
+- 각 결과의 message_index에는 해당 메시지 번호 N을 그대로 적으세요"""
 
-### 본문
-{message}
 
-## 참고 정보
+def _build_judge_human_prompt(
+    brand_name: str,
+    product_name: str,
+    product_info: Dict[str, Any],
+    purpose: str,
+    brand_tone: str,
+    title: str,
+    message: str,
+    persona_info: Optional[Dict[str, Any]] = None,
+) -> str:
+    # 타깃 고객 관련 필드 추출
+    concern = product_info.get("concern") or []
+    key_benefits = product_info.get("key_benefits") or []
+    target_user = product_info.get("target_user") or ""
+
+    concern_text = ", ".join(concern) if concern else "정보 없음"
+    key_benefits_text = "\n".join(f"- {b}" for b in key_benefits) if key_benefits else "정보 없음"
+
+    product_summary = json.dumps(_filter_product_info(product_info), ensure_ascii=False, indent=2)
+
+    if persona_info:
+        target_customer_text = json.dumps(persona_info, ensure_ascii=False, indent=2)
+    else:
+        target_customer_text = target_user if target_user else "정보 없음"
+
+    # 프롬프트 prefix 캐시 적중을 위해 변동이 적은 섹션부터 배치:
+    # 브랜드 톤(브랜드 단위) → 목적 → 상품(상품 단위) → 페르소나 → 평가 대상 메시지(매 호출)
+    return f"""## 참고 정보
+
+### 브랜드 톤 가이드
+{brand_tone}
+
+### 메시지 목적
+{purpose}
 
 ### 브랜드
 {brand_name}
@@ -147,10 +150,61 @@ CRM 메시지로서 읽기 좋고 행동을 유도하는 문장인지 평가합
 ### 타깃 고객 정보
 {target_customer_text}
 
-### 브랜드 톤 가이드
-{brand_tone}
+## 평가 대상 메시지
 
-### 메시지 목적
-{purpose}"""
+### 제목
+{title}
+
+### 본문
+{message}"""
+
+
+def build_quality_check_prompt(
+    brand_name: str,
+    product_name: str,
+    product_info: Dict[str, Any],
+    purpose: str,
+    brand_tone: str,
+    title: str,
+    message: str,
+    persona_info: Optional[Dict[str, Any]] = None,
+) -> Tuple[str, str]:
+    """
+    LLM Judge 프롬프트 구성
+
+    Returns:
+        (system_prompt, human_prompt) 문자열 튜플
+    """
+    human_prompt = _build_judge_human_prompt(
+        brand_name, product_name, product_info, purpose, brand_tone, title, message,
+        persona_info=persona_info,
+    )
+    return _JUDGE_SYSTEM_PROMPT, human_prompt
+
+
+def build_quality_check_batch_prompt(
+    items: List[Dict[str, Any]],
+    persona_info: Optional[Dict[str, Any]] = None,
+) -> Tuple[str, str]:
+    """
+    여러 메시지를 한 번의 LLM 호출로 평가하는 배치 Judge 프롬프트 구성
+
+    메시지 블록 본문은 단건 프롬프트(build_quality_check_prompt)와 동일하게 만들어
+    단건/배치 모드의 채점 기준이 어긋나지 않게 한다.
+
+    Args:
+        items: brand_name, product_name, product_info, purpose, brand_tone,
+               title, message 키를 가진 dict 리스트 (입력 순서 = message_index 1..N)
 
-    return system_prompt, human_prompt
+    Returns:
+        (system_prompt, human_prompt) 문자열 튜플
+    """
+    blocks = [
+        f"# 메시지 {i}\n\n" + _build_judge_human_prompt(
+            item["brand_name"], item["product_name"], item["product_info"], item["purpose"],
+            item["brand_tone"], item["title"], item["message"],
+            persona_info=persona_info,
+        )
+        for i, item in enumerate(items, start=1)
+    ]
+    return _JUDGE_SYSTEM_PROMPT + _JUDGE_BATCH_INSTRUCTION, "\n\n---\n\n".join(blocks)
@@ -1,11 +1,12 @@
 import asyncio
 from ....core.data_loader import get_brand_tone
-from ....core.llm_utils import ainvoke_with_retry
+from ....core.llm_utils import ainvoke_with_retry, astream_with_early_abort
 from ....config.settings import settings
 from ...shared.product.product_client import ProductClient
 from ...shared.persona.persona_client import PersonaClient
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 from ..prompts.purpose_prompt import PurPosePrompts
+from ..prompts.candidate_hint_prompt import apply_candidate_hint, build_stream_abort_hint
 from ....core.logging import get_logger
 
 logger = get_logger(__name__)
@@ -117,29 +118,34 @@ class CrmMessageGenerator:
             for item in tasks
         ]
 
-    async def generate_crm_message(self, tasks: List[Dict], llm) -> List[Dict]:
+    async def generate_crm_message(self, tasks: List[Dict], llm, stream_rule_check: Optional[Callable] = None) -> List[Dict]:
         """각 태스크의 프롬프트로 LLM을 병렬 호출하여 CRM 메시지를 생성.
 
         Args:
             tasks: prompt 키를 포함하는 태스크 dict 리스트.
             llm: ainvoke 메서드를 지원하는 LangChain LLM 인스턴스.
+            stream_rule_check: 증분 규칙 검사기 팩토리 (``QualityChecker.new_streaming_rule_check``).
+                지정하면 스트리밍으로 생성하며 위반 즉시 중단·재생성함.
 
         Returns:
             message가 추가된 태스크 리스트. 생성 결과가 없는 항목은 제외.
         """
         logger.info("generate_crm_message.start", task_count=len(tasks))
 
-        fetch_tasks = [
-            ainvoke_with_retry(
-                llm, item["prompt"],
-                semaphore_key="generate_crm_message",
-                max_concurrency=settings.generate_crm_message_max_concurrency,
-                max_retries=settings.generate_crm_message_max_retries,
-                backoff_base=settings.generate_crm_message_backoff_base,
-                logger=logger, retry_event="generate_crm_message_retry",
-            )
-            for item in tasks
-        ]
+        if stream_rule_check is not None:
+            fetch_tasks = [self._generate_with_early_abort(item, llm, stream_rule_check) for item in tasks]
+        else:
+            fetch_tasks = [
+                ainvoke_with_retry(
+                    llm, item["prompt"],
+                    semaphore_key="generate_crm_message",
+                    max_concurrency=settings.generate_crm_message_max_concurrency,
+                    max_retries=settings.generate_crm_message_max_retries,
+                    backoff_base=settings.generate_crm_message_backoff_base,
+                    logger=logger, retry_event="generate_crm_message_retry",
+                )
+                for item in tasks
+            ]
         results = await asyncio.gather(*fetch_tasks, return_exceptions=True)
 
         messages = [
@@ -154,3 +160,59 @@ class CrmMessageGenerator:
 
         logger.info("generate_crm_message.done", generated_count=len(messages))
         return messages
+
+    async def _generate_with_early_abort(self, item: Dict, llm, stream_rule_check: Callable) -> str:
+        """스트리밍 생성 중 규칙 위반이 확정되면 즉시 끊고 중단 사유를 힌트로 붙여 재생성.
+
+        재생성 한도(generate_stream_abort_max_regenerations)를 다 쓰면 마지막 시도는 검사 없이
+        끝까지 생성해 반환함 — 이후 품질 검사·피드백 루프가 처리.
+
+        Returns:
+            LLM 응답 텍스트 (JSON 문자열).
+        """
+        max_regenerations = settings.generate_stream_abort_max_regenerations
+        prompt = item["prompt"]
+        for attempt in range(max_regenerations + 1):
+            final_attempt = attempt == max_regenerations
+            text, abort_reason = await astream_with_early_abort(
+                llm, prompt,
+                make_check=None if final_attempt else (lambda: stream_rule_check().feed),
+                semaphore_key="generate_crm_message",
+                max_concurrency=settings.generate_crm_message_max_concurrency,
+                max_retries=settings.generate_crm_message_max_retries,
+                backoff_base=settings.generate_crm_message_backoff_base,
+                logger=logger, retry_event="generate_crm_message_retry",
+            )
+            if abort_reason is None:
+                return text
+            logger.info(
+                "generate_crm_message.stream_aborted",
+                product_id=item.get("product_id"),
+                attempt=attempt + 1,
+                reason=abort_reason,
+                generated_chars=len(text),
+            )
+            prompt = apply_candidate_hint(item["prompt"], build_stream_abort_hint(abort_reason))
+        return text
+
+    async def generate_crm_message_candidate(self, prompt: List, llm):
+        """후보 경쟁 모드용 단일 후보 생성.
+
+        generate_crm_message와 같은 세마포어·재시도 정책을 공유하므로 후보 K개가
+        전체 생성 동시성 한도를 넘지 않음.
+
+        Args:
+            prompt: 작성 힌트가 반영된 메시지 리스트.
+            llm: 후보별 온도로 생성한 LangChain LLM 인스턴스.
+
+        Returns:
+            LLM 원본 응답 (파싱은 호출자가 수행).
+        """
+        return await ainvoke_with_retry(
+            llm, prompt,
+            semaphore_key="generate_crm_message",
+            max_concurrency=settings.generate_crm_message_max_concurrency,
+            max_retries=settings.generate_crm_message_max_retries,
+            backoff_base=settings.generate_crm_message_backoff_base,
+            logger=logger, retry_event="generate_crm_message_retry",
+        )
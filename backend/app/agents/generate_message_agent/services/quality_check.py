@@ -16,13 +16,13 @@ from langchain_core.messages import SystemMessage, HumanMessage
 import httpx
 import ahocorasick
 from kiwipiepy import Kiwi
-from ..prompts.quality_check_prompt import build_quality_check_prompt
+from ..prompts.quality_check_prompt import build_quality_check_prompt, build_quality_check_batch_prompt
 from ....core.logging import get_logger
 from ....core.langsmith_config import traced
 from ....core.data_loader import get_forbidden_keywords, get_brand_tone
 from ....core.llm_utils import ainvoke_with_retry
 from ....config.settings import settings
-from ....core.http_client_registry import register
+from ....core.http_client_registry import create_http_client, register
 from ...shared.product.product_client import ProductClient
 
 logger = get_logger("quality_check")
@@ -41,6 +41,16 @@ class LLMJudgeOutput(BaseModel):
     feedback: str = Field(..., description="종합 피드백 (한글, 2-4문장)")
 
 
+class LLMJudgeBatchItem(LLMJudgeOutput):
+    """배치 Judge의 메시지별 결과 — 입력의 "# 메시지 N" 번호를 함께 돌려받아 순서를 검증한다"""
+    message_index: int = Field(..., ge=1, description="평가한 메시지 번호 (입력의 '# 메시지 N'의 N)")
+
+
+class LLMJudgeBatchOutput(BaseModel):
+    """LLM-as-a-Judge 배치 구조화된 출력 (메시지 N개 → 결과 N개)"""
+    results: List[LLMJudgeBatchItem] = Field(..., description="메시지별 평가 결과 (입력 순서 그대로)")
+
+
 # ============================================================
 # 스테이지2 헷지 표현 오탐 방지
 # ============================================================
@@ -63,6 +73,111 @@ def _is_hedge_without_assertion(query_sentence: str) -> bool:
 
 
 
+# ============================================================
+# 스트리밍 조기 중단용 증분 규칙 검사
+# ============================================================
+
+_JSON_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "b": "\b", "f": "\f", '"': '"', "\\": "\\", "/": "/"}
+_STREAM_FIELD_START_RE = re.compile(r'"(title|message)"\s*:\s*"$')
+_FIELD_END = object()
+
+
+class StreamingRuleCheck:
+    """
+    생성 중인 JSON 응답(``{"title": ..., "message": ...}``)을 청크 단위로 받아
+    Stage 1 중 "도중에 확정되는" 위반만 즉시 판정한다.
+
+    - 제목/본문 최대 길이 초과
+    - 금지 표현 Aho-Corasick 1·2단계 매칭 (원문 / 공백 제거) — ``QualityChecker._automaton`` 공유
+
+    필드 값 내부에서만 매칭하므로 여기서 잡히는 위반은 최종 ``_run_rule_check``에서도 반드시
+    잡힌다 (더 엄격해지지 않음). 최소 길이·형태소 매칭은 완료 후 품질 검사에서 그대로 수행한다.
+    """
+
+    def __init__(self, automaton, max_key_len: int):
+        self._automaton = automaton
+        self._overlap = max(0, max_key_len - 1)
+        self._raw_tail = ""
+        self._field: Optional[str] = None
+        self._escape: Optional[str] = None  # None | "" (백슬래시 직후) | "u..." (유니코드 이스케이프 수집 중)
+        self._values: Dict[str, str] = {"title": "", "message": ""}
+        self._stripped: Dict[str, str] = {"title": "", "message": ""}
+
+    def feed(self, chunk: str) -> Optional[str]:
+        """청크를 반영하고, 확정된 위반이 있으면 사유 문자열을 반환 (없으면 None)."""
+        appended: Dict[str, str] = {}
+        for ch in chunk:
+            if self._field is None:
+                self._raw_tail = (self._raw_tail + ch)[-32:]
+                m = _STREAM_FIELD_START_RE.search(self._raw_tail)
+                if m:
+                    self._field = m.group(1)
+                    self._raw_tail = ""
+                continue
+            decoded = self._decode(ch)
+            if decoded is None:
+                continue
+            if decoded is _FIELD_END:
+                reason = self._check_field(self._field, appended.pop(self._field, ""))
+                if reason:
+                    return reason
+                self._field = None
+                continue
+            appended[self._field] = appended.get(self._field, "") + decoded
+        for field, text in appended.items():
+            reason = self._check_field(field, text)
+            if reason:
+                return reason
+        return None
+
+    def _decode(self, ch: str):
+        if self._escape is None:
+            if ch == "\\":
+                self._escape = ""
+                return None
+            if ch == '"':
+                return _FIELD_END
+            return ch
+        if self._escape == "":
+            if ch == "u":
+                self._escape = "u"
+                return None
+            self._escape = None
+            return _JSON_ESCAPES.get(ch, ch)
+        self._escape += ch
+        if len(self._escape) < 5:
+            return None
+        code, self._escape = self._escape[1:], None
+        try:
+            return chr(int(code, 16))
+        except ValueError:
+            return ""
+
+    def _check_field(self, field: str, text: str) -> Optional[str]:
+        if not text:
+            return None
+        prev = self._values[field]
+        self._values[field] = prev + text
+        limit = settings.message_title_max_length if field == "title" else settings.message_body_max_length
+        if len(self._values[field]) > limit:
+            label = "제목" if field == "title" else "메시지"
+            return f"{label}이 너무 깁니다 (최대 {limit}자 초과)"
+
+        expr = self._scan(self._values[field], len(prev))
+        if expr is None:
+            prev_stripped = self._stripped[field]
+            self._stripped[field] = prev_stripped + QualityChecker._strip_spaces(text)
+            expr = self._scan(self._stripped[field], len(prev_stripped))
+        return f"금지 표현 감지: '{expr}'" if expr else None
+
+    def _scan(self, text: str, prev_len: int) -> Optional[str]:
+        # 새로 붙은 구간 + 직전 (최장 키워드 길이 - 1)자만 다시 훑고, 새 구간에서 끝나는 매칭만 채택
+        for end, (_, original) in self._automaton.iter(text, max(0, prev_len - self._overlap)):
+            if end >= prev_len:
+                return original
+        return None
+
+
 # ============================================================
 # 품질 검사 서비스 클래스
 # ============================================================
@@ -79,12 +194,19 @@ class QualityChecker:
         self._forbidden_expressions: List[str] = self._extract_forbidden_expressions()
         self._kiwi = Kiwi()
         self._automaton = self._build_automaton()
+        self._automaton_max_key_len = max(
+            (len(self._strip_spaces(e.strip())) for e in self._forbidden_expressions), default=0
+        )
         logger.info("quality_checker_initialized")
 
+    def new_streaming_rule_check(self) -> StreamingRuleCheck:
+        """생성 스트림 1회분의 증분 규칙 검사기 (스트림마다 새로 만든다)."""
+        return StreamingRuleCheck(self._automaton, self._automaton_max_key_len)
+
     @property
     def http_client(self) -> httpx.AsyncClient:
         if self._http_client is None or self._http_client.is_closed:
-            self._http_client = httpx.AsyncClient(
+            self._http_client = create_http_client(
                 timeout=httpx.Timeout(settings.http_timeout_short),
                 headers={"X-Internal-Token": settings.internal_token},
             )
@@ -138,23 +260,101 @@ class QualityChecker:
                     "llm_judge_scores": dict | None,
                 }
         """
-        title = message.get("title", "")
-        message_text = message.get("message", "")
+        result, judge_ctx = await self._run_pre_judge_stages(message, product_id)
+        if judge_ctx is None:
+            return result
 
-        if not product_id:
-            return {
-                "passed": False,
-                "failed_stage": "product_fetch",
-                "failure_reason": "product_id가 비어있습니다",
-                "rule_check_passed": False,
-                "rule_check_issues": [],
-                "semantic_check_passed": False,
-                "semantic_check_results": [],
-                "llm_judge_passed": False,
-                "llm_judge_scores": None,
-            }
-
-        result = {
+        # Stage 3: LLM-as-a-Judge
+        if llm is None:
+            logger.error("llm_judge_skipped", reason="llm not provided")
+            result["failed_stage"] = "llm_judge"
+            result["failure_reason"] = "LLM이 제공되지 않아 품질 평가를 수행할 수 없습니다"
+            return result
+        logger.info("stage3_llm_judge_started")
+        passed, scores = await self._run_llm_judge(
+            judge_ctx["title"], judge_ctx["message"], judge_ctx["product_name"],
+            judge_ctx["product"], purpose, judge_ctx["brand_name"], llm,
+            persona_info=persona_info,
+        )
+        return self._apply_llm_judge_result(result, passed, scores)
+
+    @traced(name="quality_check_batch", run_type="chain")
+    async def check_quality_batch(
+        self,
+        items: List[Dict[str, Any]],
+        llm: Optional[BaseChatModel] = None,
+        persona_info: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        여러 메시지를 한꺼번에 품질 검사합니다 (Stage 3 배치 모드).
+
+        Stage 1·2는 메시지별로 동시에 실행하고, 둘 다 통과한 메시지만 모아
+        ``quality_check_llm_judge_batch_max_size``개씩 LLM Judge 1회 호출로 채점합니다.
+        배치 출력이 검증(결과 개수·message_index)에 실패하거나 호출 자체가 실패하면
+        해당 묶음만 단건 Judge 호출로 폴백합니다. 통과 기준과 결과 dict 형식은
+        ``check_quality``와 동일합니다.
+
+        Args:
+            items:        ``message``, ``product_id``, ``purpose`` 키를 가진 dict 리스트.
+            llm:          Stage 3에서 사용할 LangChain LLM 인스턴스.
+            persona_info: 모든 메시지가 공유하는 페르소나 정보.
+
+        Returns:
+            items와 같은 순서의 품질 검사 결과 dict 리스트.
+        """
+        pre_results = await asyncio.gather(
+            *[self._run_pre_judge_stages(item["message"], item["product_id"]) for item in items],
+            return_exceptions=True,
+        )
+
+        results: List[Dict[str, Any]] = []
+        pending: List[Tuple[int, Dict[str, Any]]] = []
+        for idx, (item, pre) in enumerate(zip(items, pre_results)):
+            if isinstance(pre, Exception):
+                logger.error("quality_check_batch_item_failed", product_id=item["product_id"], error_type=type(pre).__name__)
+                results.append({"passed": False, "failed_stage": "quality_check_error", "failure_reason": "품질 검사 중 오류가 발생했습니다."})
+                continue
+            result, judge_ctx = pre
+            results.append(result)
+            if judge_ctx is None:
+                continue
+            if llm is None:
+                logger.error("llm_judge_skipped", reason="llm not provided")
+                result["failed_stage"] = "llm_judge"
+                result["failure_reason"] = "LLM이 제공되지 않아 품질 평가를 수행할 수 없습니다"
+                continue
+            pending.append((idx, {**judge_ctx, "purpose": item["purpose"]}))
+
+        if not pending:
+            return results
+
+        size = max(1, settings.quality_check_llm_judge_batch_max_size)
+        chunks = [pending[i:i + size] for i in range(0, len(pending), size)]
+        logger.info("stage3_llm_judge_batch_started", message_count=len(pending), batch_count=len(chunks))
+
+        async def judge_chunk(chunk: List[Tuple[int, Dict[str, Any]]]) -> List[Tuple[bool, Optional[Dict[str, Any]]]]:
+            ctxs = [ctx for _, ctx in chunk]
+            judged = await self._run_llm_judge_batch(ctxs, llm, persona_info=persona_info) if len(ctxs) > 1 else None
+            if judged is not None:
+                return judged
+            # 단건이거나 배치 출력 검증 실패 → 메시지별 단건 Judge로 폴백
+            return list(await asyncio.gather(*[
+                self._run_llm_judge(
+                    ctx["title"], ctx["message"], ctx["product_name"], ctx["product"],
+                    ctx["purpose"], ctx["brand_name"], llm, persona_info=persona_info,
+                )
+                for ctx in ctxs
+            ]))
+
+        judged_chunks = await asyncio.gather(*[judge_chunk(c) for c in chunks])
+        for chunk, judged in zip(chunks, judged_chunks):
+            for (idx, _), (passed, scores) in zip(chunk, judged):
+                self._apply_llm_judge_result(results[idx], passed, scores)
+        return results
+
+    @staticmethod
+    def _new_result() -> Dict[str, Any]:
+        return {
             "passed": False,
             "failed_stage": None,
             "failure_reason": None,
@@ -166,6 +366,28 @@ class QualityChecker:
             "llm_judge_scores": None,
         }
 
+    async def _run_pre_judge_stages(
+        self,
+        message: Dict[str, Any],
+        product_id: str,
+    ) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+        """
+        상품 조회 → Stage 1 → Stage 2를 실행합니다 (단건/배치 공용).
+
+        Returns:
+            ``(result, judge_ctx)`` 튜플. 중간 단계에서 실패하면 judge_ctx는 None이고
+            result에 실패 단계와 사유가 채워져 있습니다. 모두 통과하면 judge_ctx에
+            Stage 3 입력(title, message, product_name, product, brand_name)이 담깁니다.
+        """
+        title = message.get("title", "")
+        message_text = message.get("message", "")
+        result = self._new_result()
+
+        if not product_id:
+            result["failed_stage"] = "product_fetch"
+            result["failure_reason"] = "product_id가 비어있습니다"
+            return result, None
+
         db_products = await self._product_client.get_products_detail_from_db([product_id])
         db_product = db_products[0] if db_products else {}
 
@@ -173,7 +395,7 @@ class QualityChecker:
             logger.error("product_db_not_found", product_id=product_id)
             result["failed_stage"] = "product_fetch"
             result["failure_reason"] = f"상품 정보를 찾을 수 없습니다 (product_id: {product_id})"
-            return result
+            return result, None
 
         product = self._product_client.flatten_product_data(db_product)
 
@@ -189,7 +411,7 @@ class QualityChecker:
             result["failed_stage"] = "rule_check"
             result["failure_reason"] = f"규칙 기반 검사 실패: {'; '.join(issues)}"
             logger.warning("stage1_failed", issues=issues)
-            return result
+            return result, None
         logger.info("stage1_passed")
 
         # Stage 2: Semantic Similarity Check
@@ -208,20 +430,23 @@ class QualityChecker:
                 ])
                 result["failure_reason"] = f"금지 표현 유사 문장 감지: {triggered_details}"
             logger.warning("stage2_semantic_failed", triggered=similar_results)
-            return result
+            return result, None
         logger.info("stage2_semantic_passed")
 
-        # Stage 3: LLM-as-a-Judge
-        if llm is None:
-            logger.error("llm_judge_skipped", reason="llm not provided")
-            result["failed_stage"] = "llm_judge"
-            result["failure_reason"] = "LLM이 제공되지 않아 품질 평가를 수행할 수 없습니다"
-            return result
-        logger.info("stage3_llm_judge_started")
-        passed, scores = await self._run_llm_judge(
-            title, message_text, product_name, product, purpose, brand_name, llm,
-            persona_info=persona_info,
-        )
+        return result, {
+            "title": title,
+            "message": message_text,
+            "product_name": product_name,
+            "product": product,
+            "brand_name": brand_name,
+        }
+
+    @staticmethod
+    def _apply_llm_judge_result(
+        result: Dict[str, Any],
+        passed: bool,
+        scores: Optional[Dict[str, Any]],
+    ) -> Dict[str, Any]:
         result["llm_judge_passed"] = passed
         result["llm_judge_scores"] = scores
         if not passed:
@@ -605,6 +830,75 @@ class QualityChecker:
             logger.error("llm_judge_failed", error_type=type(e).__name__, exc_info=True)
             return False, {"feedback": "LLM 평가 중 오류가 발생했습니다."}
 
+        return self._judge_output_to_scores(result)
+
+    @traced(name="llm_judge_batch", run_type="llm")
+    async def _run_llm_judge_batch(
+        self,
+        ctxs: List[Dict[str, Any]],
+        llm: BaseChatModel,
+        persona_info: Optional[Dict[str, Any]] = None,
+    ) -> Optional[List[Tuple[bool, Optional[Dict[str, Any]]]]]:
+        """
+        메시지 N개를 LLM Judge 1회 호출로 채점합니다 (Stage 3 배치 모드).
+
+        ``llm.with_structured_output(LLMJudgeBatchOutput)``으로 메시지별 ``LLMJudgeOutput``
+        리스트를 받고, 결과 개수와 message_index가 입력(1..N)과 정확히 일치할 때만
+        채택합니다. 통과 기준은 단건 모드(``_run_llm_judge``)와 동일합니다.
+
+        Args:
+            ctxs: ``_run_pre_judge_stages``의 judge_ctx에 purpose를 더한 dict 리스트.
+            llm:  LangChain BaseChatModel 인스턴스.
+
+        Returns:
+            입력 순서의 ``(passed, scores)`` 리스트. 호출 실패 또는 출력 검증 실패 시 ``None``
+            (호출자가 단건 호출로 폴백).
+        """
+        try:
+            system_prompt, human_prompt = build_quality_check_batch_prompt(
+                [
+                    {
+                        "brand_name": ctx["brand_name"],
+                        "product_name": ctx["product_name"],
+                        "product_info": ctx["product"],
+                        "purpose": ctx["purpose"],
+                        "brand_tone": get_brand_tone(ctx["brand_name"]),
+                        "title": ctx["title"],
+                        "message": ctx["message"],
+                    }
+                    for ctx in ctxs
+                ],
+                persona_info=persona_info,
+            )
+            judge = llm.with_structured_output(LLMJudgeBatchOutput)
+            output: LLMJudgeBatchOutput = await ainvoke_with_retry(
+                judge, [SystemMessage(content=system_prompt), HumanMessage(content=human_prompt)],
+                semaphore_key="quality_check_llm_judge",
+                max_concurrency=settings.quality_check_llm_judge_max_concurrency,
+                max_retries=settings.quality_check_llm_judge_max_retries,
+                backoff_base=settings.quality_check_retry_backoff_base,
+                logger=logger, retry_event="llm_judge_retry",
+            )
+        except Exception as e:
+            logger.warning("llm_judge_batch_failed_fallback", message_count=len(ctxs), error_type=type(e).__name__)
+            return None
+
+        by_index = {item.message_index: item for item in output.results}
+        if len(output.results) != len(ctxs) or sorted(by_index) != list(range(1, len(ctxs) + 1)):
+            logger.warning(
+                "llm_judge_batch_invalid_fallback",
+                message_count=len(ctxs),
+                result_count=len(output.results),
+                indices=sorted(by_index),
+            )
+            return None
+
+        logger.info("llm_judge_batch_done", message_count=len(ctxs))
+        return [self._judge_output_to_scores(by_index[i]) for i in range(1, len(ctxs) + 1)]
+
+    @staticmethod
+    def _judge_output_to_scores(result: LLMJudgeOutput) -> Tuple[bool, Dict[str, Any]]:
+        """Judge 구조화 출력을 scores dict로 변환하고 통과 여부를 코드로 판정합니다."""
         scores = {
             "accuracy": result.accuracy,
             "tone": result.tone,
@@ -1,7 +1,13 @@
+from typing import Any, AsyncIterator
+
 from fastapi import APIRouter, Request
 
-from a2a.models import AgentCard, AgentSkill, DataPart, Task, TaskSendRequest, TaskStatus
+from a2a.models import AgentCard, AgentSkill, DataPart, Task, TaskSendRequest, TaskStatus, TaskStreamEvent
 from a2a.serialization import deserialize_messages, serialize_messages
+from a2a.streaming import graph_task_events
+from a2a.history import create_history_cache
+from a2a.tasks import add_task_routes, create_task_manager, submit_task, subscribe_task
+from app.agents.recommend_product_agent.workflow import build_workflow
 from app.config.settings import settings
 from app.core.logging import get_logger
 
@@ -26,8 +32,13 @@ async def agent_card():
     )
 
 
-@router.post("/tasks/send", response_model=Task)
-async def send_task(request: TaskSendRequest, req: Request):
+# tasks/sendSubscribe로 진행 상황을 중계할 노드 — 추천 결과는 상품 카드로 표시되므로 토큰은 중계하지 않음
+_STREAM_TRACKED_NODES: frozenset[str] = frozenset({
+    "parser_node", "get_search_query_node", "recommend_products_node",
+})
+
+
+def _prepare(request: TaskSendRequest, state: Any) -> tuple[dict, dict]:
     data = next(
         (p.data for p in request.message.parts if isinstance(p, DataPart)),
         {},
@@ -36,7 +47,7 @@ async def send_task(request: TaskSendRequest, req: Request):
     config = {
         "configurable": {
             "thread_id": request.sessionId or request.id,
-            "services": req.app.state.services,
+            "services": state.services,
             "user_id": data.get("user_id"),
         },
         "recursion_limit": settings.langgraph_recursion_limit,
@@ -44,41 +55,89 @@ async def send_task(request: TaskSendRequest, req: Request):
 
     _logger.info("a2a_task_received", task_id=request.id, session_id=request.sessionId)
 
-    try:
-        messages = deserialize_messages(data.get("messages", []))
-        subgraph_input = {
-            "messages": messages,
-            "active_persona_id": data.get("active_persona_id"),
-        }
-        graph = req.app.state.graph
-        result = await graph.ainvoke(subgraph_input, config)
-
-        status = TaskStatus.COMPLETED if result.get("status") == "completed" else TaskStatus.FAILED
-
-        _logger.info("a2a_task_completed", task_id=request.id, status=status)
-
-        return Task(
-            id=request.id,
-            sessionId=request.sessionId,
-            status=status,
-            artifacts=[{
-                "type": "data",
-                "data": {
-                    "recommended_products": result.get("recommended_products", []),
-                    "active_persona_id": result.get("active_persona_id"),
-                    "messages": serialize_messages(result.get("messages", [])),
-                    "logs": result.get("logs", []),
-                    "status": result.get("status"),
-                    "error": result.get("error"),
-                },
-            }],
-        )
+    messages = deserialize_messages(data.get("messages", []))
+    subgraph_input = {
+        "messages": messages,
+        "active_persona_id": data.get("active_persona_id"),
+    }
+    return subgraph_input, config
+
+
+def _build_task(request: TaskSendRequest, result: dict) -> Task:
+    status = TaskStatus.COMPLETED if result.get("status") == "completed" else TaskStatus.FAILED
+    return Task(
+        id=request.id,
+        sessionId=request.sessionId,
+        status=status,
+        artifacts=[{
+            "type": "data",
+            "data": {
+                "recommended_products": result.get("recommended_products", []),
+                "active_persona_id": result.get("active_persona_id"),
+                "messages": serialize_messages(result.get("messages", [])),
+                "logs": result.get("logs", []),
+                "status": result.get("status"),
+                "error": result.get("error"),
+            },
+        }],
+    )
+
+
+def _build_failed_task(request: TaskSendRequest) -> Task:
+    return Task(
+        id=request.id,
+        sessionId=request.sessionId,
+        status=TaskStatus.FAILED,
+        artifacts=[{"type": "data", "data": {"error": "상품 추천 처리 중 오류가 발생했습니다.", "status": "failed"}}],
+    )
+
 
+async def task_events(request: TaskSendRequest, state: Any, stream: bool = True) -> AsyncIterator[TaskStreamEvent]:
+    """작업 1건 실행 — HTTP 라우트와 in-process transport(a2a/local.py) 공통. state는 services·graph를 가진 app.state.
+    stream=False(tasks/send)면 진행 이벤트 없이 최종 Task만 보낸다."""
+    try:
+        subgraph_input, config = _prepare(request, state)
     except Exception as e:
         _logger.error("a2a_task_failed", task_id=request.id, error_type=type(e).__name__, exc_info=True)
-        return Task(
-            id=request.id,
-            sessionId=request.sessionId,
-            status=TaskStatus.FAILED,
-            artifacts=[{"type": "data", "data": {"error": "상품 추천 처리 중 오류가 발생했습니다.", "status": "failed"}}],
-        )
+        yield TaskStreamEvent(id=request.id, kind="task", task=_build_failed_task(request))
+        return
+
+    async for event in graph_task_events(
+        state.graph, subgraph_input, config,
+        task_id=request.id,
+        tracked_nodes=_STREAM_TRACKED_NODES,
+        token_nodes=frozenset(),
+        build_task=lambda result: _build_task(request, result),
+        build_failed_task=lambda: _build_failed_task(request),
+        logger=_logger,
+        stream=stream,
+    ):
+        yield event
+
+
+@router.post("/tasks/send", response_model=Task)
+async def send_task(request: TaskSendRequest, req: Request):
+    """작업 등록 — blocking=false면 즉시 반환하고 결과는 tasks/get · tasks/resubscribe로 받는다.
+    같은 id 재전송은 기존 작업에 붙는다. 진행 이벤트(토큰)는 내지 않고 그래프를 ainvoke로 실행한다."""
+    return await submit_task(req, request, lambda: task_events(request, req.app.state, stream=False))
+
+
+@router.post("/tasks/sendSubscribe")
+async def send_task_subscribe(request: TaskSendRequest, req: Request):
+    """tasks/send의 스트리밍 버전 — 노드 진행 상황을 SSE로 흘리고 마지막에 Task를 보낸다.
+    연결이 끊기면 작업도 취소된다."""
+    return subscribe_task(req, request, lambda: task_events(request, req.app.state))
+
+
+def init_agent_state(state: Any) -> None:
+    """services·graph·A2A 작업 테이블을 state에 채운다 — 서버 lifespan과 in-process transport 공통."""
+    from app.core.containers import RecommendProductServices
+    from app.agents.recommend_product_agent.services.recommend_product_in_persona import ProductRecommender
+
+    state.services = RecommendProductServices(recommender=ProductRecommender())
+    state.graph = build_workflow()
+    state.a2a_history = create_history_cache()
+    state.a2a_tasks = create_task_manager("recommend_product_agent")
+
+
+add_task_routes(router)
@@ -9,6 +9,7 @@ from ...core.llm_factory import get_llm
 from ...core.logging import AgentLogger
 from ..shared.parser_and_router.parser_and_router_request import recommend_product_parser
 from ..shared.persona.generate_persona_and_query import generate_search_query, generate_structured_persona_info
+from ..shared.product.product_refs import to_product_ref
 from .state import RecommendProductState
 import asyncio
 
@@ -242,6 +243,10 @@ async def recommend_products_node(state: RecommendProductState, config: Runnable
                 "logs": logger.get_user_logs(),
             }
 
+        # state·A2A 응답·CRM 체크포인트에는 참조만 — 상품 카드용 상세는 CRM 응답 시 재수화
+        if settings.recommend_slim_product_state:
+            recommended_products = [to_product_ref(p) for p in recommended_products]
+
         product_summary = "\n".join(
             f"- [TOP{i+1}] [상품ID: {p.get('product_id')}] [{p.get('brand')}] {p.get('product_name')} ({p.get('sub_tag')}): {p.get('product_comment')}"
             for i, p in enumerate(recommended_products)
@@ -4,7 +4,7 @@ from ....core.langsmith_config import traced
 from ....config.settings import settings
 from ....core.auth import UserContext
 from ....core.auth_utils import create_user_assertion
-from ....core.http_client_registry import register
+from ....core.http_client_registry import create_http_client, register
 import httpx
 
 logger = get_logger("recommend_products")
@@ -18,9 +18,9 @@ class PersonaClient:
 
     @property
     def http_client(self) -> httpx.AsyncClient:
-        """httpx.AsyncClient lazy init (커넥션 풀 재사용)"""
+        """httpx.AsyncClient lazy init (upstream별 공유 커넥션 풀)"""
         if self._http_client is None or self._http_client.is_closed:
-            self._http_client = httpx.AsyncClient(
+            self._http_client = create_http_client(
                 timeout=httpx.Timeout(settings.http_timeout_default),
                 headers={"X-Internal-Token": settings.internal_token},
             )
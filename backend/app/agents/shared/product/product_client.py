@@ -2,7 +2,7 @@ from typing import Optional, List, Dict, Any
 from ....core.langsmith_config import traced
 from ....core.logging import get_logger
 from ....config.settings import settings
-from ....core.http_client_registry import register
+from ....core.http_client_registry import create_http_client, is_balanced_upstream, is_http2_upstream, register
 import httpx
 import asyncio
 import random
@@ -51,6 +51,10 @@ class ProductClient:
         교체하지 않고 요청 1건의 커넥션만 닫으므로 asyncio.gather로 동시에 진행 중인
         다른 요청에는 영향이 없다.
         """
+        if is_balanced_upstream(request.url) or is_http2_upstream(request.url):
+            # 클라이언트 측 balancer가 복제본을 직접 고르면 커넥션을 은퇴시킬 필요가 없다.
+            # HTTP/2는 Connection 헤더를 쓸 수 없고, 커넥션 1개에 요청을 다중화하므로 은퇴 대상이 아니다
+            return
         self._request_count += 1
         if self._request_count >= self._close_threshold:
             request.headers["Connection"] = "close"
@@ -59,11 +63,10 @@ class ProductClient:
 
     @property
     def http_client(self) -> httpx.AsyncClient:
-        """httpx.AsyncClient lazy init (커넥션 풀 재사용)"""
+        """httpx.AsyncClient lazy init (upstream별 공유 커넥션 풀)"""
         if self._http_client is None or self._http_client.is_closed:
-            self._http_client = httpx.AsyncClient(
+            self._http_client = create_http_client(
                 timeout=httpx.Timeout(settings.http_timeout_long),
-                limits=httpx.Limits(keepalive_expiry=settings.http_keepalive_expiry),
                 headers={"X-Internal-Token": settings.internal_token},
                 event_hooks={"request": [self._maybe_mark_connection_close]},
             )
@@ -0,0 +1,51 @@
+"""
+추천 상품 state 경량화 — 상품 참조(product ref) 변환과 재수화.
+
+recommend_products_node가 DB 상품 레코드 전체(product_details 포함)를 state에 넣으면
+A2A 응답과 CRM 체크포인트(checkpoint_writes/blobs)에 매 스텝 그대로 직렬화된다.
+state에는 product_id와 표시용 필드 몇 개만 남기고, 상품 카드용 전체 정보는 응답을
+만들 때 ProductClient로 다시 조회한다.
+"""
+
+from typing import Any, Dict, List
+
+from ....core.logging import get_logger
+from .product_client import ProductClient
+
+logger = get_logger("product_refs")
+
+# 참조에 남기는 필드 — supervisor 요약·폴백 응답(_build_fallback_answer)에 쓰는 표시용 정보
+PRODUCT_REF_FIELDS: tuple[str, ...] = (
+    "product_id", "brand", "product_name", "sub_tag", "product_comment", "rrf_score",
+)
+
+
+def to_product_ref(product: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: product[k] for k in PRODUCT_REF_FIELDS if k in product}
+
+
+def is_product_ref(product: Dict[str, Any]) -> bool:
+    return set(product) <= set(PRODUCT_REF_FIELDS)
+
+
+async def resolve_product_refs(products: List[Dict[str, Any]], product_client: ProductClient) -> List[Dict[str, Any]]:
+    """참조만 남은 항목을 DB 상세로 재수화. 이미 전체 정보가 있는 항목은 그대로 둔다.
+
+    순서는 입력(추천 순위) 그대로 유지하며, 조회에 실패한 항목은 참조 그대로 반환한다.
+    """
+    ref_ids = [p["product_id"] for p in products if p.get("product_id") and is_product_ref(p)]
+    if not ref_ids:
+        return products
+
+    details = await product_client.get_products_detail_from_db(ref_ids)
+    id_to_detail = {d.get("product_id"): d for d in details}
+    missing = len(set(ref_ids) - set(id_to_detail))
+    if missing:
+        logger.warning("resolve_product_refs.partial", requested=len(ref_ids), missing=missing)
+
+    return [
+        {**id_to_detail[p["product_id"]], **p}
+        if is_product_ref(p) and p.get("product_id") in id_to_detail
+        else p
+        for p in products
+    ]
@@ -11,7 +11,7 @@ from pydantic import BaseModel, Field
 from ...config.settings import settings
 from ...core.auth import UserContext
 from ...core.auth_utils import create_user_assertion
-from ...core.http_client_registry import register
+from ...core.http_client_registry import create_http_client, register
 from .utils.ranking import rank_and_top5
 from .utils.formatters import (
     format_get_all_personas,
@@ -31,7 +31,7 @@ _http_client: Optional[httpx.AsyncClient] = None
 
 def init_search_http_client() -> None:
     global _http_client
-    _http_client = httpx.AsyncClient(
+    _http_client = create_http_client(
         timeout=httpx.Timeout(settings.http_timeout_default),
         headers={"X-Internal-Token": settings.internal_token},
     )
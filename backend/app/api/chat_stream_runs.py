@@ -0,0 +1,338 @@
+"""
+Chat Stream Run Store — /chat/v2/stream 실행을 SSE 연결과 분리해 재연결(Last-Event-ID)을 지원한다.
+
+스트림 실행(run)은 백그라운드 task가 끝까지 진행시키고, data 이벤트마다 run 안에서
+1씩 증가하는 seq를 붙여 run별 ring buffer(chat_stream_replay_buffer_size)에 보관한다.
+SSE 프레임에는 ``id: {run_id}:{seq}``를 실어, 연결이 끊긴 클라이언트가 Last-Event-ID로
+다시 붙으면 놓친 이벤트부터 replay하고 아직 실행 중인 run을 이어서 따라간다 — 재시도가
+새 recommend+generate 실행을 띄우지 않는다.
+
+chat_stream_events_persist=true이면 이벤트를 chat_stream_events 테이블에도 기록한다
+(token/text_chunk 같은 고빈도 표시용 이벤트 제외 — result 이벤트에 최종 결과가 모두 담긴다).
+다른 워커로 재연결되거나 프로세스가 재시작된 경우 DB에서 replay하고, 실행 중인 run은
+upload job 스트림처럼 polling으로 따라간다.
+
+구독자가 모두 끊긴 채 chat_stream_abandon_after_seconds가 지나면 run을 버린 것으로 보고
+취소한다 — chat_stream producer가 취소되며 서브에이전트 A2A 작업(tasks/cancel)과 진행 중인
+LLM 호출까지 멈춘다. 다른 워커에서 DB polling으로 따라가는 구독자는 세지 못하므로, 그 경우에도
+이 시간 안에 원래 워커로 재연결되지 않으면 취소된다.
+"""
+
+import asyncio
+import json
+import uuid
+from collections import deque
+from typing import AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+from psycopg_pool import AsyncConnectionPool
+
+from ..config.settings import settings
+from ..core.logging import get_logger
+from ..core.metrics import counter
+
+logger = get_logger("chat_stream_runs")
+
+_ABANDONED_RUNS = counter("chat_stream_runs_abandoned_total", "구독자 없이 남아 취소된 /chat/v2/stream 실행 수")
+
+_pool: AsyncConnectionPool | None = None
+_runs: Dict[str, "StreamRun"] = {}
+_run_tasks: set[asyncio.Task] = set()
+
+# DB에 남기지 않는 고빈도 이벤트 — 메모리 버퍼 replay에서만 재전송된다
+_EPHEMERAL_EVENT_TYPES = frozenset({"token", "agent_token", "text_chunk", "queued"})
+_POLL_INTERVAL = 0.5
+
+
+def set_pool(pool: AsyncConnectionPool) -> None:
+    global _pool
+    _pool = pool
+
+
+def parse_last_event_id(value: Optional[str]) -> Optional[Tuple[str, int]]:
+    """``{run_id}:{seq}`` 형식의 Last-Event-ID를 (run_id, seq)로. 형식이 다르면 None."""
+    if not value:
+        return None
+    run_id, sep, seq = value.strip().rpartition(":")
+    if not sep or not run_id or not seq.isdigit():
+        return None
+    return run_id, int(seq)
+
+
+def _event_type(frame: str) -> Optional[str]:
+    try:
+        payload = json.loads(frame[len("data: "):].strip())
+    except ValueError:
+        return None
+    return payload.get("type") if isinstance(payload, dict) else None
+
+
+class StreamRun:
+    """실행 중(또는 막 끝난) 스트림 1건의 이벤트 버퍼."""
+
+    def __init__(self, run_id: str, owner_user_id: str, conversation_id: str):
+        self.run_id = run_id
+        self.owner_user_id = owner_user_id
+        self.conversation_id = conversation_id
+        self.buffer: Deque[Tuple[int, str]] = deque(maxlen=settings.chat_stream_replay_buffer_size)
+        self.last_seq = 0
+        self.finished = False
+        self.abandoned = False
+        self.task: Optional[asyncio.Task] = None
+        self._followers = 0
+        self._abandon_timer: Optional[asyncio.TimerHandle] = None
+        self._changed = asyncio.Event()
+
+    def frame(self, seq: int, data_frame: str) -> str:
+        return f"id: {self.run_id}:{seq}\n{data_frame}"
+
+    def publish(self, data_frame: str) -> int:
+        self.last_seq += 1
+        self.buffer.append((self.last_seq, data_frame))
+        self._notify()
+        return self.last_seq
+
+    def finish(self) -> None:
+        self.finished = True
+        if self._abandon_timer is not None:
+            self._abandon_timer.cancel()
+        self._notify()
+
+    def _attach(self) -> None:
+        self._followers += 1
+        if self._abandon_timer is not None:
+            self._abandon_timer.cancel()
+            self._abandon_timer = None
+
+    def _detach(self) -> None:
+        self._followers -= 1
+        if self._followers == 0 and not self.finished and settings.chat_stream_abandon_after_seconds > 0:
+            self._abandon_timer = asyncio.get_running_loop().call_later(
+                settings.chat_stream_abandon_after_seconds, self._abandon
+            )
+
+    def _abandon(self) -> None:
+        self._abandon_timer = None
+        if self._followers or self.finished or self.task is None:
+            return
+        logger.info("chat_stream_run_abandoned", run_id=self.run_id, events=self.last_seq)
+        _ABANDONED_RUNS.inc()
+        self.abandoned = True
+        self.task.cancel()
+
+    def _notify(self) -> None:
+        # 대기 중인 구독자를 깨우고, 다음 대기용 Event로 교체
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def _events_after(self, after_seq: int) -> List[Tuple[int, str]]:
+        # seq는 연속이므로 버퍼 끝에서부터 필요한 개수만 꺼낸다
+        count = min(self.last_seq - after_seq, len(self.buffer))
+        return [self.buffer[i] for i in range(len(self.buffer) - count, len(self.buffer))] if count > 0 else []
+
+    async def follow(self, after_seq: int = 0) -> AsyncIterator[str]:
+        """after_seq 이후 이벤트를 replay하고, run이 끝날 때까지 새 이벤트를 이어서 전달."""
+        self._attach()
+        try:
+            async for frame in self._follow(after_seq):
+                yield frame
+        finally:
+            self._detach()
+
+    async def _follow(self, after_seq: int) -> AsyncIterator[str]:
+        oldest = self.buffer[0][0] if self.buffer else self.last_seq + 1
+        if after_seq < oldest - 1:
+            logger.warning(
+                "chat_stream_replay_gap",
+                run_id=self.run_id, after_seq=after_seq, oldest_buffered=oldest,
+            )
+            if settings.chat_stream_events_persist and _pool is not None:
+                for seq, data_frame in await _get_persisted_events(self.run_id, after_seq, before_seq=oldest):
+                    yield self.frame(seq, data_frame)
+            after_seq = oldest - 1
+
+        last = after_seq
+        while True:
+            changed = self._changed
+            for seq, data_frame in self._events_after(last):
+                last = seq
+                yield self.frame(seq, data_frame)
+            if self.finished:
+                return
+            try:
+                await asyncio.wait_for(changed.wait(), timeout=settings.sse_keepalive_timeout)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+
+
+def start_run(owner_user_id: str, conversation_id: str, source: AsyncIterator[str]) -> StreamRun:
+    """source(SSE 문자열 generator)를 백그라운드에서 끝까지 소비하는 run을 시작한다."""
+    run = StreamRun(uuid.uuid4().hex, owner_user_id, conversation_id)
+    _runs[run.run_id] = run
+    task = asyncio.create_task(_pump(run, source))
+    run.task = task
+    _run_tasks.add(task)
+    task.add_done_callback(_run_tasks.discard)
+    return run
+
+
+def get_run(run_id: str) -> Optional[StreamRun]:
+    return _runs.get(run_id)
+
+
+def pending_run_tasks() -> set[asyncio.Task]:
+    return set(_run_tasks)
+
+
+async def _pump(run: StreamRun, source: AsyncIterator[str]) -> None:
+    persist_queue: Optional[asyncio.Queue] = None
+    writer: Optional[asyncio.Task] = None
+    if settings.chat_stream_events_persist and _pool is not None:
+        persist_queue = asyncio.Queue()
+        writer = asyncio.create_task(_persist_events(run, persist_queue))
+
+    def publish_error(message: str) -> None:
+        for chunk in (
+            f'data: {{"type":"error","message":"{message}"}}\n\n',
+            'data: {"type":"done"}\n\n',
+        ):
+            seq = run.publish(chunk)
+            if persist_queue is not None:
+                persist_queue.put_nowait((seq, _event_type(chunk), chunk))
+
+    try:
+        async for chunk in source:
+            if not chunk.startswith("data: "):
+                continue  # keepalive는 구독자별로 따로 보낸다
+            seq = run.publish(chunk)
+            if persist_queue is not None:
+                event_type = _event_type(chunk)
+                if event_type not in _EPHEMERAL_EVENT_TYPES:
+                    persist_queue.put_nowait((seq, event_type, chunk))
+        if run.abandoned:
+            # chat_stream은 취소를 받으면 조용히 끝나므로 종료 이벤트를 여기서 남긴다
+            publish_error("응답 생성이 취소되었습니다.")
+    except asyncio.CancelledError:
+        publish_error("응답 생성이 취소되었습니다.")
+    except Exception as e:
+        logger.error("chat_stream_run_failed", run_id=run.run_id, error_type=type(e).__name__, exc_info=True)
+        publish_error("스트리밍 중 오류가 발생했습니다.")
+    finally:
+        run.finish()
+        if writer is not None:
+            persist_queue.put_nowait(None)
+            await asyncio.gather(writer, return_exceptions=True)
+        asyncio.get_running_loop().call_later(
+            settings.chat_stream_run_retention_seconds, _runs.pop, run.run_id, None
+        )
+        logger.info("chat_stream_run_finished", run_id=run.run_id, events=run.last_seq)
+
+
+async def _persist_events(run: StreamRun, queue: asyncio.Queue) -> None:
+    """이벤트를 모아서 INSERT — 스트림 전달 경로(pump)는 DB 지연에 묶이지 않는다."""
+    while True:
+        batch = [await queue.get()]
+        while not queue.empty():
+            batch.append(queue.get_nowait())
+        rows = [
+            (run.run_id, seq, run.owner_user_id, event_type, chunk)
+            for seq, event_type, chunk in (item for item in batch if item is not None)
+        ]
+        if rows:
+            try:
+                async with _pool.connection() as conn:
+                    async with conn.cursor() as cur:
+                        await cur.executemany(
+                            """
+                            INSERT INTO chat_stream_events (run_id, seq, owner_user_id, event_type, frame)
+                            VALUES (%s, %s, %s, %s, %s)
+                            ON CONFLICT (run_id, seq) DO NOTHING
+                            """,
+                            rows,
+                        )
+            except Exception as e:
+                logger.warning("chat_stream_events_persist_failed", run_id=run.run_id, error_type=type(e).__name__)
+        if batch[-1] is None:
+            return
+
+
+async def _get_persisted_events(
+    run_id: str, after_seq: int, before_seq: Optional[int] = None
+) -> List[Tuple[int, str]]:
+    async with _pool.connection() as conn:
+        rows = await conn.execute(
+            """
+            SELECT seq, frame FROM chat_stream_events
+            WHERE run_id = %s AND seq > %s AND (%s::int IS NULL OR seq < %s::int)
+            ORDER BY seq
+            """,
+            (run_id, after_seq, before_seq, before_seq),
+        )
+        return [(r[0], r[1]) for r in await rows.fetchall()]
+
+
+async def _get_persisted_owner(run_id: str) -> Optional[str]:
+    async with _pool.connection() as conn:
+        row = await conn.execute(
+            "SELECT owner_user_id FROM chat_stream_events WHERE run_id = %s LIMIT 1",
+            (run_id,),
+        )
+        record = await row.fetchone()
+    return record[0] if record else None
+
+
+async def _follow_persisted(run_id: str, after_seq: int) -> AsyncIterator[str]:
+    """다른 워커/재시작 전 프로세스의 run을 DB polling으로 따라간다. done 이벤트에서 종료."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + settings.graph_execution_timeout + settings.chat_stream_admission_timeout
+    last_sent = loop.time()
+    first = True
+    while True:
+        if not first:
+            await asyncio.sleep(_POLL_INTERVAL)
+        first = False
+        events = await _get_persisted_events(run_id, after_seq)
+        for seq, data_frame in events:
+            after_seq = seq
+            yield f"id: {run_id}:{seq}\n{data_frame}"
+            if _event_type(data_frame) == "done":
+                return
+        if events:
+            last_sent = loop.time()
+        elif loop.time() >= deadline:
+            # 실행하던 프로세스가 재시작돼 run이 끝나지 못한 경우
+            yield 'data: {"type":"error","message":"이전 응답을 이어받지 못했습니다. 다시 시도해주세요."}\n\n'
+            yield 'data: {"type":"done"}\n\n'
+            return
+        elif loop.time() - last_sent >= settings.sse_keepalive_timeout:
+            last_sent = loop.time()
+            yield ": keepalive\n\n"
+
+
+async def open_resume_stream(last_event_id: Optional[str], user_id: str) -> Optional[AsyncIterator[str]]:
+    """Last-Event-ID에 해당하는 run을 이어받는 SSE generator. 찾지 못하거나 소유자가 아니면 None."""
+    parsed = parse_last_event_id(last_event_id)
+    if parsed is None:
+        return None
+    run_id, after_seq = parsed
+
+    run = _runs.get(run_id)
+    if run is not None:
+        if run.owner_user_id != user_id:
+            return None
+        return run.follow(after_seq)
+
+    if settings.chat_stream_events_persist and _pool is not None:
+        if await _get_persisted_owner(run_id) == user_id:
+            return _follow_persisted(run_id, after_seq)
+    return None
+
+
+async def cleanup_expired_stream_events(ttl_seconds: int) -> int:
+    assert _pool is not None, "chat_stream_runs pool not initialized"
+
+    async with _pool.connection() as conn:
+        result = await conn.execute(
+            "DELETE FROM chat_stream_events WHERE created_at < NOW() - make_interval(secs => %s)",
+            (ttl_seconds,),
+        )
+        return result.rowcount
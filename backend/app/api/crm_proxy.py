@@ -144,6 +144,21 @@ async def proxy_chat_v2_stream(
     )
 
 
+@router.get("/marketing/chat/v2/stream/resume")
+async def proxy_chat_v2_stream_resume(
+    request: Request,
+    user: UserContext = Depends(get_current_user),
+    client: httpx.AsyncClient = Depends(get_crm_client),
+):
+    # 새 그래프 실행이 아니라 기존 run 이어받기라 chat 한도를 차감하지 않는다
+    headers = {"X-User-Assertion": create_user_assertion(user)}
+    if request.headers.get("Last-Event-ID"):
+        headers["Last-Event-ID"] = request.headers["Last-Event-ID"]
+    return await _proxy_stream(
+        client, "GET", "/api/marketing/chat/v2/stream/resume", request, headers,
+    )
+
+
 @router.get("/marketing/health")
 async def proxy_marketing_health(
     request: Request,
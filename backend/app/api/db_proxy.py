@@ -107,6 +107,27 @@ async def proxy_conversations_update(
     )
 
 
+@router.post("/conversations/{conv_id}/messages")
+async def proxy_conversations_append(
+    conv_id: UUID,
+    request: Request,
+    user: UserContext = Depends(get_current_user),
+    client: httpx.AsyncClient = Depends(get_internal_client),
+    limiter: PostgresRateLimiter = Depends(get_conversation_write_limiter),
+):
+    allowed, retry_after = await limiter.is_allowed(user.user_id)
+    if not allowed:
+        raise HTTPException(
+            status_code=429,
+            detail="요청 한도를 초과했습니다. 잠시 후 다시 시도하세요.",
+            headers={"Retry-After": str(retry_after)},
+        )
+    return await _proxy(
+        client, "POST", f"/api/conversations/{str(conv_id)}/messages", request,
+        {"X-User-Assertion": create_user_assertion(user)},
+    )
+
+
 @router.delete("/conversations/{conv_id}")
 async def proxy_conversations_delete(
     conv_id: UUID,
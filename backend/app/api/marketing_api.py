@@ -9,15 +9,19 @@ from datetime import datetime, timezone
 
 import json as _json
 
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, ConfigDict, Field, field_validator
+from sqlalchemy import insert
 from typing import Optional, List, Dict, Any
 from ..config.settings import ALLOWED_MODEL_PREFIXES, settings
+from ..core.admission import AdmissionController, AdmissionRejected
+from ..core.write_behind import WriteBehindQueue
 from ..core.auth import UserContext
 from ..core.logging import get_logger
 from ..core.database import SessionLocal
 from ..core.models import Conversation, GeneratedMessage, ConversationMessage
+from .chat_stream_runs import open_resume_stream, start_run
 from .deps import get_user_from_headers
 
 logger = get_logger("marketing_api")
@@ -29,10 +33,14 @@ def get_agent_v2(request: Request):
     return request.app.state.agent_v2
 
 
-def get_chat_stream_semaphore(request: Request) -> "asyncio.Semaphore":
-    return request.app.state.chat_stream_semaphore
+def get_chat_stream_admission(request: Request) -> AdmissionController:
+    return request.app.state.chat_stream_admission
 
 
+_ADMISSION_REJECTED_SSE = (
+    'data: {"type":"error","message":"현재 요청이 많아 지금은 처리할 수 없습니다. 잠시 후 다시 시도해주세요."}\n\n'
+)
+
 _db_save_tasks: set[asyncio.Task] = set()
 
 
@@ -105,68 +113,77 @@ def _verify_conversation_ownership(conv_id: str, user_id: str, role: str = "user
         db.close()
 
 
-def _save_generated_messages_best_effort(
+def _generated_message_rows(
     conv_id: str,
     user_id: str,
     generated_tasks: list,
     user_input: str,
     thread_id: str,
     regeneration_history: list | None,
-) -> None:
+) -> list[dict]:
+    """generated_tasks를 generated_messages INSERT용 행(dict) 목록으로 변환. 본문이 없는 task는 제외."""
+    rows: list[dict] = []
+    for task in generated_tasks:
+        _quality = task.get("quality_check") or {}
+        _scores = _quality.get("llm_judge_scores") or {}
+        msg = task.get("message") or {}
+        content = msg.get("message") or msg.get("content", "")
+        if not content:
+            continue
+        rows.append({
+            "conversation_id": conv_id,
+            "user_id": user_id,
+            "product_id": task.get("product_id", ""),
+            "product_name": task.get("product_name"),
+            "brand": task.get("brand"),
+            "sub_tag": task.get("sub_tag"),
+            "purpose": task.get("purpose"),
+            "user_input": user_input,
+            "title": msg.get("title"),
+            "content": content,
+            "quality_passed": _quality.get("passed"),
+            "quality_failed_stage": _quality.get("failed_stage"),
+            "quality_failure_reason": _quality.get("failure_reason"),
+            "llm_score_accuracy": _scores.get("accuracy"),
+            "llm_score_tone": _scores.get("tone"),
+            "llm_score_personalization": _scores.get("personalization"),
+            "llm_score_naturalness": _scores.get("naturalness"),
+            "llm_score_cta_clarity": _scores.get("cta_clarity"),
+            "llm_score_overall": _scores.get("overall"),
+            "llm_feedback": _scores.get("feedback"),
+            "quality_details": {
+                "rule_check_passed": _quality.get("rule_check_passed"),
+                "rule_check_issues": _quality.get("rule_check_issues", []),
+                "semantic_check_passed": _quality.get("semantic_check_passed"),
+                "semantic_check_results": _quality.get("semantic_check_results", []),
+            },
+            "regeneration_count": len(regeneration_history or []),
+            "thread_id": thread_id,
+        })
+    return rows
+
+
+def _log_generated_messages_saved(rows: list[dict]) -> None:
+    for row in rows:
+        logger.info(
+            "generated_message_saved",
+            conversation_id=row["conversation_id"],
+            product_id=row["product_id"],
+            user_id=row["user_id"],
+            quality_passed=row["quality_passed"],
+            llm_score_overall=float(row["llm_score_overall"]) if row["llm_score_overall"] else None,
+        )
+
+
+def _save_generated_rows_best_effort(conv_id: str, rows: list[dict]) -> None:
     """생성된 메시지를 DB에 저장한다. 실패해도 응답에 영향 없음."""
+    if not rows:
+        return
     db = SessionLocal()
     try:
-        saved_items: list[GeneratedMessage] = []
-        for task in generated_tasks:
-            _quality = task.get("quality_check") or {}
-            _scores = _quality.get("llm_judge_scores") or {}
-            msg = task.get("message") or {}
-            content = msg.get("message") or msg.get("content", "")
-            if not content:
-                continue
-            gm = GeneratedMessage(
-                conversation_id=conv_id,
-                user_id=user_id,
-                product_id=task.get("product_id", ""),
-                product_name=task.get("product_name"),
-                brand=task.get("brand"),
-                sub_tag=task.get("sub_tag"),
-                purpose=task.get("purpose"),
-                user_input=user_input,
-                title=msg.get("title"),
-                content=content,
-                quality_passed=_quality.get("passed"),
-                quality_failed_stage=_quality.get("failed_stage"),
-                quality_failure_reason=_quality.get("failure_reason"),
-                llm_score_accuracy=_scores.get("accuracy"),
-                llm_score_tone=_scores.get("tone"),
-                llm_score_personalization=_scores.get("personalization"),
-                llm_score_naturalness=_scores.get("naturalness"),
-                llm_score_cta_clarity=_scores.get("cta_clarity"),
-                llm_score_overall=_scores.get("overall"),
-                llm_feedback=_scores.get("feedback"),
-                quality_details={
-                    "rule_check_passed": _quality.get("rule_check_passed"),
-                    "rule_check_issues": _quality.get("rule_check_issues", []),
-                    "semantic_check_passed": _quality.get("semantic_check_passed"),
-                    "semantic_check_results": _quality.get("semantic_check_results", []),
-                },
-                regeneration_count=len(regeneration_history or []),
-                thread_id=thread_id,
-            )
-            db.add(gm)
-            saved_items.append(gm)
-        if saved_items:
-            db.commit()
-        for gm in saved_items:
-            logger.info(
-                "generated_message_saved",
-                conversation_id=conv_id,
-                product_id=gm.product_id,
-                user_id=user_id,
-                quality_passed=gm.quality_passed,
-                llm_score_overall=float(gm.llm_score_overall) if gm.llm_score_overall else None,
-            )
+        db.execute(insert(GeneratedMessage), rows)
+        db.commit()
+        _log_generated_messages_saved(rows)
     except Exception as db_err:
         db.rollback()
         logger.warning(
@@ -180,6 +197,101 @@ def _save_generated_messages_best_effort(
         db.close()
 
 
+# ============================================================
+# Write-behind 저장 — 동시 대화들의 저장을 모아 배치 INSERT
+# ============================================================
+# 항목: ("conversation", conv_id, entries) | ("generated", conv_id, rows)
+
+_chat_writer: WriteBehindQueue | None = None
+
+
+def _write_chat_batch(batch: list[tuple]) -> None:
+    """배치 1회 = conversation_messages / generated_messages 다중 행 INSERT + commit 1회."""
+    conv_rows = [
+        {"conversation_id": conv_id, "message_data": entry}
+        for kind, conv_id, payload in batch if kind == "conversation"
+        for entry in payload
+    ]
+    gen_rows = [row for kind, _, payload in batch if kind == "generated" for row in payload]
+    conv_ids = list({conv_id for kind, conv_id, _ in batch if kind == "conversation"})
+
+    db = SessionLocal()
+    try:
+        if conv_rows:
+            db.execute(insert(ConversationMessage), conv_rows)
+            db.query(Conversation).filter(Conversation.id.in_(conv_ids)).update(
+                {"last_active_at": datetime.now(timezone.utc)}, synchronize_session=False,
+            )
+        if gen_rows:
+            db.execute(insert(GeneratedMessage), gen_rows)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+    _log_generated_messages_saved(gen_rows)
+
+
+def _write_chat_item(item: tuple) -> None:
+    kind, conv_id, payload = item
+    if kind == "conversation":
+        _save_conversation_messages_best_effort(conv_id, payload)
+    else:
+        _save_generated_rows_best_effort(conv_id, payload)
+
+
+def start_chat_writer() -> None:
+    """lifespan 시작 시 호출 — chat_write_behind_enabled=false면 기존처럼 건별 저장."""
+    global _chat_writer
+    if not settings.chat_write_behind_enabled or _chat_writer is not None:
+        return
+    _chat_writer = WriteBehindQueue(
+        "chat_persistence",
+        _write_chat_batch,
+        _write_chat_item,
+        max_batch=settings.chat_write_behind_max_batch,
+        flush_interval=settings.chat_write_behind_flush_interval,
+        max_queue=settings.chat_write_behind_max_queue,
+        put_timeout=settings.chat_write_behind_put_timeout,
+    )
+    _chat_writer.start()
+
+
+async def stop_chat_writer() -> None:
+    """lifespan 종료 시 호출 — 큐에 남은 저장을 모두 flush한다."""
+    if _chat_writer is not None:
+        await _chat_writer.close(timeout=settings.chat_write_behind_shutdown_timeout)
+
+
+async def _submit_chat_write(item: tuple, *, wait_flushed: bool = False) -> None:
+    """wait_flushed면 write-behind 큐에 넣는 데서 끝내지 않고 바로 flush시켜 DB 저장까지 기다린다."""
+    if _chat_writer is None:
+        await asyncio.to_thread(_write_chat_item, item)
+        return
+    flushed = await _chat_writer.submit(item, urgent=wait_flushed)
+    if wait_flushed:
+        await flushed
+
+
+async def _persist_conversation_messages(conversation_id: str, new_entries: list, *, wait_flushed: bool = False) -> None:
+    if new_entries:
+        await _submit_chat_write(("conversation", conversation_id, new_entries), wait_flushed=wait_flushed)
+
+
+async def _persist_generated_messages(
+    conv_id: str,
+    user_id: str,
+    generated_tasks: list,
+    user_input: str,
+    thread_id: str,
+    regeneration_history: list | None,
+) -> None:
+    rows = _generated_message_rows(conv_id, user_id, generated_tasks, user_input, thread_id, regeneration_history)
+    if rows:
+        await _submit_chat_write(("generated", conv_id, rows))
+
+
 # ============================================================
 # 데이터 모델
 # ============================================================
@@ -273,11 +385,10 @@ async def chat_v2(
                     })
 
                 if late_entries:
-                    await asyncio.to_thread(_save_conversation_messages_best_effort, conv_id, late_entries)
+                    await _persist_conversation_messages(conv_id, late_entries)
 
                 if late_status in ("completed", "failed") and conv_id:
-                    await asyncio.to_thread(
-                        _save_generated_messages_best_effort,
+                    await _persist_generated_messages(
                         conv_id, user_id,
                         result_data.get("generated_tasks", []) + result_data.get("quality_failed_tasks", []),
                         request.user_input, late_thread_id, result_data.get("regeneration_history"),
@@ -338,13 +449,12 @@ async def chat_v2(
                 "thread_id": thread_id,
             })
 
-        _spawn_db_save_task(asyncio.to_thread(_save_conversation_messages_best_effort, conv_id, new_entries))
+        _spawn_db_save_task(_persist_conversation_messages(conv_id, new_entries))
 
         # 품질 검사 통과/실패 메시지 모두 generated_messages에 저장 (실패 사유 분석용)
         if conv_id:
             generated_tasks = result.get("generated_tasks", []) + result.get("quality_failed_tasks", [])
-            _spawn_db_save_task(asyncio.to_thread(
-                _save_generated_messages_best_effort,
+            _spawn_db_save_task(_persist_generated_messages(
                 conv_id, user_id, generated_tasks,
                 request.user_input, thread_id,
                 result.get("regeneration_history"),
@@ -378,8 +488,13 @@ async def chat_v2_stream(
     대화 처리 v2 — SSE 스트리밍 (astream_events 기반)
     /chat/v2와 동일한 비즈니스 로직, 결과를 SSE로 스트리밍.
 
-    SSE event types: node_start, token, log, node_end, result, error, done
+    SSE event types: queued, node_start, token, log, node_end, result, error, done
+    queued: 슬롯 대기 중일 때 {"position", "estimated_wait_seconds"} — 위치·예상 대기가 바뀔 때마다 전송
     Keepalive: ': keepalive' SSE comments (~25s 간격)
+
+    chat_stream_resumable=true이면 실행은 SSE 연결과 분리된 run으로 끝까지 진행되고,
+    각 이벤트에 ``id: {run_id}:{seq}``가 붙는다. 연결이 끊기면 같은 Last-Event-ID로
+    GET /chat/v2/stream/resume에 다시 붙어 이어받는다 (그래프를 다시 실행하지 않음).
     """
     # ── conversation_id 사전 확보 (chat_v2와 동일) ─────────────────
     try:
@@ -402,8 +517,7 @@ async def chat_v2_stream(
         raise HTTPException(status_code=500, detail="내부 서버 오류가 발생했습니다.")
 
     # Write-ahead: 유저 메시지를 AI 처리 시작 전에 즉시 저장
-    _spawn_db_save_task(asyncio.to_thread(
-        _save_conversation_messages_best_effort,
+    _spawn_db_save_task(_persist_conversation_messages(
         conv_id,
         [{"role": "user", "content": request.user_input, "type": "text",
           "timestamp": datetime.now(timezone.utc).isoformat(), "thread_id": conv_id}],
@@ -432,11 +546,12 @@ async def chat_v2_stream(
                 })
 
             if new_entries:
-                await asyncio.to_thread(_save_conversation_messages_best_effort, conv_id, new_entries)
+                # done 프레임 전에 커밋돼 있어야 한다 — 프론트엔드가 done 직후 보내는 전체 교체 PUT보다
+                # 늦게 flush되면 assistant 메시지가 한 번 더 붙는다
+                await _persist_conversation_messages(conv_id, new_entries, wait_flushed=True)
 
             if conv_id:
-                await asyncio.to_thread(
-                    _save_generated_messages_best_effort,
+                await _persist_generated_messages(
                     conv_id, user_id,
                     result_data.get("generated_tasks", []) + result_data.get("quality_failed_tasks", []),
                     request.user_input, thread_id, [],
@@ -457,22 +572,74 @@ async def chat_v2_stream(
         _result_data: dict | None = None
         _error_payload: dict | None = None
 
-        semaphore = get_chat_stream_semaphore(req)
+        admission = get_chat_stream_admission(req)
+        priority = 0 if current_user.role in settings.chat_stream_priority_roles else 1
+        deadline = settings.chat_stream_admission_timeout
         try:
-            await asyncio.wait_for(semaphore.acquire(), timeout=settings.chat_stream_admission_timeout)
-        except asyncio.TimeoutError:
-            logger.warning("chat_v2_stream_admission_timeout", conv_id=conv_id)
-            yield 'data: {"type":"error","message":"현재 요청이 많아 대기 시간이 초과되었습니다. 잠시 후 다시 시도해주세요."}\n\n'
+            ticket = admission.enqueue(priority, deadline)
+        except AdmissionRejected as e:
+            logger.warning(
+                "chat_v2_stream_admission_rejected",
+                conv_id=conv_id, reason=e.reason,
+                estimated_wait_seconds=round(e.estimated_wait, 1),
+                queue_length=admission.queue_length,
+            )
+            yield _ADMISSION_REJECTED_SSE
             yield 'data: {"type":"done"}\n\n'
             return
 
-        _semaphore_released = False
+        # ── 슬롯 대기 — 위치·예상 대기가 바뀔 때 queued 이벤트, 마감 안에 못 받을 것 같으면 조기 거절
+        queued_at = loop.time()
+        last_reported: tuple[int, int] | None = None
+        last_sent_at = queued_at
+        try:
+            while not ticket.admitted:
+                remaining = deadline - (loop.time() - queued_at)
+                estimated = ticket.estimated_wait()
+                if estimated > remaining:
+                    reason = "timeout" if remaining <= 0 else "deadline"
+                    admission.reject(ticket, reason)
+                    logger.warning(
+                        "chat_v2_stream_admission_rejected",
+                        conv_id=conv_id, reason=reason,
+                        estimated_wait_seconds=round(estimated, 1),
+                        waited_seconds=round(loop.time() - queued_at, 1),
+                        queue_length=admission.queue_length,
+                    )
+                    yield (
+                        'data: {"type":"error","message":"현재 요청이 많아 대기 시간이 초과되었습니다. 잠시 후 다시 시도해주세요."}\n\n'
+                        if reason == "timeout" else _ADMISSION_REJECTED_SSE
+                    )
+                    yield 'data: {"type":"done"}\n\n'
+                    return
+
+                report = (ticket.position(), round(estimated))
+                if report != last_reported:
+                    last_reported = report
+                    last_sent_at = loop.time()
+                    yield "data: " + _json.dumps(
+                        {"type": "queued", "position": report[0], "estimated_wait_seconds": report[1]}
+                    ) + "\n\n"
+                elif loop.time() - last_sent_at >= settings.sse_keepalive_timeout:
+                    last_sent_at = loop.time()
+                    yield ": keepalive\n\n"
+
+                await ticket.wait(min(settings.chat_stream_queue_update_interval, remaining))
+        except (asyncio.CancelledError, GeneratorExit):
+            ticket.abandon("cancelled")
+            logger.info("chat_v2_stream_disconnected_while_queued", conv_id=conv_id)
+            return
 
-        def _release_semaphore_once() -> None:
-            nonlocal _semaphore_released
-            if not _semaphore_released:
-                _semaphore_released = True
-                semaphore.release()
+        if last_reported is not None:
+            logger.info(
+                "chat_v2_stream_admitted",
+                conv_id=conv_id,
+                waited_seconds=round(loop.time() - queued_at, 2),
+                queue_length=admission.queue_length,
+            )
+
+        def _release_slot_once() -> None:
+            ticket.release()
 
         try:
             async for chunk in agent.chat_stream(
@@ -484,7 +651,7 @@ async def chat_v2_stream(
                 model=request.model,
                 file_records=request.file_records,
                 on_late_result=_persist_results,
-                release_semaphore=_release_semaphore_once,
+                release_semaphore=_release_slot_once,
             ):
                 if chunk.startswith("data: "):
                     try:
@@ -506,8 +673,8 @@ async def chat_v2_stream(
                                     _result_data = None
                                 elif _error_payload is not None:
                                     error_msg = _error_payload.get("message") or "처리 중 오류가 발생했습니다."
-                                    _spawn_db_save_task(asyncio.to_thread(
-                                        _save_conversation_messages_best_effort, conv_id,
+                                    _spawn_db_save_task(_persist_conversation_messages(
+                                        conv_id,
                                         [{"role": "assistant", "content": error_msg, "type": "error",
                                           "timestamp": datetime.now(timezone.utc).isoformat(), "thread_id": conv_id}],
                                     ))
@@ -521,9 +688,9 @@ async def chat_v2_stream(
             return
         except Exception as e:
             logger.error("chat_v2_stream_generate_failed", error_type=type(e).__name__, exc_info=True)
-            _release_semaphore_once()
-            _spawn_db_save_task(asyncio.to_thread(
-                _save_conversation_messages_best_effort, conv_id,
+            _release_slot_once()
+            _spawn_db_save_task(_persist_conversation_messages(
+                conv_id,
                 [{"role": "assistant", "content": "스트리밍 중 오류가 발생했습니다.", "type": "error",
                   "timestamp": datetime.now(timezone.utc).isoformat(), "thread_id": conv_id}],
             ))
@@ -531,8 +698,36 @@ async def chat_v2_stream(
             yield 'data: {"type":"done"}\n\n'
             return
 
+    if settings.chat_stream_resumable:
+        run = start_run(user_id, conv_id, generate())
+        logger.info("chat_v2_stream_run_started", run_id=run.run_id, conv_id=conv_id)
+        stream = run.follow()
+    else:
+        stream = generate()
+
+    return StreamingResponse(
+        stream,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/chat/v2/stream/resume")
+async def chat_v2_stream_resume(
+    current_user: UserContext = Depends(get_user_from_headers),
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+    last_event_id_query: Optional[str] = Query(None, alias="last_event_id"),
+):
+    """
+    끊긴 /chat/v2/stream 이어받기 — Last-Event-ID 헤더(또는 last_event_id 쿼리)의
+    ``{run_id}:{seq}`` 이후 이벤트를 replay하고, 실행 중이면 완료까지 이어서 전달한다.
+    """
+    stream = await open_resume_stream(last_event_id or last_event_id_query, current_user.user_id)
+    if stream is None:
+        raise HTTPException(status_code=404, detail="이어받을 스트림을 찾을 수 없습니다.")
+    logger.info("chat_v2_stream_resumed", last_event_id=last_event_id or last_event_id_query)
     return StreamingResponse(
-        generate(),
+        stream,
         media_type="text/event-stream",
         headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
@@ -0,0 +1,28 @@
+"""
+/metrics — 프로세스 내 메트릭 레지스트리(app/core/metrics.py)를 Prometheus text format으로 노출.
+
+게이트웨이·CRM·서브에이전트 서버가 같은 라우터를 쓴다. 서브에이전트 서버는 InternalTokenMiddleware가
+이미 X-Internal-Token을 검사하지만, 공개 ALB 뒤의 게이트웨이에는 그 미들웨어가 없으므로 여기서도 검사한다.
+"""
+
+import hmac
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import PlainTextResponse
+
+from ..config.settings import settings
+from ..core.metrics import render_prometheus
+
+router = APIRouter(tags=["Metrics"])
+
+_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get("/metrics", include_in_schema=False)
+def metrics(request: Request) -> PlainTextResponse:
+    if not settings.metrics_endpoint_enabled:
+        raise HTTPException(status_code=404, detail="Not Found")
+    token = request.headers.get("X-Internal-Token", "")
+    if not settings.internal_token or not hmac.compare_digest(token, settings.internal_token):
+        raise HTTPException(status_code=401, detail="Unauthorized")
+    return PlainTextResponse(render_prometheus(), media_type=_CONTENT_TYPE)
@@ -3,7 +3,7 @@ from pathlib import Path
 from pydantic import Field, field_validator, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
-ALLOWED_MODEL_PREFIXES: tuple[str, ...] = ("gpt-", "o1", "o3", "o4", "claude-", "gemini-")
+ALLOWED_MODEL_PREFIXES: tuple[str, ...] = ("gpt-", "o1", "o3", "o4", "claude-", "gemini-", "fake-")
 
 _WEAK_SECRET_FRAGMENTS: frozenset[str] = frozenset({
     "secret", "changeme", "password", "example", "test",
@@ -130,6 +130,14 @@ class Settings(BaseSettings):
     # LangGraph checkpoint retention
     checkpoint_retention_days: int = 30       # 마지막 체크포인트 기준 보존 기간 (일)
     checkpoint_cleanup_batch_size: int = 500  # 1회 삭제 최대 thread 수 (락 경합 방지)
+    checkpoint_size_metrics_enabled: bool = True  # 노드별 쓰기·채널별 blob 크기 히스토그램 (checkpoint_metrics)
+    # 일자 range 파티션 레이아웃 (checkpoint_partitions) — 보존 정리가 만료 파티션 DROP으로 바뀜.
+    # 기존 테이블은 scripts/migrate_checkpoints_partitioned.py로 이관 후 켠다
+    checkpoint_partitioned: bool = False
+    checkpoint_partition_days_ahead: int = 7  # 미리 만들어 둘 미래 일자 파티션 수
+
+    # 추천 상품을 state에 참조(product_id + 표시 필드)로만 저장, CRM 응답 시 재수화 (product_refs)
+    recommend_slim_product_state: bool = True
 
     # A2A URLs
     recommend_agent_url: str = "http://localhost:8001"
@@ -137,6 +145,32 @@ class Settings(BaseSettings):
     data_registration_agent_url: str = "http://localhost:8003"
     a2a_timeout: float = 280.0
     a2a_max_retries: int = Field(default=3, ge=1)
+    # recommend/generate 호출을 tasks/sendSubscribe로 보내 서브에이전트 노드 진행·토큰을 CRM 스트림에 중계
+    a2a_streaming_enabled: bool = False
+    # tasks/send를 비동기로 등록(blocking=false)하고 tasks/get long poll로 결과를 받음 —
+    # 서브에이전트 실행 동안 HTTP 요청 하나를 붙잡지 않고, 재시도는 같은 task id로 멱등 처리.
+    # 작업 상태는 등록받은 replica 메모리에만 있으므로 tasks/get·tasks/cancel이 그 replica로 가는
+    # 배포(서브에이전트 1대, sticky 라우팅)에서만 켠다 — Cloud Map MULTIVALUE로 여러 대면 조회가 404
+    a2a_async_tasks_enabled: bool = False
+    # tasks/get·tasks/cancel이 404(다른 replica로 감)일 때 재등록 없이 다시 조회하는 횟수
+    a2a_task_not_found_retries: int = Field(default=3, ge=0)
+    # tasks/send 등록 · tasks/get · tasks/cancel 요청 1건의 HTTP 타임아웃(초)
+    a2a_control_timeout: float = 10.0
+    # 클라이언트가 tasks/get 1회에 요청하는 대기 시간(초) / 서버가 허용하는 최대 대기 시간(초)
+    a2a_poll_wait_seconds: float = 20.0
+    a2a_get_max_wait: float = 30.0
+    # 서버: 끝난 작업 보관 시간(초) — 늦게 도착한 tasks/get·재전송 응답용 / 보관 작업 최대 수
+    a2a_task_retention_seconds: float = 600.0
+    a2a_max_tasks: int = Field(default=1000, ge=1)
+    # 서브에이전트가 이미 받은 메시지는 빼고 새 메시지만 보냄 (sessionId별 이력 캐시 + digest 검증,
+    # 불일치 시 전체 재전송). 모든 서브에이전트가 이 기능을 지원하는 버전일 때만 켠다
+    a2a_delta_history_enabled: bool = False
+    # 이력 캐시 보관 시간(초) / 최대 세션 수 — 클라이언트·서브에이전트 공통
+    a2a_history_cache_ttl_seconds: float = 1800.0
+    a2a_history_cache_max_sessions: int = Field(default=2000, ge=1)
+    # 같은 프로세스에서 실행할 서브에이전트 (recommend_product_agent, generate_message_agent,
+    # data_registration_agent) — 단일 호스트 배포용, HTTP·JSON 직렬화 없이 직접 호출
+    a2a_local_agents: set[str] = set()
 
     # CRM Service (내부 전용)
     crm_service_url: str = "http://localhost:8006"
@@ -156,6 +190,26 @@ class Settings(BaseSettings):
     http_keepalive_expiry: float = 30.0
     http_client_close_every_n_requests: int = 75        # N번째 요청마다 커넥션 1개만 정상 은퇴
     http_client_close_every_n_jitter: int = 20          # N ± 지터 (여러 인스턴스 동시 은퇴 방지)
+    # 내부 서비스 공유 커넥션 풀 (http_client_registry.create_http_client) — upstream별 풀 1개
+    http_pool_max_connections: int = Field(default=100, ge=1)
+    http_pool_max_keepalive: int = Field(default=20, ge=0)
+    # upstream별 최대 커넥션 — "opensearch_api:200,database_api:50" 형식
+    http_pool_upstream_max_connections: dict[str, int] = {}
+    # HTTP/2로 다중화할 upstream 이름 (database_api, opensearch_api, crm, recommend_agent, ...).
+    # http:// upstream은 h2c(prior knowledge)로 연결하므로 upstream 서버가 h2c를 지원해야 한다
+    http2_upstreams: set[str] = set()
+
+    # opensearch-api 클라이언트 측 부하 분산 (app/core/upstream_balancer.py) — NLB 커넥션 은퇴 대신
+    # 복제본마다 진행 중 요청 수 × EWMA 지연이 가장 작은 곳으로 보낸다
+    opensearch_api_lb_enabled: bool = False
+    # 복제본 주소 (콤마 구분, 예: "http://10.0.1.5:8010,http://10.0.2.7:8010").
+    # 비우면 opensearch_api_url 호스트의 DNS A 레코드를 주기적으로 조회 (Cloud Map 등)
+    opensearch_api_lb_endpoints: list[str] = []
+    upstream_lb_dns_refresh_seconds: float = 10.0
+    upstream_lb_ewma_alpha: float = Field(default=0.3, gt=0, le=1)
+    # 연결 오류·502/503/504가 N번 연속이면 eject_seconds 동안 후보에서 제외 (passive health)
+    upstream_lb_eject_failures: int = Field(default=3, ge=1)
+    upstream_lb_eject_seconds: float = 15.0
 
     # Database API client — RemoteProtocolError 재시도 (keep-alive 커넥션 레이스)
     db_fetch_max_retries: int = 2
@@ -171,6 +225,31 @@ class Settings(BaseSettings):
     # LLM call timeouts (seconds)
     llm_timeout: float = 60.0
     llm_call_timeout: float = 70.0
+    # provider·model별 LLM 호출 governor (app/core/llm_governor.py) — 켜면 호출 지점별
+    # *_max_concurrency 세마포어 대신 RPM/TPM token bucket + 우선순위 대기열로 제한
+    llm_rate_governor_enabled: bool = False
+    # 응답 헤더(x-ratelimit-limit-*)를 받기 전 초기 한도 — 헤더가 오면 그 값으로 바뀐다
+    llm_governor_default_rpm: int = Field(default=5000, ge=1)
+    llm_governor_default_tpm: int = Field(default=2_000_000, ge=1)
+    llm_governor_max_concurrency: int = Field(default=120, ge=1)   # provider·model당 동시 호출 상한
+    llm_governor_output_token_estimate: int = 512                  # 호출당 출력 토큰 예상치 (usage로 정산)
+    # 호출 지점 우선순위 (0 = 사용자 응답 경로, 클수록 나중) — "conversation_summarize:1,product_registration_llm:2"
+    llm_call_site_priorities: dict[str, int] = {"conversation_summarize": 1, "product_registration_llm": 2}
+    # hedged request (app/core/llm_hedging.py) — 지정한 호출 지점이 관측 백분위 지연을 넘기면 중복 요청
+    # 토큰이 사용자에게 스트리밍되는 supervisor_final_answer는 넣어도 hedge하지 않는다
+    llm_hedge_call_sites: set[str] = set()           # "supervisor_routing,recommend_product_parser"
+    llm_hedge_percentile: float = Field(default=0.95, gt=0, lt=1)
+    llm_hedge_budget_ratio: float = Field(default=0.05, ge=0, le=1)  # 호출 대비 hedge 비율 상한
+    llm_hedge_min_samples: int = Field(default=20, ge=1)   # 이보다 관측이 적으면 hedge하지 않음
+    llm_hedge_window: int = Field(default=200, ge=1)       # 백분위 계산에 쓰는 최근 성공 호출 수
+    llm_hedge_min_delay_seconds: float = 0.5
+    # hedge 요청을 보낼 대체 모델 — "supervisor_routing:gpt-4.1-mini" (없으면 같은 모델로)
+    llm_hedge_fallback_models: dict[str, str] = {}
+    # 로컬 가짜 LLM provider (app/core/fake_llm.py) — 모델명 "fake-*"로 선택, production에서는 거부
+    fake_llm_ttft_ms: float = Field(default=400.0, ge=0)        # 첫 토큰까지 지연 중앙값
+    fake_llm_latency_sigma: float = Field(default=0.5, ge=0)    # 첫 토큰 지연 로그정규 σ (0이면 고정)
+    fake_llm_per_token_ms: float = Field(default=8.0, ge=0)     # 출력 토큰당 지연
+    fake_llm_seed: int = 0                                      # 지연 난수 시드
     llm_document_timeout: float = 300.0
     llm_registration_sdk_timeout: float = 330.0  # 상품 등록 LLM SDK 타임아웃 (llm_document_timeout보다 여유있게)
 
@@ -208,18 +287,34 @@ class Settings(BaseSettings):
     quality_check_llm_min_overall_score: int = 4
     quality_check_llm_judge_max_retries: int = 2
     quality_check_llm_judge_max_concurrency: int = 40
+    # 배치 Judge: Stage 1·2 통과 메시지를 최대 N개씩 묶어 Judge 1회 호출로 채점
+    # (출력 검증 실패 시 해당 묶음만 단건 호출로 폴백). 회귀 확인 전까지 기본 비활성
+    quality_check_llm_judge_batch_enabled: bool = False
+    quality_check_llm_judge_batch_max_size: int = 5
 
     # CRM supervisor — 최종 응답 생성 LLM 호출 재시도/동시성 제한
     supervisor_final_answer_max_retries: int = 2
     supervisor_final_answer_max_concurrency: int = 40
     supervisor_final_answer_backoff_base: float = 0.5
 
+    # supervisor 프롬프트 컨텍스트 토큰 예산 (context_builder) — 초과 시 이전 턴 에이전트/툴 출력을
+    # ID 참조로 압축, 그래도 넘으면 오래된 메시지부터 제외. 0이면 비활성
+    supervisor_routing_context_token_budget: int = 6000
+    supervisor_final_answer_context_token_budget: int = 12000
+
     # 구조적 LLM 호출 보호 확대 — 38차 후속 점검에서 발견한 무방비 호출 6곳
     # (재시도/동시성 제한 없음 + 100개 동시 세션이 수렴 가능한 위치)
     supervisor_routing_max_retries: int = 2
     supervisor_routing_max_concurrency: int = 40
     supervisor_routing_backoff_base: float = 0.5
 
+    # supervisor 첫 라우팅 임베딩 fast-path (intent_router)
+    # off: 미사용 / shadow: 판정만 로그로 남기고 LLM 라우팅 유지 / on: 확신 시 LLM 호출 생략
+    supervisor_intent_router_mode: Literal["off", "shadow", "on"] = "off"
+    supervisor_intent_router_min_similarity: float = 0.80  # 최근접 예문 코사인 유사도 하한
+    supervisor_intent_router_min_margin: float = 0.05      # 1위·2위 플랜 유사도 차 하한
+    supervisor_intent_router_timeout: float = 1.0          # 인코딩 대기 상한(초), 초과 시 LLM 폴백
+
     recommend_parser_max_retries: int = 2
     recommend_parser_max_concurrency: int = 40
     recommend_parser_backoff_base: float = 0.5
@@ -235,6 +330,19 @@ class Settings(BaseSettings):
     generate_crm_message_max_retries: int = 2
     generate_crm_message_max_concurrency: int = 40
     generate_crm_message_backoff_base: float = 0.5
+    # Generate — 스트리밍 조기 중단: 생성 토큰을 증분 규칙 검사(최대 길이·금지 표현)에 흘려
+    # 위반이 확정되는 즉시 스트림을 끊고 재생성. 재생성 한도를 다 쓰면 마지막 시도는 검사 없이
+    # 끝까지 생성해 기존 품질 검사·피드백 루프로 넘긴다.
+    generate_stream_rule_check_enabled: bool = False
+    generate_stream_abort_max_regenerations: int = Field(default=2, ge=0)
+
+    # Generate — 후보 경쟁(candidate race) 모드
+    # 지정한 목적(purpose)은 K개 후보를 온도·작성 힌트를 달리해 동시에 생성하고, 도착 순서대로
+    # 품질 검사해 3단계를 먼저 통과한 후보를 채택(나머지 취소). 피드백 재시도 루프 왕복을 줄이는 용도.
+    # 환경변수는 콤마 구분 문자열 ("*" = 전체 목적). 비어 있으면 기존 재시도 루프만 사용.
+    generate_candidate_race_purposes: set[str] = set()
+    generate_candidate_race_k: int = Field(default=3, ge=1)
+    generate_candidate_race_temperatures: list[float] = [0.7, 0.9, 0.5]
 
     apply_feedback_max_retries: int = 2
     apply_feedback_max_concurrency: int = 40
@@ -254,6 +362,10 @@ class Settings(BaseSettings):
 
     # SSE keepalive & file upload
     sse_keepalive_timeout: float = 25.0
+    # chat_stream 토큰 이벤트(token/agent_token/text_chunk) 병합 시간 창 (ms, 0이면 병합 안 함)
+    sse_coalesce_window_ms: float = 30.0
+    # 병합 중인 토큰 content가 이 크기(bytes)를 넘으면 창이 끝나기 전이라도 즉시 전송
+    sse_coalesce_max_bytes: int = 1024
     sse_stream_max_seconds: int = 7320  # upload_job_max_seconds(7200) + 120s 버퍼
     max_upload_bytes: int = 52428800  # 50 * 1024 * 1024
 
@@ -268,6 +380,9 @@ class Settings(BaseSettings):
     # Conversation management
     conversation_summarize_threshold: int = 30
     conversation_keep_messages: int = 10
+    # 요약을 턴 종료 후 백그라운드로 수행 (사용자 턴이 요약 LLM 호출을 기다리지 않음).
+    # 켜져 있으면 maybe_summarize 노드는 threshold의 2배를 넘을 때만 인라인 요약(안전망)
+    conversation_summarize_background: bool = True
 
     # Database pool (SQLAlchemy sync)
     db_pool_size: int = 10
@@ -283,13 +398,42 @@ class Settings(BaseSettings):
 
     # /chat/v2/stream 진입 동시성 게이팅 — OpenSearch 보호는 opensearch_api.py(fastapi-search,
     # recommend-agent·generate-agent가 공통으로 호출하는 단일 서버 프로세스)의 워커별 세마포어가
-    # 전담하므로, 진입 단계는 동시 100명까지 허용. 그래프 실행(astream_events) 시작 전 세마포어
-    # 슬롯을 획득.
+    # 전담하므로, 진입 단계는 동시 100명까지 허용. 그래프 실행(astream_events) 시작 전
+    # AdmissionController(app/core/admission.py) 슬롯을 획득.
     chat_stream_max_concurrent: int = 100
     chat_stream_admission_timeout: float = 300.0  # 슬롯 대기 최대 시간 (초) — 실제 처리시간(~150s) 대비 여유
+    # 슬롯 대기열 최대 길이 — 넘으면 즉시 거절 (예상 대기가 admission_timeout을 넘어도 즉시 거절)
+    chat_stream_max_queue: int = 200
+    # 처리시간 EWMA 초기값 (초) — 대기 시간 추정용, 이후 실제 처리시간으로 갱신
+    chat_stream_expected_service_seconds: float = 150.0
+    # 대기 중 queued 이벤트(대기 위치·예상 대기) 갱신 주기 (초)
+    chat_stream_queue_update_interval: float = 2.0
+    # 대기열에서 먼저 슬롯을 받는 역할 (콤마 구분)
+    chat_stream_priority_roles: set[str] = {"admin"}
+    # 스트림 실행을 SSE 연결과 분리해 Last-Event-ID 재연결(GET /chat/v2/stream/resume) 지원
+    chat_stream_resumable: bool = True
+    # run별 replay용 ring buffer 크기 (이벤트 수) — text_chunk 포함 1회 응답이 보통 수백~천여 개
+    chat_stream_replay_buffer_size: int = 4096
+    # 끝난 run을 메모리에 남겨두는 시간 (초) — 그 뒤 재연결은 DB(chat_stream_events)에서 replay
+    chat_stream_run_retention_seconds: float = 300.0
+    # 스트림 이벤트를 chat_stream_events에 기록 — 다른 워커로 재연결되거나 재시작된 경우 replay용
+    chat_stream_events_persist: bool = True
+    chat_stream_events_ttl_seconds: int = 3600
+    # 구독자가 모두 끊긴 채 이 시간(초)이 지난 스트림 실행은 취소 — 서브에이전트 A2A 작업·LLM 호출까지 중단 (0이면 끝까지 실행)
+    chat_stream_abandon_after_seconds: float = 30.0
+
+    # 대화 메시지·생성 메시지 저장 write-behind 배치 (app/core/write_behind.py)
+    chat_write_behind_enabled: bool = True
+    chat_write_behind_max_batch: int = 200          # flush 1회 최대 항목 수
+    chat_write_behind_flush_interval: float = 0.5   # 첫 항목 도착 후 flush까지 최대 대기 (초)
+    chat_write_behind_max_queue: int = 5000         # 넘으면 back-pressure (호출자 대기 → 직접 저장)
+    chat_write_behind_put_timeout: float = 2.0      # 큐 자리 대기 최대 시간 (초)
+    chat_write_behind_shutdown_timeout: float = 30.0  # 종료 시 잔여 항목 flush 대기 (초)
 
     # Health check
     health_check_db_timeout: float = 2.0
+    # GET /metrics — 프로세스 메트릭 Prometheus text format (X-Internal-Token 필요, app/api/metrics_api.py)
+    metrics_endpoint_enabled: bool = True
 
     # Product retrieval
     product_retrieval_top_k: int = 100
@@ -339,6 +483,79 @@ class Settings(BaseSettings):
             return {ip.strip() for ip in v.split(",") if ip.strip()}
         return v
 
+    @field_validator("generate_candidate_race_purposes", mode="before")
+    @classmethod
+    def parse_generate_candidate_race_purposes(cls, v: object) -> object:
+        if isinstance(v, str):
+            return {p.strip() for p in v.split(",") if p.strip()}
+        return v
+
+    @field_validator("http_pool_upstream_max_connections", mode="before")
+    @classmethod
+    def parse_http_pool_upstream_max_connections(cls, v: object) -> object:
+        if isinstance(v, str):
+            pairs = (item.split(":", 1) for item in v.split(",") if item.strip())
+            return {name.strip(): int(limit) for name, limit in pairs}
+        return v
+
+    @field_validator("http2_upstreams", mode="before")
+    @classmethod
+    def parse_http2_upstreams(cls, v: object) -> object:
+        if isinstance(v, str):
+            return {u.strip() for u in v.split(",") if u.strip()}
+        return v
+
+    @field_validator("opensearch_api_lb_endpoints", mode="before")
+    @classmethod
+    def parse_opensearch_api_lb_endpoints(cls, v: object) -> object:
+        if isinstance(v, str):
+            return [e.strip() for e in v.split(",") if e.strip()]
+        return v
+
+    @field_validator("llm_call_site_priorities", mode="before")
+    @classmethod
+    def parse_llm_call_site_priorities(cls, v: object) -> object:
+        if isinstance(v, str):
+            pairs = (item.split(":", 1) for item in v.split(",") if item.strip())
+            return {site.strip(): int(priority) for site, priority in pairs}
+        return v
+
+    @field_validator("llm_hedge_call_sites", mode="before")
+    @classmethod
+    def parse_llm_hedge_call_sites(cls, v: object) -> object:
+        if isinstance(v, str):
+            return {s.strip() for s in v.split(",") if s.strip()}
+        return v
+
+    @field_validator("llm_hedge_fallback_models", mode="before")
+    @classmethod
+    def parse_llm_hedge_fallback_models(cls, v: object) -> object:
+        if isinstance(v, str):
+            pairs = (item.split(":", 1) for item in v.split(",") if item.strip())
+            return {site.strip(): model.strip() for site, model in pairs}
+        return v
+
+    @field_validator("a2a_local_agents", mode="before")
+    @classmethod
+    def parse_a2a_local_agents(cls, v: object) -> object:
+        if isinstance(v, str):
+            return {a.strip() for a in v.split(",") if a.strip()}
+        return v
+
+    @field_validator("chat_stream_priority_roles", mode="before")
+    @classmethod
+    def parse_chat_stream_priority_roles(cls, v: object) -> object:
+        if isinstance(v, str):
+            return {r.strip() for r in v.split(",") if r.strip()}
+        return v
+
+    @field_validator("generate_candidate_race_temperatures", mode="before")
+    @classmethod
+    def parse_generate_candidate_race_temperatures(cls, v: object) -> object:
+        if isinstance(v, str):
+            return [float(t) for t in v.split(",") if t.strip()]
+        return v
+
     @field_validator("chatgpt_model_name", "parser_model_name")
     @classmethod
     def validate_model_name(cls, v: str) -> str:
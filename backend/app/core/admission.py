@@ -0,0 +1,196 @@
+"""
+/chat/v2/stream 진입 제어 — 우선순위 대기열 + 마감 기반 조기 거절.
+
+BoundedSemaphore는 초과 요청을 보이지 않게 붙잡아 두다가 admission 타임아웃에야
+실패시켰다. AdmissionController는 대기열을 직접 관리해
+- 대기 위치와 예상 대기 시간(EWMA 처리시간 × 앞선 대기 수 / 동시 슬롯)을 계산하고
+- 예상 대기가 마감(chat_stream_admission_timeout)을 넘거나 대기열이 가득 차면 즉시 거절하며
+- 같은 우선순위 안에서는 FIFO로, 우선순위 역할(admin 등)은 먼저 슬롯을 받게 한다.
+
+단일 이벤트 루프에서만 사용한다 (락 없음).
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from .metrics import counter, gauge, histogram
+
+_QUEUE_LENGTH = gauge("chat_admission_queue_length", "/chat/v2/stream 슬롯 대기 중인 요청 수")
+_IN_FLIGHT = gauge("chat_admission_in_flight", "/chat/v2/stream 슬롯을 점유한 요청 수")
+_WAIT_SECONDS = histogram(
+    "chat_admission_wait_seconds",
+    "/chat/v2/stream 슬롯 대기 시간(초)",
+    ("outcome",),
+    buckets=(0.01, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0),
+)
+_REJECTED = counter("chat_admission_rejected_total", "/chat/v2/stream 진입 거절 수", ("reason",))
+
+# EWMA 평활 계수 — 최근 20건 정도가 추정에 주로 반영된다
+_EWMA_ALPHA = 0.1
+
+
+class AdmissionRejected(Exception):
+    """대기열 진입 또는 대기 중 거절. reason: queue_full | deadline | timeout"""
+
+    def __init__(self, reason: str, estimated_wait: float = 0.0):
+        super().__init__(reason)
+        self.reason = reason
+        self.estimated_wait = estimated_wait
+
+
+@dataclass(order=True)
+class _Entry:
+    priority: int
+    seq: int
+    future: asyncio.Future = field(compare=False)
+    enqueued_at: float = field(compare=False, default_factory=time.monotonic)
+
+
+class AdmissionTicket:
+    """대기열 항목 핸들. ``wait()``이 True를 반환하면 슬롯을 받은 것이고, 이후 ``release()``로 반납한다."""
+
+    def __init__(self, controller: "AdmissionController", entry: Optional[_Entry]):
+        self._controller = controller
+        self._entry = entry
+        self._granted_at: Optional[float] = None
+        self._released = False
+        if entry is None:
+            self._granted_at = time.monotonic()
+
+    @property
+    def admitted(self) -> bool:
+        return self._granted_at is not None or (self._entry is not None and self._entry.future.done())
+
+    def position(self) -> int:
+        """1부터 시작하는 대기 위치. 슬롯을 받았으면 0."""
+        if self.admitted:
+            return 0
+        return self._controller._position(self._entry)
+
+    def estimated_wait(self) -> float:
+        return self._controller.estimate_wait(self.position())
+
+    async def wait(self, timeout: float) -> bool:
+        """최대 timeout초 동안 슬롯을 기다린다. 받았으면 True."""
+        if self.admitted:
+            self._mark_granted()
+            return True
+        try:
+            await asyncio.wait_for(asyncio.shield(self._entry.future), timeout=timeout)
+        except asyncio.TimeoutError:
+            return False
+        self._mark_granted()
+        return True
+
+    def _mark_granted(self) -> None:
+        if self._granted_at is None:
+            self._granted_at = time.monotonic()
+            _WAIT_SECONDS.observe(self._granted_at - self._entry.enqueued_at, outcome="admitted")
+
+    def abandon(self, outcome: str) -> None:
+        """대기 중단(타임아웃·조기 거절·클라이언트 종료). 그 사이 슬롯을 받았다면 바로 반납한다."""
+        if self._entry is None or self._released:
+            return
+        if self._entry.future.done():
+            # 취소 직전에 슬롯이 넘어온 경우 — 처리시간 표본으로 쓰지 않고 반납만
+            self._released = True
+            self._controller._release(None)
+            return
+        self._entry.future.cancel()
+        self._controller._remove(self._entry)
+        _WAIT_SECONDS.observe(time.monotonic() - self._entry.enqueued_at, outcome=outcome)
+
+    def release(self) -> None:
+        if self._released or not self.admitted:
+            return
+        self._mark_granted()
+        self._released = True
+        self._controller._release(time.monotonic() - self._granted_at)
+
+
+class AdmissionController:
+    """동시 슬롯 capacity개 + 최대 max_queue개 대기열."""
+
+    def __init__(self, capacity: int, max_queue: int, initial_service_seconds: float):
+        self.capacity = capacity
+        self.max_queue = max_queue
+        self._service_ewma = initial_service_seconds
+        self._in_flight = 0
+        self._queue: List[_Entry] = []
+        self._seq = itertools.count()
+
+    @property
+    def queue_length(self) -> int:
+        return len(self._queue)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def estimate_wait(self, position: int) -> float:
+        """position번째 대기자가 슬롯을 받기까지의 예상 시간(초) — 슬롯이 평균 service/capacity초마다 하나씩 빈다고 본다."""
+        if position <= 0:
+            return 0.0
+        return position * self._service_ewma / self.capacity
+
+    def enqueue(self, priority: int, deadline: float) -> AdmissionTicket:
+        """빈 슬롯이 있으면 즉시 배정, 아니면 대기열에 넣는다.
+
+        대기열이 가득 찼거나 예상 대기가 deadline(초)을 넘으면 AdmissionRejected.
+        """
+        if self._in_flight < self.capacity and not self._queue:
+            self._in_flight += 1
+            _IN_FLIGHT.set(self._in_flight)
+            _WAIT_SECONDS.observe(0.0, outcome="admitted")
+            return AdmissionTicket(self, None)
+
+        if len(self._queue) >= self.max_queue:
+            _REJECTED.inc(reason="queue_full")
+            raise AdmissionRejected("queue_full", self.estimate_wait(len(self._queue) + 1))
+
+        # 새 항목이 들어갈 위치 — 같은 우선순위 안에서는 맨 뒤
+        position = sum(1 for e in self._queue if e.priority <= priority) + 1
+        estimated = self.estimate_wait(position)
+        if estimated > deadline:
+            _REJECTED.inc(reason="deadline")
+            raise AdmissionRejected("deadline", estimated)
+
+        entry = _Entry(priority, next(self._seq), asyncio.get_running_loop().create_future())
+        heapq.heappush(self._queue, entry)
+        _QUEUE_LENGTH.set(len(self._queue))
+        return AdmissionTicket(self, entry)
+
+    def reject(self, ticket: AdmissionTicket, reason: str) -> None:
+        """대기 중인 ticket을 거절 처리 (대기 중 마감 초과 등)."""
+        _REJECTED.inc(reason=reason)
+        ticket.abandon(reason)
+
+    def _position(self, entry: _Entry) -> int:
+        return sum(1 for e in self._queue if e < entry) + 1
+
+    def _remove(self, entry: _Entry) -> None:
+        try:
+            self._queue.remove(entry)
+        except ValueError:
+            return
+        heapq.heapify(self._queue)
+        _QUEUE_LENGTH.set(len(self._queue))
+
+    def _release(self, service_seconds: Optional[float]) -> None:
+        if service_seconds is not None:
+            self._service_ewma += _EWMA_ALPHA * (service_seconds - self._service_ewma)
+        # 슬롯을 바로 다음 대기자에게 넘긴다 (in_flight 유지)
+        while self._queue:
+            entry = heapq.heappop(self._queue)
+            if entry.future.done():
+                continue
+            entry.future.set_result(None)
+            _QUEUE_LENGTH.set(len(self._queue))
+            return
+        _QUEUE_LENGTH.set(0)
+        self._in_flight -= 1
+        _IN_FLIGHT.set(self._in_flight)
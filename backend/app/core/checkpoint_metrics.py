@@ -0,0 +1,67 @@
+"""
+체크포인트 크기 메트릭.
+
+- checkpoint_node_write_bytes{graph,node}: 노드 1회 실행의 state 업데이트 직렬화 크기.
+  checkpoint_writes 테이블에 해당 태스크의 쓰기로 그대로 저장되는 양이다.
+- checkpoint_blob_bytes{channel}: aput마다 새 버전으로 저장되는 채널 값 크기.
+  checkpoint_blobs 테이블 증가량을 채널별로 보여준다.
+
+체크포인터가 저장하려고 이미 만든 직렬화 결과(_dump_blobs · _dump_writes)의 길이를 잰다 —
+값을 한 번 더 직렬화하지 않으므로 체크포인트 쓰기 경로에 CPU 비용을 더하지 않는다.
+"""
+
+from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+
+from ..config.settings import settings
+from .metrics import histogram
+
+_BYTES_BUCKETS = (
+    256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216,
+)
+
+_NODE_WRITE_BYTES = histogram(
+    "checkpoint_node_write_bytes",
+    "노드 1회 실행의 state 업데이트 직렬화 크기(bytes)",
+    ("graph", "node"),
+    buckets=_BYTES_BUCKETS,
+)
+_BLOB_BYTES = histogram(
+    "checkpoint_blob_bytes",
+    "aput 1회에 새 버전으로 저장되는 채널 값 직렬화 크기(bytes)",
+    ("channel",),
+    buckets=_BYTES_BUCKETS,
+)
+
+# 노드 실행 태스크의 task_path — langgraph task_path_str((PULL, node)) 형식 "~__pregel_pull, <node>"
+_PULL_TASK_PREFIX = "~__pregel_pull, "
+
+
+def _task_node(task_path: str) -> str:
+    if task_path.startswith(_PULL_TASK_PREFIX):
+        return task_path[len(_PULL_TASK_PREFIX):].split(",", 1)[0]
+    return "push" if task_path.startswith("~__pregel_push") else "unknown"
+
+
+class MeteredAsyncPostgresSaver(AsyncPostgresSaver):
+    """저장하는 blob·write의 직렬화 크기를 checkpoint_blob_bytes · checkpoint_node_write_bytes에 기록하는 AsyncPostgresSaver."""
+
+    # checkpoint_node_write_bytes의 graph 라벨 — 이 체크포인터를 쓰는 그래프는 CRM 그래프뿐이다
+    metrics_graph = "crm_message_agent"
+
+    def _dump_blobs(self, thread_id, checkpoint_ns, values, versions):
+        blobs = super()._dump_blobs(thread_id, checkpoint_ns, values, versions)
+        if settings.checkpoint_size_metrics_enabled:
+            # (thread_id, checkpoint_ns, channel, version, type, blob) — 빈 채널은 blob이 None
+            for _, _, channel, _, _, blob in blobs:
+                if blob is not None:
+                    _BLOB_BYTES.observe(len(blob), channel=channel)
+        return blobs
+
+    def _dump_writes(self, thread_id, checkpoint_ns, checkpoint_id, task_id, task_path, writes):
+        rows = super()._dump_writes(thread_id, checkpoint_ns, checkpoint_id, task_id, task_path, writes)
+        if settings.checkpoint_size_metrics_enabled and rows:
+            # 행 마지막 원소가 직렬화된 값 (bytes)
+            _NODE_WRITE_BYTES.observe(
+                sum(len(row[-1]) for row in rows), graph=self.metrics_graph, node=_task_node(task_path),
+            )
+        return rows
@@ -0,0 +1,240 @@
+"""
+일자별 range 파티션 체크포인트 저장소 (선택, CHECKPOINT_PARTITIONED=true).
+
+기본 AsyncPostgresSaver 스키마에서는 보존 기간 정리(cleanup_old_checkpoints)가 checkpoints
+전체를 GROUP BY로 훑고 세 테이블에서 thread 단위 DELETE를 반복해 라이브 쓰기와 경합한다.
+파티션 레이아웃에서는 checkpoints / checkpoint_writes / checkpoint_blobs를 생성일
+(created_on DATE)로 일 단위 파티셔닝하고, 보존 기간이 지난 파티션을 DROP한다.
+
+주의점과 처리:
+- 파티션 테이블의 unique 제약은 파티션 키를 포함해야 하므로, 업스트림 saver의 ON CONFLICT
+  대상에 created_on을 덧붙인 SQL을 쓴다. 같은 키를 자정을 넘겨 다시 쓰면 다른 날짜 파티션에
+  중복 행이 생길 수 있으나, 조회는 checkpoint_id 최신순·blob 버전 매칭이라 결과에 영향 없다.
+- 오래 변경되지 않은 채널의 blob은 활성 thread의 최신 체크포인트가 여전히 참조한다. 파티션을
+  DROP하기 전에 그런 blob을 오늘 파티션으로 옮긴다(drop_expired_checkpoint_partitions).
+- thread별 마지막 활동 시각은 checkpoint_threads(last-active 인덱스)에 따로 유지한다.
+
+기존 비파티션 테이블이 있으면 setup()이 실패한다 — scripts/migrate_checkpoints_partitioned.py로 먼저 이관.
+"""
+
+import re
+import time
+from contextlib import asynccontextmanager
+from datetime import date, timedelta
+from typing import AsyncIterator, Dict, List, Optional
+
+from psycopg import AsyncConnection
+from psycopg_pool import AsyncConnectionPool
+
+from .checkpoint_metrics import MeteredAsyncPostgresSaver
+from .logging import get_logger
+
+_logger = get_logger("checkpoint_partitions")
+
+PARTITIONED_TABLES: tuple[str, ...] = ("checkpoints", "checkpoint_blobs", "checkpoint_writes")
+
+# 아래 DDL이 반영하고 있는 업스트림 MIGRATIONS 개수 — 업스트림 스키마가 바뀌면 setup()이 실패해 알린다
+_KNOWN_UPSTREAM_MIGRATIONS = 10
+
+PARTITIONED_SCHEMA_DDL: tuple[str, ...] = (
+    """
+    CREATE TABLE IF NOT EXISTS checkpoints (
+        thread_id            TEXT NOT NULL,
+        checkpoint_ns        TEXT NOT NULL DEFAULT '',
+        checkpoint_id        TEXT NOT NULL,
+        parent_checkpoint_id TEXT,
+        type                 TEXT,
+        checkpoint           JSONB NOT NULL,
+        metadata             JSONB NOT NULL DEFAULT '{}',
+        created_at           TIMESTAMPTZ DEFAULT NOW(),
+        created_on           DATE NOT NULL DEFAULT CURRENT_DATE,
+        PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, created_on)
+    ) PARTITION BY RANGE (created_on)
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS checkpoint_blobs (
+        thread_id     TEXT NOT NULL,
+        checkpoint_ns TEXT NOT NULL DEFAULT '',
+        channel       TEXT NOT NULL,
+        version       TEXT NOT NULL,
+        type          TEXT NOT NULL,
+        blob          BYTEA,
+        created_on    DATE NOT NULL DEFAULT CURRENT_DATE,
+        PRIMARY KEY (thread_id, checkpoint_ns, channel, version, created_on)
+    ) PARTITION BY RANGE (created_on)
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS checkpoint_writes (
+        thread_id     TEXT NOT NULL,
+        checkpoint_ns TEXT NOT NULL DEFAULT '',
+        checkpoint_id TEXT NOT NULL,
+        task_id       TEXT NOT NULL,
+        idx           INTEGER NOT NULL,
+        channel       TEXT NOT NULL,
+        type          TEXT,
+        blob          BYTEA NOT NULL,
+        task_path     TEXT NOT NULL DEFAULT '',
+        created_on    DATE NOT NULL DEFAULT CURRENT_DATE,
+        PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx, created_on)
+    ) PARTITION BY RANGE (created_on)
+    """,
+    "CREATE INDEX IF NOT EXISTS checkpoints_thread_id_idx ON checkpoints(thread_id)",
+    "CREATE INDEX IF NOT EXISTS checkpoint_blobs_thread_id_idx ON checkpoint_blobs(thread_id)",
+    "CREATE INDEX IF NOT EXISTS checkpoint_writes_thread_id_idx ON checkpoint_writes(thread_id)",
+    # 관리 작업이 밀려도 쓰기가 실패하지 않도록 기본 파티션 — 평소엔 비어 있어야 한다
+    "CREATE TABLE IF NOT EXISTS checkpoints_default PARTITION OF checkpoints DEFAULT",
+    "CREATE TABLE IF NOT EXISTS checkpoint_blobs_default PARTITION OF checkpoint_blobs DEFAULT",
+    "CREATE TABLE IF NOT EXISTS checkpoint_writes_default PARTITION OF checkpoint_writes DEFAULT",
+    """
+    CREATE TABLE IF NOT EXISTS checkpoint_threads (
+        thread_id      TEXT PRIMARY KEY,
+        last_active_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_checkpoint_threads_last_active ON checkpoint_threads(last_active_at)",
+)
+
+# 같은 분 안의 반복 갱신은 건너뛰어 행 churn을 줄인다
+_TOUCH_THREAD_SQL = """
+    INSERT INTO checkpoint_threads (thread_id, last_active_at) VALUES (%s, NOW())
+    ON CONFLICT (thread_id) DO UPDATE SET last_active_at = EXCLUDED.last_active_at
+    WHERE checkpoint_threads.last_active_at < EXCLUDED.last_active_at - INTERVAL '1 minute'
+"""
+# 위 SQL의 1분 간격을 프로세스 안에서 먼저 걸러 대부분의 aput이 DB를 건드리지 않게 한다
+_TOUCH_INTERVAL_SECONDS = 60.0
+# 스레드별 마지막 갱신 시각 dict 상한 — 넘으면 간격이 지난 항목부터 정리
+_TOUCHED_THREADS_MAX = 10_000
+
+
+def _with_partition_key(sql: str, conflict_target: str) -> str:
+    if conflict_target not in sql:
+        raise RuntimeError(f"업스트림 체크포인트 SQL이 바뀌었습니다 — 충돌 대상 '{conflict_target}'를 찾지 못했습니다")
+    return sql.replace(conflict_target, conflict_target[:-1] + ", created_on)")
+
+
+def partition_name(table: str, day: date) -> str:
+    return f"{table}_p{day:%Y%m%d}"
+
+
+async def ensure_partitions(conn: AsyncConnection, days_ahead: int, start: Optional[date] = None) -> int:
+    """start(기본 오늘)부터 오늘+days_ahead일까지의 일자 파티션을 만든다. 새로 만든 파티션 수를 반환."""
+    created = 0
+    start = start or date.today()
+    end = date.today() + timedelta(days=days_ahead)
+    for offset in range((end - start).days + 1):
+        day = start + timedelta(days=offset)
+        for table in PARTITIONED_TABLES:
+            name = partition_name(table, day)
+            row = await (await conn.execute("SELECT to_regclass(%s)", [name])).fetchone()
+            if row[0] is not None:
+                continue
+            await conn.execute(
+                f"CREATE TABLE {name} PARTITION OF {table}"
+                f" FOR VALUES FROM ('{day.isoformat()}') TO ('{(day + timedelta(days=1)).isoformat()}')"
+            )
+            created += 1
+    if created:
+        _logger.info("checkpoint_partitions_created", created=created, days_ahead=days_ahead)
+    return created
+
+
+async def list_partition_days(conn: AsyncConnection, table: str) -> List[date]:
+    rows = await conn.execute(
+        """
+        SELECT c.relname FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = to_regclass(%s)
+        """,
+        [table],
+    )
+    pattern = re.compile(rf"^{table}_p(\d{{8}})$")
+    days = []
+    for (relname,) in await rows.fetchall():
+        m = pattern.match(relname)
+        if m:
+            days.append(date(int(m.group(1)[:4]), int(m.group(1)[4:6]), int(m.group(1)[6:])))
+    return sorted(days)
+
+
+class PartitionedAsyncPostgresSaver(MeteredAsyncPostgresSaver):
+    """일자 파티션 스키마용 AsyncPostgresSaver — ON CONFLICT 대상에 파티션 키 포함, last-active 갱신."""
+
+    UPSERT_CHECKPOINTS_SQL = _with_partition_key(
+        MeteredAsyncPostgresSaver.UPSERT_CHECKPOINTS_SQL,
+        "ON CONFLICT (thread_id, checkpoint_ns, checkpoint_id)",
+    )
+    UPSERT_CHECKPOINT_BLOBS_SQL = _with_partition_key(
+        MeteredAsyncPostgresSaver.UPSERT_CHECKPOINT_BLOBS_SQL,
+        "ON CONFLICT (thread_id, checkpoint_ns, channel, version)",
+    )
+    UPSERT_CHECKPOINT_WRITES_SQL = _with_partition_key(
+        MeteredAsyncPostgresSaver.UPSERT_CHECKPOINT_WRITES_SQL,
+        "ON CONFLICT (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)",
+    )
+    INSERT_CHECKPOINT_WRITES_SQL = _with_partition_key(
+        MeteredAsyncPostgresSaver.INSERT_CHECKPOINT_WRITES_SQL,
+        "ON CONFLICT (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)",
+    )
+
+    def __init__(self, conn: AsyncConnectionPool, *, partition_days_ahead: int = 7, **kwargs):
+        super().__init__(conn, **kwargs)
+        self.partition_days_ahead = partition_days_ahead
+        self._touched_at: Dict[str, float] = {}
+
+    @asynccontextmanager
+    async def _connection(self) -> AsyncIterator[AsyncConnection]:
+        if isinstance(self.conn, AsyncConnectionPool):
+            async with self.conn.connection() as conn:
+                yield conn
+        else:
+            yield self.conn
+
+    async def setup(self) -> None:
+        """파티션 스키마 생성 + 업스트림 마이그레이션을 적용 완료로 기록 + 앞으로 쓸 파티션 생성."""
+        if len(self.MIGRATIONS) != _KNOWN_UPSTREAM_MIGRATIONS:
+            raise RuntimeError(
+                f"업스트림 체크포인트 마이그레이션 수가 {len(self.MIGRATIONS)}개입니다"
+                f" (파티션 DDL 기준 {_KNOWN_UPSTREAM_MIGRATIONS}개) — PARTITIONED_SCHEMA_DDL을 먼저 갱신하세요"
+            )
+        async with self._connection() as conn:
+            row = await (await conn.execute(
+                "SELECT relkind FROM pg_class WHERE oid = to_regclass('checkpoints')"
+            )).fetchone()
+            if row is not None and row[0] != "p":
+                raise RuntimeError(
+                    "비파티션 checkpoints 테이블이 있습니다 — scripts/migrate_checkpoints_partitioned.py로 먼저 이관하세요"
+                )
+            for ddl in PARTITIONED_SCHEMA_DDL:
+                await conn.execute(ddl)
+            await conn.execute("CREATE TABLE IF NOT EXISTS checkpoint_migrations (v INTEGER PRIMARY KEY)")
+            await conn.execute(
+                "INSERT INTO checkpoint_migrations (v) SELECT generate_series(0, %s) ON CONFLICT DO NOTHING",
+                [len(self.MIGRATIONS) - 1],
+            )
+            await ensure_partitions(conn, self.partition_days_ahead)
+
+    async def aput(self, config, checkpoint, metadata, new_versions):
+        next_config = await super().aput(config, checkpoint, metadata, new_versions)
+        thread_id = config["configurable"]["thread_id"]
+        now = time.monotonic()
+        last = self._touched_at.get(thread_id)
+        if last is not None and now - last < _TOUCH_INTERVAL_SECONDS:
+            return next_config
+        try:
+            async with self._connection() as conn:
+                await conn.execute(_TOUCH_THREAD_SQL, [thread_id])
+            self._remember_touch(thread_id, now)
+        except Exception as e:
+            # last-active 갱신 실패는 체크포인트 저장 실패가 아님 — 다음 aput에서 다시 갱신
+            _logger.warning("checkpoint_thread_touch_failed", error_type=type(e).__name__)
+        return next_config
+
+    def _remember_touch(self, thread_id: str, now: float) -> None:
+        touched = self._touched_at
+        touched[thread_id] = now
+        if len(touched) > _TOUCHED_THREADS_MAX:
+            for stale in [t for t, at in touched.items() if now - at >= _TOUCH_INTERVAL_SECONDS]:
+                del touched[stale]
+            if len(touched) > _TOUCHED_THREADS_MAX:
+                # 1분 안에 상한을 넘는 스레드가 몰린 경우 — 비워도 DB 쪽 WHERE가 중복 갱신을 막는다
+                touched.clear()
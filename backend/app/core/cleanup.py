@@ -1,6 +1,6 @@
 import asyncio
 import uuid
-from datetime import timedelta
+from datetime import date, timedelta
 from typing import TYPE_CHECKING
 
 from sqlalchemy import text
@@ -103,6 +103,65 @@ async def cleanup_old_checkpoints(
     return len(thread_ids)
 
 
+# 드롭할 blob 파티션(created_on = day)에서 활성 thread의 최신 체크포인트가 참조하는 blob만 오늘 파티션으로 이동
+_CARRY_FORWARD_BLOBS_SQL = """
+    WITH active AS (
+        SELECT DISTINCT b.thread_id FROM checkpoint_blobs b
+        JOIN checkpoint_threads t ON t.thread_id = b.thread_id
+        WHERE b.created_on = %(day)s AND t.last_active_at::date >= %(cutoff)s
+    ), latest AS (
+        SELECT DISTINCT ON (c.thread_id, c.checkpoint_ns) c.thread_id, c.checkpoint_ns, c.checkpoint
+        FROM checkpoints c JOIN active a ON a.thread_id = c.thread_id
+        ORDER BY c.thread_id, c.checkpoint_ns, c.checkpoint_id DESC
+    ), needed AS (
+        SELECT l.thread_id, l.checkpoint_ns, v.key AS channel, v.value AS version
+        FROM latest l, jsonb_each_text(l.checkpoint -> 'channel_versions') v
+    )
+    UPDATE checkpoint_blobs b SET created_on = CURRENT_DATE
+    FROM needed n
+    WHERE b.created_on = %(day)s
+      AND b.thread_id = n.thread_id AND b.checkpoint_ns = n.checkpoint_ns
+      AND b.channel = n.channel AND b.version = n.version
+"""
+
+
+async def drop_expired_checkpoint_partitions(
+    pool: "AsyncConnectionPool",
+    retention_days: int,
+    days_ahead: int,
+) -> int:
+    """파티션 레이아웃(checkpoint_partitioned)의 보존 기간 정리 — 만료 일자 파티션을 DROP한다.
+
+    마지막 활동일이 보존 기간 안인 thread는 최신 체크포인트가 오늘자 파티션 쪽에 있으므로
+    그대로 남고, 그 체크포인트가 참조하는 오래된 blob만 DROP 전에 오늘 파티션으로 옮긴다.
+    보존 기간을 넘긴 thread는 모든 행이 만료 파티션에 있어 함께 사라진다.
+    앞으로 쓸 파티션(days_ahead일)도 이때 미리 만든다. 드롭한 일자 수를 반환.
+    """
+    from app.core.checkpoint_partitions import PARTITIONED_TABLES, ensure_partitions, list_partition_days, partition_name
+
+    cutoff = date.today() - timedelta(days=retention_days)
+    async with pool.connection() as conn:
+        await ensure_partitions(conn, days_ahead)
+        days = set()
+        for table in PARTITIONED_TABLES:
+            days.update(await list_partition_days(conn, table))
+        expired = sorted(d for d in days if d < cutoff)
+
+        for day in expired:
+            async with conn.transaction():
+                cur = await conn.execute(_CARRY_FORWARD_BLOBS_SQL, {"day": day, "cutoff": cutoff})
+                carried = cur.rowcount
+                for table in ("checkpoint_writes", "checkpoint_blobs", "checkpoints"):
+                    await conn.execute(f"DROP TABLE IF EXISTS {partition_name(table, day)}")
+            logger.info("checkpoint_partition_dropped", day=day.isoformat(), carried_blobs=carried)
+
+        await conn.execute(
+            "DELETE FROM checkpoint_threads WHERE last_active_at::date < %s", [cutoff]
+        )
+
+    return len(expired)
+
+
 async def cleanup_loop() -> None:
     while True:
         try:
@@ -0,0 +1,312 @@
+"""
+로컬 가짜 LLM provider — OpenAI 키·AWS 스택 없이 에이전트 자체 오버헤드를 프로파일링하기 위한 chat model.
+
+모델명 접두사 "fake-"(예: CHATGPT_MODEL_NAME=fake-gpt-4o-mini)면 create_llm이 FakeChatModel을 돌려준다.
+
+- 응답 내용은 프롬프트로 결정된다(같은 입력 → 같은 출력). with_structured_output(schema)는 스키마별
+  규칙(RouteDecision · GenerateMessageRouterResult · LLMJudgeOutput/BatchOutput · MessageOutput ·
+  RecommendProductRequest)으로, 그 외 스키마는 JSON schema에서 필수 필드를 채워 항상 검증을 통과하는
+  JSON을 만든다. 일반 호출은 프롬프트가 요구하는 JSON 형식(CRM 메시지 title/message, 상품 등록
+  extracted_text)이 보이면 그 형식으로, 아니면 짧은 한국어 답변을 돌려준다.
+- 지연: 첫 토큰까지 로그정규 분포(중앙값 fake_llm_ttft_ms, σ fake_llm_latency_sigma) + 출력 토큰당
+  fake_llm_per_token_ms. 지연 난수는 fake_llm_seed로 고정된 프로세스 단위 시퀀스다.
+- astream은 몇 글자씩 토큰을 흘려보내고 마지막 청크에 usage를 붙인다. usage_metadata가 있어
+  llm_usage·governor 정산도 실제 provider와 같은 경로를 탄다.
+- bind_tools는 도구를 무시한다 — create_agent 기반 에이전트(search_agent 등)는 도구 호출 없이 답변 1회로 끝난다.
+
+임베딩(intent router·semantic check)과 DB·OpenSearch 호출은 대상이 아니다.
+"""
+
+import asyncio
+import json
+import math
+import random
+import re
+import time
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.runnables import Runnable, RunnableLambda
+from pydantic import BaseModel, ConfigDict, Field
+
+from app.config.settings import settings
+from app.core.token_counter import count_message_tokens, count_tokens, message_text
+
+# 스트리밍 청크당 글자 수
+_CHUNK_CHARS = 3
+
+_latency_rng = random.Random(settings.fake_llm_seed)
+
+_AGENT_KEYWORDS = (
+    ("data_registration_agent", ("등록",)),
+    ("search_agent", ("검색", "조회", "찾아")),
+    ("recommend_product_agent", ("추천",)),
+    ("generate_message_agent", ("메시지", "문자", "CRM")),
+)
+_PURPOSES = (
+    "브랜드/제품 첫소개", "신제품 홍보", "베스트셀러 제품 소개", "프로모션/이벤트 소개",
+    "성분/효능 강조 소개", "피부타입/고민 강조 소개", "라이프스타일/연령대 강조 소개",
+)
+_PRODUCT_ID = re.compile(r"상품ID: ([^\]\s]+)")
+_PERSONA_ID = re.compile(r"\bPERSONA_\w+")
+_PRODUCT_NAME = re.compile(r"['\"]product_name['\"]: ['\"]([^'\"]+)['\"]")
+_JUDGE_INDEX = re.compile(r"# 메시지 (\d+)")
+
+
+def _crm_message(text: str, rng: random.Random) -> Dict[str, str]:
+    match = _PRODUCT_NAME.search(text)
+    name = match.group(1)[:20] if match else "추천 상품"
+    benefit = rng.choice(("촉촉한 보습", "맑은 피부결", "산뜻한 사용감", "건강한 윤기"))
+    return {
+        "title": f"{name}로 만나는 {benefit}"[:40],
+        "message": (
+            f"{name}을 소개해 드려요. 매일 가볍게 바르면 {benefit}을 느낄 수 있도록 도와줍니다. "
+            "지금 아모레몰에서 자세한 정보를 확인해 보세요."
+        ),
+    }
+
+
+def _route_decision(text: str, last: str, rng: random.Random) -> Dict[str, Any]:
+    plan = [agent for agent, keywords in _AGENT_KEYWORDS if any(k in last for k in keywords)]
+    return {"task_plan": plan, "reason": "요청 키워드 기준 라우팅" if plan else "수행할 작업 없음"}
+
+
+def _generate_router(text: str, last: str, rng: random.Random) -> Dict[str, Any]:
+    persona = _PERSONA_ID.search(text)
+    purpose = next((p for p in _PURPOSES if p in last), _PURPOSES[0])
+    product_ids = list(dict.fromkeys(_PRODUCT_ID.findall(text)))
+    return {
+        "next_node": "generate_message_node",
+        "tasks": [{"product_id": pid, "purpose": purpose} for pid in product_ids],
+        "feedback_input": None,
+        "persona_id": persona.group(0) if persona else None,
+    }
+
+
+def _recommend_request(text: str, last: str, rng: random.Random) -> Dict[str, Any]:
+    persona = _PERSONA_ID.search(last)
+    return {
+        "persona_id": persona.group(0) if persona else None,
+        "product_categories": [],
+        "brands": [],
+        "has_persona_info": persona is not None or any(k in last for k in ("피부", "고민", "나이", "연령")),
+    }
+
+
+def _judge_scores(rng: random.Random) -> Dict[str, Any]:
+    scores = {k: rng.choice((4, 5)) for k in ("accuracy", "tone", "personalization", "naturalness", "cta_clarity")}
+    return {**scores, "feedback": "상품 특징과 혜택이 잘 드러납니다. CTA 문구를 조금 더 구체화하면 좋겠습니다."}
+
+
+def _judge(text: str, last: str, rng: random.Random) -> Dict[str, Any]:
+    return _judge_scores(rng)
+
+
+def _judge_batch(text: str, last: str, rng: random.Random) -> Dict[str, Any]:
+    indexes = sorted({int(i) for i in _JUDGE_INDEX.findall(text)}) or [1]
+    return {"results": [{**_judge_scores(rng), "message_index": i} for i in indexes]}
+
+
+def _message_output(text: str, last: str, rng: random.Random) -> Dict[str, Any]:
+    return _crm_message(text, rng)
+
+
+# 스키마 클래스 이름 → (전체 프롬프트, 마지막 사용자 발화, 난수) → dict
+_STRUCTURED_BUILDERS: Dict[str, Callable[[str, str, random.Random], Dict[str, Any]]] = {
+    "RouteDecision": _route_decision,
+    "GenerateMessageRouterResult": _generate_router,
+    "RecommendProductRequest": _recommend_request,
+    "LLMJudgeOutput": _judge,
+    "LLMJudgeBatchOutput": _judge_batch,
+    "MessageOutput": _message_output,
+}
+
+
+def _fit(sample: str, min_length: int, max_length: Optional[int]) -> str:
+    text = " ".join(sample.split())[:200] or "응답"
+    while len(text) < min_length:
+        text = f"{text} {text}"
+    return text[:max_length] if max_length is not None else text
+
+
+def _from_json_schema(schema: Dict[str, Any], defs: Dict[str, Any], sample: str) -> Any:
+    """JSON schema에서 필수 필드만 채운 값 — 제약(enum·최솟값·길이·최소 항목 수)을 지킨다."""
+    if "$ref" in schema:
+        return _from_json_schema(defs[schema["$ref"].rsplit("/", 1)[-1]], defs, sample)
+    if "const" in schema:
+        return schema["const"]
+    if schema.get("enum"):
+        return schema["enum"][0]
+    if "anyOf" in schema:
+        options = [o for o in schema["anyOf"] if o.get("type") != "null"] or schema["anyOf"]
+        return _from_json_schema(options[0], defs, sample)
+    kind = schema.get("type")
+    if kind == "object":
+        props = schema.get("properties", {})
+        return {name: _from_json_schema(props.get(name, {}), defs, sample) for name in schema.get("required", [])}
+    if kind == "array":
+        return [_from_json_schema(schema.get("items", {}), defs, sample) for _ in range(schema.get("minItems", 0))]
+    if kind == "string":
+        return _fit(sample, schema.get("minLength", 0), schema.get("maxLength"))
+    if kind in ("integer", "number"):
+        value = schema.get("minimum", schema.get("exclusiveMinimum", -1) + 1)
+        return int(value) if kind == "integer" else float(value)
+    if kind == "boolean":
+        return False
+    return None
+
+
+def _structured_content(schema: type[BaseModel], text: str, last: str, rng: random.Random) -> str:
+    builder = _STRUCTURED_BUILDERS.get(schema.__name__)
+    if builder is not None:
+        data = builder(text, last, rng)
+    else:
+        json_schema = schema.model_json_schema()
+        data = _from_json_schema(json_schema, json_schema.get("$defs", {}), last)
+    return json.dumps(data, ensure_ascii=False)
+
+
+def _text_content(text: str, last: str, rng: random.Random) -> str:
+    if '"title"' in text and '"message"' in text:
+        return json.dumps(_crm_message(text, rng), ensure_ascii=False)
+    if '"extracted_text"' in text:
+        return json.dumps({
+            "extracted_text": "상품명과 효능, 사용법이 적힌 상세페이지입니다.",
+            "main_category": None, "tag": None, "confidence": "none", "reason": "가짜 응답",
+        }, ensure_ascii=False)
+    topic = _fit(last, 0, 40)
+    return rng.choice((
+        f"요청하신 내용({topic})을 확인했습니다. 결과를 정리해 드릴게요.",
+        f"'{topic}'에 대해 처리한 결과를 안내해 드립니다. 추가로 필요한 작업이 있으면 말씀해 주세요.",
+    ))
+
+
+class FakeChatModel(BaseChatModel):
+    """프롬프트로 결정되는 응답과 설정 가능한 지연 분포를 가진 로컬 chat model."""
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    model_name: str = Field(alias="model")
+    temperature: float = 0
+    timeout: Optional[float] = None
+    ttft_ms: float = Field(default_factory=lambda: settings.fake_llm_ttft_ms)
+    latency_sigma: float = Field(default_factory=lambda: settings.fake_llm_latency_sigma)
+    per_token_ms: float = Field(default_factory=lambda: settings.fake_llm_per_token_ms)
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {"model_name": self.model_name, "temperature": self.temperature}
+
+    def _respond(self, messages: List[BaseMessage], schema: Optional[type[BaseModel]]) -> str:
+        text = "\n".join(message_text(m) for m in messages)
+        last = next((message_text(m) for m in reversed(messages) if isinstance(m, HumanMessage)), text)
+        rng = random.Random(f"{self.model_name}:{self.temperature}:{text}")
+        if schema is not None:
+            return _structured_content(schema, text, last, rng)
+        return _text_content(text, last, rng)
+
+    def _ttft(self) -> float:
+        median = self.ttft_ms / 1000
+        if self.latency_sigma <= 0:
+            return median
+        return median * math.exp(_latency_rng.gauss(0, self.latency_sigma))
+
+    def _message(self, messages: List[BaseMessage], content: str) -> AIMessage:
+        input_tokens = count_message_tokens(messages)
+        output_tokens = count_tokens(content)
+        return AIMessage(content=content, usage_metadata={
+            "input_tokens": input_tokens, "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+        })
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        message = self._message(messages, self._respond(messages, kwargs.get("fake_schema")))
+        time.sleep(self._ttft() + message.usage_metadata["output_tokens"] * self.per_token_ms / 1000)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        message = self._message(messages, self._respond(messages, kwargs.get("fake_schema")))
+        await asyncio.sleep(self._ttft() + message.usage_metadata["output_tokens"] * self.per_token_ms / 1000)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        message = self._message(messages, self._respond(messages, kwargs.get("fake_schema")))
+        pieces = self._pieces(message.content)
+        delay = message.usage_metadata["output_tokens"] * self.per_token_ms / 1000 / len(pieces)
+        time.sleep(self._ttft())
+        for i, piece in enumerate(pieces):
+            if i:
+                time.sleep(delay)
+            chunk = self._chunk(piece, message, last=i == len(pieces) - 1)
+            if run_manager is not None:
+                run_manager.on_llm_new_token(piece, chunk=chunk)
+            yield chunk
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        message = self._message(messages, self._respond(messages, kwargs.get("fake_schema")))
+        pieces = self._pieces(message.content)
+        delay = message.usage_metadata["output_tokens"] * self.per_token_ms / 1000 / len(pieces)
+        await asyncio.sleep(self._ttft())
+        for i, piece in enumerate(pieces):
+            if i:
+                await asyncio.sleep(delay)
+            chunk = self._chunk(piece, message, last=i == len(pieces) - 1)
+            if run_manager is not None:
+                await run_manager.on_llm_new_token(piece, chunk=chunk)
+            yield chunk
+
+    @staticmethod
+    def _pieces(content: str) -> List[str]:
+        return [content[i:i + _CHUNK_CHARS] for i in range(0, len(content), _CHUNK_CHARS)] or [""]
+
+    @staticmethod
+    def _chunk(piece: str, message: AIMessage, last: bool) -> ChatGenerationChunk:
+        # usage는 OpenAI stream_usage처럼 마지막 청크에만 붙인다
+        usage = message.usage_metadata if last else None
+        return ChatGenerationChunk(message=AIMessageChunk(content=piece, usage_metadata=usage))
+
+    def bind_tools(self, tools: Any, **kwargs: Any) -> Runnable:
+        return self.bind(**kwargs)
+
+    def with_structured_output(
+        self, schema: Any, *, include_raw: bool = False, **kwargs: Any,
+    ) -> Runnable:
+        if not (isinstance(schema, type) and issubclass(schema, BaseModel)):
+            raise ValueError("FakeChatModel.with_structured_output은 pydantic 모델 스키마만 지원합니다.")
+
+        def parse(message: AIMessage) -> Any:
+            parsed = schema.model_validate_json(message.content)
+            return {"raw": message, "parsed": parsed, "parsing_error": None} if include_raw else parsed
+
+        return self.bind(fake_schema=schema) | RunnableLambda(parse)
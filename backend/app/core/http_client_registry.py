@@ -1,10 +1,60 @@
-from typing import Any
+"""
+내부 서비스 HTTP 클라이언트 등록·종료 + upstream별 공유 커넥션 풀.
 
+서비스 객체(ProductClient, PersonaClient, QualityChecker, A2AClient, search tools, ...)가 각자
+httpx.AsyncClient를 만들면 풀과 keep-alive 타이머가 객체마다 따로라 같은 upstream에 커넥션이
+중복으로 열린다. create_http_client()로 만든 클라이언트는 헤더·timeout·event hook만 각자 갖고,
+실제 커넥션은 shared_transport()가 upstream(scheme + host:port)별 풀 하나로 프로세스 전체에서 공유한다.
+
+- upstream 이름: settings의 서비스 URL과 host:port가 같으면 그 이름(database_api, opensearch_api, crm,
+  recommend_agent, ...), 아니면 host:port
+- 풀 크기: http_pool_max_connections / http_pool_max_keepalive, upstream별 http_pool_upstream_max_connections
+- http2_upstreams: HTTP/2로 다중화할 upstream — 커넥션 1개에 동시 요청을 싣는다. http:// upstream은
+  prior knowledge(h2c)로 연결하므로 upstream이 h2c를 받아야 한다(uvicorn 미지원 — ALB·hypercorn 뒤에서만).
+  h2 패키지가 없으면 경고 후 HTTP/1.1로 연결한다.
+- 클라이언트 aclose()는 공유 풀을 닫지 않는다 — 풀은 close_all()이 마지막에 닫는다.
+- balancer가 설정된 upstream(upstream_balancer.create_balancer)은 요청마다 복제본 endpoint를 골라
+  그 endpoint의 풀로 보낸다.
+
+지표 (httpcore trace 확장으로 측정):
+- http_client_requests_total{upstream,connection}: connection=new(새 커넥션) | reused(풀 재사용)
+- http_client_pool_wait_seconds{upstream}: 풀에서 커넥션을 얻기까지 대기
+- http_client_connect_seconds{upstream}: 새 커넥션 TCP(+TLS) 연결 시간
+"""
+
+import functools
+import importlib.util
+import time
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+import httpx
+
+from app.config.settings import settings
 from app.core.logging import get_logger
+from app.core.metrics import counter, histogram
+from app.core.upstream_balancer import FAILURE_STATUS_CODES, UpstreamBalancer, create_balancer
 
 _registry: list[Any] = []
 _logger = get_logger("http_client_registry")
 
+_REQUESTS = counter(
+    "http_client_requests_total",
+    "공유 풀 요청 수 (connection: new | reused)",
+    ("upstream", "connection"),
+)
+_POOL_WAIT = histogram(
+    "http_client_pool_wait_seconds",
+    "공유 풀에서 커넥션을 얻기까지 대기 시간(초)",
+    ("upstream",),
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+_CONNECT_SECONDS = histogram(
+    "http_client_connect_seconds",
+    "새 커넥션 연결 시간(초, TCP + TLS)",
+    ("upstream",),
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+
 
 def register(instance: Any) -> None:
     _registry.append(instance)
@@ -19,6 +69,11 @@ def replace(old_instance: Any, new_instance: Any) -> None:
 
 
 async def close_all() -> None:
+    global _shared
+    for balancer in _balancers.values():
+        if balancer is not None:
+            await balancer.aclose()
+    _balancers.clear()
     errors: list[tuple[str, str]] = []
     for instance in _registry:
         if not getattr(instance, "is_closed", False):
@@ -27,5 +82,199 @@ async def close_all() -> None:
             except Exception as e:
                 errors.append((type(instance).__name__, type(e).__name__))
     _registry.clear()
+    if _shared is not None:
+        try:
+            await _shared.aclose_pools()
+        except Exception as e:
+            errors.append(("SharedTransport", type(e).__name__))
+        _shared = None
     if errors:
         _logger.warning("close_all_partial_failure", failures=errors)
+
+
+# ── upstream별 공유 풀 ─────────────────────────────────────────────────────
+
+@functools.lru_cache(maxsize=1)
+def _upstream_names() -> Dict[str, str]:
+    urls = {
+        "database_api": settings.database_api_url,
+        "opensearch_api": settings.opensearch_api_url,
+        "crm": settings.crm_service_url,
+        "recommend_agent": settings.recommend_agent_url,
+        "generate_message_agent": settings.generate_message_agent_url,
+        "data_registration_agent": settings.data_registration_agent_url,
+    }
+    names: Dict[str, str] = {}
+    for name, url in urls.items():
+        names.setdefault(httpx.URL(url).netloc.decode("ascii"), name)
+    return names
+
+
+def upstream_name(url: httpx.URL) -> str:
+    netloc = url.netloc.decode("ascii")
+    return _upstream_names().get(netloc, netloc)
+
+
+_balancers: Dict[str, Optional[UpstreamBalancer]] = {}
+
+
+def get_balancer(upstream: str) -> Optional[UpstreamBalancer]:
+    if upstream not in _balancers:
+        _balancers[upstream] = create_balancer(upstream)
+    return _balancers[upstream]
+
+
+def is_balanced_upstream(url: str | httpx.URL) -> bool:
+    """이 URL의 upstream이 클라이언트 측 balancer로 분산되는지."""
+    return get_balancer(upstream_name(httpx.URL(url))) is not None
+
+
+def is_http2_upstream(url: str | httpx.URL) -> bool:
+    """이 URL의 upstream이 HTTP/2로 연결되는지 — Connection 헤더 같은 HTTP/1.1 전용 처리를 건너뛸 때."""
+    return (
+        upstream_name(httpx.URL(url)) in settings.http2_upstreams
+        and importlib.util.find_spec("h2") is not None
+    )
+
+
+class _RequestTrace:
+    """요청 1건의 httpcore trace — 첫 이벤트 = 커넥션 확보, connect_tcp = 새 커넥션."""
+
+    __slots__ = ("started", "acquired_at", "connect_started", "connect_ended")
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.acquired_at: Optional[float] = None
+        self.connect_started: Optional[float] = None
+        self.connect_ended: Optional[float] = None
+
+    async def __call__(self, name: str, info: dict) -> None:
+        now = time.perf_counter()
+        if self.acquired_at is None:
+            self.acquired_at = now
+        if name == "connection.connect_tcp.started":
+            self.connect_started = now
+        elif name in ("connection.connect_tcp.complete", "connection.start_tls.complete"):
+            self.connect_ended = now
+
+    def record(self, upstream: str) -> None:
+        if self.acquired_at is not None:
+            _POOL_WAIT.observe(self.acquired_at - self.started, upstream=upstream)
+        new = self.connect_started is not None
+        _REQUESTS.inc(upstream=upstream, connection="new" if new else "reused")
+        if new and self.connect_ended is not None:
+            _CONNECT_SECONDS.observe(self.connect_ended - self.connect_started, upstream=upstream)
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """응답 본문을 다 읽고 닫을 때 balancer의 진행 중 요청 수를 돌려준다."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, release: Callable[[], None]):
+        self._stream = stream
+        self._release: Optional[Callable[[], None]] = release
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if self._release is not None:
+                self._release()
+                self._release = None
+
+
+class SharedTransport(httpx.AsyncBaseTransport):
+    """요청 URL의 upstream별 httpx.AsyncHTTPTransport로 보내는 transport (프로세스 공유)."""
+
+    def __init__(self) -> None:
+        self._pools: Dict[tuple[bytes, str], tuple[str, httpx.AsyncHTTPTransport]] = {}
+
+    def _pool(self, url: httpx.URL, upstream: str) -> tuple[str, httpx.AsyncHTTPTransport]:
+        key = (url.raw_scheme, url.netloc.decode("ascii"))
+        entry = self._pools.get(key)
+        if entry is None:
+            max_connections = settings.http_pool_upstream_max_connections.get(
+                upstream, settings.http_pool_max_connections
+            )
+            limits = httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=min(settings.http_pool_max_keepalive, max_connections),
+                keepalive_expiry=settings.http_keepalive_expiry,
+            )
+            http2 = upstream in settings.http2_upstreams
+            if http2 and importlib.util.find_spec("h2") is None:
+                _logger.warning("http2_unavailable", upstream=upstream, reason="h2 package not installed")
+                http2 = False
+            # http:// 에서 HTTP/2는 ALPN이 없으므로 prior knowledge(h2c)
+            http1 = not (http2 and url.scheme == "http")
+            entry = (upstream, httpx.AsyncHTTPTransport(limits=limits, http1=http1, http2=http2))
+            self._pools[key] = entry
+            _logger.info(
+                "http_pool_created", upstream=upstream, host=key[1], http2=http2, max_connections=max_connections,
+            )
+        return entry
+
+    async def _send(self, request: httpx.Request, upstream: str) -> httpx.Response:
+        _, pool = self._pool(request.url, upstream)
+        trace = _RequestTrace()
+        request.extensions["trace"] = trace
+        response = await pool.handle_async_request(request)
+        trace.record(upstream)
+        return response
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        upstream = upstream_name(request.url)
+        balancer = get_balancer(upstream)
+        endpoint = await balancer.acquire() if balancer is not None else None
+        if endpoint is None:
+            return await self._send(request, upstream)
+
+        # Host 헤더는 요청 생성 시 원래 URL로 정해져 있으므로 연결 대상(host:port)만 바꾼다.
+        # https면 SNI·인증서 검증이 endpoint IP가 아니라 원래 호스트명으로 이뤄지도록 sni_hostname을 둔다
+        if endpoint.scheme == "https":
+            request.extensions["sni_hostname"] = request.url.host
+        request.url = request.url.copy_with(scheme=endpoint.scheme, host=endpoint.host, port=endpoint.port)
+        started = time.perf_counter()
+        try:
+            response = await self._send(request, upstream)
+        except httpx.TransportError:
+            balancer.release(endpoint, failed=True)
+            raise
+        except BaseException:
+            balancer.release(endpoint)
+            raise
+        latency = time.perf_counter() - started
+        failed = response.status_code in FAILURE_STATUS_CODES
+        response.stream = _ReleasingStream(
+            response.stream,
+            lambda: balancer.release(endpoint, latency=None if failed else latency, failed=failed),
+        )
+        return response
+
+    async def aclose(self) -> None:
+        # 클라이언트별 aclose()는 공유 풀을 닫지 않는다 — aclose_pools()는 close_all()만 호출
+        return None
+
+    async def aclose_pools(self) -> None:
+        pools = [pool for _, pool in self._pools.values()]
+        self._pools.clear()
+        for pool in pools:
+            await pool.aclose()
+
+
+_shared: Optional[SharedTransport] = None
+
+
+def shared_transport() -> SharedTransport:
+    global _shared
+    if _shared is None:
+        _shared = SharedTransport()
+    return _shared
+
+
+def create_http_client(**kwargs: Any) -> httpx.AsyncClient:
+    """공유 풀을 쓰는 httpx.AsyncClient — 헤더·timeout·event_hooks·base_url은 그대로 넘긴다."""
+    return httpx.AsyncClient(transport=shared_transport(), **kwargs)
@@ -7,6 +7,7 @@ LLM 팩토리
 - OpenAI  : gpt-*, o1-*, o3-*
 - Anthropic: claude-*
 - Google  : gemini-*
+- 로컬 가짜 provider: fake-* (오프라인 벤치마크용, app/core/fake_llm.py)
 """
 
 from functools import lru_cache
@@ -83,6 +84,12 @@ def create_llm(model_name: str, temperature: float = 0, **kwargs) -> BaseChatMod
 
     if model_name.startswith(("gpt-", "o1", "o3", "o4")):
         from langchain_openai import ChatOpenAI
+        # 스트리밍 호출도 usage(cached_tokens 포함)를 마지막 청크로 받아 llm_usage에 기록되게 함
+        kwargs.setdefault("stream_usage", True)
+        if settings.llm_rate_governor_enabled:
+            # 응답의 x-ratelimit-* 헤더를 model별 governor에 반영 (llm_governor)
+            from .llm_governor import provider_http_client
+            kwargs.setdefault("http_async_client", provider_http_client(model_name))
         return ChatOpenAI(model=model_name, temperature=temperature, **kwargs)
 
     elif model_name.startswith("claude-"):
@@ -95,8 +102,15 @@ def create_llm(model_name: str, temperature: float = 0, **kwargs) -> BaseChatMod
         kwargs.pop("reasoning_effort", None)  # Gemini API에 없는 파라미터 — model_kwargs로 새어나가 400 에러 유발
         return ChatGoogleGenerativeAI(model=model_name, temperature=temperature, **kwargs)
 
+    elif model_name.startswith("fake-"):
+        if settings.environment == "production":
+            raise ValueError(f"가짜 LLM 모델({model_name})은 production 환경에서 사용할 수 없습니다.")
+        from .fake_llm import FakeChatModel
+        kwargs.pop("reasoning_effort", None)
+        return FakeChatModel(model=model_name, temperature=temperature, **kwargs)
+
     else:
         raise ValueError(
             f"지원하지 않는 모델명: '{model_name}'. "
-            "지원 접두사: gpt-*, o1*, o3*, o4*, claude-*, gemini-*"
+            "지원 접두사: gpt-*, o1*, o3*, o4*, claude-*, gemini-*, fake-*"
         )
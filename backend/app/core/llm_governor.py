@@ -0,0 +1,359 @@
+"""
+provider·model별 전역 LLM 호출 governor — 호출 지점별 고정 세마포어 대체.
+
+ainvoke_with_retry는 semaphore_key(호출 지점)마다 고정 한도(대부분 40) 세마포어를 뒀다. 호출 지점을
+모두 더하면 provider가 감당하는 양을 넘고, provider가 돌려주는 RPM/TPM 헤더도 무시된다.
+llm_rate_governor_enabled면 호출 지점 세마포어 대신 provider·model마다 governor 1개가
+
+- 요청 수 bucket(RPM)과 추정 토큰 bucket(TPM)을 함께 검사하고 (토큰 = 입력 추정 + 출력 예상치,
+  응답의 usage로 차이를 정산),
+- 응답 헤더(OpenAI x-ratelimit-*, Anthropic anthropic-ratelimit-*)의 limit으로 bucket 크기를,
+  remaining으로 남은 양을 낮춰 맞추며 (여러 프로세스가 같은 조직 한도를 나눠 쓰므로 remaining이 더 정확하다),
+  429·remaining 0이면 retry-after/reset 동안 새 호출을 멈추고,
+- 대기열을 호출 지점 우선순위(llm_call_site_priorities, 0 = 사용자 응답 경로, 클수록 나중)로 처리한다.
+
+OpenAI 모델은 create_llm이 provider_http_client()를 SDK의 HTTP 클라이언트로 넣어 모든 응답 헤더를 받는다.
+다른 provider는 오류(429 등)의 response 헤더만 반영한다.
+"""
+
+import asyncio
+import heapq
+import itertools
+import re
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Mapping, Optional
+
+import httpx
+from langchain_core.messages import BaseMessage
+
+from app.config.settings import settings
+from app.core.logging import get_logger
+from app.core.metrics import counter, gauge, histogram
+from app.core.token_counter import count_message_tokens, count_tokens
+
+_logger = get_logger("llm_governor")
+
+_WAIT_SECONDS = histogram(
+    "llm_governor_wait_seconds",
+    "governor 대기열에서 호출 허가를 받기까지 대기 시간(초)",
+    ("model", "call_site"),
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+)
+_QUEUE_DEPTH = gauge("llm_governor_queue_depth", "governor 대기 중인 호출 수", ("model",))
+_IN_FLIGHT = gauge("llm_governor_in_flight", "governor가 허가해 진행 중인 호출 수", ("model",))
+_LIMIT = gauge("llm_governor_limit_per_minute", "governor bucket 한도 (kind: requests | tokens)", ("model", "kind"))
+_PROVIDER_BLOCKS = counter(
+    "llm_governor_provider_blocks_total",
+    "provider 한도 신호로 새 호출을 멈춘 횟수 (reason: rate_limited | exhausted)",
+    ("model", "reason"),
+)
+
+
+def provider_of(model_name: str) -> str:
+    if model_name.startswith(("gpt-", "o1", "o3", "o4")):
+        return "openai"
+    if model_name.startswith("claude-"):
+        return "anthropic"
+    if model_name.startswith("gemini-"):
+        return "google"
+    if model_name.startswith("fake-"):
+        return "fake"
+    return "unknown"
+
+
+def _model_name(node: Any) -> Optional[str]:
+    for attr in ("model_name", "model"):
+        value = getattr(node, attr, None)
+        if isinstance(value, str) and value:
+            return value
+    return None
+
+
+def find_chat_model(runnable: Any) -> Optional[Any]:
+    """runnable(모델 · with_structured_output · prompt | llm 체인)에서 chat model 객체를 찾는다."""
+    stack = [runnable]
+    for _ in range(32):
+        if not stack:
+            break
+        node = stack.pop()
+        if _model_name(node) is not None:
+            return node
+        for attr in ("bound", "runnable"):
+            child = getattr(node, attr, None)
+            if child is not None:
+                stack.append(child)
+        steps = getattr(node, "steps", None)
+        if isinstance(steps, list):
+            stack.extend(reversed(steps))
+    return None
+
+
+def resolve_model_name(runnable: Any) -> str:
+    """runnable에서 chat model 이름을 찾는다 (못 찾으면 "unknown")."""
+    model = find_chat_model(runnable)
+    return _model_name(model) if model is not None else "unknown"
+
+
+def estimate_input_tokens(input: Any) -> int:
+    """ainvoke 입력(메시지 리스트 · 문자열 · PromptValue · dict)의 토큰 수 근사."""
+    if isinstance(input, str):
+        return count_tokens(input)
+    if hasattr(input, "to_messages"):
+        input = input.to_messages()
+    if isinstance(input, list):
+        messages = [m for m in input if isinstance(m, BaseMessage)]
+        others = [m for m in input if not isinstance(m, BaseMessage)]
+        return count_message_tokens(messages) + sum(estimate_input_tokens(m) for m in others)
+    if isinstance(input, dict):
+        return sum(estimate_input_tokens(v) for v in input.values())
+    return count_tokens(str(input))
+
+
+# ── 헤더 파싱 ─────────────────────────────────────────────────────────────
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def parse_reset(value: Optional[str]) -> Optional[float]:
+    """reset 헤더 → 남은 초. OpenAI "6m0s"·"20ms", Anthropic RFC 3339 시각, 숫자(초) 모두 허용."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if parts and "".join(n + u for n, u in parts) == value:
+        return sum(float(n) * _DURATION_UNITS[u] for n, u in parts)
+    try:
+        reset_at = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return max((reset_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def _header_int(headers: Mapping[str, str], *names: str) -> Optional[int]:
+    for name in names:
+        value = headers.get(name)
+        if value is not None:
+            try:
+                return int(float(value))
+            except ValueError:
+                return None
+    return None
+
+
+# ── governor ─────────────────────────────────────────────────────────────
+
+class _Bucket:
+    """분당 한도 token bucket. level이 음수(부채)가 될 수 있다 — 추정보다 큰 실사용량 정산."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.level = float(per_minute)
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.capacity / 60.0)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        self._refill(now)
+        need = min(amount, self.capacity) - self.level
+        return need * 60.0 / self.capacity if need > 0 else 0.0
+
+    def take(self, amount: float, now: float) -> None:
+        self._refill(now)
+        self.level -= amount
+
+    def set_capacity(self, per_minute: float, now: float) -> None:
+        self._refill(now)
+        self.capacity = float(per_minute)
+        self.level = min(self.level, self.capacity)
+
+    def clamp(self, remaining: float, now: float) -> None:
+        self._refill(now)
+        self.level = min(self.level, float(remaining))
+
+
+class LLMRateGovernor:
+    """provider·model 1개의 요청/토큰 bucket + 우선순위 대기열 (이벤트 루프 1개 전제)."""
+
+    def __init__(self, model: str, *, rpm: int, tpm: int, max_concurrency: int):
+        self.model = model
+        self.requests = _Bucket(rpm)
+        self.tokens = _Bucket(tpm)
+        self.max_concurrency = max_concurrency
+        self._in_flight = 0
+        self._blocked_until = 0.0
+        self._waiters: list = []
+        self._seq = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._timer_at = 0.0
+        _LIMIT.set(rpm, model=model, kind="requests")
+        _LIMIT.set(tpm, model=model, kind="tokens")
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    async def acquire(self, tokens: int, priority: int, call_site: str) -> None:
+        """bucket·동시성 여유가 생길 때까지 우선순위 순서로 기다린 뒤 요청 1건·tokens를 차감."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), future, tokens))
+        started = time.perf_counter()
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # 허가 직후 취소 — 자리만 돌려준다 (차감한 bucket은 그대로)
+                self._release_slot()
+            raise
+        finally:
+            _WAIT_SECONDS.observe(time.perf_counter() - started, model=self.model, call_site=call_site)
+            _QUEUE_DEPTH.set(len(self._waiters), model=self.model)
+
+    def release(self, estimated_tokens: int, actual_tokens: Optional[int]) -> None:
+        """호출 종료 — usage가 보고됐으면 추정과의 차이를 토큰 bucket에 정산."""
+        if actual_tokens:
+            now = time.monotonic()
+            self.tokens.take(actual_tokens - estimated_tokens, now)
+        self._release_slot()
+
+    def _release_slot(self) -> None:
+        self._in_flight -= 1
+        _IN_FLIGHT.set(self._in_flight, model=self.model)
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        now = time.monotonic()
+        while self._waiters:
+            _, _, future, tokens = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            if self._in_flight >= self.max_concurrency:
+                break
+            wait = max(
+                self._blocked_until - now,
+                self.requests.wait_time(1, now),
+                self.tokens.wait_time(tokens, now),
+            )
+            if wait > 0:
+                self._schedule(wait, now)
+                break
+            heapq.heappop(self._waiters)
+            self.requests.take(1, now)
+            self.tokens.take(tokens, now)
+            self._in_flight += 1
+            future.set_result(None)
+        _QUEUE_DEPTH.set(len(self._waiters), model=self.model)
+        _IN_FLIGHT.set(self._in_flight, model=self.model)
+
+    def _schedule(self, wait: float, now: float) -> None:
+        at = now + wait
+        if self._timer is not None and self._timer_at <= at:
+            return
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer_at = at
+        self._timer = asyncio.get_running_loop().call_later(wait, self._on_timer)
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        self._dispatch()
+
+    def _block(self, seconds: float, reason: str) -> None:
+        until = time.monotonic() + seconds
+        if until > self._blocked_until:
+            self._blocked_until = until
+            _PROVIDER_BLOCKS.inc(model=self.model, reason=reason)
+            _logger.warning("llm_governor_provider_block", model=self.model, reason=reason, seconds=round(seconds, 3))
+
+    def observe_headers(self, headers: Mapping[str, str], status_code: Optional[int] = None) -> None:
+        """provider 응답 헤더로 bucket 보정. 429면 retry-after(없으면 1초) 동안 멈춘다."""
+        now = time.monotonic()
+        limit_requests = _header_int(headers, "x-ratelimit-limit-requests", "anthropic-ratelimit-requests-limit")
+        limit_tokens = _header_int(headers, "x-ratelimit-limit-tokens", "anthropic-ratelimit-tokens-limit")
+        remaining_requests = _header_int(
+            headers, "x-ratelimit-remaining-requests", "anthropic-ratelimit-requests-remaining"
+        )
+        remaining_tokens = _header_int(headers, "x-ratelimit-remaining-tokens", "anthropic-ratelimit-tokens-remaining")
+
+        if limit_requests and limit_requests != self.requests.capacity:
+            self.requests.set_capacity(limit_requests, now)
+            _LIMIT.set(limit_requests, model=self.model, kind="requests")
+        if limit_tokens and limit_tokens != self.tokens.capacity:
+            self.tokens.set_capacity(limit_tokens, now)
+            _LIMIT.set(limit_tokens, model=self.model, kind="tokens")
+        if remaining_requests is not None:
+            self.requests.clamp(remaining_requests, now)
+            if remaining_requests <= 0:
+                reset = parse_reset(
+                    headers.get("x-ratelimit-reset-requests") or headers.get("anthropic-ratelimit-requests-reset")
+                )
+                self._block(reset if reset is not None else 1.0, "exhausted")
+        if remaining_tokens is not None:
+            self.tokens.clamp(remaining_tokens, now)
+            if remaining_tokens <= 0:
+                reset = parse_reset(
+                    headers.get("x-ratelimit-reset-tokens") or headers.get("anthropic-ratelimit-tokens-reset")
+                )
+                self._block(reset if reset is not None else 1.0, "exhausted")
+        if status_code == 429:
+            retry_after = parse_reset(headers.get("retry-after"))
+            self._block(retry_after if retry_after is not None else 1.0, "rate_limited")
+        if self._waiters:
+            self._dispatch()
+
+    def observe_error(self, error: BaseException) -> None:
+        """SDK 예외의 response(429 등) 헤더 반영 — HTTP 훅이 없는 provider용."""
+        response = getattr(error, "response", None)
+        headers = getattr(response, "headers", None)
+        if headers is not None:
+            self.observe_headers(headers, getattr(response, "status_code", None))
+        elif type(error).__name__ == "RateLimitError":
+            self._block(1.0, "rate_limited")
+
+
+_governors: Dict[str, LLMRateGovernor] = {}
+_http_clients: Dict[str, httpx.AsyncClient] = {}
+
+
+def get_governor(model: str) -> LLMRateGovernor:
+    governor = _governors.get(model)
+    if governor is None:
+        governor = _governors[model] = LLMRateGovernor(
+            model,
+            rpm=settings.llm_governor_default_rpm,
+            tpm=settings.llm_governor_default_tpm,
+            max_concurrency=settings.llm_governor_max_concurrency,
+        )
+        _logger.info("llm_governor_created", model=model, provider=provider_of(model))
+    return governor
+
+
+def call_site_priority(call_site: str) -> int:
+    return settings.llm_call_site_priorities.get(call_site, 0)
+
+
+def provider_http_client(model: str) -> httpx.AsyncClient:
+    """provider SDK용 HTTP 클라이언트 — 모든 응답 헤더를 model의 governor에 넘긴다 (model별 1개 공유)."""
+    client = _http_clients.get(model)
+    if client is None or client.is_closed:
+        governor = get_governor(model)
+
+        async def observe(response: httpx.Response) -> None:
+            governor.observe_headers(response.headers, response.status_code)
+
+        client = _http_clients[model] = httpx.AsyncClient(
+            timeout=settings.llm_timeout,
+            limits=httpx.Limits(max_connections=1000, max_keepalive_connections=100),
+            event_hooks={"response": [observe]},
+        )
+    return client
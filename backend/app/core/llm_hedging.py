@@ -0,0 +1,123 @@
+"""
+LLM hedged request — 느린 호출에 중복 요청을 보내 먼저 온 결과를 쓴다.
+
+chat 파이프라인의 꼬리 지연은 가끔 느린 LLM 호출이 만든다. ainvoke_with_retry는 시도 전체가
+타임아웃(llm_call_timeout)에 걸려야 재시도한다. llm_hedge_call_sites에 있는 호출 지점은
+
+- 최근 성공 호출 지연(llm_hedge_window개)의 llm_hedge_percentile(기본 p95)을 넘도록 응답이 없으면
+  같은 요청을 한 번 더 보내고 (llm_hedge_fallback_models에 대체 모델이 있으면 그 모델로),
+- 먼저 성공한 결과를 쓰고 나머지는 취소한다 (한쪽이 실패하면 다른 쪽을 기다린다).
+- hedge 수는 호출 지점별 budget으로 전체 호출의 llm_hedge_budget_ratio 이하로 묶는다 — 호출마다
+  ratio만큼 적립하고 hedge 1번에 1을 쓴다. provider가 전반적으로 느려져도 부하가 크게 늘지 않는다.
+
+관측 표본이 llm_hedge_min_samples보다 적으면 hedge하지 않는다. 스트리밍 호출(astream_with_early_abort)은
+토큰이 이미 흘러가므로 대상이 아니다. ainvoke라도 그래프의 astream_events가 토큰을 사용자에게 그대로
+전달하는 호출(supervisor_final_answer)은 hedge를 보내면 두 생성의 on_chat_model_stream이 섞여
+token 프레임에 진 쪽 텍스트까지 남으므로, llm_hedge_call_sites에 넣어도 hedge하지 않는다.
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, Optional, TypeVar
+
+from app.config.settings import settings
+from app.core.logging import get_logger
+from app.core.metrics import counter, gauge
+
+_logger = get_logger("llm_hedging")
+
+T = TypeVar("T")
+
+_HEDGES = counter(
+    "llm_hedges_total",
+    "hedge 판단 수 (outcome: fired | budget_exhausted)",
+    ("call_site", "outcome"),
+)
+_WINS = counter(
+    "llm_hedge_wins_total",
+    "hedge를 보낸 호출에서 먼저 성공한 쪽 (winner: primary | hedge)",
+    ("call_site", "winner"),
+)
+_DELAY = gauge("llm_hedge_delay_seconds", "현재 hedge 발사 기준 지연(관측 백분위)", ("call_site",))
+
+# 적립 상한 — 조용하던 호출 지점이 갑자기 느려질 때 hedge가 한꺼번에 몰리지 않게
+_MAX_BUDGET_CREDITS = 10.0
+
+
+class _SiteStats:
+    def __init__(self, window: int):
+        self.latencies: Deque[float] = deque(maxlen=window)
+        self.credits = 0.0
+
+    def delay(self) -> Optional[float]:
+        if len(self.latencies) < settings.llm_hedge_min_samples:
+            return None
+        ordered = sorted(self.latencies)
+        idx = min(int(len(ordered) * settings.llm_hedge_percentile), len(ordered) - 1)
+        return max(ordered[idx], settings.llm_hedge_min_delay_seconds)
+
+
+_sites: Dict[str, _SiteStats] = {}
+
+
+def _stats(call_site: str) -> _SiteStats:
+    stats = _sites.get(call_site)
+    if stats is None:
+        stats = _sites[call_site] = _SiteStats(settings.llm_hedge_window)
+    return stats
+
+
+# 응답 토큰이 chat_stream의 token 프레임으로 사용자에게 나가는 호출 지점 — hedge 대상에서 제외
+_USER_STREAMED_CALL_SITES = frozenset({"supervisor_final_answer"})
+
+
+def is_hedged(call_site: str) -> bool:
+    return call_site in settings.llm_hedge_call_sites and call_site not in _USER_STREAMED_CALL_SITES
+
+
+async def hedged_call(
+    call_site: str,
+    primary: Callable[[], Awaitable[T]],
+    hedge: Callable[[], Awaitable[T]],
+) -> T:
+    """primary를 실행하고, 관측 백분위 지연을 넘기면 budget 안에서 hedge를 추가로 실행해 먼저 성공한 결과를 반환."""
+    stats = _stats(call_site)
+    stats.credits = min(stats.credits + settings.llm_hedge_budget_ratio, _MAX_BUDGET_CREDITS)
+    delay = stats.delay()
+    if delay is not None:
+        _DELAY.set(delay, call_site=call_site)
+
+    started = time.perf_counter()
+    primary_task = asyncio.ensure_future(primary())
+    tasks: Dict[asyncio.Future, str] = {primary_task: "primary"}
+    try:
+        if delay is not None:
+            done, _ = await asyncio.wait({primary_task}, timeout=delay)
+            if not done:
+                if stats.credits >= 1.0:
+                    stats.credits -= 1.0
+                    _HEDGES.inc(call_site=call_site, outcome="fired")
+                    _logger.info("llm_hedge_fired", call_site=call_site, delay_ms=round(delay * 1000))
+                    tasks[asyncio.ensure_future(hedge())] = "hedge"
+                else:
+                    _HEDGES.inc(call_site=call_site, outcome="budget_exhausted")
+
+        pending = set(tasks)
+        first_error: Optional[BaseException] = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if len(tasks) > 1:
+                        _WINS.inc(call_site=call_site, winner=tasks[task])
+                    stats.latencies.append(time.perf_counter() - started)
+                    return task.result()
+                if first_error is None or tasks[task] == "primary":
+                    first_error = task.exception()
+        assert first_error is not None
+        raise first_error
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
@@ -0,0 +1,100 @@
+"""
+LLM 호출 지점별 토큰 사용량·프롬프트 캐시 적중 기록.
+
+OpenAI(자동 prefix 캐시)·Anthropic(cache_read/cache_creation)은 LangChain의
+``usage_metadata.input_token_details``로 정규화되어 들어온다. 호출 지점(call_site,
+= ainvoke_with_retry의 semaphore_key)마다 입력/캐시 적중/캐시 생성/출력 토큰을
+메트릭에 누적하고 ``llm_usage`` 로그로 남긴다.
+
+핸들러는 ContextVar + ``register_configure_hook``으로 주입한다. runnable.ainvoke에
+callbacks를 직접 넘기면 상위 그래프의 콜백(LangSmith 트레이싱, astream_events)이
+덮어써지므로, LangChain이 CallbackManager를 구성할 때 ContextVar 값을 자동으로
+추가하는 훅을 쓴다 (get_openai_callback과 같은 방식).
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, Optional
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from langchain_core.tracers.context import register_configure_hook
+
+from .logging import get_logger
+from .metrics import counter
+
+_logger = get_logger("llm_usage")
+
+_INPUT_TOKENS = counter("llm_input_tokens_total", "LLM 입력 토큰 수", ("call_site",))
+_CACHED_TOKENS = counter("llm_cached_input_tokens_total", "provider 프롬프트 캐시 적중 입력 토큰 수", ("call_site",))
+_CACHE_CREATION_TOKENS = counter("llm_cache_creation_input_tokens_total", "provider 프롬프트 캐시 생성 입력 토큰 수", ("call_site",))
+_OUTPUT_TOKENS = counter("llm_output_tokens_total", "LLM 출력 토큰 수", ("call_site",))
+_CALLS = counter("llm_usage_reported_calls_total", "usage_metadata가 보고된 LLM 호출 수", ("call_site",))
+
+
+class _UsageCallbackHandler(BaseCallbackHandler):
+    # 동기 핸들러를 executor로 넘기지 않고 이벤트 루프에서 바로 실행
+    run_inline = True
+
+    def __init__(self, call_site: str):
+        self.call_site = call_site
+        # 블록 안 호출들의 토큰 합계 (llm_governor 토큰 bucket 정산, llm_utils 호출별 히스토그램용)
+        self.reported_calls = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.cached_tokens = 0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.input_tokens + self.output_tokens
+
+    def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
+        for generations in response.generations:
+            for gen in generations:
+                usage = getattr(getattr(gen, "message", None), "usage_metadata", None)
+                if usage:
+                    record_usage(self.call_site, usage)
+                    self.reported_calls += 1
+                    self.input_tokens += usage.get("input_tokens") or 0
+                    self.output_tokens += usage.get("output_tokens") or 0
+                    self.cached_tokens += (usage.get("input_token_details") or {}).get("cache_read") or 0
+
+
+_usage_handler_var: ContextVar[Optional[_UsageCallbackHandler]] = ContextVar("llm_usage_handler", default=None)
+register_configure_hook(_usage_handler_var, inheritable=True)
+
+
+def record_usage(call_site: str, usage: dict) -> None:
+    """usage_metadata(dict) 하나를 메트릭·로그에 반영."""
+    input_tokens = usage.get("input_tokens") or 0
+    output_tokens = usage.get("output_tokens") or 0
+    details = usage.get("input_token_details") or {}
+    cached = details.get("cache_read") or 0
+    cache_creation = details.get("cache_creation") or 0
+
+    _CALLS.inc(call_site=call_site)
+    _INPUT_TOKENS.inc(input_tokens, call_site=call_site)
+    _OUTPUT_TOKENS.inc(output_tokens, call_site=call_site)
+    _CACHED_TOKENS.inc(cached, call_site=call_site)
+    _CACHE_CREATION_TOKENS.inc(cache_creation, call_site=call_site)
+
+    _logger.info(
+        "llm_usage",
+        call_site=call_site,
+        input_tokens=input_tokens,
+        cached_tokens=cached,
+        cache_creation_tokens=cache_creation,
+        output_tokens=output_tokens,
+        cache_hit_ratio=round(cached / input_tokens, 3) if input_tokens else 0.0,
+    )
+
+
+@contextmanager
+def track_llm_usage(call_site: str) -> Iterator[_UsageCallbackHandler]:
+    """블록 안에서 실행되는 LLM 호출의 usage를 call_site로 집계. 핸들러(토큰 합계)를 돌려준다."""
+    handler = _UsageCallbackHandler(call_site)
+    token = _usage_handler_var.set(handler)
+    try:
+        yield handler
+    finally:
+        _usage_handler_var.reset(token)
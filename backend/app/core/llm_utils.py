@@ -1,8 +1,53 @@
 import asyncio
+import contextlib
 import random
-from typing import Any
+import time
+from typing import Any, AsyncIterator, Callable, Optional
+from langchain_core.language_models import BaseChatModel
 from langchain_core.runnables import Runnable
 from ..config.settings import settings
+from .llm_factory import get_llm
+from .llm_governor import call_site_priority, estimate_input_tokens, find_chat_model, get_governor, resolve_model_name
+from .llm_hedging import hedged_call, is_hedged
+from .llm_usage import track_llm_usage
+from .metrics import counter, histogram
+
+_CANCELLED_CALLS = counter(
+    "llm_calls_cancelled_total",
+    "응답을 받기 전에 취소된 LLM 호출 수 (요청자 연결 종료·A2A tasks/cancel)",
+    ("call_site",),
+)
+
+# 호출 지점·모델별 텔레메트리 — 세마포어 대기 / provider 지연(시도) / 첫 토큰 / 전체 지연 / 토큰 / 재시도
+_LATENCY_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0)
+_TOKEN_BUCKETS = (16, 64, 256, 512, 1024, 2048, 4096, 8192, 16384, 32768, 65536, 131072)
+_SEMAPHORE_WAIT = histogram(
+    "llm_call_semaphore_wait_seconds",
+    "호출 지점 세마포어 획득까지 대기 시간(초) — governor 모드의 대기는 llm_governor_wait_seconds",
+    ("call_site", "model"),
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+)
+_ATTEMPT_SECONDS = histogram(
+    "llm_call_attempt_seconds",
+    "LLM 호출 시도 1회의 provider 응답 시간(초) (outcome: ok | error | cancelled)",
+    ("call_site", "model", "outcome"),
+    buckets=_LATENCY_BUCKETS,
+)
+_TTFT_SECONDS = histogram(
+    "llm_call_ttft_seconds", "스트리밍 호출 시도의 첫 토큰까지 시간(초)", ("call_site", "model"), buckets=_LATENCY_BUCKETS,
+)
+_CALL_SECONDS = histogram(
+    "llm_call_duration_seconds",
+    "LLM 호출 전체 시간(초) — 대기·재시도·백오프 포함 (outcome: ok | error | cancelled)",
+    ("call_site", "model", "outcome"),
+    buckets=_LATENCY_BUCKETS,
+)
+_INPUT_TOKENS = histogram("llm_call_input_tokens", "시도당 입력 토큰 수", ("call_site", "model"), buckets=_TOKEN_BUCKETS)
+_OUTPUT_TOKENS = histogram("llm_call_output_tokens", "시도당 출력 토큰 수", ("call_site", "model"), buckets=_TOKEN_BUCKETS)
+_CACHED_TOKENS = histogram(
+    "llm_call_cached_input_tokens", "시도당 provider 캐시 적중 입력 토큰 수", ("call_site", "model"), buckets=_TOKEN_BUCKETS,
+)
+_RETRIES = histogram("llm_call_retries", "호출당 재시도 횟수", ("call_site", "model"), buckets=(0, 1, 2, 3, 5, 10))
 
 
 async def ainvoke_with_timeout(runnable: Runnable, input: Any, timeout: float | None = None) -> Any:
@@ -26,6 +71,74 @@ def _get_semaphore(key: str, limit: int) -> asyncio.Semaphore:
     return _semaphores[key]
 
 
+@contextlib.asynccontextmanager
+async def _call_site_slot(key: str, limit: int, model: str) -> AsyncIterator[None]:
+    """호출 지점 동시성 제한 — llm_rate_governor_enabled면 시도마다 governor가 대신 제한한다."""
+    if settings.llm_rate_governor_enabled:
+        yield
+        return
+    started = time.perf_counter()
+    async with _get_semaphore(key, limit):
+        _SEMAPHORE_WAIT.observe(time.perf_counter() - started, call_site=key, model=model)
+        yield
+
+
+@contextlib.asynccontextmanager
+async def _llm_attempt(runnable: Runnable, input: Any, call_site: str) -> AsyncIterator[None]:
+    """LLM 호출 시도 1회 — usage·지연 기록, governor가 켜져 있으면 provider·model 한도 허가를 받고 정산."""
+    model = resolve_model_name(runnable)
+    governor = None
+    tokens = 0
+    if settings.llm_rate_governor_enabled:
+        governor = get_governor(model)
+        tokens = estimate_input_tokens(input) + settings.llm_governor_output_token_estimate
+        await governor.acquire(tokens, call_site_priority(call_site), call_site)
+
+    started = time.perf_counter()
+    outcome = "error"
+    usage = None
+    try:
+        with track_llm_usage(call_site) as usage:
+            yield
+        outcome = "ok"
+    except asyncio.CancelledError:
+        outcome = "cancelled"
+        raise
+    except Exception as e:
+        if governor is not None:
+            governor.observe_error(e)
+        raise
+    finally:
+        _ATTEMPT_SECONDS.observe(time.perf_counter() - started, call_site=call_site, model=model, outcome=outcome)
+        if usage is not None and usage.reported_calls:
+            _INPUT_TOKENS.observe(usage.input_tokens, call_site=call_site, model=model)
+            _OUTPUT_TOKENS.observe(usage.output_tokens, call_site=call_site, model=model)
+            _CACHED_TOKENS.observe(usage.cached_tokens, call_site=call_site, model=model)
+        if governor is not None:
+            governor.release(tokens, usage.total_tokens if usage is not None else None)
+
+
+def _observe_call(call_site: str, model: str, outcome: str, started: float, attempts: int) -> None:
+    _CALL_SECONDS.observe(time.perf_counter() - started, call_site=call_site, model=model, outcome=outcome)
+    _RETRIES.observe(max(attempts - 1, 0), call_site=call_site, model=model)
+
+
+def _hedge_runnable(
+    runnable: Runnable, call_site: str, hedge_builder: Optional[Callable[[BaseChatModel], Runnable]],
+) -> Runnable:
+    """hedge 요청에 쓸 runnable — 대체 모델이 설정돼 있고 hedge_builder가 있으면 그 모델로 다시 구성한다."""
+    fallback = settings.llm_hedge_fallback_models.get(call_site)
+    if not fallback or hedge_builder is None:
+        return runnable
+    model = find_chat_model(runnable)
+    return hedge_builder(get_llm(fallback, temperature=getattr(model, "temperature", None) or 0))
+
+
+async def _invoke_attempt(runnable: Runnable, input: Any, call_site: str) -> Any:
+    async with _llm_attempt(runnable, input, call_site):
+        return await runnable.ainvoke(input)
+
+
 async def ainvoke_with_retry(
     runnable: Runnable,
     input: Any,
@@ -37,6 +150,7 @@ async def ainvoke_with_retry(
     logger,
     retry_event: str,
     timeout: float | None = None,
+    hedge_builder: Optional[Callable[[BaseChatModel], Runnable]] = None,
 ) -> Any:
     """provider 무관 재시도 + 호출 지점별 전용 동시성 제한 + Full Jitter 백오프.
 
@@ -45,17 +159,137 @@ async def ainvoke_with_retry(
     supervisor_agent 최종 응답 호출 42건 발생). semaphore_key별로 세마포어를
     lazy 생성해 호출 지점마다 독립적인 동시성 한도를 두고, 재시도 대기는 고정
     백오프 대신 0~상한 사이 무작위(Full Jitter)로 흩어 재시도 자체가 다시
-    부하를 만드는 "재시도 동기화"를 막는다.
+    부하를 만드는 "재시도 동기화"를 막는다. 토큰·프롬프트 캐시 사용량은 semaphore_key를
+    호출 지점 라벨로 삼아 llm_usage에 기록한다.
+
+    llm_rate_governor_enabled면 호출 지점 세마포어(max_concurrency) 대신 시도마다
+    provider·model별 governor(llm_governor)의 RPM/TPM·우선순위 허가를 받는다.
+
+    semaphore_key가 llm_hedge_call_sites에 있으면 시도마다 관측 백분위 지연을 넘길 때 중복
+    요청을 보내 먼저 성공한 결과를 쓴다(llm_hedging). hedge_builder는 chat model을 받아 이
+    호출의 runnable을 다시 구성하는 함수(예: ``lambda m: m.with_structured_output(X)``)로,
+    llm_hedge_fallback_models에 대체 모델이 있을 때 hedge 요청을 그 모델로 보내는 데 쓴다.
+    timeout은 hedge를 포함한 시도 전체에 적용된다. 토큰이 astream_events로 사용자에게 나가는
+    supervisor_final_answer는 두 생성이 함께 스트리밍되므로 hedge하지 않는다.
+
+    호출 지점·모델별로 세마포어 대기, 시도별 provider 지연·토큰, 전체 지연, 재시도 횟수를
+    히스토그램(llm_call_*)에 기록한다 — 각 서버의 /metrics로 노출된다.
     """
-    async with _get_semaphore(semaphore_key, max_concurrency):
-        for attempt in range(1, max_retries + 1):
-            try:
-                return await ainvoke_with_timeout(runnable, input, timeout=timeout)
-            except Exception as e:
-                is_retryable = type(e).__name__ in _RETRYABLE_LLM_ERROR_NAMES
-                if is_retryable and attempt < max_retries:
-                    base = backoff_base * (2 ** (attempt - 1))
-                    logger.warning(retry_event, error_type=type(e).__name__, attempt=attempt)
-                    await asyncio.sleep(random.uniform(0, base))
+    hedge_target = _hedge_runnable(runnable, semaphore_key, hedge_builder) if is_hedged(semaphore_key) else None
+    t = timeout if timeout is not None else settings.llm_call_timeout
+    model = resolve_model_name(runnable)
+    started = time.perf_counter()
+    attempt = 0
+    outcome = "error"
+    try:
+        async with _call_site_slot(semaphore_key, max_concurrency, model):
+            for attempt in range(1, max_retries + 1):
+                try:
+                    if hedge_target is not None:
+                        result = await asyncio.wait_for(hedged_call(
+                            semaphore_key,
+                            lambda: _invoke_attempt(runnable, input, semaphore_key),
+                            lambda: _invoke_attempt(hedge_target, input, semaphore_key),
+                        ), timeout=t)
+                    else:
+                        async with _llm_attempt(runnable, input, semaphore_key):
+                            result = await ainvoke_with_timeout(runnable, input, timeout=timeout)
+                    outcome = "ok"
+                    return result
+                except asyncio.CancelledError:
+                    _CANCELLED_CALLS.inc(call_site=semaphore_key)
+                    outcome = "cancelled"
+                    raise
+                except Exception as e:
+                    is_retryable = type(e).__name__ in _RETRYABLE_LLM_ERROR_NAMES
+                    if is_retryable and attempt < max_retries:
+                        base = backoff_base * (2 ** (attempt - 1))
+                        logger.warning(retry_event, error_type=type(e).__name__, attempt=attempt)
+                        await asyncio.sleep(random.uniform(0, base))
+                        continue
+                    raise
+    finally:
+        _observe_call(semaphore_key, model, outcome, started, attempt)
+
+
+def _chunk_text(chunk: Any) -> str:
+    content = chunk.content if hasattr(chunk, "content") else chunk
+    if isinstance(content, str):
+        return content
+    # Anthropic 등 content block 리스트 응답
+    if isinstance(content, list):
+        return "".join(b.get("text", "") if isinstance(b, dict) else str(b) for b in content)
+    return str(content)
+
+
+async def astream_with_early_abort(
+    runnable: Runnable,
+    input: Any,
+    *,
+    make_check: Optional[Callable[[], Callable[[str], Optional[str]]]],
+    semaphore_key: str,
+    max_concurrency: int,
+    max_retries: int,
+    backoff_base: float,
+    logger,
+    retry_event: str,
+    timeout: float | None = None,
+) -> tuple[str, Optional[str]]:
+    """ainvoke_with_retry의 스트리밍 버전 — 청크마다 검사 함수를 돌려 위반 시 즉시 스트림을 닫는다.
+
+    make_check는 시도마다 새 검사 함수(청크 → 위반 사유 또는 None)를 만든다(재시도 시
+    누적 상태 초기화). None이면 검사 없이 끝까지 받는다. 세마포어·재시도·Full Jitter
+    정책은 ainvoke_with_retry와 동일하며, timeout은 시도당 스트림 전체에 적용된다.
+    토큰을 이미 흘려보내는 호출이라 hedge(llm_hedging)는 하지 않는다.
+
+    Returns:
+        ``(text, abort_reason)`` — 끝까지 받았으면 abort_reason은 None.
+    """
+    model = resolve_model_name(runnable)
+
+    async def consume() -> tuple[str, Optional[str]]:
+        check = make_check() if make_check is not None else None
+        parts: list[str] = []
+        attempt_started = time.perf_counter()
+        stream = runnable.astream(input)
+        try:
+            async for chunk in stream:
+                text = _chunk_text(chunk)
+                if not text:
                     continue
-                raise
+                if not parts:
+                    _TTFT_SECONDS.observe(time.perf_counter() - attempt_started, call_site=semaphore_key, model=model)
+                parts.append(text)
+                if check is not None and (reason := check(text)):
+                    return "".join(parts), reason
+        finally:
+            # 조기 중단 시 provider 스트림 연결을 바로 닫아 남은 토큰 생성을 멈춘다
+            await stream.aclose()
+        return "".join(parts), None
+
+    t = timeout if timeout is not None else settings.llm_call_timeout
+    started = time.perf_counter()
+    attempt = 0
+    outcome = "error"
+    try:
+        async with _call_site_slot(semaphore_key, max_concurrency, model):
+            for attempt in range(1, max_retries + 1):
+                try:
+                    async with _llm_attempt(runnable, input, semaphore_key):
+                        result = await asyncio.wait_for(consume(), timeout=t)
+                    outcome = "ok"
+                    return result
+                except asyncio.CancelledError:
+                    _CANCELLED_CALLS.inc(call_site=semaphore_key)
+                    outcome = "cancelled"
+                    raise
+                except Exception as e:
+                    is_retryable = type(e).__name__ in _RETRYABLE_LLM_ERROR_NAMES
+                    if is_retryable and attempt < max_retries:
+                        base = backoff_base * (2 ** (attempt - 1))
+                        logger.warning(retry_event, error_type=type(e).__name__, attempt=attempt)
+                        await asyncio.sleep(random.uniform(0, base))
+                        continue
+                    raise
+    finally:
+        _observe_call(semaphore_key, model, outcome, started, attempt)
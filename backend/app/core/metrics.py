@@ -0,0 +1,207 @@
+"""
+프로세스 내 경량 메트릭 레지스트리 (Prometheus 텍스트 포맷 호환).
+
+prometheus_client 의존성 없이 Counter / Gauge / Histogram 세 종류만 제공한다.
+각 서버 프로세스가 자기 레지스트리를 가지며, ``render_prometheus()`` 결과를
+그대로 /metrics 응답 본문으로 쓸 수 있다.
+
+사용 예:
+    _CACHED_TOKENS = counter("llm_cached_input_tokens_total", "provider 캐시 적중 입력 토큰", ("call_site",))
+    _CACHED_TOKENS.inc(512, call_site="generate_crm_message")
+
+단일 이벤트 루프 스레드에서 갱신한다는 전제지만, 스레드 풀 콜백에서 올 수 있어 갱신은 락으로 보호한다.
+"""
+
+import math
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+LabelKey = Tuple[str, ...]
+
+_DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0,
+)
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str], extra: Optional[Dict[str, str]] = None) -> str:
+    pairs = [f'{n}="{_escape_label_value(str(v))}"' for n, v in zip(names, values)]
+    if extra:
+        pairs += [f'{n}="{_escape_label_value(v)}"' for n, v in extra.items()]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    type_name = ""
+
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelKey:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name}: 라벨 불일치 (기대 {self.labelnames}, 입력 {tuple(labels)})")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type_name}"]
+
+
+class Counter(_Metric):
+    type_name = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        if amount < 0:
+            raise ValueError(f"{self.name}: Counter는 감소할 수 없습니다")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Gauge(_Metric):
+    type_name = "gauge"
+
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[LabelKey, float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = _DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # key → (버킷별 개수(비누적), 합계, 총 개수)
+        self._data: Dict[LabelKey, Tuple[List[int], float, int]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            counts, total, n = self._data.get(key) or ([0] * len(self.buckets), 0.0, 0)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            self._data[key] = (counts, total + value, n + 1)
+
+    def count(self, **labels: str) -> int:
+        data = self._data.get(self._key(labels))
+        return data[2] if data else 0
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock:
+            items = [(k, (list(c), s, n)) for k, (c, s, n) in self._data.items()]
+        for key, (counts, total, n) in items:
+            cumulative = 0
+            for bound, c in zip(self.buckets, counts):
+                cumulative += c
+                labels = _format_labels(self.labelnames, key, {"le": _format_value(bound)})
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key, {"le": "+Inf"})
+            lines.append(f"{self.name}_bucket{labels} {n}")
+            base = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{base} {_format_value(total)}")
+            lines.append(f"{self.name}_count{base} {n}")
+        return lines
+
+
+_registry: Dict[str, _Metric] = {}
+_registry_lock = threading.Lock()
+
+
+def _get_or_create(cls, name: str, help: str, labelnames: Tuple[str, ...], **kwargs):
+    with _registry_lock:
+        metric = _registry.get(name)
+        if metric is None:
+            metric = cls(name, help, tuple(labelnames), **kwargs)
+            _registry[name] = metric
+        elif not isinstance(metric, cls) or metric.labelnames != tuple(labelnames):
+            raise ValueError(f"메트릭 {name}이 다른 타입/라벨로 이미 등록되어 있습니다")
+        return metric
+
+
+def counter(name: str, help: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+    return _get_or_create(Counter, name, help, labelnames)
+
+
+def gauge(name: str, help: str, labelnames: Tuple[str, ...] = ()) -> Gauge:
+    return _get_or_create(Gauge, name, help, labelnames)
+
+
+def histogram(
+    name: str,
+    help: str,
+    labelnames: Tuple[str, ...] = (),
+    buckets: Tuple[float, ...] = _DEFAULT_BUCKETS,
+) -> Histogram:
+    return _get_or_create(Histogram, name, help, labelnames, buckets=buckets)
+
+
+def render_prometheus() -> str:
+    """등록된 전체 메트릭을 Prometheus text exposition format(0.0.4)으로 렌더링."""
+    with _registry_lock:
+        metrics = list(_registry.values())
+    lines: List[str] = []
+    for metric in metrics:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
@@ -216,10 +216,19 @@ class ConversationMessage(Base):
         nullable=False,
     )
     message_data    = Column(JSONB, nullable=False)
+    # append API의 클라이언트 지정 순번 — (conversation_id, seq) 유니크로 재전송을 멱등 처리.
+    # PUT 전체 교체·서버 측 저장 행은 NULL
+    seq             = Column(Integer, nullable=True)
     created_at      = Column(TIMESTAMP(timezone=True), server_default=func.now())
 
     __table_args__ = (
         Index('idx_conv_messages_conv_id', 'conversation_id', 'id'),
+        # 조회·before 커서 정렬 (conversations_router._message_order_key)
+        Index('idx_conv_messages_conv_seq_id', 'conversation_id', func.coalesce(seq, -1), 'id'),
+        Index(
+            'uq_conv_messages_conv_seq', 'conversation_id', 'seq',
+            unique=True, postgresql_where=text('seq IS NOT NULL'),
+        ),
     )
 
 
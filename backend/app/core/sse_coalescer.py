@@ -0,0 +1,84 @@
+"""
+SSE 토큰 이벤트 병합(coalescing).
+
+chat_stream은 astream_events의 토큰마다 SSE 프레임을 하나씩 만들고, 게이트웨이
+(crm_proxy._proxy_stream)가 이를 다시 프레임 단위로 릴레이한다. 동시 100 스트림에서는
+작은 write와 json.dumps가 두 홉에 걸쳐 폭증한다.
+
+SSECoalescer는 같은 종류의 토큰 이벤트(token / agent_token / text_chunk, agent_token은
+agent·node·run_id까지 같을 때)를 시간 창(window) 또는 바이트 예산(max_bytes) 안에서 하나의
+프레임으로 합친다. 그 밖의 이벤트(node_start·node_end·log·result 등)는 버퍼를 먼저 비운 뒤
+즉시 내보내므로 노드 경계 순서는 그대로 유지된다. window <= 0이면 병합하지 않는다.
+"""
+
+import json
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+MERGEABLE_EVENT_TYPES = frozenset({"token", "agent_token", "text_chunk"})
+
+
+def sse_frame(data: Dict[str, Any]) -> str:
+    return f"data: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def _merge_key(data: Dict[str, Any]) -> Tuple[Any, ...]:
+    return (data.get("type"), data.get("agent"), data.get("node"), data.get("run_id"))
+
+
+class SSECoalescer:
+    def __init__(self, window_seconds: float, max_bytes: int):
+        self.window_seconds = window_seconds
+        self.max_bytes = max_bytes
+        self._pending: Optional[Dict[str, Any]] = None
+        self._parts: List[str] = []
+        self._bytes = 0
+        self._first_at = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.window_seconds > 0
+
+    def add(self, data: Dict[str, Any]) -> List[str]:
+        """이벤트를 받아 지금 내보낼 SSE 프레임 목록을 반환."""
+        if not self.enabled:
+            return [sse_frame(data)]
+
+        if data.get("type") not in MERGEABLE_EVENT_TYPES:
+            return self.flush() + [sse_frame(data)]
+
+        frames: List[str] = []
+        if self._pending is not None and _merge_key(self._pending) != _merge_key(data):
+            frames = self.flush()
+        if self._pending is None:
+            self._pending = data
+            self._first_at = time.monotonic()
+        content = data.get("content") or ""
+        self._parts.append(content)
+        self._bytes += len(content.encode("utf-8"))
+
+        if self._bytes >= self.max_bytes or self.due():
+            frames += self.flush()
+        return frames
+
+    @property
+    def has_pending(self) -> bool:
+        return self._pending is not None
+
+    def due(self) -> bool:
+        return self._pending is not None and time.monotonic() - self._first_at >= self.window_seconds
+
+    def time_until_flush(self) -> Optional[float]:
+        """버퍼가 비어 있으면 None, 아니면 시간 창이 끝날 때까지 남은 초."""
+        if self._pending is None:
+            return None
+        return max(0.0, self.window_seconds - (time.monotonic() - self._first_at))
+
+    def flush(self) -> List[str]:
+        if self._pending is None:
+            return []
+        merged = {**self._pending, "content": "".join(self._parts)}
+        self._pending = None
+        self._parts = []
+        self._bytes = 0
+        return [sse_frame(merged)]
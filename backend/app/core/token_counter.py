@@ -0,0 +1,88 @@
+"""
+프롬프트 토큰 수 계산 (캐시된 tiktoken 인코더).
+
+정확한 provider별 토크나이저가 아니라 컨텍스트 예산 판단용 근사치다. tiktoken은
+langchain-openai 의존성으로 함께 설치되지만, 없으면 문자 수 기반 추정으로 대체한다.
+같은 메시지가 supervisor 패스마다 반복 계산되므로 텍스트 단위로도 캐시한다.
+
+tiktoken.get_encoding은 BPE 파일이 캐시(TIKTOKEN_CACHE_DIR, 이미지 빌드 때 채움)에 없으면 네트워크로
+받아온다. count_tokens는 이벤트 루프 위에서 동기로 불리므로 여기서는 절대 로드하지 않는다 —
+첫 호출(또는 lifespan의 warm_up)이 띄운 백그라운드 스레드가 로드를 끝낼 때까지는 문자 수 추정을 쓴다.
+"""
+
+import asyncio
+import threading
+from functools import lru_cache
+from typing import Iterable, Optional
+
+from langchain_core.messages import BaseMessage
+
+from .logging import get_logger
+
+_logger = get_logger("token_counter")
+
+# 메시지 1건당 role/구분자 오버헤드 (OpenAI chat 포맷 기준 근사)
+_PER_MESSAGE_OVERHEAD = 4
+# tiktoken이 없을 때: 한국어 위주 텍스트는 대략 1.5~2자당 1토큰
+_CHARS_PER_TOKEN_FALLBACK = 2
+
+_encoding = None
+_load_lock = threading.Lock()
+_load_thread: Optional[threading.Thread] = None
+
+
+def _load_encoding() -> None:
+    """인코더를 로드한다 (블로킹 — 백그라운드 스레드에서만 호출). 실패하면 문자 수 추정을 계속 쓴다."""
+    global _encoding
+    if _encoding is not None:
+        return
+    try:
+        import tiktoken
+        _encoding = tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        _logger.warning("tiktoken_encoding_unavailable", error_type=type(e).__name__)
+        return
+    # 로드 전에 문자 수 추정으로 캐시된 값을 버린다
+    count_tokens.cache_clear()
+    _logger.info("tiktoken_encoding_loaded")
+
+
+def _get_encoding():
+    global _load_thread
+    if _encoding is None and _load_thread is None:
+        with _load_lock:
+            if _load_thread is None:
+                _load_thread = threading.Thread(target=_load_encoding, name="tiktoken-load", daemon=True)
+                _load_thread.start()
+    return _encoding
+
+
+async def warm_up(timeout: float) -> bool:
+    """lifespan 시작 시 인코더 로드를 띄우고 timeout초까지 기다린다 — 첫 요청부터 정확한 토큰 수를 쓰도록."""
+    _get_encoding()
+    if _encoding is None and _load_thread is not None:
+        await asyncio.to_thread(_load_thread.join, timeout)
+    if _encoding is None:
+        _logger.warning("tiktoken_warm_up_incomplete", timeout=timeout)
+    return _encoding is not None
+
+
+@lru_cache(maxsize=4096)
+def count_tokens(text: str) -> int:
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is None:
+        return len(text) // _CHARS_PER_TOKEN_FALLBACK + 1
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def message_text(message: BaseMessage) -> str:
+    content = message.content
+    if isinstance(content, list):
+        return " ".join(p.get("text", "") if isinstance(p, dict) else str(p) for p in content)
+    return str(content)
+
+
+def count_message_tokens(messages: Iterable[BaseMessage]) -> int:
+    return sum(count_tokens(message_text(m)) + _PER_MESSAGE_OVERHEAD for m in messages)
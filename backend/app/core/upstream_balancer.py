@@ -0,0 +1,199 @@
+"""
+내부 upstream 복제본에 대한 클라이언트 측 부하 분산 (least outstanding requests + EWMA 지연).
+
+L4 NLB는 커넥션 단위로 라우팅하므로 keep-alive 풀을 오래 쓰면 스케일아웃된 새 인스턴스가 트래픽을
+받지 못한다 — ProductClient가 N번째 요청마다 Connection: close로 커넥션을 은퇴시킨 이유다(매번 새
+handshake). UpstreamBalancer는 복제본 endpoint 목록을 직접 알고 요청마다 가장 한가한 endpoint를 고른다.
+
+- endpoint 목록: 고정 목록 또는 DNS — 서비스 호스트명(Cloud Map 등)의 A 레코드를 refresh_seconds마다
+  다시 조회해 추가·제거한다 (남아 있는 endpoint의 통계는 유지).
+- 선택: (진행 중 요청 수 + 1) × EWMA 응답 지연이 가장 작은 endpoint. 지연 기록이 없는 새 endpoint는
+  현재 최소 EWMA로 계산해 바로 트래픽을 받는다.
+- passive health: 연결 오류·502/503/504가 eject_failures번 연속이면 eject_seconds 동안 후보에서 뺀다.
+  기간이 끝나면 다시 후보가 되고 첫 성공에 실패 횟수가 초기화된다(실패하면 바로 다시 제외).
+  모두 제외됐으면 가장 먼저 풀리는 endpoint로 보낸다.
+
+SharedTransport(http_client_registry)가 upstream 이름으로 balancer를 찾아 요청 URL의 host:port만 고른
+endpoint로 바꿔 보낸다 — Host 헤더와 호출 코드는 그대로다.
+"""
+
+import asyncio
+import random
+import socket
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+import httpx
+
+from app.config.settings import settings
+from app.core.logging import get_logger
+from app.core.metrics import counter, gauge
+
+_logger = get_logger("upstream_balancer")
+
+FAILURE_STATUS_CODES: frozenset[int] = frozenset({502, 503, 504})
+
+_REQUESTS = counter(
+    "upstream_lb_requests_total",
+    "balancer가 endpoint로 보낸 요청 수 (outcome: ok | error | cancelled)",
+    ("upstream", "endpoint", "outcome"),
+)
+_EJECTIONS = counter("upstream_lb_ejections_total", "연속 실패로 제외된 횟수", ("upstream", "endpoint"))
+_ENDPOINTS = gauge("upstream_lb_endpoints", "balancer가 아는 endpoint 수", ("upstream",))
+
+
+@dataclass(eq=False)
+class Endpoint:
+    origin: str
+    scheme: str
+    host: str
+    port: Optional[int]
+    outstanding: int = 0
+    ewma: Optional[float] = None
+    failures: int = 0
+    ejected_until: float = 0.0
+
+    def cost(self, default_ewma: float) -> float:
+        return (self.outstanding + 1) * (self.ewma if self.ewma is not None else default_ewma)
+
+
+def _format_host(ip: str) -> str:
+    return f"[{ip}]" if ":" in ip else ip
+
+
+class UpstreamBalancer:
+    def __init__(
+        self,
+        name: str,
+        *,
+        endpoints: Iterable[str] = (),
+        dns_url: Optional[str] = None,
+        refresh_seconds: float,
+        ewma_alpha: float,
+        eject_failures: int,
+        eject_seconds: float,
+    ):
+        self.name = name
+        self.refresh_seconds = refresh_seconds
+        self.ewma_alpha = ewma_alpha
+        self.eject_failures = eject_failures
+        self.eject_seconds = eject_seconds
+        self._endpoints: Dict[str, Endpoint] = {}
+        for origin in endpoints:
+            self._add(origin)
+        self._dns = httpx.URL(dns_url) if dns_url else None
+        self._refreshed_at = 0.0
+        self._refresh_task: Optional[asyncio.Task] = None
+        _ENDPOINTS.set(len(self._endpoints), upstream=self.name)
+
+    @property
+    def endpoints(self) -> List[Endpoint]:
+        return list(self._endpoints.values())
+
+    def _add(self, origin: str) -> Endpoint:
+        url = httpx.URL(origin)
+        endpoint = Endpoint(origin=origin.rstrip("/"), scheme=url.scheme, host=url.host, port=url.port)
+        self._endpoints[endpoint.origin] = endpoint
+        return endpoint
+
+    # ── DNS ──────────────────────────────────────────────────────────────
+
+    def _maybe_refresh(self) -> None:
+        if self._dns is None or (self._refresh_task is not None and not self._refresh_task.done()):
+            return
+        if self._endpoints and time.monotonic() - self._refreshed_at < self.refresh_seconds:
+            return
+        self._refresh_task = asyncio.create_task(self.refresh())
+
+    async def refresh(self) -> None:
+        """DNS A 레코드로 endpoint 목록 갱신. 조회 실패·빈 결과면 기존 목록을 유지한다."""
+        assert self._dns is not None
+        port = self._dns.port or (443 if self._dns.scheme == "https" else 80)
+        self._refreshed_at = time.monotonic()
+        try:
+            infos = await asyncio.get_running_loop().getaddrinfo(self._dns.host, port, type=socket.SOCK_STREAM)
+        except OSError as e:
+            _logger.warning("upstream_lb_dns_failed", upstream=self.name, host=self._dns.host, error_type=type(e).__name__)
+            return
+        origins = {f"{self._dns.scheme}://{_format_host(info[4][0])}:{port}" for info in infos}
+        if not origins:
+            return
+        added = origins - self._endpoints.keys()
+        removed = self._endpoints.keys() - origins
+        for origin in added:
+            self._add(origin)
+        for origin in removed:
+            # 진행 중인 요청은 Endpoint 객체를 들고 있으므로 목록에서만 뺀다
+            del self._endpoints[origin]
+        if added or removed:
+            _logger.info(
+                "upstream_lb_endpoints_changed",
+                upstream=self.name, added=sorted(added), removed=sorted(removed), total=len(self._endpoints),
+            )
+        _ENDPOINTS.set(len(self._endpoints), upstream=self.name)
+
+    # ── 선택 / 결과 기록 ──────────────────────────────────────────────────
+
+    async def acquire(self) -> Optional[Endpoint]:
+        """요청 1건을 보낼 endpoint (진행 중 요청 수 +1). endpoint를 모르면 None — 원래 URL로 보낸다."""
+        self._maybe_refresh()
+        if not self._endpoints and self._refresh_task is not None:
+            await asyncio.shield(self._refresh_task)
+        candidates = list(self._endpoints.values())
+        if not candidates:
+            return None
+        now = time.monotonic()
+        healthy = [e for e in candidates if e.ejected_until <= now]
+        if healthy:
+            default_ewma = min((e.ewma for e in healthy if e.ewma is not None), default=1.0)
+            endpoint = min(healthy, key=lambda e: (e.cost(default_ewma), e.outstanding, random.random()))
+        else:
+            endpoint = min(candidates, key=lambda e: e.ejected_until)
+        endpoint.outstanding += 1
+        return endpoint
+
+    def release(self, endpoint: Endpoint, latency: Optional[float] = None, failed: bool = False) -> None:
+        """요청 종료. latency가 있으면 성공(EWMA 갱신), failed면 실패, 둘 다 없으면 취소(통계 변화 없음)."""
+        endpoint.outstanding -= 1
+        if failed:
+            endpoint.failures += 1
+            _REQUESTS.inc(upstream=self.name, endpoint=endpoint.origin, outcome="error")
+            now = time.monotonic()
+            if endpoint.failures >= self.eject_failures and endpoint.ejected_until <= now:
+                endpoint.ejected_until = now + self.eject_seconds
+                _EJECTIONS.inc(upstream=self.name, endpoint=endpoint.origin)
+                _logger.warning(
+                    "upstream_lb_endpoint_ejected",
+                    upstream=self.name, endpoint=endpoint.origin,
+                    failures=endpoint.failures, eject_seconds=self.eject_seconds,
+                )
+            return
+        if latency is None:
+            _REQUESTS.inc(upstream=self.name, endpoint=endpoint.origin, outcome="cancelled")
+            return
+        endpoint.failures = 0
+        endpoint.ewma = latency if endpoint.ewma is None else endpoint.ewma + self.ewma_alpha * (latency - endpoint.ewma)
+        _REQUESTS.inc(upstream=self.name, endpoint=endpoint.origin, outcome="ok")
+
+    async def aclose(self) -> None:
+        if self._refresh_task is not None and not self._refresh_task.done():
+            self._refresh_task.cancel()
+
+
+def create_balancer(upstream: str) -> Optional[UpstreamBalancer]:
+    """설정에서 upstream의 balancer를 만든다 — 현재 opensearch_api만 지원, 꺼져 있으면 None."""
+    if upstream != "opensearch_api" or not settings.opensearch_api_lb_enabled:
+        return None
+    endpoints = settings.opensearch_api_lb_endpoints
+    balancer = UpstreamBalancer(
+        upstream,
+        endpoints=endpoints,
+        dns_url=None if endpoints else settings.opensearch_api_url,
+        refresh_seconds=settings.upstream_lb_dns_refresh_seconds,
+        ewma_alpha=settings.upstream_lb_ewma_alpha,
+        eject_failures=settings.upstream_lb_eject_failures,
+        eject_seconds=settings.upstream_lb_eject_seconds,
+    )
+    _logger.info("upstream_lb_enabled", upstream=upstream, endpoints=list(endpoints), dns=not endpoints)
+    return balancer
@@ -0,0 +1,163 @@
+"""
+Write-behind 배치 저장 큐.
+
+동시 대화마다 완료 시점에 스레드 하나씩 띄워 동기 INSERT/commit을 하던 경로를, 프로세스 내
+큐 하나로 모아 flush_interval 또는 max_batch 단위로 한 번에 저장한다(다중 행 INSERT 1회 + commit 1회).
+
+- 순서: 단일 flusher가 FIFO로 처리하므로 같은 대화의 메시지 순서가 유지된다.
+- back-pressure: 큐가 가득 차면 submit()이 put_timeout까지 기다리고, 그래도 자리가 없으면
+  호출자 쪽에서 직접 저장한다(유실 없음, 호출자가 느려지는 것으로 압력이 전달된다).
+- 배치 실패: 배치 저장이 예외를 내면 항목별 직접 저장(write_one)으로 다시 시도해 문제 행만 격리한다.
+- 종료: close()가 남은 항목을 모두 flush한 뒤 반환한다 (lifespan 종료 단계에서 호출).
+- 완료 대기: submit()은 그 항목이 저장(또는 저장 시도)된 뒤 완료되는 Future를 돌려준다. 저장이 끝난 뒤에
+  다음 단계로 넘어가야 하는 호출자(예: done 프레임 전 최종 답변 저장)는 urgent=True로 넣어 flush_interval을
+  채우지 않고 바로 flush하게 한 뒤 이를 await한다.
+"""
+
+import asyncio
+import time
+from typing import Any, Callable, List, Optional
+
+from .logging import get_logger
+from .metrics import counter, gauge, histogram
+
+_logger = get_logger("write_behind")
+
+_BATCH_SIZE = histogram(
+    "write_behind_batch_size",
+    "write-behind flush 1회의 항목 수",
+    ("queue",),
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500, 1000),
+)
+_FLUSH_SECONDS = histogram("write_behind_flush_seconds", "write-behind flush 1회 소요 시간(초)", ("queue",))
+_QUEUE_DEPTH = gauge("write_behind_queue_depth", "write-behind 큐에 대기 중인 항목 수", ("queue",))
+_BACKPRESSURE = counter(
+    "write_behind_backpressure_total", "큐가 가득 차 호출자 쪽에서 직접 저장한 항목 수", ("queue",)
+)
+_BATCH_FAILURES = counter(
+    "write_behind_batch_failures_total", "배치 저장이 실패해 항목별 저장으로 재시도한 횟수", ("queue",)
+)
+
+_STOP = object()
+
+
+class WriteBehindQueue:
+    """write_batch(items)와 write_one(item)은 동기 함수 — 스레드에서 실행된다."""
+
+    def __init__(
+        self,
+        name: str,
+        write_batch: Callable[[List[Any]], None],
+        write_one: Callable[[Any], None],
+        *,
+        max_batch: int,
+        flush_interval: float,
+        max_queue: int,
+        put_timeout: float,
+    ):
+        self.name = name
+        self._write_batch = write_batch
+        self._write_one = write_one
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.put_timeout = put_timeout
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._closing
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def submit(self, item: Any, *, urgent: bool = False) -> "asyncio.Future[None]":
+        """항목을 큐에 넣고, 그 항목이 flush되면 완료되는 Future를 반환 (직접 저장한 경우 이미 완료).
+
+        urgent면 모으던 배치를 이 항목까지로 끊어 바로 flush한다.
+        """
+        flushed: asyncio.Future = asyncio.get_running_loop().create_future()
+        if not self.running:
+            await asyncio.to_thread(self._write_one_safe, item)
+            flushed.set_result(None)
+            return flushed
+        try:
+            await asyncio.wait_for(self._queue.put((item, flushed, urgent)), timeout=self.put_timeout)
+        except asyncio.TimeoutError:
+            _BACKPRESSURE.inc(queue=self.name)
+            _logger.warning("write_behind_queue_full", queue=self.name, depth=self._queue.qsize())
+            await asyncio.to_thread(self._write_one_safe, item)
+            flushed.set_result(None)
+            return flushed
+        _QUEUE_DEPTH.set(self._queue.qsize(), queue=self.name)
+        return flushed
+
+    async def close(self, timeout: float) -> None:
+        """새 항목은 직접 저장으로 돌리고, 큐에 남은 항목을 모두 flush한 뒤 flusher를 끝낸다."""
+        if self._task is None or self._closing:
+            return
+        self._closing = True
+        remaining = self._queue.qsize()
+        await self._queue.put(_STOP)
+        try:
+            await asyncio.wait_for(asyncio.shield(self._task), timeout=timeout)
+            _logger.info("write_behind_drained", queue=self.name, flushed=remaining)
+            # _STOP 뒤에 들어온 항목 (close 직전 running 확인을 통과한 submit) — 직접 저장
+            while not self._queue.empty():
+                entry = self._queue.get_nowait()
+                if entry is not _STOP:
+                    await asyncio.to_thread(self._write_one_safe, entry[0])
+                    entry[1].set_result(None)
+        except asyncio.TimeoutError:
+            _logger.error("write_behind_drain_timeout", queue=self.name, left=self._queue.qsize())
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            first = await self._queue.get()
+            if first is _STOP:
+                break
+            batch = [first]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.max_batch and not batch[-1][2]:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            _QUEUE_DEPTH.set(self._queue.qsize(), queue=self.name)
+            await self._flush(batch)
+
+    async def _flush(self, entries: List[tuple]) -> None:
+        started = time.perf_counter()
+        batch = [item for item, _, _ in entries]
+        try:
+            await asyncio.to_thread(self._write_batch, batch)
+        except Exception as e:
+            _BATCH_FAILURES.inc(queue=self.name)
+            _logger.warning(
+                "write_behind_batch_failed",
+                queue=self.name, size=len(batch), error_type=type(e).__name__,
+            )
+            await asyncio.to_thread(lambda: [self._write_one_safe(item) for item in batch])
+        finally:
+            for _, flushed, _ in entries:
+                if not flushed.done():
+                    flushed.set_result(None)
+        _BATCH_SIZE.observe(len(batch), queue=self.name)
+        _FLUSH_SECONDS.observe(time.perf_counter() - started, queue=self.name)
+
+    def _write_one_safe(self, item: Any) -> None:
+        try:
+            self._write_one(item)
+        except Exception as e:
+            _logger.warning("write_behind_item_failed", queue=self.name, error_type=type(e).__name__)
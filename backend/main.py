@@ -14,12 +14,14 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.api import auth_router
 from app.api import db_proxy
 from app.api import crm_proxy
+from app.api import metrics_api
 from app.config.settings import settings
 from app.core.logging import configure_logging, get_logger
 from app.core.middleware import RequestLoggingMiddleware
 from app.core.body_limit import BodySizeLimitMiddleware, PayloadTooLargeError
 from app.core.auth import get_auth_provider
 from app.core.cleanup import cleanup_loop
+from app.core.http_client_registry import close_all, create_http_client
 
 # Load .env before anything else
 load_dotenv(os.path.join(os.path.dirname(__file__), "app/.env"), override=True)
@@ -141,12 +143,12 @@ async def lifespan(app: FastAPI):
     db_executor = ThreadPoolExecutor(max_workers=20, thread_name_prefix="db_worker")
     app.state.db_executor = db_executor
 
-    app.state.crm_client = httpx.AsyncClient(
+    app.state.crm_client = create_http_client(
         base_url=settings.crm_service_url,
         headers={"X-Internal-Token": settings.internal_token},
         timeout=httpx.Timeout(settings.http_timeout_long),
     )
-    app.state.internal_client = httpx.AsyncClient(
+    app.state.internal_client = create_http_client(
         base_url=settings.database_api_url,
         headers={"X-Internal-Token": settings.internal_token},
         timeout=httpx.Timeout(settings.http_timeout_long),
@@ -167,6 +169,8 @@ async def lifespan(app: FastAPI):
         logger.info("cleanup_worker_stopped")
         await app.state.crm_client.aclose()
         await app.state.internal_client.aclose()
+        # 공유 커넥션 풀 (create_http_client) 종료
+        await close_all()
         db_executor.shutdown(wait=False)
 
 
@@ -199,6 +203,7 @@ app.add_middleware(
 app.include_router(auth_router.router)
 app.include_router(db_proxy.router)
 app.include_router(crm_proxy.router)
+app.include_router(metrics_api.router)
 
 
 @app.get("/")
@@ -0,0 +1,86 @@
+"""
+intent_router 정규식 신호(페르소나·상품 ID) 점검 — ID 뒤에 조사가 붙은 예문을 route()로 돌려 본다.
+
+opensearch-api 인코더 대신 ID와 뒤에 붙은 조사를 지운 문장별 one-hot 벡터를 쓰므로, 예문과 그 조사
+변형("PERSONA_00012에/에게/로/의/을 …")은 항상 같은 예문으로 최근접 매칭된다. 그 상태에서
+
+- 페르소나 ID가 있는 추천 예문은 어떤 조사가 붙어도 persona_id_missing으로 폴백하지 않아야 하고,
+- 추천 예문 뒤에 조사 붙은 상품 ID를 덧붙이면 product_id_conflict로 폴백해야 한다.
+
+사용법 (backend/ 디렉터리에서):
+  python -m scripts.check_intent_router_ids
+"""
+
+import asyncio
+import re
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # backend/ 를 경로에 추가
+
+from langchain_core.messages import HumanMessage
+
+from app.config.settings import settings
+from app.agents.crm_message_agent import intent_router
+from app.agents.crm_message_agent.intent_router import IntentRouter
+
+_PARTICLES = ("에", "에게", "로", "의", "을")
+# 인코더 정규화용 — 유니코드 \w로 ID 뒤 조사까지 함께 지운다 (점검 대상 정규식과 일부러 다르게)
+_ID_WITH_PARTICLE = re.compile(r"(PERSONA_|[A-Z]\d{11})\w*")
+_PERSONA_WITH_PARTICLE = re.compile(r"(PERSONA_[A-Za-z0-9]+?\d)([가-힣]+)")
+
+
+def _make_encoder():
+    vocab: Dict[str, int] = {}
+
+    async def encode(texts: List[str]) -> List[List[float]]:
+        vectors = []
+        for text in texts:
+            key = " ".join(_ID_WITH_PARTICLE.sub(" ", text).split())
+            index = vocab.setdefault(key, len(vocab))
+            vector = [0.0] * 1024
+            vector[index] = 1.0
+            vectors.append(vector)
+        return vectors
+
+    return encode
+
+
+async def run() -> List[str]:
+    router = IntentRouter(encode=_make_encoder())
+    failures: List[str] = []
+    recommend_exemplars = [
+        text
+        for plan, texts in intent_router._EXEMPLARS.items() if "recommend_product_agent" in plan
+        for text in texts if _PERSONA_WITH_PARTICLE.search(text)
+    ]
+    for exemplar in recommend_exemplars:
+        for particle in _PARTICLES:
+            text = _PERSONA_WITH_PARTICLE.sub(lambda m: m.group(1) + particle, exemplar, count=1)
+            route = await router.route([HumanMessage(content=text)])
+            if route.task_plan is None:
+                failures.append(f"{text!r}: 확정 기대, {route.reason}")
+
+            conflict = f"{text} A20251200017{particle}"
+            route = await router.route([HumanMessage(content=conflict)])
+            if route.reason != "product_id_conflict":
+                failures.append(f"{conflict!r}: product_id_conflict 기대, {route.reason}")
+    print(f"추천 예문 {len(recommend_exemplars)}개 × 조사 {len(_PARTICLES)}개 점검")
+    return failures
+
+
+def main() -> None:
+    # 임계값이 아니라 정규식 규칙을 보는 점검이므로 유사도 조건은 항상 통과시킨다
+    settings.supervisor_intent_router_min_similarity = 0.0
+    settings.supervisor_intent_router_min_margin = 0.0
+    failures = asyncio.run(run())
+    for failure in failures:
+        print(f"FAIL {failure}")
+    if failures:
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
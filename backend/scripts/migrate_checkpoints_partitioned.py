@@ -0,0 +1,160 @@
+"""
+기존 LangGraph 체크포인트 테이블을 일자 파티션 레이아웃(CHECKPOINT_PARTITIONED)으로 이관하는 CLI 스크립트.
+
+checkpoints / checkpoint_blobs / checkpoint_writes를 *_legacy로 이름을 바꾸고, 파티션 스키마를
+만든 뒤 데이터를 복사한다. 복사 중 새 쓰기가 legacy 쪽에 들어가면 유실되므로 crm 서버를
+모두 내린 상태에서 실행하고, 끝나면 CHECKPOINT_PARTITIONED=true로 서버를 올린다.
+
+파티션 키(created_on) 부여 기준:
+- checkpoints: 기존 created_at (없으면 실행 시각)
+- checkpoint_writes: 해당 체크포인트의 created_at
+- checkpoint_blobs: 해당 thread/namespace의 마지막 체크포인트 시각 — 최신 체크포인트가 오래된
+  blob 버전을 계속 참조할 수 있으므로 thread가 살아 있는 동안 함께 남도록 보수적으로 잡는다.
+- checkpoint_threads(last-active 인덱스): thread별 MAX(created_at)
+
+사용법 (backend/ 디렉터리에서):
+  python -m scripts.migrate_checkpoints_partitioned --dry-run     # 건수·기간만 출력
+  python -m scripts.migrate_checkpoints_partitioned               # 이관 (단일 트랜잭션)
+  python -m scripts.migrate_checkpoints_partitioned --drop-legacy # 검증 후 *_legacy 테이블 삭제
+"""
+
+import argparse
+import asyncio
+import sys
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # backend/ 를 경로에 추가
+
+from psycopg import AsyncConnection
+
+from app.config.settings import settings
+from app.core.checkpoint_partitions import PARTITIONED_SCHEMA_DDL, PARTITIONED_TABLES, ensure_partitions
+
+_COPY_CHECKPOINTS_SQL = """
+    INSERT INTO checkpoints (thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, type,
+                             checkpoint, metadata, created_at, created_on)
+    SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, type,
+           checkpoint, metadata, COALESCE(created_at, NOW()), COALESCE(created_at, NOW())::date
+    FROM checkpoints_legacy
+"""
+
+_COPY_WRITES_SQL = """
+    INSERT INTO checkpoint_writes (thread_id, checkpoint_ns, checkpoint_id, task_id, idx,
+                                   channel, type, blob, task_path, created_on)
+    SELECT w.thread_id, w.checkpoint_ns, w.checkpoint_id, w.task_id, w.idx,
+           w.channel, w.type, w.blob, w.task_path, COALESCE(c.created_at, NOW())::date
+    FROM checkpoint_writes_legacy w
+    LEFT JOIN checkpoints_legacy c
+      ON c.thread_id = w.thread_id AND c.checkpoint_ns = w.checkpoint_ns AND c.checkpoint_id = w.checkpoint_id
+"""
+
+_COPY_BLOBS_SQL = """
+    WITH last_seen AS (
+        SELECT thread_id, checkpoint_ns, MAX(COALESCE(created_at, NOW())) AS last_at
+        FROM checkpoints_legacy GROUP BY thread_id, checkpoint_ns
+    )
+    INSERT INTO checkpoint_blobs (thread_id, checkpoint_ns, channel, version, type, blob, created_on)
+    SELECT b.thread_id, b.checkpoint_ns, b.channel, b.version, b.type, b.blob,
+           COALESCE(s.last_at, NOW())::date
+    FROM checkpoint_blobs_legacy b
+    LEFT JOIN last_seen s ON s.thread_id = b.thread_id AND s.checkpoint_ns = b.checkpoint_ns
+"""
+
+_COPY_THREADS_SQL = """
+    INSERT INTO checkpoint_threads (thread_id, last_active_at)
+    SELECT thread_id, MAX(COALESCE(created_at, NOW())) FROM checkpoints_legacy GROUP BY thread_id
+    ON CONFLICT (thread_id) DO NOTHING
+"""
+
+
+async def _relkind(conn: AsyncConnection, table: str) -> str | None:
+    row = await (await conn.execute(
+        "SELECT relkind FROM pg_class WHERE oid = to_regclass(%s)", [table]
+    )).fetchone()
+    return row[0] if row else None
+
+
+async def _count(conn: AsyncConnection, table: str) -> int:
+    return (await (await conn.execute(f"SELECT COUNT(*) FROM {table}")).fetchone())[0]
+
+
+async def _rename_to_legacy(conn: AsyncConnection, table: str) -> None:
+    # 새 파티션 테이블의 PK/인덱스 이름(checkpoints_pkey, *_thread_id_idx)과 겹치지 않게 인덱스도 함께 변경
+    rows = await conn.execute("SELECT indexname FROM pg_indexes WHERE tablename = %s", [table])
+    for (indexname,) in await rows.fetchall():
+        await conn.execute(f'ALTER INDEX "{indexname}" RENAME TO "{indexname}_legacy"')
+    await conn.execute(f"ALTER TABLE {table} RENAME TO {table}_legacy")
+
+
+async def migrate(dry_run: bool) -> None:
+    async with await AsyncConnection.connect(settings.postgres_url) as conn:
+        if await _relkind(conn, "checkpoints") == "p":
+            print("이미 파티션 레이아웃입니다.")
+            return
+        if await _relkind(conn, "checkpoints") is None:
+            print("checkpoints 테이블이 없습니다 — 이관할 데이터 없음. CHECKPOINT_PARTITIONED=true로 서버를 올리면 스키마가 생성됩니다.")
+            return
+
+        counts = {t: await _count(conn, t) for t in PARTITIONED_TABLES}
+        first_day, last_day = await (await conn.execute(
+            "SELECT MIN(created_at)::date, MAX(created_at)::date FROM checkpoints"
+        )).fetchone()
+        print(f"기존 행 수: {counts}")
+        print(f"체크포인트 기간: {first_day} ~ {last_day}")
+        if dry_run:
+            return
+
+        async with conn.transaction():
+            for table in PARTITIONED_TABLES:
+                await _rename_to_legacy(conn, table)
+            for ddl in PARTITIONED_SCHEMA_DDL:
+                await conn.execute(ddl)
+            await ensure_partitions(conn, settings.checkpoint_partition_days_ahead, start=first_day or date.today())
+
+            for label, sql in (
+                ("checkpoints", _COPY_CHECKPOINTS_SQL),
+                ("checkpoint_writes", _COPY_WRITES_SQL),
+                ("checkpoint_blobs", _COPY_BLOBS_SQL),
+                ("checkpoint_threads", _COPY_THREADS_SQL),
+            ):
+                cur = await conn.execute(sql)
+                print(f"{label}: {cur.rowcount}행 복사")
+
+            for table in PARTITIONED_TABLES:
+                copied = await _count(conn, table)
+                if copied != counts[table]:
+                    raise RuntimeError(f"{table} 행 수 불일치: 기존 {counts[table]}, 이관 {copied} — 롤백합니다")
+
+        print("이관 완료. CHECKPOINT_PARTITIONED=true로 서버를 올리고 확인한 뒤 --drop-legacy를 실행하세요.")
+
+
+async def drop_legacy() -> None:
+    async with await AsyncConnection.connect(settings.postgres_url) as conn:
+        if await _relkind(conn, "checkpoints") != "p":
+            print("파티션 레이아웃이 아닙니다 — legacy 테이블을 삭제하지 않습니다.", file=sys.stderr)
+            sys.exit(1)
+        for table in PARTITIONED_TABLES:
+            await conn.execute(f"DROP TABLE IF EXISTS {table}_legacy")
+            print(f"{table}_legacy 삭제")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="체크포인트 테이블 일자 파티션 이관")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--dry-run", action="store_true", help="행 수·기간만 출력")
+    group.add_argument("--drop-legacy", action="store_true", help="이관 후 *_legacy 테이블 삭제")
+    args = parser.parse_args()
+
+    if not settings.postgres_url:
+        print("POSTGRES_URL이 설정되지 않았습니다.", file=sys.stderr)
+        sys.exit(1)
+
+    if args.drop_legacy:
+        asyncio.run(drop_legacy())
+    else:
+        asyncio.run(migrate(args.dry_run))
+
+
+if __name__ == "__main__":
+    main()
@@ -13,21 +13,25 @@ load_dotenv(os.path.join(os.path.dirname(__file__), "../app/.env"))
 
 from fastapi import FastAPI, Request
 from starlette.responses import JSONResponse
-from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
 from psycopg_pool import AsyncConnectionPool
 
 from app.agents.crm_message_agent.crm_message_agent import CRMMessageAgent
-from app.api import marketing_api, products_pipeline, persona_pipeline
+from app.api import marketing_api, metrics_api, products_pipeline, persona_pipeline
+from app.api import chat_stream_runs
 from app.api.upload_jobs import cleanup_expired_jobs, set_pool as set_upload_pool
-from app.core.cleanup import cleanup_old_checkpoints
+from app.core.admission import AdmissionController
+from app.core.checkpoint_metrics import MeteredAsyncPostgresSaver
+from app.core.cleanup import cleanup_old_checkpoints, drop_expired_checkpoint_partitions
 from app.config.settings import settings
 from app.core.data_loader import validate_static_configs
+from app.core import token_counter
 from app.core.body_limit import BodySizeLimitMiddleware, PayloadTooLargeError
 from app.core.internal_auth import InternalTokenMiddleware
 from app.core.logging import configure_logging, get_logger
 from app.core.langsmith_config import configure_langsmith
 from app.core.middleware import RequestLoggingMiddleware
 from app.core.http_client_registry import close_all
+from a2a.local import close_local_agents
 
 configure_logging(
     log_level=settings.log_level,
@@ -51,6 +55,8 @@ async def lifespan(app: FastAPI):
     init_search_http_client()
 
     validate_static_configs()
+    # 컨텍스트 예산(build_budgeted_context)·LLM governor가 쓰는 tiktoken 인코더 — 첫 턴이 로드를 기다리지 않게
+    await token_counter.warm_up(timeout=10.0)
 
     async with AsyncConnectionPool(
         conninfo=settings.postgres_url,
@@ -59,18 +65,26 @@ async def lifespan(app: FastAPI):
         kwargs={"autocommit": True, "prepare_threshold": 0},
     ) as pool:
         await pool.wait()
-        checkpointer = AsyncPostgresSaver(pool)
+        if settings.checkpoint_partitioned:
+            from app.core.checkpoint_partitions import PartitionedAsyncPostgresSaver
+            checkpointer = PartitionedAsyncPostgresSaver(
+                pool, partition_days_ahead=settings.checkpoint_partition_days_ahead,
+            )
+        else:
+            checkpointer = MeteredAsyncPostgresSaver(pool)
         await checkpointer.setup()
 
         async with pool.connection() as conn:
-            await conn.execute(
-                "ALTER TABLE checkpoints ADD COLUMN IF NOT EXISTS"
-                " created_at TIMESTAMPTZ DEFAULT NOW()"
-            )
-            await conn.execute(
-                "CREATE INDEX IF NOT EXISTS idx_checkpoints_created_at"
-                " ON checkpoints(created_at)"
-            )
+            if not settings.checkpoint_partitioned:
+                # 파티션 레이아웃은 DDL에 created_at이 포함되어 있고 보존 정리에 쓰지 않음
+                await conn.execute(
+                    "ALTER TABLE checkpoints ADD COLUMN IF NOT EXISTS"
+                    " created_at TIMESTAMPTZ DEFAULT NOW()"
+                )
+                await conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_checkpoints_created_at"
+                    " ON checkpoints(created_at)"
+                )
             await conn.execute(
                 """
                 CREATE TABLE IF NOT EXISTS upload_jobs (
@@ -100,18 +114,47 @@ async def lifespan(app: FastAPI):
                 ON upload_job_events(job_id, id)
                 """
             )
+            await conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS chat_stream_events (
+                    run_id        TEXT NOT NULL,
+                    seq           INTEGER NOT NULL,
+                    owner_user_id TEXT NOT NULL,
+                    event_type    TEXT,
+                    frame         TEXT NOT NULL,
+                    created_at    TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+                    PRIMARY KEY (run_id, seq)
+                )
+                """
+            )
+            await conn.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_chat_stream_events_created_at
+                ON chat_stream_events(created_at)
+                """
+            )
 
         set_upload_pool(pool)
+        chat_stream_runs.set_pool(pool)
 
         db_executor = ThreadPoolExecutor(max_workers=20, thread_name_prefix="db_worker")
         app.state.db_executor = db_executor
         app.state.pool = pool
         app.state.agent_v2 = CRMMessageAgent(checkpointer=checkpointer)
+        marketing_api.start_chat_writer()
         logger.info("crm_services_initialized")
 
-        # /chat/v2/stream 진입 동시성 게이팅 — OpenSearch 동시 부하를 세마포어로 제한
-        app.state.chat_stream_semaphore = asyncio.BoundedSemaphore(settings.chat_stream_max_concurrent)
-        logger.info("chat_stream_semaphore_initialized", max_concurrent=settings.chat_stream_max_concurrent)
+        # /chat/v2/stream 진입 동시성 게이팅 — 동시 슬롯 + 우선순위 대기열 + 마감 기반 조기 거절
+        app.state.chat_stream_admission = AdmissionController(
+            capacity=settings.chat_stream_max_concurrent,
+            max_queue=settings.chat_stream_max_queue,
+            initial_service_seconds=settings.chat_stream_expected_service_seconds,
+        )
+        logger.info(
+            "chat_stream_admission_initialized",
+            max_concurrent=settings.chat_stream_max_concurrent,
+            max_queue=settings.chat_stream_max_queue,
+        )
 
         async def _upload_cleanup_loop() -> None:
             while True:
@@ -125,11 +168,28 @@ async def lifespan(app: FastAPI):
                         logger.info("upload_jobs_cleaned", removed=removed)
                 except Exception:
                     logger.error("upload_cleanup_failed", exc_info=True)
+                try:
+                    removed = await chat_stream_runs.cleanup_expired_stream_events(
+                        settings.chat_stream_events_ttl_seconds,
+                    )
+                    if removed:
+                        logger.info("chat_stream_events_cleaned", removed=removed)
+                except Exception:
+                    logger.error("chat_stream_events_cleanup_failed", exc_info=True)
 
         async def _checkpoint_cleanup_loop() -> None:
             while True:
                 await asyncio.sleep(86400)  # 24시간마다
                 try:
+                    if settings.checkpoint_partitioned:
+                        dropped = await drop_expired_checkpoint_partitions(
+                            pool,
+                            settings.checkpoint_retention_days,
+                            settings.checkpoint_partition_days_ahead,
+                        )
+                        if dropped:
+                            logger.info("checkpoint_cleanup_done", dropped_partition_days=dropped)
+                        continue
                     deleted = await cleanup_old_checkpoints(
                         pool,
                         settings.checkpoint_retention_days,
@@ -158,15 +218,21 @@ async def lifespan(app: FastAPI):
         # 닫기 전에 끝낼 기회를 준다(완료 시 _persist_results가 DB에 저장하므로, pool을
         # 먼저 닫으면 그 저장이 끊긴다). db_executor와는 무관 — 백그라운드 저장은
         # asyncio.to_thread(기본 executor)를 쓴다. 못 끝나면 깨끗이 포기 — 다음 배포에서 자연히 해소된다.
-        background_tasks = app.state.agent_v2._background_tasks
+        # 클라이언트 연결과 분리된 스트림 run도 같은 이유로 기다린다 (run이 끝나야 결과가 저장됨)
+        background_tasks = app.state.agent_v2._background_tasks | chat_stream_runs.pending_run_tasks()
         if background_tasks:
             await asyncio.wait(background_tasks, timeout=settings.graph_execution_timeout)
 
-        # DB 저장 task — 단순 INSERT라 짧게만 기다린다
+        # DB 저장 task — write-behind 큐 적재(또는 단순 INSERT)라 짧게만 기다린다
         if marketing_api._db_save_tasks:
             await asyncio.wait(marketing_api._db_save_tasks, timeout=10)
 
+        # write-behind 큐에 남은 저장을 모두 flush — 위 작업들이 적재를 끝낸 뒤여야 한다
+        await marketing_api.stop_chat_writer()
+
         db_executor.shutdown(wait=False)
+        # in-process로 실행 중인 서브에이전트 작업 (a2a_local_agents)
+        await close_local_agents()
         await close_all()
 
 
@@ -190,6 +256,7 @@ app.add_middleware(RequestLoggingMiddleware)
 app.include_router(marketing_api.router)
 app.include_router(products_pipeline.router)
 app.include_router(persona_pipeline.router)
+app.include_router(metrics_api.router)
 
 
 @app.get("/health")
@@ -7,8 +7,8 @@ load_dotenv(os.path.join(os.path.dirname(__file__), "../app/.env"))
 from fastapi import FastAPI, Request
 from starlette.responses import JSONResponse
 
-from app.agents.data_registration_agent.a2a_agent import router
-from app.agents.data_registration_agent.workflow import build_workflow
+from app.agents.data_registration_agent.a2a_agent import init_agent_state, router
+from app.api import metrics_api
 from app.core.body_limit import BodySizeLimitMiddleware, PayloadTooLargeError
 from app.core.internal_auth import InternalTokenMiddleware
 from app.core.middleware import RequestLoggingMiddleware
@@ -27,17 +27,11 @@ _logger = get_logger("data_registration_server")
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    from app.core.containers import DataRegistrationServices
-    from app.agents.data_registration_agent.services.product_registration import ProductRegistrationService
-    from app.agents.shared.persona.persona_client import PersonaClient
-
-    app.state.services = DataRegistrationServices(
-        registration=ProductRegistrationService(),
-        persona_client=PersonaClient(),
-    )
-    app.state.graph = build_workflow()
+    init_agent_state(app.state)
     _logger.info("services_and_graph_initialized")
     yield
+    # 진행 중인 A2A 작업을 끝낼 기회를 준 뒤 남은 것만 취소 (crm_server의 background task 대기와 같은 한도)
+    await app.state.a2a_tasks.close(drain_timeout=settings.graph_execution_timeout)
     await close_all()
 
 
@@ -53,6 +47,7 @@ app.add_middleware(RequestLoggingMiddleware)
 app.add_middleware(InternalTokenMiddleware)
 app.add_middleware(BodySizeLimitMiddleware, max_body_bytes=settings.max_chat_body_bytes)
 app.include_router(router)
+app.include_router(metrics_api.router)
 
 
 @app.get("/health")
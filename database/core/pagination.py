@@ -28,3 +28,17 @@ def decode_persona_cursor(cursor: str) -> tuple[datetime, str]:
         return datetime.fromisoformat(data["ts"]), data["id"]
     except Exception as e:
         raise ValueError(f"Invalid cursor: {e}") from e
+
+
+def encode_message_cursor(seq_key: int, message_id: int) -> str:
+    payload = json.dumps({"seq": seq_key, "id": message_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).rstrip(b"=").decode()
+
+
+def decode_message_cursor(cursor: str) -> tuple[int, int]:
+    padding = "=" * (-len(cursor) % 4)
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor + padding))
+        return int(data["seq"]), int(data["id"])
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {e}") from e
@@ -144,12 +144,21 @@ CREATE TABLE IF NOT EXISTS conversation_messages (
     conversation_id VARCHAR(36) NOT NULL
                         REFERENCES conversations(id) ON DELETE CASCADE,
     message_data    JSONB NOT NULL,
+    seq             INTEGER,
     created_at      TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
 CREATE INDEX IF NOT EXISTS idx_conv_messages_conv_id
     ON conversation_messages(conversation_id, id);
 
+-- 메시지 조회 정렬용 — append 행은 seq 순, seq 없는 행(PUT·서버 측 저장)은 앞에 두고 id 순
+CREATE INDEX IF NOT EXISTS idx_conv_messages_conv_seq_id
+    ON conversation_messages(conversation_id, (COALESCE(seq, -1)), id);
+
+-- append API 멱등 처리용 (seq는 클라이언트 지정 순번, PUT 저장 행은 NULL)
+CREATE UNIQUE INDEX IF NOT EXISTS uq_conv_messages_conv_seq
+    ON conversation_messages(conversation_id, seq) WHERE seq IS NOT NULL;
+
 -- ============================================================
 -- 6. 생성된 마케팅 메시지 테이블 (generated_messages)
 -- 품질 검사(3단계) 통과/실패 메시지 모두 저장 (quality_passed로 구분, 실패 사유 분석용)
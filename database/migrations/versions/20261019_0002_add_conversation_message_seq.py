@@ -0,0 +1,34 @@
+"""add conversation message seq
+
+Revision ID: b7c8d9e0f1a2
+Revises: a1b2c3d4e5f6
+Create Date: 2026-10-19
+
+append 전용 메시지 API를 위한 클라이언트 순번 컬럼 추가.
+- conversation_messages.seq: 클라이언트가 지정하는 대화 내 순번 (기존 행·PUT 저장 행은 NULL)
+- uq_conv_messages_conv_seq: (conversation_id, seq) 부분 유니크 인덱스 — 재전송 멱등 처리와 last_seq 조회용
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "b7c8d9e0f1a2"
+down_revision = "a1b2c3d4e5f6"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("conversation_messages", sa.Column("seq", sa.Integer(), nullable=True))
+    op.create_index(
+        "uq_conv_messages_conv_seq",
+        "conversation_messages",
+        ["conversation_id", "seq"],
+        unique=True,
+        postgresql_where=sa.text("seq IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_conv_messages_conv_seq", table_name="conversation_messages")
+    op.drop_column("conversation_messages", "seq")
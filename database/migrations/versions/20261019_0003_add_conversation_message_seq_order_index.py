@@ -0,0 +1,29 @@
+"""add conversation message seq order index
+
+Revision ID: c8d9e0f1a2b3
+Revises: b7c8d9e0f1a2
+Create Date: 2026-10-19
+
+대화 메시지 조회·before 커서 정렬을 (COALESCE(seq, -1), id)로 바꾸면서 필요한 인덱스 추가.
+- idx_conv_messages_conv_seq_id: append 행은 seq 순, seq 없는 행(PUT·서버 측 저장)은 앞에 두고 id 순
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "c8d9e0f1a2b3"
+down_revision = "b7c8d9e0f1a2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "idx_conv_messages_conv_seq_id",
+        "conversation_messages",
+        ["conversation_id", sa.text("COALESCE(seq, -1)"), "id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_conv_messages_conv_seq_id", table_name="conversation_messages")
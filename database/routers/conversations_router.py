@@ -9,11 +9,14 @@ from typing import List, Optional, Any
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from pydantic import BaseModel, Field
+from sqlalchemy import func, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
 from core.database import get_db
 from core.logging import get_logger
 from core.models import Conversation, ConversationMessage
+from core.pagination import encode_message_cursor, decode_message_cursor
 from routers.auth_utils import get_request_user_id, resolve_role
 
 logger = get_logger("conversations_api")
@@ -42,6 +45,11 @@ class ConversationSummary(BaseModel):
 class ConversationDetail(ConversationSummary):
     """대화 상세 (messages 포함)"""
     messages: Optional[List[Any]] = []
+    # 더 이전 메시지 조회용 커서 (before 파라미터로 전달), 없으면 처음까지 모두 받은 것
+    next_cursor: Optional[str] = None
+    has_more: bool = False
+    # append API로 저장된 마지막 순번 — 클라이언트는 last_seq + 1부터 이어서 append
+    last_seq: Optional[int] = None
 
 
 class CreateConversationRequest(BaseModel):
@@ -56,6 +64,38 @@ class UpdateMessagesRequest(BaseModel):
     title: Optional[str] = Field(default=None, max_length=500)
 
 
+class AppendMessageItem(BaseModel):
+    """append 항목 — seq는 대화 내 클라이언트 순번 (0부터 증가)"""
+    seq: int = Field(..., ge=0)
+    message: Any
+
+
+class AppendMessagesRequest(BaseModel):
+    """새 메시지만 추가 요청 (같은 seq 재전송은 멱등)"""
+    messages: List[AppendMessageItem] = Field(..., min_length=1, max_length=100)
+    title: Optional[str] = Field(default=None, max_length=500)
+
+
+def _get_owned_conversation(db: Session, conv_id: str, x_user_id: str) -> Conversation:
+    conv = db.query(Conversation).filter(Conversation.id == conv_id).first()
+    if not conv:
+        raise HTTPException(status_code=404, detail="Conversation not found")
+    role = resolve_role(db, x_user_id)
+    if role != "admin" and conv.user_id != x_user_id:
+        raise HTTPException(status_code=403, detail="접근 권한이 없습니다.")
+    return conv
+
+
+def _message_order_key():
+    """메시지 정렬 키 seq_key — (seq_key, id) 순으로 정렬한다.
+
+    append 행은 클라이언트 seq 순이라 재시도로 낮은 seq가 늦게 INSERT돼도 제자리에 나오고,
+    seq가 없는 행(PUT·서버 측 저장)은 -1로 앞에 두어 id 순. 인덱스
+    idx_conv_messages_conv_seq_id (conversation_id, COALESCE(seq, -1), id)와 같은 식이어야 한다.
+    """
+    return func.coalesce(ConversationMessage.seq, -1)
+
+
 # ============================================================
 # 엔드포인트
 # ============================================================
@@ -105,22 +145,37 @@ def list_conversations(
 def get_conversation(
     conv_id: str,
     limit: int = Query(default=200, ge=1, le=500),
+    before: Optional[str] = Query(default=None, max_length=200),
     x_user_id: str = Depends(get_request_user_id),
     db: Session = Depends(get_db),
 ):
-    """대화 상세 조회 (messages 포함, 최근 limit건)"""
-    conv = db.query(Conversation).filter(Conversation.id == conv_id).first()
-    if not conv:
-        raise HTTPException(status_code=404, detail="Conversation not found")
-    role = resolve_role(db, x_user_id)
-    if role != "admin" and conv.user_id != x_user_id:
-        raise HTTPException(status_code=403, detail="접근 권한이 없습니다.")
-    rows = (
-        db.query(ConversationMessage)
+    """대화 상세 조회 (messages 포함, 최근 limit건)
+
+    before 커서를 주면 그 이전 limit건을 반환한다 (위로 스크롤하며 이전 메시지 로드).
+    순서는 (seq_key, id) — _message_order_key 참고. idx_conv_messages_conv_seq_id 역순 스캔이라
+    대화 길이와 무관하게 limit건만 읽는다.
+    """
+    before_key: Optional[tuple[int, int]] = None
+    if before:
+        try:
+            before_key = decode_message_cursor(before)
+        except ValueError:
+            raise HTTPException(status_code=422, detail="Invalid cursor format")
+
+    conv = _get_owned_conversation(db, conv_id, x_user_id)
+    seq_key = _message_order_key()
+    q = db.query(ConversationMessage, seq_key).filter(ConversationMessage.conversation_id == conv_id)
+    if before_key is not None:
+        q = q.filter(tuple_(seq_key, ConversationMessage.id) < before_key)
+    rows = q.order_by(seq_key.desc(), ConversationMessage.id.desc()).limit(limit + 1).all()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = encode_message_cursor(rows[-1][1], rows[-1][0].id) if has_more else None
+    last_seq = (
+        db.query(func.max(ConversationMessage.seq))
         .filter(ConversationMessage.conversation_id == conv_id)
-        .order_by(ConversationMessage.id.desc())
-        .limit(limit)
-        .all()
+        .scalar()
     )
     return {
         "id": conv.id,
@@ -130,7 +185,84 @@ def get_conversation(
         "title": conv.title,
         "created_at": conv.created_at,
         "last_active_at": conv.last_active_at,
-        "messages": [row.message_data for row in reversed(rows)],
+        "messages": [row.message_data for row, _ in reversed(rows)],
+        "next_cursor": next_cursor,
+        "has_more": has_more,
+        "last_seq": last_seq,
+    }
+
+
+@router.post("/{conv_id}/messages")
+def append_messages(
+    conv_id: str,
+    body: AppendMessagesRequest,
+    x_user_id: str = Depends(get_request_user_id),
+    db: Session = Depends(get_db),
+):
+    """새 메시지만 추가 (append-only)
+
+    PUT의 전체 삭제 후 재삽입과 달리 요청에 담긴 행만 INSERT한다. (conversation_id, seq)
+    유니크 인덱스에 ON CONFLICT DO NOTHING으로 넣으므로 같은 payload 재전송은 멱등이고,
+    이미 저장된 seq에 다른 내용을 보내면 409 (요청 전체 롤백).
+    """
+    seqs = [item.seq for item in body.messages]
+    if len(set(seqs)) != len(seqs):
+        raise HTTPException(status_code=422, detail="요청 안에 중복된 seq가 있습니다.")
+
+    conv = _get_owned_conversation(db, conv_id, x_user_id)
+    items = sorted(body.messages, key=lambda item: item.seq)
+    stmt = (
+        pg_insert(ConversationMessage)
+        .values([
+            {"conversation_id": conv_id, "seq": item.seq, "message_data": item.message}
+            for item in items
+        ])
+        .on_conflict_do_nothing(
+            index_elements=["conversation_id", "seq"],
+            index_where=ConversationMessage.seq.isnot(None),
+        )
+        .returning(ConversationMessage.seq)
+    )
+    inserted = {row[0] for row in db.execute(stmt)}
+
+    duplicates = [item for item in items if item.seq not in inserted]
+    if duplicates:
+        existing = dict(
+            db.query(ConversationMessage.seq, ConversationMessage.message_data)
+            .filter(
+                ConversationMessage.conversation_id == conv_id,
+                ConversationMessage.seq.in_([item.seq for item in duplicates]),
+            )
+            .all()
+        )
+        conflicts = [item.seq for item in duplicates if existing.get(item.seq) != item.message]
+        if conflicts:
+            db.rollback()
+            logger.warning("conversation_messages_append_conflict", conv_id=conv_id, seqs=conflicts[:10])
+            raise HTTPException(
+                status_code=409,
+                detail={"message": "이미 다른 내용으로 저장된 seq입니다.", "seqs": conflicts},
+            )
+
+    last_seq = (
+        db.query(func.max(ConversationMessage.seq))
+        .filter(ConversationMessage.conversation_id == conv_id)
+        .scalar()
+    )
+    if body.title:
+        conv.title = body.title
+    conv.last_active_at = datetime.now(timezone.utc)
+    db.commit()
+
+    logger.info(
+        "conversation_messages_appended",
+        conv_id=conv_id, appended=len(inserted), duplicates=len(duplicates),
+    )
+    return {
+        "status": "ok",
+        "appended": len(inserted),
+        "duplicates": len(duplicates),
+        "last_seq": last_seq,
     }
 
 
@@ -141,13 +273,11 @@ def update_messages(
     x_user_id: str = Depends(get_request_user_id),
     db: Session = Depends(get_db),
 ):
-    """메시지 배열 및 제목 갱신 (기존 메시지 삭제 후 재삽입)"""
-    conv = db.query(Conversation).filter(Conversation.id == conv_id).first()
-    if not conv:
-        raise HTTPException(status_code=404, detail="Conversation not found")
-    role = resolve_role(db, x_user_id)
-    if role != "admin" and conv.user_id != x_user_id:
-        raise HTTPException(status_code=403, detail="접근 권한이 없습니다.")
+    """메시지 배열 및 제목 갱신 (기존 메시지 삭제 후 재삽입)
+
+    대화 길이에 비례해 비용이 커지므로 새 클라이언트는 POST append를 사용한다 (호환용으로 유지).
+    """
+    conv = _get_owned_conversation(db, conv_id, x_user_id)
 
     db.query(ConversationMessage).filter(
         ConversationMessage.conversation_id == conv_id
@@ -170,12 +300,7 @@ def delete_conversation(
     db: Session = Depends(get_db),
 ):
     """대화 삭제"""
-    conv = db.query(Conversation).filter(Conversation.id == conv_id).first()
-    if not conv:
-        raise HTTPException(status_code=404, detail="Conversation not found")
-    role = resolve_role(db, x_user_id)
-    if role != "admin" and conv.user_id != x_user_id:
-        raise HTTPException(status_code=403, detail="접근 권한이 없습니다.")
+    conv = _get_owned_conversation(db, conv_id, x_user_id)
 
     db.delete(conv)
     db.commit()
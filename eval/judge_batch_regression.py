@@ -0,0 +1,124 @@
+"""
+품질 검사 LLM Judge 단건 vs 배치 모드 회귀 비교 스크립트
+
+사용법:
+    python eval/judge_batch_regression.py --input PATH [--batch_size N] [--model NAME] [--output PATH]
+
+입력 JSONL (한 줄 = 메시지 1개):
+    {"product_id": "...", "purpose": "...", "title": "...", "message": "..."}
+
+동작:
+    1. 각 메시지에 대해 상품 조회 + Stage 1·2 실행 (통과한 메시지만 Judge 비교 대상)
+    2. 단건 모드: 메시지마다 Judge 1회 호출 (_run_llm_judge)
+    3. 배치 모드: batch_size개씩 묶어 Judge 1회 호출 (_run_llm_judge_batch, 검증 실패 묶음은 폴백 건수로 집계)
+    4. 항목별 점수 일치율 / 평균 절대 오차 / 통과 판정 일치율 / LLM 호출 수 출력 및 JSONL 저장
+"""
+import asyncio
+import sys
+import json
+import argparse
+from pathlib import Path
+
+# 프로젝트 루트를 sys.path에 추가 (백엔드 패키지 import 가능하도록)
+_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(_ROOT))
+
+import os
+from dotenv import load_dotenv
+load_dotenv(_ROOT / "backend" / "app" / ".env")
+
+from backend.app.agents.generate_message_agent.services.quality_check import QualityChecker
+from backend.app.config.settings import settings
+from backend.app.core.llm_factory import get_llm
+
+# settings.py가 load_dotenv(override=True)로 덮어쓰므로, 모든 import 이후에 설정해야 함
+os.environ["LANGCHAIN_TRACING_V2"] = "false"
+os.environ["LANGSMITH_TRACING"] = "false"
+
+_SCORE_KEYS = ("accuracy", "tone", "personalization", "naturalness", "cta_clarity")
+
+
+def load_dataset(path: Path) -> list[dict]:
+    records = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                records.append(json.loads(line))
+    return records
+
+
+async def main(input_path: Path, batch_size: int, model: str, output_path: Path) -> None:
+    checker = QualityChecker()
+    llm = get_llm(model, temperature=0.0, reasoning_effort="low")
+    records = load_dataset(input_path)
+
+    pre = await asyncio.gather(*[
+        checker._run_pre_judge_stages({"title": r["title"], "message": r["message"]}, r["product_id"])
+        for r in records
+    ])
+    ctxs = [
+        {**ctx, "purpose": r["purpose"], "product_id": r["product_id"]}
+        for r, (_, ctx) in zip(records, pre) if ctx is not None
+    ]
+    print(f"대상 메시지: {len(ctxs)}/{len(records)}개 (Stage 1·2 통과)")
+    if not ctxs:
+        await checker.aclose()
+        return
+
+    single = await asyncio.gather(*[
+        checker._run_llm_judge(
+            c["title"], c["message"], c["product_name"], c["product"], c["purpose"], c["brand_name"], llm,
+        )
+        for c in ctxs
+    ])
+
+    chunks = [ctxs[i:i + batch_size] for i in range(0, len(ctxs), batch_size)]
+    batched_chunks = await asyncio.gather(*[checker._run_llm_judge_batch(chunk, llm) for chunk in chunks])
+    fallback_count = sum(1 for b in batched_chunks if b is None)
+
+    rows = []
+    for chunk_no, (chunk, batched) in enumerate(zip(chunks, batched_chunks)):
+        for j, c in enumerate(chunk):
+            idx = chunk_no * batch_size + j
+            s_passed, s_scores = single[idx]
+            b_passed, b_scores = batched[j] if batched is not None else (None, None)
+            rows.append({
+                "product_id": c["product_id"],
+                "single_passed": s_passed,
+                "batch_passed": b_passed,
+                "single_scores": s_scores,
+                "batch_scores": b_scores,
+            })
+
+    compared = [r for r in rows if r["single_scores"] and r["batch_scores"]]
+    total_dims = len(compared) * len(_SCORE_KEYS)
+    exact = sum(1 for r in compared for k in _SCORE_KEYS if r["single_scores"][k] == r["batch_scores"][k])
+    abs_err = sum(abs(r["single_scores"][k] - r["batch_scores"][k]) for r in compared for k in _SCORE_KEYS)
+    pass_agree = sum(1 for r in compared if r["single_passed"] == r["batch_passed"])
+
+    print(f"\n{'=' * 50}")
+    print(f"  배치 크기            : {batch_size}")
+    print(f"  LLM 호출 수          : 단건 {len(ctxs)}회 / 배치 {len(chunks)}회 (폴백 묶음 {fallback_count}개)")
+    if compared:
+        print(f"  항목 점수 일치율     : {exact / total_dims:.1%} ({exact}/{total_dims})")
+        print(f"  항목 평균 절대 오차  : {abs_err / total_dims:.3f}")
+        print(f"  통과 판정 일치율     : {pass_agree / len(compared):.1%} ({pass_agree}/{len(compared)})")
+    print(f"{'=' * 50}")
+
+    with open(output_path, "w", encoding="utf-8") as f:
+        for r in rows:
+            f.write(json.dumps(r, ensure_ascii=False) + "\n")
+    print(f"결과 저장: {output_path}")
+
+    await checker.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="LLM Judge 단건 vs 배치 회귀 비교")
+    parser.add_argument("--input", type=Path, required=True)
+    parser.add_argument("--batch_size", type=int, default=settings.quality_check_llm_judge_batch_max_size)
+    parser.add_argument("--model", type=str, default=settings.chatgpt_model_name)
+    parser.add_argument("--output", type=Path, default=Path(__file__).parent / "judge_batch_regression_results.jsonl")
+    args = parser.parse_args()
+    asyncio.run(main(args.input, args.batch_size, args.model, args.output))
@@ -29,7 +29,7 @@ const NODE_STATUS = {
   data_registration_agent: '데이터 등록 중...',
 };
 
-async function* parseSSE(response) {
+async function* parseSSE(response, cursor = {}) {
   const reader = response.body.getReader();
   const decoder = new TextDecoder();
   let buffer = '';
@@ -41,7 +41,9 @@ async function* parseSSE(response) {
       const lines = buffer.split('\n');
       buffer = lines.pop();
       for (const line of lines) {
-        if (line.startsWith('data: ')) {
+        if (line.startsWith('id: ')) {
+          cursor.lastEventId = line.slice(4);
+        } else if (line.startsWith('data: ')) {
           try { yield JSON.parse(line.slice(6)); }
           catch { /* 파싱 실패 무시 */ }
         }
@@ -52,6 +54,33 @@ async function* parseSSE(response) {
   }
 }
 
+const STREAM_RESUME_MAX_RETRIES = 3;
+
+// 연결이 끊기면 마지막 이벤트 id로 /chat/v2/stream/resume에 다시 붙어 이어받는다 (그래프 재실행 없음)
+async function* parseSSEWithResume(response) {
+  const cursor = {};
+  let retries = 0;
+  let current = response;
+  while (true) {
+    try {
+      for await (const event of parseSSE(current, cursor)) {
+        yield event;
+        if (event.type === 'done') return;
+      }
+    } catch (err) {
+      if (!cursor.lastEventId || retries >= STREAM_RESUME_MAX_RETRIES) throw err;
+    }
+    if (!cursor.lastEventId || retries >= STREAM_RESUME_MAX_RETRIES) return;
+    retries += 1;
+    await new Promise(resolve => setTimeout(resolve, 1000 * retries));
+    current = await fetch('/api/marketing/chat/v2/stream/resume', {
+      headers: { 'Last-Event-ID': cursor.lastEventId },
+      credentials: 'include',
+    });
+    if (!current.ok) return;
+  }
+}
+
 /* --- [1] 스타일 컴포넌트 --- */
 const Container = styled.div` display: flex; height: calc(100vh - 100px); gap: 24px; max-width: 1400px; margin: 0 auto; `;
 const Sidebar = styled.div` width: 340px; background: white; border-radius: 24px; border: 1px solid #eee; padding: 24px; display: flex; flex-direction: column; gap: 24px; box-shadow: 0 4px 20px rgba(0,0,0,0.02); `;
@@ -610,9 +639,11 @@ export default function Message() {
 
       let result = null;
       let accStreamingText = '';
-      for await (const event of parseSSE(response)) {
-        if (event.type === 'node_start') {
-          const label = NODE_STATUS[event.node] || '처리 중...';
+      for await (const event of parseSSEWithResume(response)) {
+        if (event.type === 'node_start' || event.type === 'queued') {
+          const label = event.type === 'queued'
+            ? `대기 중... (${event.position}번째, 약 ${event.estimated_wait_seconds}초)`
+            : NODE_STATUS[event.node] || '처리 중...';
           const updatedMessages = messagesWithLoading.map(m =>
             m.id === loadingMsg.id ? { ...m, statusText: label } : m
           );
@@ -757,9 +788,11 @@ export default function Message() {
 
       let result = null;
       let accStreamingText = '';
-      for await (const event of parseSSE(response)) {
-        if (event.type === 'node_start') {
-          const label = NODE_STATUS[event.node] || '처리 중...';
+      for await (const event of parseSSEWithResume(response)) {
+        if (event.type === 'node_start' || event.type === 'queued') {
+          const label = event.type === 'queued'
+            ? `대기 중... (${event.position}번째, 약 ${event.estimated_wait_seconds}초)`
+            : NODE_STATUS[event.node] || '처리 중...';
           const updatedMessages = messagesWithLoading.map(m =>
             m.id === loadingMsg.id ? { ...m, statusText: label } : m
           );
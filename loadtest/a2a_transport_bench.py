@@ -0,0 +1,160 @@
+"""A2A transport 벤치마크 — HTTP(A2AClient) vs in-process(LocalA2AClient) hop당 오버헤드.
+
+사용법 (backend 의존성이 설치된 환경, 저장소 루트에서):
+    python loadtest/a2a_transport_bench.py                              # 대화 20메시지, 3 hop, 동시 20
+    python loadtest/a2a_transport_bench.py --messages 50 --hops 5 --concurrency 50
+
+generate_message_agent의 실제 라우터(tasks/send · TaskManager · 이력 처리)와 task_events를 쓰되,
+그래프는 LLM 없이 입력 messages를 그대로 돌려주는 echo 그래프로 바꿔 transport 비용만 남긴다.
+
+- HTTP: 같은 이벤트 루프에서 uvicorn으로 서브에이전트 앱(InternalToken · BodySizeLimit 미들웨어 포함)을
+  띄우고 A2AClient로 호출 — 직렬화 · 루프백 소켓 · 미들웨어 · JSON 파싱을 모두 거친다.
+- local: LocalA2AClient가 같은 TaskManager에 직접 등록 — 메시지 객체를 그대로 넘긴다.
+
+대화(동시 --concurrency개)마다 --hops번 연속으로 send_task를 호출한다 (CRM 1턴의 서브에이전트 호출).
+
+출력 (transport별 1행):
+- hop 지연 p50/p99
+- CPU ms/hop: 클라이언트·서버가 같은 프로세스라 양쪽 합계 process CPU / 전체 hop 수
+- 요청 bytes/hop: tasks/send 요청 본문 크기 (local은 직렬화하지 않으므로 0)
+"""
+
+import argparse
+import asyncio
+import socket
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+
+from analyze_results import percentile  # noqa: E402
+
+import uvicorn  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+from langchain_core.messages import AIMessage, HumanMessage  # noqa: E402
+
+from a2a.client import A2AClient  # noqa: E402
+from a2a.history import create_history_cache  # noqa: E402
+from a2a.local import LocalA2AClient, LocalAgentHost  # noqa: E402
+from a2a.tasks import create_task_manager  # noqa: E402
+from app.agents.generate_message_agent.a2a_agent import router  # noqa: E402
+from app.config.settings import settings  # noqa: E402
+from app.core.body_limit import BodySizeLimitMiddleware  # noqa: E402
+from app.core.internal_auth import InternalTokenMiddleware  # noqa: E402
+
+_AGENT = "generate_message_agent"
+
+
+class EchoGraph:
+    """astream_events(v2)의 루트 on_chain_end만 내보내는 그래프 — 입력 messages를 그대로 결과로."""
+
+    async def astream_events(self, graph_input: dict, config: dict, version: str = "v2"):
+        yield {
+            "event": "on_chain_end",
+            "parent_ids": [],
+            "data": {"output": {"messages": graph_input["messages"], "generated_tasks": [], "status": "completed"}},
+        }
+
+
+def build_agent_state() -> SimpleNamespace:
+    return SimpleNamespace(
+        services=None,
+        graph=EchoGraph(),
+        a2a_history=create_history_cache(),
+        a2a_tasks=create_task_manager(_AGENT),
+    )
+
+
+def build_messages(count: int) -> list:
+    body = "고객님께 추천드릴 상품은 보습 크림입니다. " * 8
+    return [
+        (HumanMessage if i % 2 == 0 else AIMessage)(content=f"{i}: {body}", id=f"msg-{i}")
+        for i in range(count)
+    ]
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def run_hops(client, messages: list, hops: int, conv: int, latencies: list) -> None:
+    for hop in range(hops):
+        started = time.perf_counter()
+        await client.send_task(f"bench-{conv}", {"messages": messages, "active_persona_id": "p1"})
+        latencies.append(time.perf_counter() - started)
+
+
+async def run_case(client, messages: list, hops: int, concurrency: int) -> dict:
+    # 워밍업 1회 (연결 수립 · 모듈 초기화 제외)
+    await client.send_task("bench-warmup", {"messages": messages})
+    latencies: list[float] = []
+    cpu_start = time.process_time()
+    await asyncio.gather(*(run_hops(client, messages, hops, c, latencies) for c in range(concurrency)))
+    return {"latencies": latencies, "cpu": time.process_time() - cpu_start}
+
+
+async def bench_http(messages: list, hops: int, concurrency: int) -> tuple[dict, int]:
+    app = FastAPI()
+    app.add_middleware(InternalTokenMiddleware)
+    app.add_middleware(BodySizeLimitMiddleware, max_body_bytes=settings.max_chat_body_bytes)
+    app.include_router(router)
+    state = build_agent_state()
+    app.state.services, app.state.graph = state.services, state.graph
+    app.state.a2a_history, app.state.a2a_tasks = state.a2a_history, state.a2a_tasks
+
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    serve_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+
+    client = A2AClient(f"http://127.0.0.1:{port}/a2a/generate-message")
+    req, _ = client._build_request("bench-size", {"messages": messages, "active_persona_id": "p1"})
+    request_bytes = len(req.model_dump_json().encode("utf-8"))
+    try:
+        stats = await run_case(client, messages, hops, concurrency)
+    finally:
+        await client.aclose()
+        await state.a2a_tasks.close()
+        server.should_exit = True
+        await serve_task
+    return stats, request_bytes
+
+
+async def bench_local(messages: list, hops: int, concurrency: int) -> tuple[dict, int]:
+    host = LocalAgentHost(_AGENT, state=build_agent_state())
+    client = LocalA2AClient(_AGENT, host=host)
+    try:
+        stats = await run_case(client, messages, hops, concurrency)
+    finally:
+        await host.close()
+    return stats, 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="A2A transport 벤치마크")
+    parser.add_argument("--messages", type=int, default=20, help="hop마다 보내는 대화 메시지 수")
+    parser.add_argument("--hops", type=int, default=3, help="대화당 연속 send_task 횟수")
+    parser.add_argument("--concurrency", type=int, default=20, help="동시 대화 수")
+    args = parser.parse_args()
+
+    messages = build_messages(args.messages)
+    total_hops = args.hops * args.concurrency
+    print(f"# A2A transport 벤치마크 — 메시지 {args.messages}개, {args.hops} hop × 동시 {args.concurrency}\n")
+    print("| transport | hop p50 | hop p99 | CPU ms/hop | 요청 bytes/hop |")
+    print("|---|---|---|---|---|")
+    for name, bench in (("http", bench_http), ("local", bench_local)):
+        stats, request_bytes = asyncio.run(bench(messages, args.hops, args.concurrency))
+        latencies = sorted(x * 1000 for x in stats["latencies"])
+        print(
+            f"| {name} | {percentile(latencies, 0.5):.2f}ms | {percentile(latencies, 0.99):.2f}ms"
+            f" | {stats['cpu'] * 1000 / total_hops:.3f} | {request_bytes} |"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""후보 경쟁(candidate race) 모드 vs 기존 재시도 루프 — generate 서버 로그에서 지연 분포 비교.
+
+사용법:
+    python candidate_race_report.py <generate_server_log> [<generate_server_log> ...] > CANDIDATE_RACE_결과_<날짜>.md
+
+generate 서버의 JSON 로그(structlog)에서 generate_pipeline_latency 이벤트를 generation_mode별로
+모아 p50/p95/p99와 피드백 재시도 분포를 표로 출력한다. 같은 부하(run_chat_stream_test.sh)를
+GENERATE_CANDIDATE_RACE_PURPOSES 미설정/설정 상태로 각각 돌린 로그를 함께 넘기면 된다.
+candidate_race_done 이벤트로 후보 통과율·취소 건수도 함께 집계한다.
+"""
+
+import json
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+from analyze_results import percentile
+
+
+def iter_events(paths: list[Path]):
+    for path in paths:
+        for line in path.read_text(encoding="utf-8", errors="replace").splitlines():
+            line = line.strip()
+            if not line.startswith("{"):
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+def fmt(v: float | None) -> str:
+    return "-" if v is None else f"{v / 1000:.2f}s"
+
+
+def main() -> None:
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    durations: dict[str, list[float]] = defaultdict(list)
+    retries: dict[str, list[int]] = defaultdict(list)
+    race_total = race_passed = race_cancelled = 0
+
+    for event in iter_events([Path(p) for p in sys.argv[1:]]):
+        name = event.get("event")
+        if name == "generate_pipeline_latency":
+            mode = event.get("generation_mode", "retry_loop")
+            durations[mode].append(float(event["duration_ms"]))
+            retries[mode].append(int(event.get("feedback_retry_count", 0)))
+        elif name == "candidate_race_done":
+            race_total += 1
+            race_passed += bool(event.get("passed"))
+            race_cancelled += int(event.get("cancelled_count", 0))
+
+    print("## 생성 모드별 end-to-end 지연 (generate_message_agent)\n")
+    print("| 모드 | 요청 수 | p50 | p95 | p99 | 피드백 재시도 ≥1 비율 |")
+    print("|---|---|---|---|---|---|")
+    for mode in ("retry_loop", "candidate_race"):
+        data = durations.get(mode, [])
+        retried = sum(1 for r in retries.get(mode, []) if r > 0)
+        retry_rate = f"{retried / len(data):.1%}" if data else "-"
+        print(
+            f"| {mode} | {len(data)} | {fmt(percentile(data, 0.50))} | {fmt(percentile(data, 0.95))} "
+            f"| {fmt(percentile(data, 0.99))} | {retry_rate} |"
+        )
+
+    base_p99 = percentile(durations.get("retry_loop", []), 0.99)
+    race_p99 = percentile(durations.get("candidate_race", []), 0.99)
+    if base_p99 and race_p99:
+        print(f"\np99 변화: {fmt(base_p99)} → {fmt(race_p99)} ({(race_p99 - base_p99) / base_p99:+.1%})")
+
+    if race_total:
+        print("\n## 후보 경쟁 상세\n")
+        print(f"- 경쟁 태스크 수: {race_total}")
+        print(f"- 첫 통과 후보 확보율: {race_passed / race_total:.1%} ({race_passed}/{race_total})")
+        print(f"- 취소된 후보 수: {race_cancelled} (태스크당 평균 {race_cancelled / race_total:.2f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""가짜 LLM provider(fake-*)로 CRM → recommend → generate 대화 1건의 LLM 호출 흐름을 오프라인 재현하는 벤치마크.
+
+사용법 (backend 의존성이 설치된 환경, 저장소 루트에서):
+    python loadtest/fake_llm_flow_bench.py                                  # 세션 200, 동시 50
+    python loadtest/fake_llm_flow_bench.py --sessions 1000 --concurrency 200 --ttft-ms 0 --per-token-ms 0
+
+세션마다 실제 코드 경로(프롬프트 빌더·with_structured_output·ainvoke_with_retry·astream_with_early_abort)로
+아래 호출을 순서대로 실행한다. OpenSearch·DB 대신 추천 결과는 가짜 상품 --products개로 채운다.
+
+1. supervisor_routing — RouteDecision
+2. recommend_product_parser · search_query — RecommendProductRequest · SearchQuery
+3. generate_message_router — GenerateMessageRouterResult (추천 결과의 상품ID로 tasks)
+4. generate_crm_message — 상품별 스트리밍 생성 (JSON title/message)
+5. quality_check_llm_judge — LLMJudgeBatchOutput
+6. supervisor_final_answer — 최종 답변
+
+--ttft-ms 0 --per-token-ms 0이면 provider 지연이 없으므로 측정값이 곧 에이전트 쪽 오버헤드(프롬프트 구성,
+세마포어·governor, 파싱, 콜백)다.
+
+출력 (호출 지점별 1행 + 세션 전체): 호출 수, 실패 수, 지연 p50/p99
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+
+from analyze_results import percentile  # noqa: E402
+
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage  # noqa: E402
+
+from app.config.settings import settings  # noqa: E402
+from app.agents.crm_message_agent.nodes import RouteDecision  # noqa: E402
+from app.agents.crm_message_agent.prompts.supervisor_prompt import (  # noqa: E402
+    build_final_answer_prompt,
+    build_supervisor_prompt,
+)
+from app.agents.generate_message_agent.services.quality_check import LLMJudgeBatchOutput  # noqa: E402
+from app.agents.shared.parser_and_router.parser_and_router_request import (  # noqa: E402
+    generate_message_router,
+    recommend_product_parser,
+)
+from app.agents.shared.persona.generate_persona_and_query import generate_search_query  # noqa: E402
+from app.core.llm_factory import get_llm  # noqa: E402
+from app.core.llm_utils import ainvoke_with_retry, astream_with_early_abort  # noqa: E402
+from app.core.logging import get_logger  # noqa: E402
+
+_logger = get_logger("fake_llm_flow_bench")
+_USER_MESSAGE = "PERSONA_00253 고객에게 건성 피부 보습 크림을 추천하고 CRM 메시지를 만들어줘"
+
+
+def _recommend_result(products: int) -> AIMessage:
+    lines = [
+        f"- [TOP{i + 1}] [상품ID: p{i + 1:03d}] [브랜드{i + 1}] 수분 크림 {i + 1} (크림): 건성 피부 보습"
+        for i in range(products)
+    ]
+    return AIMessage(content="추천 상품:\n" + "\n".join(lines), name="recommend_product_agent")
+
+
+def _message_prompt(product_id: str) -> list:
+    return [
+        SystemMessage(content="당신은 아모레몰의 전문 뷰티 마케팅 카피라이터입니다."),
+        HumanMessage(content=(
+            f"# 입력 정보\n- 상품정보: {{'product_id': '{product_id}', 'product_name': '수분 크림 {product_id}'}}\n\n"
+            "# 출력 형식 (JSON만 출력, 설명 없음)\n"
+            '{"title": "[40자 이내 제목]", "message": "[350자 이내 메시지 본문]"}'
+        )),
+    ]
+
+
+def _judge_prompt(messages: list[str]) -> list:
+    body = "\n\n".join(f"# 메시지 {i + 1}\n{m}" for i, m in enumerate(messages))
+    return [SystemMessage(content="CRM 메시지를 5개 항목으로 평가하세요."), HumanMessage(content=body)]
+
+
+async def run_session(model: str, products: int, timings: dict, failures: dict) -> None:
+    llm = get_llm(model, temperature=settings.llm_temperature_classifier)
+    message_llm = get_llm(model, temperature=settings.llm_temperature_generator)
+    retry = {"max_retries": 1, "backoff_base": 0.1, "logger": _logger}
+
+    async def timed(site: str, coro):
+        started = time.perf_counter()
+        try:
+            return await coro
+        except Exception:
+            failures[site] += 1
+            raise
+        finally:
+            timings[site].append(time.perf_counter() - started)
+
+    messages = [HumanMessage(content=_USER_MESSAGE)]
+    await timed("supervisor_routing", ainvoke_with_retry(
+        llm.with_structured_output(RouteDecision), build_supervisor_prompt(messages),
+        semaphore_key="supervisor_routing", max_concurrency=settings.supervisor_routing_max_concurrency,
+        retry_event="supervisor_routing_retry", **retry,
+    ))
+    await asyncio.gather(
+        timed("recommend_product_parser", recommend_product_parser(messages, llm)),
+        timed("search_query", generate_search_query(messages, llm)),
+    )
+    messages.append(_recommend_result(products))
+
+    route = await timed("generate_message_router", generate_message_router(messages, llm))
+    product_ids = [task.product_id for task in route.tasks or []]
+    generated = await asyncio.gather(*(
+        timed("generate_crm_message", astream_with_early_abort(
+            message_llm, _message_prompt(pid), make_check=None,
+            semaphore_key="generate_crm_message", max_concurrency=settings.generate_crm_message_max_concurrency,
+            retry_event="generate_crm_message_retry", **retry,
+        ))
+        for pid in product_ids
+    ))
+    await timed("quality_check_llm_judge", ainvoke_with_retry(
+        llm.with_structured_output(LLMJudgeBatchOutput), _judge_prompt([text for text, _ in generated]),
+        semaphore_key="quality_check_llm_judge", max_concurrency=settings.quality_check_llm_judge_max_concurrency,
+        retry_event="llm_judge_retry", **retry,
+    ))
+    messages.append(AIMessage(content="생성된 CRM 메시지:\n" + "\n".join(t for t, _ in generated),
+                              name="generate_message_agent"))
+    await timed("supervisor_final_answer", ainvoke_with_retry(
+        llm, build_final_answer_prompt(messages),
+        semaphore_key="supervisor_final_answer", max_concurrency=settings.supervisor_final_answer_max_concurrency,
+        retry_event="supervisor_final_answer_retry", **retry,
+    ))
+
+
+async def run(args) -> tuple[dict, dict, float]:
+    timings: dict = defaultdict(list)
+    failures: dict = defaultdict(int)
+    remaining = iter(range(args.sessions))
+
+    async def worker() -> None:
+        for _ in remaining:
+            started = time.perf_counter()
+            try:
+                await run_session(args.model, args.products, timings, failures)
+            except Exception:
+                failures["session"] += 1
+            timings["session"].append(time.perf_counter() - started)
+
+    wall_start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    return timings, failures, time.perf_counter() - wall_start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="가짜 LLM provider 대화 흐름 벤치마크")
+    parser.add_argument("--model", default="fake-gpt-4o-mini", help="fake-* 모델명")
+    parser.add_argument("--sessions", type=int, default=200, help="전체 대화 세션 수")
+    parser.add_argument("--concurrency", type=int, default=50, help="동시 세션 수")
+    parser.add_argument("--products", type=int, default=3, help="세션당 추천·생성 상품 수")
+    parser.add_argument("--ttft-ms", type=float, default=None, help="fake_llm_ttft_ms 덮어쓰기")
+    parser.add_argument("--sigma", type=float, default=None, help="fake_llm_latency_sigma 덮어쓰기")
+    parser.add_argument("--per-token-ms", type=float, default=None, help="fake_llm_per_token_ms 덮어쓰기")
+    args = parser.parse_args()
+    if not args.model.startswith("fake-"):
+        parser.error("--model은 fake-* 모델명이어야 합니다")
+
+    for name, value in (("ttft_ms", args.ttft_ms), ("latency_sigma", args.sigma), ("per_token_ms", args.per_token_ms)):
+        if value is not None:
+            setattr(settings, f"fake_llm_{name}", value)
+
+    timings, failures, wall = asyncio.run(run(args))
+    print(f"# 가짜 LLM 흐름 벤치마크 — {args.model}, 세션 {args.sessions} × 동시 {args.concurrency},"
+          f" 첫 토큰 {settings.fake_llm_ttft_ms:g}ms(σ {settings.fake_llm_latency_sigma:g})"
+          f" + 토큰당 {settings.fake_llm_per_token_ms:g}ms, 전체 {wall:.1f}s\n")
+    print("| 호출 지점 | 호출 | 실패 | p50 | p99 |")
+    print("|---|---|---|---|---|")
+    for site, values in timings.items():
+        lat = sorted(v * 1000 for v in values)
+        print(f"| {site} | {len(lat)} | {failures[site]} | {percentile(lat, 0.5):.1f}ms | {percentile(lat, 0.99):.1f}ms |")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""supervisor 임베딩 fast-path(intent_router) 정확도·지연 리포트 — crm 서버 로그 기반.
+
+사용법:
+    python intent_router_report.py <crm_server_log> [<crm_server_log> ...] > INTENT_ROUTER_결과_<날짜>.md
+
+SUPERVISOR_INTENT_ROUTER_MODE=shadow로 부하(run_chat_stream_test.sh) 또는 실제 대화를 돌린 로그를
+넘긴다. shadow 모드는 모든 첫 라우팅에서 라우터 판정과 LLM 플랜을 함께 남기므로
+(supervisor_intent_router_compare) LLM 플랜을 정답으로 보고 다음을 집계한다.
+
+- 현재 임계값 기준 fast-path 적용률(coverage)과 적용 건의 정확도
+- 폴백 사유 분포, 불일치 플랜 쌍
+- 라우터 vs LLM 라우팅 지연 p50/p95/p99
+- 유사도·margin 임계값 스윕 (정규식 규칙으로 폴백된 건은 항상 미적용으로 계산 —
+  유사도 미달 건은 규칙 검사 전이라 낮은 임계값에서는 적용률이 약간 과대평가될 수 있음)
+
+on 모드 로그도 넘길 수 있다: fast-path로 확정된 건(supervisor_intent_routed)은 LLM 호출이 없어
+정확도 계산에서 빠지고 적용률·지연에만 반영된다.
+"""
+
+import json
+import sys
+from collections import Counter
+from pathlib import Path
+
+from analyze_results import percentile
+
+_RULE_REASONS = {"persona_id_missing", "product_id_conflict", "file_records", "no_human_message", "encode_failed"}
+_SIM_THRESHOLDS = (0.70, 0.75, 0.80, 0.85, 0.90)
+_MARGIN_THRESHOLDS = (0.0, 0.03, 0.05, 0.08)
+
+
+def iter_events(paths: list[Path]):
+    for path in paths:
+        for line in path.read_text(encoding="utf-8", errors="replace").splitlines():
+            line = line.strip()
+            if not line.startswith("{"):
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+def fmt_ms(v: float | None) -> str:
+    return "-" if v is None else f"{v:.0f}ms"
+
+
+def plan_str(plan) -> str:
+    return " → ".join(plan) if plan else "(없음)"
+
+
+def main() -> None:
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    compares: list[dict] = []
+    routed: list[dict] = []
+    for event in iter_events([Path(p) for p in sys.argv[1:]]):
+        name = event.get("event")
+        if name == "supervisor_intent_router_compare":
+            compares.append(event)
+        elif name == "supervisor_intent_routed":
+            routed.append(event)
+
+    total = len(compares) + len(routed)
+    if not total:
+        print("supervisor_intent_router_compare / supervisor_intent_routed 이벤트가 없습니다.")
+        sys.exit(1)
+
+    decided = [e for e in compares if e.get("router_plan")]
+    correct = sum(1 for e in decided if e.get("agree"))
+
+    print("## 현재 임계값 기준\n")
+    print(f"- 첫 라우팅 수: {total} (shadow 비교 {len(compares)}, on 모드 fast-path 확정 {len(routed)})")
+    print(f"- fast-path 적용률: {(len(decided) + len(routed)) / total:.1%}")
+    if decided:
+        print(f"- 적용 건 정확도 (LLM 플랜 일치): {correct / len(decided):.1%} ({correct}/{len(decided)})")
+    top_agree = sum(1 for e in compares if e.get("agree"))
+    if compares:
+        print(f"- 임계값 무시 top-1 일치율: {top_agree / len(compares):.1%}")
+
+    reasons = Counter(e.get("fallback_reason") for e in compares if not e.get("router_plan"))
+    if reasons:
+        print("\n### 폴백 사유\n")
+        print("| 사유 | 건수 |")
+        print("|---|---|")
+        for reason, n in reasons.most_common():
+            print(f"| {reason} | {n} |")
+
+    mismatches = Counter(
+        (plan_str(e.get("router_plan")), plan_str(e.get("llm_plan")))
+        for e in decided if not e.get("agree")
+    )
+    if mismatches:
+        print("\n### 적용 건 중 불일치 (라우터 → LLM)\n")
+        print("| 라우터 플랜 | LLM 플랜 | 건수 |")
+        print("|---|---|---|")
+        for (router_plan, llm_plan), n in mismatches.most_common(10):
+            print(f"| {router_plan} | {llm_plan} | {n} |")
+
+    router_lat = [float(e["router_latency_ms"]) for e in compares if "router_latency_ms" in e]
+    router_lat += [float(e["latency_ms"]) for e in routed if "latency_ms" in e]
+    llm_lat = [float(e["llm_latency_ms"]) for e in compares if "llm_latency_ms" in e]
+    print("\n## 라우팅 지연\n")
+    print("| 경로 | 건수 | p50 | p95 | p99 |")
+    print("|---|---|---|---|---|")
+    for label, data in (("intent_router", router_lat), ("LLM 라우팅", llm_lat)):
+        print(
+            f"| {label} | {len(data)} | {fmt_ms(percentile(data, 0.50))} | {fmt_ms(percentile(data, 0.95))} "
+            f"| {fmt_ms(percentile(data, 0.99))} |"
+        )
+
+    sweepable = [e for e in compares if e.get("fallback_reason") not in _RULE_REASONS and e.get("top_plan")]
+    if sweepable:
+        print("\n## 임계값 스윕 (shadow 비교 건 기준: 적용률 / 정확도)\n")
+        print("| min_similarity \\ min_margin | " + " | ".join(f"{m:.2f}" for m in _MARGIN_THRESHOLDS) + " |")
+        print("|---|" + "---|" * len(_MARGIN_THRESHOLDS))
+        for sim in _SIM_THRESHOLDS:
+            cells = []
+            for margin in _MARGIN_THRESHOLDS:
+                hit = [
+                    e for e in sweepable
+                    if float(e.get("similarity", 0)) >= sim and float(e.get("margin", 0)) >= margin
+                ]
+                ok = sum(1 for e in hit if e.get("agree"))
+                cells.append(f"{len(hit) / len(compares):.0%} / {ok / len(hit):.1%}" if hit else "0% / -")
+            print(f"| {sim:.2f} | " + " | ".join(cells) + " |")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""LLM rate governor 벤치마크 — 로컬 가짜 OpenAI 호환 provider로 세마포어 방식과 비교.
+
+사용법 (backend 의존성이 설치된 환경, 저장소 루트에서):
+    python loadtest/llm_governor_bench.py                                   # 사용자 응답 300 + 백그라운드 300 호출
+    python loadtest/llm_governor_bench.py --interactive 500 --background 1000 --provider-rpm 1800 --burst-seconds 2
+
+같은 이벤트 루프에서 uvicorn으로 가짜 provider(POST /v1/chat/completions)를 띄운다.
+- 한도: 요청 수(--provider-rpm)·토큰(--provider-tpm) token bucket. 실제 provider처럼 분당 한도를 더 짧은
+  구간(--burst-seconds)으로 나눠 집행하고, 넘으면 429 + retry-after를 돌려준다.
+- 모든 응답에 OpenAI와 같은 x-ratelimit-{limit,remaining,reset}-{requests,tokens} 헤더를 붙인다.
+- 지연: --latency-ms(기본) + 출력 토큰당 --per-token-ms, usage(prompt/completion tokens)를 돌려준다.
+
+실제 ChatOpenAI(get_llm, base_url=가짜 provider, SDK 재시도 0)를 ainvoke_with_retry로 호출한다.
+사용자 응답 경로(supervisor_routing, 우선순위 0)와 백그라운드(conversation_summarize, 우선순위 1)
+호출을 동시에 쏟아 넣고,
+
+- semaphore: 기존 방식 — 호출 지점별 세마포어(--site-concurrency), 429는 Full Jitter 재시도
+- governor: llm_rate_governor_enabled — provider·model governor (헤더로 한도 학습, 우선순위 대기열)
+
+출력 (방식 × 호출 지점별 1행): 지연 p50/p99, 실패(재시도 소진) 수, 전체 소요 시간, provider 429 수
+"""
+
+import argparse
+import asyncio
+import json
+import socket
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+
+from analyze_results import percentile  # noqa: E402
+
+import uvicorn  # noqa: E402
+from langchain_core.messages import HumanMessage  # noqa: E402
+
+from app.config.settings import settings  # noqa: E402
+from app.core import llm_governor  # noqa: E402
+from app.core.llm_factory import get_llm  # noqa: E402
+from app.core.llm_utils import ainvoke_with_retry  # noqa: E402
+from app.core.logging import get_logger  # noqa: E402
+
+_MODEL = "gpt-4o-mini"
+_SITES = {"supervisor_routing": "interactive", "conversation_summarize": "background"}
+_logger = get_logger("llm_governor_bench")
+
+
+class FakeProvider:
+    """OpenAI chat.completions 호환 가짜 provider (ASGI) — 요청·토큰 bucket과 rate-limit 헤더."""
+
+    def __init__(self, rpm: int, tpm: int, burst_seconds: float, latency: float, per_token: float):
+        self.rpm, self.tpm = rpm, tpm
+        self.req_capacity = rpm / 60 * burst_seconds
+        self.tok_capacity = tpm / 60 * burst_seconds
+        self.req_level, self.tok_level = self.req_capacity, self.tok_capacity
+        self.updated = time.monotonic()
+        self.latency, self.per_token = latency, per_token
+        self.rate_limited = 0
+        self.completed = 0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed, self.updated = now - self.updated, now
+        self.req_level = min(self.req_capacity, self.req_level + elapsed * self.rpm / 60)
+        self.tok_level = min(self.tok_capacity, self.tok_level + elapsed * self.tpm / 60)
+
+    def _headers(self) -> list[tuple[bytes, bytes]]:
+        req_reset = max(self.req_capacity - self.req_level, 0) / (self.rpm / 60)
+        tok_reset = max(self.tok_capacity - self.tok_level, 0) / (self.tpm / 60)
+        values = {
+            "x-ratelimit-limit-requests": self.rpm,
+            "x-ratelimit-limit-tokens": self.tpm,
+            "x-ratelimit-remaining-requests": max(int(self.req_level), 0),
+            "x-ratelimit-remaining-tokens": max(int(self.tok_level), 0),
+            "x-ratelimit-reset-requests": f"{req_reset:.3f}s",
+            "x-ratelimit-reset-tokens": f"{tok_reset:.3f}s",
+        }
+        return [(k.encode(), str(v).encode()) for k, v in values.items()]
+
+    async def __call__(self, scope, receive, send):
+        body = b""
+        more = True
+        while more:
+            message = await receive()
+            body += message.get("body", b"")
+            more = message.get("more_body", False)
+        request = json.loads(body or b"{}")
+        prompt_tokens = len(body) // 4
+        completion_tokens = request.get("max_tokens") or 200
+
+        self._refill()
+        cost = prompt_tokens + completion_tokens
+        if self.req_level < 1 or self.tok_level < cost:
+            self.rate_limited += 1
+            wait = max((1 - self.req_level) / (self.rpm / 60), (cost - self.tok_level) / (self.tpm / 60), 0.05)
+            headers = self._headers() + [(b"retry-after", f"{wait:.3f}".encode()),
+                                         (b"content-type", b"application/json")]
+            await send({"type": "http.response.start", "status": 429, "headers": headers})
+            await send({"type": "http.response.body", "body": json.dumps({"error": {
+                "message": "Rate limit reached", "type": "requests", "code": "rate_limit_exceeded"}}).encode()})
+            return
+        self.req_level -= 1
+        self.tok_level -= cost
+        headers = self._headers() + [(b"content-type", b"application/json")]
+
+        await asyncio.sleep(self.latency + completion_tokens * self.per_token)
+        self.completed += 1
+        payload = {
+            "id": f"chatcmpl-{self.completed}", "object": "chat.completion", "created": int(time.time()),
+            "model": request.get("model", _MODEL),
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": "네, 확인했습니다."}}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                      "total_tokens": prompt_tokens + completion_tokens},
+        }
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": json.dumps(payload).encode()})
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def run_mode(mode: str, args) -> dict:
+    settings.llm_rate_governor_enabled = mode == "governor"
+    llm_governor._governors.clear()
+    llm_governor._http_clients.clear()
+
+    provider = FakeProvider(args.provider_rpm, args.provider_tpm, args.burst_seconds,
+                            args.latency_ms / 1000, args.per_token_ms / 1000)
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(provider, host="127.0.0.1", port=port, log_level="warning", lifespan="off"))
+    serve_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+
+    llm = get_llm(_MODEL, base_url=f"http://127.0.0.1:{port}/v1", api_key="fake", max_retries=0, max_tokens=200)
+    prompt = [HumanMessage(content="고객 문의를 분류해 주세요. " * 40)]
+    results: dict[str, dict] = {site: {"latencies": [], "failures": 0} for site in _SITES}
+
+    async def call(site: str) -> None:
+        started = time.perf_counter()
+        try:
+            await ainvoke_with_retry(
+                llm, prompt,
+                semaphore_key=site, max_concurrency=args.site_concurrency,
+                max_retries=args.max_retries, backoff_base=0.5,
+                logger=_logger, retry_event=f"{site}_retry",
+            )
+            results[site]["latencies"].append(time.perf_counter() - started)
+        except Exception:
+            results[site]["failures"] += 1
+
+    calls = ["conversation_summarize"] * args.background + ["supervisor_routing"] * args.interactive
+    wall_start = time.perf_counter()
+    try:
+        # 백그라운드 호출이 먼저 몰리고 사용자 응답 호출이 뒤따르는 상황
+        await asyncio.gather(*(call(site) for site in calls))
+    finally:
+        wall = time.perf_counter() - wall_start
+        server.should_exit = True
+        await serve_task
+        for client in llm_governor._http_clients.values():
+            await client.aclose()
+    return {"results": results, "wall": wall, "rate_limited": provider.rate_limited}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="LLM rate governor 벤치마크 (가짜 provider)")
+    parser.add_argument("--interactive", type=int, default=300, help="사용자 응답 경로 호출 수 (supervisor_routing)")
+    parser.add_argument("--background", type=int, default=300, help="백그라운드 호출 수 (conversation_summarize)")
+    parser.add_argument("--provider-rpm", type=int, default=1200, help="가짜 provider 분당 요청 한도")
+    parser.add_argument("--provider-tpm", type=int, default=1_000_000, help="가짜 provider 분당 토큰 한도")
+    parser.add_argument("--burst-seconds", type=float, default=2.0, help="한도를 집행하는 구간(초)")
+    parser.add_argument("--latency-ms", type=float, default=300, help="provider 기본 응답 지연")
+    parser.add_argument("--per-token-ms", type=float, default=2, help="출력 토큰당 추가 지연")
+    parser.add_argument("--site-concurrency", type=int, default=40, help="semaphore 방식의 호출 지점별 한도")
+    parser.add_argument("--max-retries", type=int, default=3, help="ainvoke_with_retry 최대 시도")
+    args = parser.parse_args()
+
+    print(f"# LLM rate governor 벤치마크 — provider {args.provider_rpm} RPM / {args.provider_tpm} TPM"
+          f" ({args.burst_seconds:g}s 구간 집행), 사용자 {args.interactive} + 백그라운드 {args.background} 호출\n")
+    print("| 방식 | 호출 지점 | p50 | p99 | 실패 | 전체 소요 | provider 429 |")
+    print("|---|---|---|---|---|---|---|")
+    for mode in ("semaphore", "governor"):
+        run = asyncio.run(run_mode(mode, args))
+        for site, kind in _SITES.items():
+            stats = run["results"][site]
+            lat = sorted(stats["latencies"])
+            p50, p99 = percentile(lat, 0.5), percentile(lat, 0.99)
+            fmt = lambda v: f"{v:.2f}s" if v is not None else "-"  # noqa: E731
+            print(f"| {mode} | {site} ({kind}) | {fmt(p50)} | {fmt(p99)} | {stats['failures']}"
+                  f" | {run['wall']:.1f}s | {run['rate_limited']} |")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""SSE 토큰 병합(SSECoalescer) 벤치마크 — 병합 창별 프레임 수·frames/sec·스트림당 CPU.
+
+사용법 (backend 의존성이 설치된 환경, 저장소 루트에서):
+    python loadtest/sse_coalesce_bench.py                          # 동시 100 스트림, 창 0/10/30/50ms
+    python loadtest/sse_coalesce_bench.py --streams 200 --windows 0,30 --max-bytes 512
+
+chat_stream 1턴과 비슷한 이벤트 시퀀스(supervisor 토큰 스트림 → A2A 서브에이전트 토큰 →
+text_chunk 3글자 단위 방출 → result)를 스트림마다 실제 간격(asyncio.sleep)으로 재생하고,
+chat_stream 컨슈머와 같은 방식(다음 이벤트 대기 중 병합 창이 끝나면 flush)으로 프레임을 만든다.
+각 프레임은 게이트웨이 릴레이처럼 bytes로 인코딩해 한 번 더 복사한다.
+
+출력 (창별 1행):
+- frames/stream, frames/sec(전체 스트림 합계), bytes/frame
+- 직렬화 CPU ms/stream: 병합·json.dumps·인코딩 구간만 잰 CPU 시간(thread_time) / 스트림 수
+- 전체 CPU ms/stream: 이벤트 재생(sleep 스케줄링) 포함 process CPU / 스트림 수 — 이벤트 루프 부하 참고용
+- token 지연 p50/p99: 토큰 이벤트 발생 → 그 토큰이 담긴 프레임 방출까지 (병합 창이 더하는 지연)
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+
+from analyze_results import percentile  # noqa: E402
+from app.core.sse_coalescer import SSECoalescer  # noqa: E402
+
+_SUPERVISOR_TOKENS = 120      # supervisor 라우팅·최종 응답 토큰 수
+_SUPERVISOR_INTERVAL = 0.02
+_AGENT_TOKENS = 200           # generate 서브에이전트 토큰 (a2a_streaming_enabled)
+_AGENT_INTERVAL = 0.015
+_TEXT_CHARS = 600             # 최종 생성 메시지 길이 — text_chunk 3글자 단위, 15ms 간격
+_TEXT_INTERVAL = 0.015
+
+
+def build_script() -> list[tuple[float, dict]]:
+    """(직전 이벤트 이후 대기 초, 이벤트) 목록."""
+    script: list[tuple[float, dict]] = [(0.0, {"type": "node_start", "node": "supervisor", "step": 1})]
+    script += [(_SUPERVISOR_INTERVAL, {"type": "token", "content": "토큰"}) for _ in range(_SUPERVISOR_TOKENS)]
+    script.append((0.0, {"type": "node_start", "node": "generate_message_agent", "step": 2}))
+    script.append((0.0, {"type": "agent_progress", "agent": "generate", "node": "generate", "phase": "start"}))
+    script += [
+        (_AGENT_INTERVAL, {"type": "agent_token", "agent": "generate", "node": "generate",
+                           "run_id": "r1", "content": "생성"})
+        for _ in range(_AGENT_TOKENS)
+    ]
+    script.append((0.0, {"type": "agent_progress", "agent": "generate", "node": "generate", "phase": "end"}))
+    script.append((0.0, {"type": "log", "message": "메시지 생성 완료"}))
+    text = ("안녕하세요 고객님, " * 100)[:_TEXT_CHARS]
+    script += [(_TEXT_INTERVAL, {"type": "text_chunk", "content": text[i:i + 3]}) for i in range(0, len(text), 3)]
+    script.append((0.0, {"type": "text_done"}))
+    script.append((0.0, {"type": "node_end", "node": "generate_message_agent"}))
+    script.append((0.0, {"type": "result", "status": "completed", "messages": [{"content": text}]}))
+    script.append((0.0, {"type": "done"}))
+    return script
+
+
+async def run_stream(script, window_ms: float, max_bytes: int, stats: dict) -> None:
+    co = SSECoalescer(window_ms / 1000, max_bytes)
+    pending_token_times: list[float] = []
+
+    def timed(fn, *args) -> list[str]:
+        started = time.thread_time()
+        frames = fn(*args)
+        for frame in frames:
+            frame.encode("utf-8")  # 게이트웨이 릴레이 복사
+        stats["serialize_cpu"] += time.thread_time() - started
+        return frames
+
+    def emit(frames: list[str]) -> None:
+        now = time.perf_counter()
+        for frame in frames:
+            stats["frames"] += 1
+            stats["bytes"] += len(frame.encode("utf-8"))
+        if frames and pending_token_times:
+            stats["token_delays"].extend(now - t for t in pending_token_times)
+            pending_token_times.clear()
+
+    for delay, event in script:
+        deadline = time.perf_counter() + delay
+        while True:
+            remaining = deadline - time.perf_counter()
+            flush_in = co.time_until_flush()
+            if flush_in is not None and flush_in <= remaining:
+                await asyncio.sleep(flush_in)
+                emit(timed(co.flush))
+                continue
+            if remaining > 0:
+                await asyncio.sleep(remaining)
+            break
+        if event["type"] in ("token", "agent_token", "text_chunk"):
+            pending_token_times.append(time.perf_counter())
+        emit(timed(co.add, dict(event)))
+    emit(timed(co.flush))
+
+
+async def run_case(streams: int, window_ms: float, max_bytes: int) -> dict:
+    script = build_script()
+    stats = {"frames": 0, "bytes": 0, "token_delays": [], "serialize_cpu": 0.0}
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    await asyncio.gather(*(run_stream(script, window_ms, max_bytes, stats) for _ in range(streams)))
+    stats["cpu"] = time.process_time() - cpu_start
+    stats["wall"] = time.perf_counter() - wall_start
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="SSE 토큰 병합 벤치마크")
+    parser.add_argument("--streams", type=int, default=100, help="동시 스트림 수")
+    parser.add_argument("--windows", default="0,10,30,50", help="병합 창(ms) 목록, 콤마 구분 — 0은 병합 안 함")
+    parser.add_argument("--max-bytes", type=int, default=1024, help="병합 바이트 예산")
+    args = parser.parse_args()
+
+    windows = [float(w) for w in args.windows.split(",") if w.strip()]
+    print(f"# SSE 토큰 병합 벤치마크 — 동시 {args.streams} 스트림, max_bytes={args.max_bytes}\n")
+    print("| 창(ms) | frames/stream | frames/sec | bytes/frame | 직렬화 CPU ms/stream | 전체 CPU ms/stream"
+          " | token 지연 p50 | token 지연 p99 |")
+    print("|---|---|---|---|---|---|---|---|")
+    for window_ms in windows:
+        stats = asyncio.run(run_case(args.streams, window_ms, args.max_bytes))
+        delays = sorted(d * 1000 for d in stats["token_delays"])
+        print(
+            f"| {window_ms:g} | {stats['frames'] / args.streams:.0f} | {stats['frames'] / stats['wall']:.0f}"
+            f" | {stats['bytes'] / max(stats['frames'], 1):.0f}"
+            f" | {stats['serialize_cpu'] * 1000 / args.streams:.2f} | {stats['cpu'] * 1000 / args.streams:.2f}"
+            f" | {percentile(delays, 0.5):.1f}ms | {percentile(delays, 0.99):.1f}ms |"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""opensearch-api 클라이언트 측 부하 분산(UpstreamBalancer) 벤치마크 — 로컬 stand-in 서버 여러 개로.
+
+사용법 (backend 의존성이 설치된 환경, 저장소 루트에서):
+    python loadtest/upstream_lb_bench.py                                   # 4대(5/5/5/40ms), 1대 503
+    python loadtest/upstream_lb_bench.py --latencies 5,10,80 --failing -1 --requests 5000 --concurrency 100
+
+같은 이벤트 루프에서 uvicorn으로 stand-in 검색 서버를 --latencies 개수만큼 띄운다(각 서버는 지정 지연
+±20% 뒤 {"results": []} 응답, --failing 번째 서버는 항상 503 — -1이면 없음). 그 뒤 같은 요청 부하를
+
+- random: 요청마다 임의 복제본 — keep-alive 커넥션이 고르게 퍼진 L4 NLB와 비슷한 분산
+- lor: SharedTransport + UpstreamBalancer (진행 중 요청 수 × EWMA 지연, 연속 실패 시 제외)
+
+로 보내 비교한다. lor는 opensearch_api_lb_endpoints에 stand-in 주소를 고정 목록으로 넣어 실행한다.
+
+출력 (전략별 1행): 지연 p50/p99, 오류율, 서버별 요청 비율
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import socket
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+
+from analyze_results import percentile  # noqa: E402
+
+import uvicorn  # noqa: E402
+
+from app.config.settings import settings  # noqa: E402
+from app.core.http_client_registry import close_all, create_http_client  # noqa: E402
+
+_SEARCH_PATH = "/api/search/combined"
+
+
+def make_search_app(latency: float, failing: bool, hits: list, index: int):
+    """stand-in opensearch-api — 본문을 읽고 지연 뒤 응답 (ASGI)."""
+
+    async def app(scope, receive, send):
+        more = True
+        while more:
+            message = await receive()
+            more = message.get("more_body", False)
+        hits[index] += 1
+        await asyncio.sleep(latency * random.uniform(0.8, 1.2))
+        status, body = (503, b'{"detail":"unavailable"}') if failing else (200, json.dumps({"results": []}).encode())
+        await send({"type": "http.response.start", "status": status,
+                    "headers": [(b"content-type", b"application/json")]})
+        await send({"type": "http.response.body", "body": body})
+
+    return app
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def start_servers(latencies: list[float], failing: int, hits: list) -> tuple[list[str], list]:
+    origins, servers = [], []
+    for i, latency in enumerate(latencies):
+        port = _free_port()
+        app = make_search_app(latency, i == failing, hits, i)
+        server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", lifespan="off"))
+        servers.append((server, asyncio.create_task(server.serve())))
+        origins.append(f"http://127.0.0.1:{port}")
+    while not all(server.started for server, _ in servers):
+        await asyncio.sleep(0.01)
+    return origins, servers
+
+
+async def run_load(client, pick_url, requests: int, concurrency: int) -> dict:
+    latencies: list[float] = []
+    errors = 0
+    remaining = iter(range(requests))
+
+    async def worker() -> None:
+        nonlocal errors
+        for _ in remaining:
+            started = time.perf_counter()
+            try:
+                resp = await client.post(pick_url() + _SEARCH_PATH, json={"query": "보습 크림", "top_k": 10})
+                if resp.status_code >= 500:
+                    errors += 1
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return {"latencies": latencies, "errors": errors}
+
+
+async def bench(strategy: str, latencies: list[float], failing: int, requests: int, concurrency: int) -> dict:
+    hits = [0] * len(latencies)
+    origins, servers = await start_servers(latencies, failing, hits)
+    try:
+        if strategy == "lor":
+            settings.opensearch_api_lb_enabled = True
+            settings.opensearch_api_lb_endpoints = origins
+            client = create_http_client(timeout=10.0)
+            stats = await run_load(client, lambda: settings.opensearch_api_url, requests, concurrency)
+        else:
+            client = create_http_client(timeout=10.0)
+            stats = await run_load(client, lambda: random.choice(origins), requests, concurrency)
+        await client.aclose()
+    finally:
+        await close_all()
+        for server, _ in servers:
+            server.should_exit = True
+        await asyncio.gather(*(task for _, task in servers))
+    stats["hits"] = hits
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="opensearch-api 클라이언트 측 부하 분산 벤치마크")
+    parser.add_argument("--latencies", default="5,5,5,40", help="stand-in 서버별 응답 지연(ms), 콤마 구분")
+    parser.add_argument("--failing", type=int, default=0, help="항상 503을 내는 서버 번호 (-1이면 없음)")
+    parser.add_argument("--requests", type=int, default=3000, help="전체 요청 수")
+    parser.add_argument("--concurrency", type=int, default=50, help="동시 요청 수")
+    args = parser.parse_args()
+
+    # upstream 이름(opensearch_api)으로 balancer가 잡히도록 가상 호스트를 쓴다 — lor의 실제 연결은 endpoint로
+    settings.opensearch_api_url = "http://opensearch-api.bench:8010"
+    latencies = [float(x) / 1000 for x in args.latencies.split(",") if x.strip()]
+    print(f"# opensearch-api 부하 분산 벤치마크 — 서버 지연 {args.latencies}ms, 503 서버 {args.failing},"
+          f" 요청 {args.requests} × 동시 {args.concurrency}\n")
+    print("| 전략 | p50 | p99 | 오류율 | 서버별 요청 비율 |")
+    print("|---|---|---|---|---|")
+    for strategy in ("random", "lor"):
+        stats = asyncio.run(bench(strategy, latencies, args.failing, args.requests, args.concurrency))
+        lat = sorted(x * 1000 for x in stats["latencies"])
+        total = max(sum(stats["hits"]), 1)
+        share = " / ".join(f"{h / total:.0%}" for h in stats["hits"])
+        print(
+            f"| {strategy} | {percentile(lat, 0.5):.1f}ms | {percentile(lat, 0.99):.1f}ms"
+            f" | {stats['errors'] / args.requests:.1%} | {share} |"
+        )
+
+
+if __name__ == "__main__":
+    main()